@@ -0,0 +1,251 @@
+"""
+FreDeSa AI Platform - Azure AD token verification
+Process-wide JWKS key cache and verified-claims cache for the FastAPI backend
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import jwt
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """
+    Signing keys from a JWKS endpoint, fetched once and shared by all requests.
+
+    Keys are refreshed in a background thread every `refresh_interval`
+    seconds. A token signed with an unknown `kid` (key rotation) triggers an
+    immediate refetch, rate-limited to one per `min_refetch_interval` so a
+    flood of forged kids cannot hammer the identity provider. While the key
+    set is empty (endpoint down at startup) refetches are still rate-limited,
+    starting at `empty_refetch_interval` and doubling per consecutive failure
+    up to `min_refetch_interval`.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        refresh_interval: float = 3600.0,
+        min_refetch_interval: float = 30.0,
+        timeout: float = 5.0,
+        empty_refetch_interval: float = 1.0
+    ):
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.timeout = timeout
+        self.empty_refetch_interval = empty_refetch_interval
+
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._lock = threading.Lock()
+        self._last_fetch_attempt: Optional[float] = None
+        self._last_fetch_ok: Optional[float] = None
+        self._consecutive_failures = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._fetches = 0
+        self._fetch_errors = 0
+        self._kid_misses = 0
+        self._rate_limited = 0
+
+    def _fetch(self):
+        """Download and parse the key set (caller holds the lock)."""
+        self._last_fetch_attempt = time.monotonic()
+        self._fetches += 1
+        try:
+            with urllib.request.urlopen(self.jwks_url, timeout=self.timeout) as response:
+                data = json.load(response)
+            keys = {}
+            for key_data in data.get("keys", []):
+                if key_data.get("use", "sig") != "sig" or "kid" not in key_data:
+                    continue
+                try:
+                    keys[key_data["kid"]] = jwt.PyJWK(key_data)
+                except jwt.PyJWKError as e:
+                    logger.debug("Skipping unusable JWKS key %s: %s", key_data.get("kid"), e)
+        except Exception:
+            self._fetch_errors += 1
+            self._consecutive_failures += 1
+            raise
+        # Replace atomically; readers never see a partial key set
+        self._keys = keys
+        self._last_fetch_ok = time.time()
+        self._consecutive_failures = 0
+
+    def _refetch_interval(self) -> float:
+        """Minimum seconds between on-demand refetches (caller holds the lock)."""
+        if self._keys:
+            return self.min_refetch_interval
+        backoff = self.empty_refetch_interval * 2 ** self._consecutive_failures
+        return min(backoff, self.min_refetch_interval)
+
+    def refresh(self):
+        """Refetch the key set now."""
+        with self._lock:
+            self._fetch()
+
+    def get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        """Return the key for `kid`, refetching (rate-limited) on a miss."""
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        with self._lock:
+            # Another thread may have refetched while we waited
+            key = self._keys.get(kid)
+            if key is not None:
+                return key
+            self._kid_misses += 1
+            if (
+                self._last_fetch_attempt is None
+                or time.monotonic() - self._last_fetch_attempt >= self._refetch_interval()
+            ):
+                try:
+                    self._fetch()
+                except Exception as e:
+                    raise jwt.PyJWKClientConnectionError(f"Failed to fetch JWKS: {e}") from e
+                key = self._keys.get(kid)
+            else:
+                self._rate_limited += 1
+                if not self._keys:
+                    raise jwt.PyJWKClientConnectionError("JWKS unavailable; refetch is backing off")
+
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unable to find a signing key that matches: {kid}")
+        return key
+
+    def start(self):
+        """Fetch keys and keep them fresh in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="jwks-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous key set
+                logger.warning("JWKS refresh from %s failed: %s", self.jwks_url, e)
+            self._stop.wait(self.refresh_interval)
+
+    def stats(self) -> Dict:
+        """Key count and fetch counters."""
+        return {
+            "keys": len(self._keys),
+            "fetches": self._fetches,
+            "fetch_errors": self._fetch_errors,
+            "kid_misses": self._kid_misses,
+            "rate_limited_refetches": self._rate_limited,
+            "last_refresh_at": self._last_fetch_ok,
+        }
+
+
+class TokenVerifier:
+    """
+    Verify JWTs against a JWKSCache, caching verified claims.
+
+    Claims are cached by the SHA-256 of the token for at most `max_cache_ttl`
+    seconds and never past the token's own `exp`, so a cache hit can only
+    return claims that would still verify. The cache is LRU-bounded.
+    """
+
+    def __init__(
+        self,
+        jwks: JWKSCache,
+        audience: str,
+        issuer: str,
+        algorithms: Sequence[str] = ("RS256",),
+        max_cache_entries: int = 10000,
+        max_cache_ttl: float = 300.0
+    ):
+        self.jwks = jwks
+        self.audience = audience
+        self.issuer = issuer
+        self.algorithms = list(algorithms)
+        self.max_cache_entries = max_cache_entries
+        self.max_cache_ttl = max_cache_ttl
+
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _cache_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def cached(self, token: str) -> Optional[Dict[str, Any]]:
+        """Claims for a previously verified, still-valid token (no I/O)."""
+        key = self._cache_key(token)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, claims = entry
+            if time.time() >= expires_at:
+                del self._cache[key]
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return claims
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return verified claims; raises jwt.InvalidTokenError subclasses."""
+        claims = self.cached(token)
+        if claims is not None:
+            return claims
+        return self._verify_uncached(token)
+
+    def _verify_uncached(self, token: str) -> Dict[str, Any]:
+        """Check the signature and claims, then cache them; callers check `cached` first."""
+        header = jwt.get_unverified_header(token)
+        signing_key = self.jwks.get_signing_key(header.get("kid"))
+        claims = jwt.decode(
+            token,
+            signing_key.key,
+            algorithms=self.algorithms,
+            audience=self.audience,
+            issuer=self.issuer,
+            options={"verify_signature": True, "verify_exp": True, "verify_aud": True, "verify_iss": True}
+        )
+
+        expires_at = time.time() + self.max_cache_ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        with self._lock:
+            self._cache[self._cache_key(token)] = (expires_at, claims)
+            self._cache.move_to_end(self._cache_key(token))
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+        return claims
+
+    def stats(self) -> Dict:
+        """Claims cache counters plus JWKS stats."""
+        with self._lock:
+            return {
+                "cached_tokens": len(self._cache),
+                "hits": self._hits,
+                "misses": self._misses,
+                "jwks": self.jwks.stats(),
+            }
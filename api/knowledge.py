@@ -0,0 +1,224 @@
+"""
+FreDeSa AI Platform - Knowledge Registry access for the API
+Backs /api/knowledge/* with the same retrieval engine and asyncpg pool as the
+Knowledge Registry MCP server, with ETag-validated cached stats/categories
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+logger = logging.getLogger(__name__)
+
+# The engine lives with the MCP server; import it from there so both services
+# run identical SQL (override the location with KNOWLEDGE_REGISTRY_PATH)
+KNOWLEDGE_REGISTRY_PATH = Path(os.getenv(
+    "KNOWLEDGE_REGISTRY_PATH",
+    str(Path(__file__).resolve().parent.parent / "mcp_servers" / "knowledge_registry")
+))
+if str(KNOWLEDGE_REGISTRY_PATH) not in sys.path:
+    sys.path.insert(0, str(KNOWLEDGE_REGISTRY_PATH))
+
+try:
+    from async_db_operations import AsyncKnowledgeRegistryDB
+    from usage_recorder import UsageRecorder
+    ENGINE_IMPORT_ERROR: Optional[str] = None
+except ImportError as e:
+    AsyncKnowledgeRegistryDB = None
+    UsageRecorder = None
+    ENGINE_IMPORT_ERROR = str(e)
+    logger.warning("Knowledge Registry engine unavailable (%s): %s", KNOWLEDGE_REGISTRY_PATH, e)
+
+TOP_SOURCES_SQL = """
+    SELECT s.name, s.authority_score, c.name as category_name
+    FROM sources s
+    JOIN categories c ON s.category_id = c.id
+    ORDER BY s.authority_score DESC, s.quality_score DESC NULLS LAST, s.name
+    LIMIT 5
+"""
+
+
+class KnowledgeUnavailableError(Exception):
+    """Raised when the Knowledge Registry engine could not be loaded."""
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (RFC 9110: weak comparison, `*` matches)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def cached_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """200 with the body, or 304 when the client already has this representation."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def authority_tier(score: Optional[int]) -> str:
+    if score is not None and score >= 90:
+        return "official_government"
+    if score is not None and score >= 70:
+        return "expert_documentation"
+    return "community_resources"
+
+
+class KnowledgeService:
+    """
+    Knowledge endpoints over one shared AsyncKnowledgeRegistryDB pool.
+
+    With record_usage, searches are queued as usage_tracking rows and written
+    in batches by a UsageRecorder (start_usage_recorder() on startup).
+    """
+
+    def __init__(self, cache_ttl: float = 60.0, record_usage: bool = False, usage_options: Optional[Dict] = None):
+        self.cache_ttl = cache_ttl
+        self._db = None
+        self._cache: Dict[str, Tuple[float, bytes, str]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.usage = None
+        if record_usage and UsageRecorder is not None:
+            self.usage = UsageRecorder(lambda events: self.db.write_usage_events(events), **(usage_options or {}))
+        self._usage_task: Optional[asyncio.Task] = None
+
+    @property
+    def db(self):
+        if AsyncKnowledgeRegistryDB is None:
+            raise KnowledgeUnavailableError(ENGINE_IMPORT_ERROR)
+        if self._db is None:
+            self._db = AsyncKnowledgeRegistryDB()
+        return self._db
+
+    def start_usage_recorder(self):
+        if self.usage is not None and self._usage_task is None:
+            self._usage_task = asyncio.create_task(self.usage.run())
+
+    async def close(self):
+        if self._usage_task is not None:
+            self._usage_task.cancel()
+            self._usage_task = None
+        if self.usage is not None:
+            # Write (or spill) buffered usage while the pool is still open
+            await self.usage.close()
+        if self._db is not None:
+            await self._db.close()
+
+    async def _cached(self, name: str, build) -> Tuple[bytes, str]:
+        """(body, etag) for a cached payload, rebuilding it once per TTL."""
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1], entry[2]
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            # Concurrent requests share one rebuild
+            entry = self._cache.get(name)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1], entry[2]
+            payload = await build()
+            body = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+            etag = make_etag(body)
+            self._cache[name] = (time.monotonic() + self.cache_ttl, body, etag)
+            return body, etag
+
+    async def _build_stats(self) -> Dict[str, Any]:
+        stats = await self.db.get_stats()
+        categories = await self.db.list_categories()
+        top_sources = await self.db.fetch(TOP_SOURCES_SQL)
+
+        by_authority = {"official_government": 0, "expert_documentation": 0, "community_resources": 0}
+        for score, count in stats["authority_breakdown"].items():
+            by_authority[authority_tier(score)] += count
+
+        return {
+            "total_sources": stats["total_sources"],
+            "by_authority": by_authority,
+            "by_dimension": {str(dimension): count for dimension, count in stats["dimension_breakdown"].items()},
+            "by_category": {row["name"]: row["total_sources"] for row in categories},
+            "top_sources": [
+                {"name": row["name"], "authority": row["authority_score"], "category": row["category_name"]}
+                for row in top_sources
+            ],
+        }
+
+    async def _build_categories(self) -> Dict[str, Any]:
+        categories = await self.db.list_categories()
+        return {
+            "categories": [
+                {"id": row["name"], "name": row["display_name"], "count": row["total_sources"]}
+                for row in categories
+            ]
+        }
+
+    async def stats(self) -> Tuple[bytes, str]:
+        return await self._cached("stats", self._build_stats)
+
+    async def categories(self) -> Tuple[bytes, str]:
+        return await self._cached("categories", self._build_categories)
+
+    async def search(
+        self,
+        query: str,
+        dimension: Optional[str] = None,
+        category: Optional[str] = None,
+        min_authority: int = 70,
+        limit: int = 10,
+        customer_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """query_knowledge_base, reshaped to the /api/knowledge/search response."""
+        started = time.perf_counter()
+        result = await self.db.query_knowledge_base(
+            query=query,
+            dimension=dimension,
+            category=category,
+            min_authority=min_authority,
+            max_results=limit
+        )
+        sources = [
+            {
+                "id": source["id"],
+                "name": source["name"],
+                "url": source["url"],
+                "description": source["description"],
+                "dimension": source["epistemological_dimension"],
+                "authority_score": source["authority_score"],
+                "quality_score": source["quality_score"],
+                "relevance": source.get("relevance"),
+                "category": source["category"],
+            }
+            for source in result["sources"]
+        ]
+        if self.usage is not None:
+            self.usage.record_usage(
+                customer_id,
+                "semantic_search",
+                query_metadata={"tool": "search", "transport": "api", "query": query, "results": len(sources)},
+                response_time_ms=int(1000 * (time.perf_counter() - started)),
+            )
+        return {
+            "sources": sources,
+            "query_info": {
+                "original_query": query,
+                "keywords": result["query_info"]["keywords"],
+                "dimension_filter": dimension,
+                "category_filter": category,
+                "min_authority": min_authority,
+                "results_count": len(sources)
+            },
+            "total_count": len(sources)
+        }
@@ -3,14 +3,20 @@ FreDeSa AI Platform - FastAPI Backend
 Enterprise-grade API with Azure AD authentication integration
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
 import jwt
-from jwt import PyJWKClient
+import logging
 import os
 
+from auth import JWKSCache, TokenVerifier
+from knowledge import KnowledgeService, cached_json_response
+
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="FreDeSa AI Platform API",
     description="Backend API for Federal Proposal Management",
@@ -45,9 +51,53 @@ AZURE_JWKS_URL = (
 security = HTTPBearer()
 
 # Azure AD Token Validation
-def get_jwks_client():
-    """Get JWKS client for token validation"""
-    return PyJWKClient(AZURE_JWKS_URL)
+# One key set per process (refreshed in the background, refetched on unknown kid)
+# and a verified-claims cache, so a warm request never leaves the process
+jwks_cache = JWKSCache(
+    AZURE_JWKS_URL,
+    refresh_interval=float(os.getenv("JWKS_REFRESH_SECONDS", "3600")),
+    min_refetch_interval=float(os.getenv("JWKS_MIN_REFETCH_SECONDS", "30")),
+)
+token_verifier = TokenVerifier(
+    jwks_cache,
+    audience=AZURE_AUDIENCE,
+    issuer=AZURE_ISSUER,
+    max_cache_ttl=float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300")),
+)
+
+@app.on_event("startup")
+async def start_jwks_refresh():
+    """Warm and keep refreshing the Azure AD signing keys."""
+    jwks_cache.start()
+
+@app.on_event("shutdown")
+async def stop_jwks_refresh():
+    jwks_cache.stop()
+
+# Knowledge Registry: shared asyncpg pool, stats/categories cached with strong ETags.
+# Searches are recorded in usage_tracking (batched, off the request path) when
+# USAGE_RECORDING_ENABLED is set; the customer comes from X-Customer-ID.
+knowledge = KnowledgeService(
+    cache_ttl=float(os.getenv("KNOWLEDGE_CACHE_SECONDS", "60")),
+    record_usage=os.getenv("USAGE_RECORDING_ENABLED", "false").lower() in ("1", "true", "yes"),
+    usage_options={
+        "max_events": int(os.getenv("USAGE_BUFFER_SIZE", "10000")),
+        "batch_size": int(os.getenv("USAGE_BATCH_SIZE", "500")),
+        "flush_interval_seconds": float(os.getenv("USAGE_FLUSH_INTERVAL_SECONDS", "1")),
+        "spill_path": os.getenv(
+            "USAGE_SPILL_PATH",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_usage_spill.ndjson"),
+        ) or None,
+    },
+)
+
+@app.on_event("startup")
+async def start_usage_recorder():
+    knowledge.start_usage_recorder()
+
+@app.on_event("shutdown")
+async def close_knowledge_pool():
+    await knowledge.close()
 
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """
@@ -55,36 +105,31 @@ async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(secur
     """
     token = credentials.credentials
     
-    try:
-        # Decode without verification first to see what's in the token
-        unverified = jwt.decode(token, options={"verify_signature": False})
-        print(f"[token-debug] Token issuer: {unverified.get('iss')}")
-        print(f"[token-debug] Token audience: {unverified.get('aud')}")
-        print(f"[token-debug] Expected issuer: {AZURE_ISSUER}")
-        print(f"[token-debug] Expected audience: {AZURE_AUDIENCE}")
-        
-        jwks_client = get_jwks_client()
-        signing_key = jwks_client.get_signing_key_from_jwt(token).key
-        
-        payload = jwt.decode(
-            token,
-            signing_key,
-            algorithms=["RS256"],
-            audience=AZURE_AUDIENCE,
-            issuer=AZURE_ISSUER,
-            options={"verify_signature": True, "verify_exp": True, "verify_aud": True, "verify_iss": True}
-        )
-        
+    # Fast path: token already verified and not yet expired
+    payload = token_verifier.cached(token)
+    if payload is not None:
         return payload
     
+    try:
+        # Signature check may refetch the JWKS; keep it off the event loop.
+        # The cache was already consulted above, so skip verify()'s lookup.
+        return await run_in_threadpool(token_verifier._verify_uncached, token)
+    
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    except jwt.PyJWKClientError as e:
+        # Signing keys could not be fetched from Azure AD
+        logger.error("JWKS unavailable: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication keys unavailable",
+        )
     except jwt.InvalidTokenError as e:
-        print("[token-error]", str(e))
+        logger.warning("Rejected token (expected iss=%s aud=%s): %s", AZURE_ISSUER, AZURE_AUDIENCE, e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}",
@@ -126,6 +171,7 @@ async def health_check():
         "api": "operational",
         "authentication": "azure-ad",
         "tenant_id": AZURE_TENANT_ID[:8] + "...",  # Partial for security
+        "token_cache": token_verifier.stats(),
     }
 
 # ============================================================================
@@ -289,42 +335,23 @@ async def get_analytics(user_claims: Dict = Depends(verify_token)):
 # KNOWLEDGE REGISTRY ENDPOINTS
 # ============================================================================
 
+def _knowledge_unavailable(e: Exception) -> HTTPException:
+    logger.error("Knowledge Registry unavailable: %s", e)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Knowledge registry unavailable",
+    )
+
 @app.get("/api/knowledge/stats")
-async def get_knowledge_stats(user_claims: Dict = Depends(verify_token)):
+async def get_knowledge_stats(request: Request, user_claims: Dict = Depends(verify_token)):
     """
-    Get statistics about the knowledge registry
+    Get statistics about the knowledge registry (ETag / If-None-Match aware)
     """
-    # Mock data - replace with actual database queries
-    return {
-        "total_sources": 1043,
-        "by_authority": {
-            "official_government": 180,  # Authority 90
-            "expert_documentation": 592,  # Authority 70
-            "community_resources": 271    # Authority 50
-        },
-        "by_dimension": {
-            "theory": 287,
-            "practice": 456,
-            "history": 189,
-            "current": 523,
-            "future": 95
-        },
-        "by_category": {
-            "Federal_Contracting": 245,
-            "AI_ML": 198,
-            "Cybersecurity": 167,
-            "Intelligence": 143,
-            "Cloud_Infrastructure": 134,
-            "Other": 156
-        },
-        "top_sources": [
-            {"name": "Federal Acquisition Regulation (FAR)", "authority": 90, "category": "Federal_Contracting"},
-            {"name": "Defense Federal Acquisition Regulation (DFARS)", "authority": 90, "category": "Federal_Contracting"},
-            {"name": "NIST AI Framework", "authority": 90, "category": "AI_ML"},
-            {"name": "CMMC 2.0 Model", "authority": 90, "category": "Cybersecurity"},
-            {"name": "AWS Well-Architected Framework", "authority": 70, "category": "Cloud_Infrastructure"}
-        ]
-    }
+    try:
+        body, etag = await knowledge.stats()
+    except Exception as e:
+        raise _knowledge_unavailable(e)
+    return cached_json_response(request, body, etag)
 
 @app.get("/api/knowledge/search")
 async def search_knowledge(
@@ -333,76 +360,34 @@ async def search_knowledge(
     category: str = None,
     min_authority: int = 70,
     limit: int = 10,
+    x_customer_id: Optional[str] = Header(None),
     user_claims: Dict = Depends(verify_token)
 ):
     """
-    Search the knowledge registry
+    Search the knowledge registry (same engine as the MCP query_knowledge_base tool)
     """
-    # Mock data - replace with actual query_knowledge_base call
-    mock_sources = [
-        {
-            "name": "Federal Acquisition Regulation Part 19: Small Business Programs",
-            "url": "https://www.acquisition.gov/far/part-19",
-            "description": "Comprehensive guidance on small business subcontracting requirements and compliance",
-            "dimension": "practice",
-            "difficulty": "intermediate",
-            "source_type": "government",
-            "authority_score": 90,
-            "quality_score": 95.0,
-            "category": "Federal_Contracting"
-        },
-        {
-            "name": "NIST Cybersecurity Framework 2.0",
-            "url": "https://www.nist.gov/cyberframework",
-            "description": "Industry standard for managing cybersecurity risks",
-            "dimension": "practice",
-            "difficulty": "intermediate",
-            "source_type": "government",
-            "authority_score": 90,
-            "quality_score": 94.0,
-            "category": "Cybersecurity"
-        },
-        {
-            "name": "DoD Cloud Computing Security Requirements Guide",
-            "url": "https://public.cyber.mil/dccs/",
-            "description": "Security requirements for cloud service providers working with DoD",
-            "dimension": "practice",
-            "difficulty": "advanced",
-            "source_type": "government",
-            "authority_score": 90,
-            "quality_score": 92.0,
-            "category": "Cloud_Infrastructure"
-        }
-    ]
-    
-    return {
-        "sources": mock_sources[:limit],
-        "query_info": {
-            "original_query": query,
-            "dimension_filter": dimension,
-            "category_filter": category,
-            "min_authority": min_authority,
-            "results_count": len(mock_sources[:limit])
-        },
-        "total_count": len(mock_sources)
-    }
+    try:
+        return await knowledge.search(
+            query=query,
+            dimension=dimension,
+            category=category,
+            min_authority=min_authority,
+            limit=limit,
+            customer_id=x_customer_id
+        )
+    except Exception as e:
+        raise _knowledge_unavailable(e)
 
 @app.get("/api/knowledge/categories")
-async def get_categories(user_claims: Dict = Depends(verify_token)):
+async def get_categories(request: Request, user_claims: Dict = Depends(verify_token)):
     """
-    Get all knowledge categories
+    Get all knowledge categories (ETag / If-None-Match aware)
     """
-    return {
-        "categories": [
-            {"id": "Federal_Contracting", "name": "Federal Contracting", "count": 245},
-            {"id": "AI_ML", "name": "AI & Machine Learning", "count": 198},
-            {"id": "Cybersecurity", "name": "Cybersecurity", "count": 167},
-            {"id": "Intelligence", "name": "Intelligence Community", "count": 143},
-            {"id": "Cloud_Infrastructure", "name": "Cloud Infrastructure", "count": 134},
-            {"id": "DevOps", "name": "DevOps & CI/CD", "count": 89},
-            {"id": "Data_Science", "name": "Data Science", "count": 67}
-        ]
-    }
+    try:
+        body, etag = await knowledge.categories()
+    except Exception as e:
+        raise _knowledge_unavailable(e)
+    return cached_json_response(request, body, etag)
 
 if __name__ == "__main__":
     import uvicorn
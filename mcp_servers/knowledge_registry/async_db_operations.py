@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Async database operations for FreDeSa Knowledge Registry
+asyncio-native mirror of KnowledgeRegistryDB built on asyncpg's connection pool,
+so slow queries never block the uvicorn event loop
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+
+from db_operations import (
+    KnowledgeRegistryDB,
+    LIST_CATEGORIES_SQL,
+    SOURCE_DETAILS_SQL,
+    STATS_SQL,
+    build_hybrid_search_query,
+    build_search_query,
+    build_stats,
+    format_search_response,
+    hnsw_session_settings,
+    resolve_search_mode,
+)
+from embeddings import get_embedder, to_pgvector
+from usage_recorder import (
+    INSERT_CONNECTOR_QUERIES_SQL,
+    INSERT_USAGE_SQL,
+    RECORD_SOURCE_ACCESS_SQL,
+    UsageEvent,
+    usage_event_params,
+)
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER_RE = re.compile(r"%s|%%")
+
+
+def to_asyncpg_sql(sql: str) -> str:
+    """Convert psycopg2-style %s placeholders to asyncpg's numbered $n form."""
+    counter = 0
+
+    def replace(match):
+        nonlocal counter
+        if match.group(0) == "%%":
+            return "%"
+        counter += 1
+        return f"${counter}"
+
+    return _PLACEHOLDER_RE.sub(replace, sql)
+
+
+class AgedConnection(asyncpg.Connection):
+    """asyncpg connection that remembers when it was opened (for max-lifetime recycling)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opened_at = time.monotonic()
+
+
+async def init_connection(conn: asyncpg.Connection):
+    """Decode json/jsonb to Python objects, as psycopg2 does for KnowledgeRegistryDB."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+class AsyncKnowledgeRegistryDB:
+    """Async database operations for knowledge registry."""
+
+    def __init__(self, settings: Optional[KnowledgeRegistryDB] = None):
+        """
+        Initialize from the same connection settings as KnowledgeRegistryDB
+        (environment variables / Azure Key Vault). The pool opens lazily.
+        """
+        settings = settings or KnowledgeRegistryDB()
+        self.db_host = settings.db_host
+        self.db_port = int(settings.db_port)
+        self.db_name = settings.db_name
+        self.db_user = settings.db_user
+        self.db_password = settings.db_password
+        self.db_sslmode = settings.db_sslmode
+
+        self.pool_min_size = settings.pool_min_size
+        self.pool_max_size = settings.pool_max_size
+        self.pool_max_lifetime = settings.pool_max_lifetime
+        self.pool_timeout = settings.pool_timeout
+
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+
+        # Acquire wait-time metrics
+        self._acquires = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+        self._recycled = 0
+
+    def _connect_kwargs(self) -> Dict:
+        return {
+            "host": self.db_host,
+            "port": self.db_port,
+            "database": self.db_name,
+            "user": self.db_user,
+            "password": self.db_password,
+            "ssl": self.db_sslmode,
+        }
+
+    async def get_pool(self) -> asyncpg.Pool:
+        """Create the asyncpg pool on first use (must run inside the event loop)."""
+        if self._pool is None:
+            if self._pool_lock is None:
+                self._pool_lock = asyncio.Lock()
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        **self._connect_kwargs(),
+                        min_size=self.pool_min_size,
+                        max_size=self.pool_max_size,
+                        connection_class=AgedConnection,
+                        init=init_connection,
+                    )
+        return self._pool
+
+    def _expired(self, conn) -> bool:
+        return self.pool_max_lifetime > 0 and time.monotonic() - conn.opened_at > self.pool_max_lifetime
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        Borrow a pooled connection for the duration of an `async with` block.
+        Connections older than POSTGRES_POOL_MAX_LIFETIME are closed on release,
+        as in the sync pool; asyncpg opens a replacement on the next acquire.
+        """
+        pool = await self.get_pool()
+        started = time.monotonic()
+        async with pool.acquire(timeout=self.pool_timeout) as conn:
+            waited = time.monotonic() - started
+            self._acquires += 1
+            self._total_wait_s += waited
+            self._max_wait_s = max(self._max_wait_s, waited)
+            try:
+                yield conn
+            finally:
+                if not conn.is_closed() and self._expired(conn):
+                    self._recycled += 1
+                    await conn.close(timeout=self.pool_timeout)
+
+    async def fetch(self, sql: str, *params) -> List[asyncpg.Record]:
+        """Run a %s-parameterized query and return all rows."""
+        async with self.connection() as conn:
+            return await conn.fetch(to_asyncpg_sql(sql), *params)
+
+    async def fetchrow(self, sql: str, *params) -> Optional[asyncpg.Record]:
+        """Run a %s-parameterized query and return the first row."""
+        async with self.connection() as conn:
+            return await conn.fetchrow(to_asyncpg_sql(sql), *params)
+
+    async def ping(self) -> bool:
+        """Round-trip a trivial query through the pool."""
+        async with self.connection() as conn:
+            return await conn.fetchval("SELECT 1") == 1
+
+    async def listen(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_state: Optional[Callable[[bool], None]] = None,
+        keepalive_seconds: float = 30.0,
+        retry_seconds: float = 5.0
+    ):
+        """
+        LISTEN on `channel` over a dedicated (unpooled) connection until cancelled.
+
+        on_notify(payload) runs for every notification. on_state(connected)
+        reports connectivity, so callers can stop trusting caches while
+        notifications might be missed. The connection is pinged every
+        keepalive_seconds and re-established after failures.
+        """
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(**self._connect_kwargs())
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(channel, lambda _conn, _pid, _channel, payload: on_notify(payload))
+                if on_state:
+                    on_state(True)
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=keepalive_seconds)
+                    except asyncio.TimeoutError:
+                        await conn.fetchval("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("LISTEN %s connection failed: %s", channel, e)
+            finally:
+                if on_state:
+                    on_state(False)
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(retry_seconds)
+
+    def pool_stats(self) -> Dict:
+        """Connection pool occupancy and acquire wait-time metrics."""
+        if self._pool is None:
+            return {"initialized": False}
+        return {
+            "initialized": True,
+            "min_size": self._pool.get_min_size(),
+            "max_size": self._pool.get_max_size(),
+            "size": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+            "acquires": self._acquires,
+            "avg_wait_ms": round(1000 * self._total_wait_s / self._acquires, 3) if self._acquires else 0.0,
+            "max_wait_ms": round(1000 * self._max_wait_s, 3),
+            "connections_recycled": self._recycled,
+        }
+
+    async def close(self):
+        """Close all pooled connections (call on shutdown)."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    # ------------------------------------------------------------------
+    # Tool operations (mirror KnowledgeRegistryDB)
+    # ------------------------------------------------------------------
+
+    async def query_knowledge_base(
+        self,
+        query: str,
+        dimension: Optional[str] = None,
+        category: Optional[str] = None,
+        min_authority: int = 50,
+        max_results: int = 10,
+        mode: Optional[str] = None
+    ) -> Dict:
+        """Search knowledge base with epistemological filtering (see KnowledgeRegistryDB)."""
+        mode = resolve_search_mode(mode)
+        if mode != 'hybrid':
+            query_sql, params, keywords = build_search_query(
+                query, dimension, category, min_authority, max_results
+            )
+            rows = await self.fetch(query_sql, *params)
+            return format_search_response(rows, keywords, dimension, category, min_authority, mode)
+        
+        # Model-backed embedders are CPU-bound; keep them off the event loop
+        vector = await asyncio.get_running_loop().run_in_executor(None, get_embedder().embed, query)
+        query_sql, params, keywords = build_hybrid_search_query(
+            query, to_pgvector(vector), dimension, category, min_authority, max_results
+        )
+        async with self.connection() as conn:
+            # SET LOCAL needs an explicit transaction under asyncpg
+            async with conn.transaction(readonly=True):
+                for statement in hnsw_session_settings():
+                    await conn.execute(statement)
+                rows = await conn.fetch(to_asyncpg_sql(query_sql), *params)
+        return format_search_response(rows, keywords, dimension, category, min_authority, mode)
+
+    async def get_source_details(self, source_id: str) -> Dict:
+        """Get full details for a specific source."""
+        result = await self.fetchrow(SOURCE_DETAILS_SQL, source_id)
+        if not result:
+            return {"error": f"Source {source_id} not found"}
+        return dict(result)
+
+    async def list_categories(self) -> List[Dict]:
+        """Get list of all available categories with source counts."""
+        rows = await self.fetch(LIST_CATEGORIES_SQL)
+        return [dict(row) for row in rows]
+
+    async def get_stats(self) -> Dict:
+        """Source counts by authority and dimension, plus category count (one query)."""
+        return build_stats(await self.fetch(STATS_SQL))
+
+    async def refresh_knowledge_graph_summary(self) -> bool:
+        """
+        REFRESH MATERIALIZED VIEW CONCURRENTLY knowledge_graph_summary_mv.
+
+        Guarded by an advisory lock so replicas reacting to the same
+        notification don't queue identical refreshes; returns False if
+        another session is already refreshing.
+        """
+        async with self.connection() as conn:
+            if not await conn.fetchval("SELECT pg_try_advisory_lock(hashtext('knowledge_graph_summary_mv'))"):
+                return False
+            try:
+                await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY knowledge_graph_summary_mv")
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock(hashtext('knowledge_graph_summary_mv'))")
+        return True
+
+    async def write_usage_events(self, events: List[UsageEvent]) -> int:
+        """
+        Insert a UsageRecorder batch in one transaction: one multi-row INSERT
+        per log table, plus the access counters of source_access events.
+        Returns the number of rows inserted.
+        """
+        params = usage_event_params(events)
+        inserted = 0
+        async with self.connection() as conn:
+            async with conn.transaction():
+                if "usage_tracking" in params:
+                    status = await conn.execute(to_asyncpg_sql(INSERT_USAGE_SQL), *params["usage_tracking"])
+                    inserted += int(status.split()[-1])
+                if "connector_query_log" in params:
+                    status = await conn.execute(
+                        to_asyncpg_sql(INSERT_CONNECTOR_QUERIES_SQL), *params["connector_query_log"]
+                    )
+                    inserted += int(status.split()[-1])
+                if "source_access" in params:
+                    await conn.execute(to_asyncpg_sql(RECORD_SOURCE_ACCESS_SQL), *params["source_access"])
+        return inserted
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Bounded, thread-safe PostgreSQL connection pool for FreDeSa Knowledge Registry
+Reuses TLS/auth handshakes across tool calls instead of connecting per request
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class _PooledConnection:
+    """Bookkeeping for a single pooled connection."""
+
+    __slots__ = ("conn", "created_at", "last_used_at")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+
+class ConnectionPool:
+    """
+    Bounded connection pool with health checks and connection recycling.
+
+    - min_size connections are opened eagerly on first use and kept warm
+    - at most max_size connections exist at any time; callers block up to
+      checkout_timeout seconds waiting for one to be returned
+    - connections idle longer than health_check_interval are pinged
+      (SELECT 1) on checkout; broken ones are discarded and replaced
+    - connections older than max_lifetime are closed instead of reused
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], "extensions.connection"],
+        min_size: int = 1,
+        max_size: int = 10,
+        max_lifetime: float = 1800.0,
+        health_check_interval: float = 30.0,
+        checkout_timeout: float = 10.0,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool sizing: min_size={min_size}, max_size={max_size}")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._lock = threading.Condition()
+        self._idle: List[_PooledConnection] = []
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._opening = 0
+        self._closed = False
+        self._warmed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+        self._opened = 0
+        self._discarded = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Check out a connection for the duration of a `with` block."""
+        conn = self.getconn(timeout=timeout)
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def getconn(self, timeout: Optional[float] = None):
+        """Check out a healthy connection, opening one if the pool has room."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        self._warm_up()
+
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise psycopg2.InterfaceError("connection pool is closed")
+
+                entry = self._idle.pop() if self._idle else None
+                if entry is None and self._size() < self.max_size:
+                    self._opening += 1
+                    open_new = True
+                else:
+                    open_new = False
+
+                if entry is None and not open_new:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available within {timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    waited = True
+                    self._lock.wait(remaining)
+                    continue
+
+            if open_new:
+                try:
+                    entry = self._open()
+                finally:
+                    with self._lock:
+                        self._opening -= 1
+                        self._lock.notify()
+            elif not self._is_usable(entry):
+                self._close_entry(entry)
+                continue
+
+            with self._lock:
+                self._in_use[id(entry.conn)] = entry
+                self._record_checkout(time.monotonic() - started, waited)
+            return entry.conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool (or close it if broken/expired)."""
+        with self._lock:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            # Not ours (or already returned) - just make sure it is closed
+            if not conn.closed:
+                conn.close()
+            return
+
+        if not discard and not self._closed:
+            discard = not self._reset(conn) or self._expired(entry)
+
+        if discard or self._closed:
+            self._close_entry(entry)
+            return
+
+        entry.last_used_at = time.monotonic()
+        with self._lock:
+            self._idle.append(entry)
+            self._lock.notify()
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._lock.notify_all()
+        for entry in idle:
+            self._close_entry(entry)
+
+    def stats(self) -> Dict:
+        """Pool occupancy and checkout wait-time metrics."""
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size(),
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(1000 * self._total_wait_s / self._checkouts, 3) if self._checkouts else 0.0,
+                "max_wait_ms": round(1000 * self._max_wait_s, 3),
+                "connections_opened": self._opened,
+                "connections_discarded": self._discarded,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _warm_up(self):
+        """Open min_size connections on first use."""
+        if self._warmed:
+            return
+        with self._lock:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = max(0, self.min_size - self._size())
+            self._opening += missing
+        opened = []
+        try:
+            for _ in range(missing):
+                opened.append(self._open())
+        finally:
+            with self._lock:
+                self._opening -= missing
+                for entry in opened:
+                    entry.last_used_at = time.monotonic()
+                    self._idle.append(entry)
+                self._lock.notify_all()
+
+    def _open(self) -> _PooledConnection:
+        conn = self._connect()
+        with self._lock:
+            self._opened += 1
+        return _PooledConnection(conn)
+
+    def _expired(self, entry: _PooledConnection) -> bool:
+        return self.max_lifetime > 0 and time.monotonic() - entry.created_at > self.max_lifetime
+
+    def _is_usable(self, entry: _PooledConnection) -> bool:
+        """Health check on checkout: closed, expired or (if idle a while) ping."""
+        conn = entry.conn
+        if conn.closed or self._expired(entry):
+            return False
+        if time.monotonic() - entry.last_used_at < self.health_check_interval:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchall()
+            cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _reset(self, conn) -> bool:
+        """Roll back any open transaction so the next borrower starts clean."""
+        if conn.closed:
+            return False
+        try:
+            status = conn.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _close_entry(self, entry: _PooledConnection):
+        try:
+            if not entry.conn.closed:
+                entry.conn.close()
+        except psycopg2.Error:
+            pass
+        with self._lock:
+            self._discarded += 1
+            self._lock.notify()
+
+    def _record_checkout(self, wait_s: float, waited: bool):
+        self._checkouts += 1
+        self._total_wait_s += wait_s
+        self._max_wait_s = max(self._max_wait_s, wait_s)
+        if waited:
+            self._waits += 1
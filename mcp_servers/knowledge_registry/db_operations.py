@@ -5,11 +5,455 @@ Pure PostgreSQL functions without MCP SDK dependencies
 """
 
 import os
+import re
 import sys
-from typing import Dict, List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from connection_pool import ConnectionPool
+from embeddings import get_embedder, to_pgvector
+
+VALID_DIMENSIONS = ['theory', 'practice', 'history', 'current', 'future']
+
+# Hard limit on results returned by any search (security: bounded responses)
+MAX_RESULTS_LIMIT = 15
+
+# Search ranking blend: ts_rank_cd text relevance vs. authority/quality scores
+SEARCH_TEXT_WEIGHT = 0.6
+SEARCH_AUTHORITY_WEIGHT = 0.25
+SEARCH_QUALITY_WEIGHT = 0.15
+
+# Search modes: lexical (full-text only) or hybrid (full-text + vector kNN fused by RRF)
+SEARCH_MODES = ['lexical', 'hybrid']
+DEFAULT_SEARCH_MODE = os.getenv("SEARCH_MODE", "lexical")
+
+# Reciprocal rank fusion constant and per-retriever candidate depth
+RRF_K = 60
+HYBRID_CANDIDATES = 40
+
+# HNSW scan tuning (pgvector). iterative_scan (pgvector >= 0.8) keeps walking the
+# graph until enough rows pass the filters, so min_authority=90 does not starve kNN
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "100"))
+HNSW_ITERATIVE_SCAN = os.getenv("HNSW_ITERATIVE_SCAN", "relaxed_order")
+
+STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+              'of', 'with', 'by', 'from', 'as', 'is', 'are', 'was', 'were', 'be',
+              'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+              'would', 'should', 'could', 'may', 'might', 'can', 'what', 'how',
+              'when', 'where', 'who', 'which', 'this', 'that', 'these', 'those'}
+
+# Every sources column except the search internals (search_vector, embedding),
+# which would otherwise ship a tsvector and 384 floats with each response
+SOURCE_DETAIL_COLUMNS = (
+    'id', 'category_id', 'name', 'url', 'source_type', 'description',
+    'environment_flags', 'promoted_to_staging_at', 'promoted_to_production_at',
+    'promoted_by', 'approval_status', 'rejection_reason',
+    'epistemological_dimension', 'publication_year',
+    'authority_score', 'quality_score', 'validation_status', 'fact_check_date', 'fact_checked_by',
+    'superseded_by', 'supersedes', 'deprecation_reason',
+    'external_citations',
+    'prerequisite_sources', 'difficulty_level', 'estimated_read_time_minutes',
+    'geographic_scope', 'jurisdiction', 'applicable_industries',
+    'primary_language', 'available_translations',
+    'source_location',
+    'tags', 'file_count', 'word_count', 'last_ingested_at', 'last_updated_at',
+    'ingestion_status', 'cost_estimate',
+    'created_at', 'updated_at',
+)
+
+# Counters live in source_counters (sharded, see add_source_counters.sql)
+SOURCE_DETAILS_SQL = f"""
+    SELECT 
+        {', '.join('s.' + column for column in SOURCE_DETAIL_COLUMNS)},
+        c.name as category_name,
+        c.display_name as category_display,
+        COALESCE(t.cited_by_count, 0) as cited_by_count,
+        COALESCE(t.cross_reference_count, 0) as cross_reference_count,
+        COALESCE(t.access_count, 0) as access_count
+    FROM sources s
+    JOIN categories c ON s.category_id = c.id
+    LEFT JOIN source_counter_totals t ON t.source_id = s.id
+    WHERE s.id = %s
+"""
+
+LIST_CATEGORIES_SQL = """
+    SELECT 
+        c.name,
+        c.display_name,
+        c.description,
+        c.total_sources,
+        c.theory_sources,
+        c.practice_sources,
+        c.current_sources
+    FROM categories c
+    WHERE c.total_sources > 0
+    ORDER BY c.total_sources DESC
+"""
+
+# Every /stats breakdown in one scan of sources: GROUPING() tells the grand
+# total row and each breakdown apart from genuine NULL values
+STATS_SQL = """
+    SELECT
+        GROUPING(s.authority_score) AS by_authority,
+        GROUPING(s.epistemological_dimension) AS by_dimension,
+        s.authority_score,
+        s.epistemological_dimension,
+        COUNT(*) AS sources,
+        (SELECT COUNT(*) FROM categories c WHERE c.total_sources > 0) AS categories
+    FROM sources s
+    GROUP BY GROUPING SETS ((), (s.authority_score), (s.epistemological_dimension))
+"""
+
+
+def build_stats(rows) -> Dict:
+    """Fold STATS_SQL rows into the /stats response shape."""
+    total_sources = 0
+    categories = 0
+    authority_breakdown = {}
+    dimension_breakdown = {}
+    for row in rows:
+        categories = row['categories']
+        if row['by_authority'] and row['by_dimension']:
+            total_sources = row['sources']
+        elif not row['by_authority']:
+            authority_breakdown[row['authority_score']] = row['sources']
+        else:
+            dimension_breakdown[row['epistemological_dimension']] = row['sources']
+    
+    return {
+        "total_sources": total_sources,
+        "authority_breakdown": dict(sorted(
+            authority_breakdown.items(), key=lambda item: (item[0] is None, -(item[0] or 0))
+        )),
+        "dimension_breakdown": dimension_breakdown,
+        "categories": categories
+    }
+
+
+def extract_keywords(query: str) -> List[str]:
+    """Extract meaningful keywords from query."""
+    # Tokenize
+    words = re.findall(r'\b[a-z]{3,}\b', query.lower())
+    
+    # Filter stop words
+    keywords = [w for w in words if w not in STOP_WORDS]
+    
+    return keywords[:5]  # Limit to 5 keywords
+
+
+# websearch_to_tsquery tokens: optionally negated quoted phrases, or bare words
+_WEBSEARCH_TOKEN_RE = re.compile(r'-?"[^"]*"?|\S+')
+
+
+def extract_exclusions(query: str) -> List[str]:
+    """Negated terms in websearch syntax (`-word`, `-"a phrase"`), without the dash."""
+    return [
+        token[1:] for token in _WEBSEARCH_TOKEN_RE.findall(query)
+        if token.startswith('-') and len(token) > 1 and token[1:].strip('"')
+    ]
+
+
+def resolve_search_mode(mode: Optional[str]) -> str:
+    """Requested search mode, falling back to SEARCH_MODE for unknown values."""
+    if mode and mode.lower() in SEARCH_MODES:
+        return mode.lower()
+    return DEFAULT_SEARCH_MODE if DEFAULT_SEARCH_MODE in SEARCH_MODES else 'lexical'
+
+
+def _filter_clauses(
+    dimension: Optional[str],
+    category: Optional[str],
+    min_authority: int,
+    category_subquery: bool = False
+) -> Tuple[List[str], List]:
+    """
+    WHERE clauses shared by every retriever. With category_subquery the
+    category filter avoids referencing the joined `c` alias, so a kNN scan
+    stays a single-table HNSW index scan on sources.
+    """
+    clauses = []
+    params = []
+    
+    # Authority filter
+    clauses.append("s.authority_score >= %s")
+    params.append(int(min_authority))
+    
+    # Dimension filter
+    if dimension and dimension.lower() in VALID_DIMENSIONS:
+        clauses.append("s.epistemological_dimension = %s")
+        params.append(dimension.lower())
+    
+    # Category filter
+    if category:
+        if category_subquery:
+            clauses.append(
+                "s.category_id IN (SELECT cf.id FROM categories cf WHERE cf.name = %s OR cf.display_name = %s)"
+            )
+        else:
+            clauses.append("(c.name = %s OR c.display_name = %s)")
+        params.extend([category, category])
+    
+    return clauses, params
+
+
+def _lexical_match(query: str, keywords: List[str]) -> Tuple[str, List, Optional[str], str]:
+    """
+    Full-text match pieces: (FROM-clause tsquery join, its params,
+    match predicate or None, text relevance expression).
+    
+    The raw query parsed by websearch_to_tsquery (quoted phrases,
+    -exclusions) is ORed with any extracted keyword, so recall matches the old
+    keyword-OR behaviour while phrase hits rank higher. Excluded terms are
+    dropped from the keyword OR and ANDed back on negated, so `-term` removes
+    matches instead of only lowering their rank.
+    """
+    if not keywords:
+        return "", [], None, "0.0"
+    exclusions = extract_exclusions(query)
+    if not exclusions:
+        from_sql = """,
+            LATERAL (
+                SELECT websearch_to_tsquery('english', %s)
+                    || websearch_to_tsquery('english', %s) AS query
+            ) q"""
+        return (
+            from_sql,
+            [query, " or ".join(keywords)],
+            "s.search_vector @@ q.query",
+            "ts_rank_cd(s.search_vector, q.query, 32)",
+        )
+    excluded_words = set(extract_keywords(" ".join(exclusions)))
+    kept = [keyword for keyword in keywords if keyword not in excluded_words]
+    from_sql = """,
+            LATERAL (
+                SELECT (websearch_to_tsquery('english', %s)
+                    || websearch_to_tsquery('english', %s))
+                    && !! websearch_to_tsquery('english', %s) AS query
+            ) q"""
+    return (
+        from_sql,
+        [query, " or ".join(kept), " or ".join(exclusions)],
+        "s.search_vector @@ q.query",
+        "ts_rank_cd(s.search_vector, q.query, 32)",
+    )
+
+
+def _relevance_sql(text_relevance_sql: str) -> str:
+    """Text relevance (normalized to 0-1 by rank/(rank+1)) blended with authority and quality."""
+    return (
+        f"({SEARCH_TEXT_WEIGHT} * {text_relevance_sql}"
+        f" + {SEARCH_AUTHORITY_WEIGHT} * s.authority_score / 100.0"
+        f" + {SEARCH_QUALITY_WEIGHT} * COALESCE(s.quality_score, 0) / 100.0)"
+    )
+
+
+_SEARCH_COLUMNS_SQL = """
+            s.id,
+            s.name,
+            s.description,
+            s.url,
+            s.authority_score,
+            s.epistemological_dimension,
+            s.quality_score,
+            c.name as category_name,
+            c.display_name as category_display"""
+
+
+def build_search_query(
+    query: str,
+    dimension: Optional[str] = None,
+    category: Optional[str] = None,
+    min_authority: int = 50,
+    max_results: int = 10
+) -> Tuple[str, List, List[str]]:
+    """
+    Build the parameterized knowledge base search SQL.
+    
+    Shared by the sync (psycopg2) and async (asyncpg) data access layers so
+    both serve identical results. Matching uses the GIN-indexed
+    sources.search_vector column (scripts/database/add_full_text_search.sql).
+    
+    Returns:
+        (sql with %s placeholders, params, extracted keywords)
+    """
+    # Security: hard limit on results
+    max_results = min(int(max_results), MAX_RESULTS_LIMIT)
+    
+    # Extract keywords from query
+    keywords = extract_keywords(query)
+    
+    from_sql, from_params, match_sql, text_relevance_sql = _lexical_match(query, keywords)
+    where_clauses, params = _filter_clauses(dimension, category, min_authority)
+    if match_sql:
+        where_clauses.insert(0, match_sql)
+    
+    where_sql = " AND ".join(where_clauses)
+    
+    query_sql = f"""
+        SELECT {_SEARCH_COLUMNS_SQL},
+            {_relevance_sql(text_relevance_sql)} AS relevance
+        FROM sources s
+        JOIN categories c ON s.category_id = c.id{from_sql}
+        WHERE {where_sql}
+        ORDER BY relevance DESC, s.authority_score DESC, s.quality_score DESC
+        LIMIT %s
+    """
+    # Placeholders appear FROM-clause first, then WHERE, then LIMIT
+    params = from_params + params
+    params.append(max_results)
+    
+    return query_sql, params, keywords
+
+
+def build_hybrid_search_query(
+    query: str,
+    query_embedding: str,
+    dimension: Optional[str] = None,
+    category: Optional[str] = None,
+    min_authority: int = 50,
+    max_results: int = 10,
+    candidates: int = HYBRID_CANDIDATES
+) -> Tuple[str, List, List[str]]:
+    """
+    Build the hybrid (full-text + vector kNN) search SQL.
+    
+    Each retriever returns its top `candidates` with every filter applied
+    inside the retriever - the kNN filters run inside the HNSW scan, not on
+    its output - and the two rankings are fused with reciprocal rank fusion:
+    relevance = sum(1 / (RRF_K + rank)).
+    
+    Args:
+        query_embedding: pgvector text literal (embeddings.to_pgvector)
+    
+    Returns:
+        (sql with %s placeholders, params, extracted keywords)
+    """
+    max_results = min(int(max_results), MAX_RESULTS_LIMIT)
+    candidates = max(int(candidates), max_results)
+    keywords = extract_keywords(query)
+    params = []
+    
+    # Lexical retriever (skipped when the query has no keywords)
+    if keywords:
+        from_sql, from_params, match_sql, text_relevance_sql = _lexical_match(query, keywords)
+        lexical_clauses, lexical_params = _filter_clauses(dimension, category, min_authority)
+        lexical_where = " AND ".join([match_sql] + lexical_clauses)
+        lexical_sql = f"""
+            SELECT s.id,
+                   row_number() OVER (
+                       ORDER BY {_relevance_sql(text_relevance_sql)} DESC,
+                                s.authority_score DESC, s.quality_score DESC
+                   ) AS rank
+            FROM sources s
+            JOIN categories c ON s.category_id = c.id{from_sql}
+            WHERE {lexical_where}
+            ORDER BY rank
+            LIMIT %s"""
+        params.extend(from_params + lexical_params + [candidates])
+    else:
+        lexical_sql = "SELECT NULL::uuid AS id, NULL::bigint AS rank WHERE false"
+    
+    # Vector retriever: filters inside the ORDER BY distance LIMIT scan
+    knn_clauses, knn_params = _filter_clauses(dimension, category, min_authority, category_subquery=True)
+    exclusions = extract_exclusions(query)
+    if exclusions:
+        # -exclusions apply to the semantic candidates too
+        knn_clauses.append(
+            "NOT COALESCE(s.search_vector @@ websearch_to_tsquery('english', %s), false)"
+        )
+        knn_params.append(" or ".join(exclusions))
+    knn_where = " AND ".join(["s.embedding IS NOT NULL"] + knn_clauses)
+    params.append(query_embedding)
+    params.extend(knn_params)
+    params.append(candidates)
+    
+    query_sql = f"""
+        WITH lexical AS ({lexical_sql}
+        ),
+        semantic AS (
+            SELECT knn.id, row_number() OVER (ORDER BY knn.distance) AS rank
+            FROM (
+                SELECT s.id, s.embedding <=> %s::text::vector AS distance
+                FROM sources s
+                WHERE {knn_where}
+                ORDER BY distance
+                LIMIT %s
+            ) knn
+        ),
+        fused AS (
+            SELECT COALESCE(l.id, v.id) AS id,
+                   COALESCE(1.0 / ({RRF_K} + l.rank), 0)
+                   + COALESCE(1.0 / ({RRF_K} + v.rank), 0) AS relevance
+            FROM lexical l
+            FULL OUTER JOIN semantic v ON l.id = v.id
+        )
+        SELECT {_SEARCH_COLUMNS_SQL},
+            f.relevance
+        FROM fused f
+        JOIN sources s ON s.id = f.id
+        JOIN categories c ON s.category_id = c.id
+        ORDER BY f.relevance DESC, s.authority_score DESC, s.quality_score DESC
+        LIMIT %s
+    """
+    params.append(max_results)
+    
+    return query_sql, params, keywords
+
+
+def hnsw_session_settings(candidates: int = HYBRID_CANDIDATES) -> List[str]:
+    """SET LOCAL statements to run in the hybrid search transaction before the query."""
+    statements = [f"SET LOCAL hnsw.ef_search = {max(int(candidates), HNSW_EF_SEARCH)}"]
+    if HNSW_ITERATIVE_SCAN in ('relaxed_order', 'strict_order'):
+        statements.append(f"SET LOCAL hnsw.iterative_scan = {HNSW_ITERATIVE_SCAN}")
+    return statements
+
+
+def format_search_response(
+    rows,
+    keywords: List[str],
+    dimension: Optional[str],
+    category: Optional[str],
+    min_authority: int,
+    mode: str = 'lexical'
+) -> Dict:
+    """Format search rows (any mapping-like row type) as the tool response."""
+    sources = []
+    for row in rows:
+        sources.append({
+            "id": str(row['id']),
+            "name": row['name'],
+            "description": row['description'],
+            "url": row['url'],
+            "authority_score": int(row['authority_score']),
+            "epistemological_dimension": row['epistemological_dimension'],
+            "quality_score": float(row['quality_score']) if row['quality_score'] else 0.0,
+            "category": row['category_display'] or row['category_name'],
+            "relevance": round(float(row['relevance']), 4) if row.get('relevance') is not None else None
+        })
+    
+    # Generate summary
+    summary = f"Found {len(sources)} sources"
+    if dimension:
+        summary += f" in {dimension} dimension"
+    if category:
+        summary += f" from {category}"
+    
+    return {
+        "sources": sources,
+        "query_info": {
+            "keywords": keywords,
+            "dimension": dimension,
+            "category": category,
+            "min_authority": min_authority,
+            "mode": mode,
+            "results_count": len(sources)
+        },
+        "summary": summary
+    }
+
 
 class KnowledgeRegistryDB:
     """Database operations for knowledge registry."""
@@ -36,11 +480,21 @@ class KnowledgeRegistryDB:
                 self.db_password = client.get_secret("postgres-password").value
             except Exception as e:
                 print(f"⚠️  Could not load password from Key Vault: {e}", file=sys.stderr)
+        
+        # Connection pool settings (pool itself is created lazily on first use)
+        self.pool_min_size = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "1"))
+        self.pool_max_size = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10"))
+        self.pool_max_lifetime = float(os.getenv("POSTGRES_POOL_MAX_LIFETIME", "1800"))
+        self.pool_health_check_interval = float(os.getenv("POSTGRES_POOL_HEALTH_CHECK_INTERVAL", "30"))
+        self.pool_timeout = float(os.getenv("POSTGRES_POOL_TIMEOUT", "10"))
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
     
     def get_connection(self):
-        """Get PostgreSQL database connection."""
+        """Open a new, unpooled PostgreSQL connection (caller must close it)."""
         return psycopg2.connect(
             host=self.db_host,
+            port=self.db_port,
             database=self.db_name,
             user=self.db_user,
             password=self.db_password,
@@ -48,13 +502,47 @@ class KnowledgeRegistryDB:
             cursor_factory=RealDictCursor
         )
     
+    @property
+    def pool(self) -> ConnectionPool:
+        """Process-wide connection pool shared by every request handler."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        self.get_connection,
+                        min_size=self.pool_min_size,
+                        max_size=self.pool_max_size,
+                        max_lifetime=self.pool_max_lifetime,
+                        health_check_interval=self.pool_health_check_interval,
+                        checkout_timeout=self.pool_timeout,
+                    )
+        return self._pool
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of a `with` block."""
+        with self.pool.connection() as conn:
+            yield conn
+    
+    def pool_stats(self) -> Dict:
+        """Connection pool occupancy and wait-time metrics."""
+        if self._pool is None:
+            return {"initialized": False}
+        return {"initialized": True, **self._pool.stats()}
+    
+    def close(self):
+        """Close all pooled connections (call on shutdown)."""
+        if self._pool is not None:
+            self._pool.closeall()
+    
     def query_knowledge_base(
         self,
         query: str,
         dimension: Optional[str] = None,
         category: Optional[str] = None,
         min_authority: int = 50,
-        max_results: int = 10
+        max_results: int = 10,
+        mode: Optional[str] = None
     ) -> Dict:
         """
         Search knowledge base with epistemological filtering.
@@ -65,127 +553,40 @@ class KnowledgeRegistryDB:
             category: Filter by category name (e.g., "Federal_Contracting", "Cybersecurity")
             min_authority: Minimum authority score (50=community, 70=expert, 90=official)
             max_results: Maximum number of results (hard limit: 15)
+            mode: "lexical" (full-text) or "hybrid" (full-text + vector kNN), default SEARCH_MODE
         
         Returns:
             Dict with sources, query_info, and summary
         """
-        # Security: hard limit on results
-        max_results = min(max_results, 15)
-        
-        # Extract keywords from query
-        keywords = self._extract_keywords(query)
+        mode = resolve_search_mode(mode)
+        if mode == 'hybrid':
+            query_embedding = to_pgvector(get_embedder().embed(query))
+            query_sql, params, keywords = build_hybrid_search_query(
+                query, query_embedding, dimension, category, min_authority, max_results
+            )
+            settings = hnsw_session_settings()
+        else:
+            query_sql, params, keywords = build_search_query(
+                query, dimension, category, min_authority, max_results
+            )
+            settings = []
         
-        conn = self.get_connection()
-        cur = conn.cursor()
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                # SET LOCAL lasts until the pool rolls the transaction back on return
+                for statement in settings:
+                    cur.execute(statement)
+                cur.execute(query_sql, params)
+                results = cur.fetchall()
         
-        # Build WHERE clauses
-        where_clauses = []
-        params = []
-        
-        # Authority filter
-        where_clauses.append("s.authority_score >= %s")
-        params.append(min_authority)
-        
-        # Dimension filter
-        if dimension:
-            valid_dimensions = ['theory', 'practice', 'history', 'current', 'future']
-            if dimension.lower() in valid_dimensions:
-                where_clauses.append(f"s.epistemological_dimension = %s")
-                params.append(dimension.lower())
-        
-        # Category filter
-        if category:
-            where_clauses.append("c.name = %s OR c.display_name = %s")
-            params.extend([category, category])
-        
-        # Keyword matching
-        if keywords:
-            keyword_conditions = []
-            for kw in keywords:
-                keyword_conditions.append(
-                    "(LOWER(s.name) LIKE %s OR LOWER(s.description) LIKE %s OR LOWER(c.name) LIKE %s)"
-                )
-                params.extend([f"%{kw}%", f"%{kw}%", f"%{kw}%"])
-            where_clauses.append(f"({' OR '.join(keyword_conditions)})")
-        
-        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-        
-        query_sql = f"""
-            SELECT 
-                s.id,
-                s.name,
-                s.description,
-                s.url,
-                s.authority_score,
-                s.epistemological_dimension,
-                s.quality_score,
-                c.name as category_name,
-                c.display_name as category_display
-            FROM sources s
-            JOIN categories c ON s.category_id = c.id
-            WHERE {where_sql}
-            ORDER BY s.authority_score DESC, s.quality_score DESC
-            LIMIT %s
-        """
-        params.append(max_results)
-        
-        cur.execute(query_sql, params)
-        results = cur.fetchall()
-        
-        # Format response
-        sources = []
-        for row in results:
-            sources.append({
-                "id": str(row['id']),
-                "name": row['name'],
-                "description": row['description'],
-                "url": row['url'],
-                "authority_score": int(row['authority_score']),
-                "epistemological_dimension": row['epistemological_dimension'],
-                "quality_score": float(row['quality_score']) if row['quality_score'] else 0.0,
-                "category": row['category_display'] or row['category_name']
-            })
-        
-        cur.close()
-        conn.close()
-        
-        # Generate summary
-        summary = f"Found {len(sources)} sources"
-        if dimension:
-            summary += f" in {dimension} dimension"
-        if category:
-            summary += f" from {category}"
-        
-        return {
-            "sources": sources,
-            "query_info": {
-                "keywords": keywords,
-                "dimension": dimension,
-                "category": category,
-                "min_authority": min_authority,
-                "results_count": len(sources)
-            },
-            "summary": summary
-        }
+        return format_search_response(results, keywords, dimension, category, min_authority, mode)
     
     def get_source_details(self, source_id: str) -> Dict:
         """Get full details for a specific source."""
-        conn = self.get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                s.*,
-                c.name as category_name,
-                c.display_name as category_display
-            FROM sources s
-            JOIN categories c ON s.category_id = c.id
-            WHERE s.id = %s
-        """, (source_id,))
-        
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(SOURCE_DETAILS_SQL, (source_id,))
+                result = cur.fetchone()
         
         if not result:
             return {"error": f"Source {source_id} not found"}
@@ -194,44 +595,22 @@ class KnowledgeRegistryDB:
     
     def list_categories(self) -> List[Dict]:
         """Get list of all available categories with source counts."""
-        conn = self.get_connection()
-        cur = conn.cursor()
-        
-        cur.execute("""
-            SELECT 
-                c.name,
-                c.display_name,
-                c.description,
-                c.total_sources,
-                c.theory_sources,
-                c.practice_sources,
-                c.current_sources
-            FROM categories c
-            WHERE c.total_sources > 0
-            ORDER BY c.total_sources DESC
-        """)
-        
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(LIST_CATEGORIES_SQL)
+                results = cur.fetchall()
         
         return [dict(row) for row in results]
     
+    def get_stats(self) -> Dict:
+        """Source counts by authority and dimension, plus category count (one query)."""
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(STATS_SQL)
+                results = cur.fetchall()
+        
+        return build_stats(results)
+    
     def _extract_keywords(self, query: str) -> List[str]:
         """Extract meaningful keywords from query."""
-        import re
-        
-        # Remove common stop words
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                      'of', 'with', 'by', 'from', 'as', 'is', 'are', 'was', 'were', 'be',
-                      'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                      'would', 'should', 'could', 'may', 'might', 'can', 'what', 'how',
-                      'when', 'where', 'who', 'which', 'this', 'that', 'these', 'those'}
-        
-        # Tokenize
-        words = re.findall(r'\b[a-z]{3,}\b', query.lower())
-        
-        # Filter
-        keywords = [w for w in words if w not in stop_words]
-        
-        return keywords[:5]  # Limit to 5 keywords
+        return extract_keywords(query)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Embedding providers for FreDeSa Knowledge Registry semantic search
+Local, pluggable text -> vector encoders matching sources.embedding VECTOR(384)
+"""
+
+import hashlib
+import math
+import os
+import re
+from typing import Dict, List, Sequence
+
+# Must match the sources.embedding column dimension in scripts/database/schema.sql
+EMBEDDING_DIMENSIONS = 384
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def source_embedding_text(row: Dict) -> str:
+    """Text embedded for a source: name, description and tags."""
+    parts = [row.get("name") or "", row.get("description") or "", " ".join(row.get("tags") or [])]
+    return " ".join(part for part in parts if part)
+
+
+def to_pgvector(vector: Sequence[float]) -> str:
+    """Render a vector as a pgvector text literal (bind as %s::text::vector)."""
+    return "[" + ",".join(f"{value:.6g}" for value in vector) + "]"
+
+
+class HashingEmbedder:
+    """
+    Deterministic feature-hashing embedder (no model download).
+
+    Unigrams and bigrams are hashed into signed buckets and L2-normalized, so
+    cosine similarity approximates weighted term overlap. Useful for tests and
+    as a zero-dependency fallback; swap in a model-backed provider for quality.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall((text or "").lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, text: str) -> List[float]:
+        """Encode one text."""
+        vector = [0.0] * self.dimensions
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimensions
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Encode a batch of texts."""
+        return [self.embed(text) for text in texts]
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (optional dependency)."""
+
+    name = "sentence-transformers"
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_PROVIDER=sentence-transformers requires: pip install sentence-transformers"
+            ) from e
+        self.model = SentenceTransformer(model_name)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        if self.dimensions != EMBEDDING_DIMENSIONS:
+            raise ValueError(
+                f"Model {model_name} produces {self.dimensions}-dim vectors; "
+                f"sources.embedding is VECTOR({EMBEDDING_DIMENSIONS})"
+            )
+
+    def embed(self, text: str) -> List[float]:
+        """Encode one text."""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Encode a batch of texts."""
+        return self.model.encode(list(texts), normalize_embeddings=True).tolist()
+
+
+def make_embedder(provider: str):
+    """Create an embedder by provider name (hashing | sentence-transformers)."""
+    if provider == "hashing":
+        return HashingEmbedder()
+    if provider == "sentence-transformers":
+        return SentenceTransformerEmbedder(
+            os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+        )
+    raise ValueError(f"Unknown EMBEDDING_PROVIDER: {provider}")
+
+
+_embedder = None
+
+
+def get_embedder():
+    """Process-wide embedder selected by EMBEDDING_PROVIDER (default: hashing)."""
+    global _embedder
+    if _embedder is None:
+        _embedder = make_embedder(os.getenv("EMBEDDING_PROVIDER", "hashing"))
+    return _embedder
@@ -6,8 +6,12 @@ Exposes MCP tools via JSON-RPC 2.0 for Airia Gateway integration
 """
 
 import os
+import sys
 import json
-from typing import Dict, Any
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import FastAPI, HTTPException, Header, Request, Response
 from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,7 +19,14 @@ from pydantic import BaseModel
 import uvicorn
 
 # Import database operations (pure PostgreSQL, no MCP SDK)
-from db_operations import KnowledgeRegistryDB
+from db_operations import KnowledgeRegistryDB, resolve_search_mode
+from async_db_operations import AsyncKnowledgeRegistryDB
+from knowledge_index import KnowledgeIndex
+from query_cache import CHANGE_CHANNEL, QueryCache, search_cache_key
+from view_refresher import GRAPH_CHANGE_CHANNEL, MaterializedViewRefresher
+from usage_recorder import CUSTOMER_HEADER, UsageRecorder
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="FreDeSa Knowledge Registry MCP Server",
@@ -32,8 +43,205 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database connection
+# Initialize database access. Request handlers await the asyncpg-backed layer
+# (one pool shared by every route) so a slow query never stalls the event loop.
 db = KnowledgeRegistryDB()
+adb = AsyncKnowledgeRegistryDB(db)
+
+# Optional in-memory search index (serves query_knowledge_base without a DB round trip)
+KNOWLEDGE_INDEX_ENABLED = os.getenv("KNOWLEDGE_INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+KNOWLEDGE_INDEX_REFRESH_SECONDS = float(os.getenv("KNOWLEDGE_INDEX_REFRESH_SECONDS", "60"))
+knowledge_index = KnowledgeIndex() if KNOWLEDGE_INDEX_ENABLED else None
+
+# Search result cache, invalidated by LISTEN/NOTIFY on sources/categories changes.
+# Bypassed until the listener connects (and whenever it drops) so no change is missed.
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+query_cache = QueryCache(
+    max_entries=int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("QUERY_CACHE_TTL_SECONDS", "300")),
+    available=False,
+) if QUERY_CACHE_ENABLED else None
+
+# /stats snapshot: one GROUPING SETS query, refreshed on a timer or on change
+# notifications (debounced), so polling /stats never touches the database
+STATS_REFRESH_SECONDS = float(os.getenv("STATS_REFRESH_SECONDS", "300"))
+STATS_MIN_REFRESH_SECONDS = float(os.getenv("STATS_MIN_REFRESH_SECONDS", "2"))
+_stats_snapshot: Optional[Dict] = None
+_stats_refreshed_at: Optional[float] = None
+_stats_lock = asyncio.Lock()
+
+# knowledge_graph_summary_mv: refreshed concurrently after graph-table (or
+# sources) writes settle; needs scripts/database/add_knowledge_graph_summary_mv.sql
+GRAPH_SUMMARY_REFRESH_ENABLED = os.getenv("GRAPH_SUMMARY_REFRESH_ENABLED", "false").lower() in ("1", "true", "yes")
+graph_summary_refresher = MaterializedViewRefresher(
+    adb.refresh_knowledge_graph_summary,
+    quiet_seconds=float(os.getenv("GRAPH_SUMMARY_QUIET_SECONDS", "2")),
+    max_delay_seconds=float(os.getenv("GRAPH_SUMMARY_MAX_DELAY_SECONDS", "30")),
+    min_interval_seconds=float(os.getenv("GRAPH_SUMMARY_MIN_INTERVAL_SECONDS", "10")),
+) if GRAPH_SUMMARY_REFRESH_ENABLED else None
+
+# Billing usage (usage_tracking): tool calls append to an in-memory buffer that
+# a background task writes in batches; calls are attributed by X-Customer-ID
+USAGE_RECORDING_ENABLED = os.getenv("USAGE_RECORDING_ENABLED", "false").lower() in ("1", "true", "yes")
+usage_recorder = UsageRecorder(
+    adb.write_usage_events,
+    max_events=int(os.getenv("USAGE_BUFFER_SIZE", "10000")),
+    batch_size=int(os.getenv("USAGE_BATCH_SIZE", "500")),
+    flush_interval_seconds=float(os.getenv("USAGE_FLUSH_INTERVAL_SECONDS", "1")),
+    # Base name: each worker spills to <path>.<pid>; any worker replays them
+    spill_path=os.getenv(
+        "USAGE_SPILL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "usage_spill.ndjson")
+    ) or None,
+) if USAGE_RECORDING_ENABLED else None
+
+# usage_tracking.query_type per tool (list_categories is not billed)
+TOOL_USAGE_TYPES = {
+    "query_knowledge_base": "semantic_search",
+    "get_source_details": "source_access",
+}
+
+_background_tasks = []
+_index_refresh_requested = asyncio.Event()
+_stats_refresh_requested = asyncio.Event()
+_change_notifications = 0
+
+def _on_knowledge_change(payload: str):
+    """sources/categories changed: drop cached results and refresh the index now."""
+    global _change_notifications
+    _change_notifications += 1
+    if query_cache is not None:
+        query_cache.invalidate()
+    if knowledge_index is not None:
+        _index_refresh_requested.set()
+    _stats_refresh_requested.set()
+    if graph_summary_refresher is not None and payload == "sources":
+        graph_summary_refresher.request()
+
+def _on_graph_listener_state(connected: bool):
+    if connected:
+        # Graph changes made while disconnected were never notified
+        graph_summary_refresher.request()
+
+def _on_listener_state(connected: bool):
+    if query_cache is not None:
+        query_cache.set_available(connected)
+    if connected:
+        # Changes made while disconnected were never notified
+        if knowledge_index is not None:
+            _index_refresh_requested.set()
+        _stats_refresh_requested.set()
+
+async def _refresh_knowledge_index():
+    """Keep the in-memory index current (incremental, by updated_at watermark)."""
+    while True:
+        try:
+            changed = await knowledge_index.refresh(adb)
+            if changed and query_cache is not None:
+                # Results cached from the index before this refresh are stale
+                query_cache.invalidate()
+        except Exception as e:
+            # Keep serving the last good index; queries fall back to Postgres until built
+            logger.warning("Knowledge index refresh failed: %s", e)
+        try:
+            await asyncio.wait_for(_index_refresh_requested.wait(), KNOWLEDGE_INDEX_REFRESH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _index_refresh_requested.clear()
+
+async def refresh_stats_snapshot() -> Dict:
+    """Recompute the /stats snapshot (concurrent callers share one query)."""
+    global _stats_snapshot, _stats_refreshed_at
+    async with _stats_lock:
+        _stats_snapshot = await adb.get_stats()
+        _stats_refreshed_at = time.time()
+        return _stats_snapshot
+
+async def _refresh_stats_periodically():
+    """Refresh the /stats snapshot every STATS_REFRESH_SECONDS or after a change."""
+    while True:
+        try:
+            await refresh_stats_snapshot()
+        except Exception as e:
+            logger.warning("Stats snapshot refresh failed: %s", e)
+        try:
+            await asyncio.wait_for(_stats_refresh_requested.wait(), STATS_REFRESH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        # Debounce bursts (bulk ingestion sends one notification per statement)
+        await asyncio.sleep(STATS_MIN_REFRESH_SECONDS)
+        _stats_refresh_requested.clear()
+
+@app.on_event("startup")
+async def start_background_tasks():
+    """Start the change listener, stats snapshot and (optional) in-memory index."""
+    _background_tasks.append(asyncio.create_task(
+        adb.listen(CHANGE_CHANNEL, _on_knowledge_change, _on_listener_state)
+    ))
+    _background_tasks.append(asyncio.create_task(_refresh_stats_periodically()))
+    if knowledge_index is not None:
+        _background_tasks.append(asyncio.create_task(_refresh_knowledge_index()))
+    if graph_summary_refresher is not None:
+        _background_tasks.append(asyncio.create_task(
+            adb.listen(GRAPH_CHANGE_CHANNEL, graph_summary_refresher.request, _on_graph_listener_state)
+        ))
+        _background_tasks.append(asyncio.create_task(graph_summary_refresher.run()))
+    if usage_recorder is not None:
+        _background_tasks.append(asyncio.create_task(usage_recorder.run()))
+
+@app.on_event("shutdown")
+async def close_database_pool():
+    """Release pooled database connections on shutdown."""
+    for task in _background_tasks:
+        task.cancel()
+    if usage_recorder is not None:
+        # Write (or spill) buffered usage while the pool is still open
+        await usage_recorder.close()
+    await adb.close()
+    db.close()
+
+async def _search_knowledge_base(**arguments) -> Dict:
+    """Serve a search from the in-memory index when possible, else from Postgres."""
+    if (
+        knowledge_index is not None
+        and resolve_search_mode(arguments.get("mode")) == "lexical"
+        and knowledge_index.ready
+        and knowledge_index.can_serve(arguments.get("query", ""))
+    ):
+        return knowledge_index.query_knowledge_base(
+            **{key: value for key, value in arguments.items() if key != "mode"}
+        )
+    return await adb.query_knowledge_base(**arguments)
+
+async def run_query_knowledge_base(**arguments) -> Dict:
+    """query_knowledge_base through the result cache."""
+    if query_cache is None:
+        return await _search_knowledge_base(**arguments)
+    key = search_cache_key(**arguments)
+    result = query_cache.get(key)
+    if result is None:
+        generation = query_cache.generation
+        result = await _search_knowledge_base(**arguments)
+        query_cache.put(key, result, generation)
+    return result
+
+def record_tool_usage(customer_id: Optional[str], tool_name: str, arguments: Dict, result, started: float, transport: str):
+    """Queue a usage_tracking row for a successful tool call (no I/O)."""
+    query_type = TOOL_USAGE_TYPES.get(tool_name)
+    if usage_recorder is None or query_type is None:
+        return
+    if isinstance(result, dict) and "error" in result:
+        return
+    metadata = {"tool": tool_name, "transport": transport}
+    if "query" in arguments:
+        metadata["query"] = arguments["query"]
+        metadata["results"] = len(result.get("sources", [])) if isinstance(result, dict) else None
+    usage_recorder.record_usage(
+        customer_id,
+        query_type,
+        source_id=arguments.get("source_id"),
+        query_metadata=metadata,
+        response_time_ms=int(1000 * (time.perf_counter() - started)),
+    )
 
 # Request models
 class QueryRequest(BaseModel):
@@ -42,6 +250,7 @@ class QueryRequest(BaseModel):
     category: str = None
     min_authority: int = 50
     max_results: int = 10
+    mode: str = None
 
 class SourceDetailsRequest(BaseModel):
     source_id: str
@@ -51,13 +260,18 @@ class SourceDetailsRequest(BaseModel):
 async def health_check():
     """Health check endpoint."""
     try:
-        # Test database connection
-        conn = db.get_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT 1")
-        cur.close()
-        conn.close()
-        return {"status": "healthy", "database": "connected"}
+        # Test database connection through the shared pool
+        await adb.ping()
+        health = {"status": "healthy", "database": "connected", "pool": adb.pool_stats()}
+        if knowledge_index is not None:
+            health["knowledge_index"] = knowledge_index.stats()
+        if query_cache is not None:
+            health["query_cache"] = query_cache.stats()
+        if graph_summary_refresher is not None:
+            health["graph_summary_refresh"] = graph_summary_refresher.stats()
+        if usage_recorder is not None:
+            health["usage_recorder"] = usage_recorder.stats()
+        return health
     except Exception as e:
         return JSONResponse(
             status_code=503,
@@ -69,184 +283,218 @@ async def health_check():
 # Per MCP Specification 2025-03-26
 # ============================================
 
+# Tool definitions returned by tools/list (JSON Schema, MCP format)
+MCP_TOOLS = [
+    {
+        "name": "query_knowledge_base",
+        "description": "Search 1,043 authoritative federal contracting sources with epistemological filtering. Returns sources with authority scores (90=official, 70=expert, 50=community).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (e.g., 'FAR Part 15', 'DFARS cybersecurity')"
+                },
+                "dimension": {
+                    "type": "string",
+                    "enum": ["theory", "practice", "history", "current", "future"],
+                    "description": "Epistemological dimension to filter by"
+                },
+                "category": {
+                    "type": "string",
+                    "description": "Knowledge category (e.g., 'Federal_Contracting', 'Cybersecurity')"
+                },
+                "min_authority": {
+                    "type": "integer",
+                    "minimum": 50,
+                    "maximum": 90,
+                    "default": 50,
+                    "description": "Minimum authority score (50-90)"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 15,
+                    "default": 10,
+                    "description": "Maximum results to return"
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["lexical", "hybrid"],
+                    "description": "lexical = full-text search; hybrid = full-text + semantic vector search fused by rank"
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "get_source_details",
+        "description": "Get full metadata for a specific knowledge source by UUID.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "source_id": {
+                    "type": "string",
+                    "description": "UUID of the source"
+                }
+            },
+            "required": ["source_id"]
+        }
+    },
+    {
+        "name": "list_categories",
+        "description": "List all available knowledge categories with source counts.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    }
+]
+
+MCP_SERVER_INFO = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "fredesa-knowledge-registry",
+        "version": "1.0.0"
+    }
+}
+
+# JSON-RPC batches: max messages per batch, and tool calls run concurrently per batch
+MCP_BATCH_MAX_SIZE = int(os.getenv("MCP_BATCH_MAX_SIZE", "50"))
+MCP_BATCH_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", "5"))
+
+def _rpc_error(request_id, code: int, message: str) -> Dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {
+            "code": code,
+            "message": message
+        }
+    }
+
+_TOOL_HANDLERS = {
+    "query_knowledge_base": lambda arguments: run_query_knowledge_base(**arguments),
+    "get_source_details": lambda arguments: adb.get_source_details(**arguments),
+    "list_categories": lambda arguments: adb.list_categories(),
+}
+
+async def _handle_rpc_message(message, customer_id: Optional[str] = None) -> Tuple[Optional[Dict], int]:
+    """
+    Handle one JSON-RPC 2.0 message.
+    
+    Returns (response, status_code) - response is None for notifications,
+    status_code is what a single (non-batch) request answers with.
+    Successful tool calls are recorded as usage of customer_id.
+    """
+    if not isinstance(message, dict):
+        return _rpc_error(None, -32600, "Invalid Request"), 400
+    
+    method = message.get("method")
+    params = message.get("params") or {}
+    request_id = message.get("id")
+    
+    if method == "initialize":
+        # Return server capabilities per MCP spec
+        return {"jsonrpc": "2.0", "id": request_id, "result": MCP_SERVER_INFO}, 200
+    
+    elif method == "tools/list":
+        return {"jsonrpc": "2.0", "id": request_id, "result": {"tools": MCP_TOOLS}}, 200
+    
+    elif method == "tools/call":
+        # Execute tool and return result
+        tool_name = params.get("name")
+        arguments = params.get("arguments", {})
+        
+        handler = _TOOL_HANDLERS.get(tool_name)
+        if handler is None:
+            return _rpc_error(request_id, -32601, f"Unknown tool: {tool_name}"), 400
+        
+        started = time.perf_counter()
+        try:
+            result = await handler(arguments)
+        except Exception as e:
+            return _rpc_error(request_id, -32603, str(e)), 500
+        record_tool_usage(customer_id, tool_name, arguments, result, started, transport="mcp")
+        
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "result": {
+                "content": [
+                    {
+                        "type": "text",
+                        "text": json.dumps(result, indent=2, default=str)
+                    }
+                ]
+            }
+        }, 200
+    
+    elif method == "notifications/initialized":
+        # Client acknowledgment - 202 Accepted per spec
+        return None, 202
+    
+    else:
+        return _rpc_error(request_id, -32601, f"Method not found: {method}"), 400
+
+async def _handle_rpc_batch(messages: List, customer_id: Optional[str] = None) -> Response:
+    """
+    Handle a JSON-RPC 2.0 batch: messages run concurrently (bounded by
+    MCP_BATCH_CONCURRENCY), responses come back in request order, and
+    notifications (no "id" member) produce no response entry.
+    """
+    if not messages:
+        return JSONResponse(content=_rpc_error(None, -32600, "Invalid Request: empty batch"), status_code=400)
+    if len(messages) > MCP_BATCH_MAX_SIZE:
+        return JSONResponse(
+            content=_rpc_error(None, -32600, f"Invalid Request: batch exceeds {MCP_BATCH_MAX_SIZE} messages"),
+            status_code=400
+        )
+    
+    semaphore = asyncio.Semaphore(MCP_BATCH_CONCURRENCY)
+    
+    async def run(message):
+        async with semaphore:
+            try:
+                response, _ = await _handle_rpc_message(message, customer_id)
+            except Exception as e:
+                response = _rpc_error(message.get("id") if isinstance(message, dict) else None, -32603, str(e))
+        is_notification = isinstance(message, dict) and "id" not in message
+        return None if is_notification else response
+    
+    responses = [r for r in await asyncio.gather(*(run(m) for m in messages)) if r is not None]
+    if not responses:
+        # Batch of notifications only: nothing to return
+        return Response(status_code=202)
+    return JSONResponse(content=responses)
+
 @app.post("/mcp/sse")
 @app.post("/mcp")
 async def mcp_endpoint(request: Request):
     """
     MCP Streamable HTTP endpoint.
     Handles JSON-RPC 2.0 messages: initialize, tools/list, tools/call
+    (single messages or batch arrays).
     This is what Airia's Custom MCP Server connects to.
     """
     try:
         body = await request.json()
-        method = body.get("method")
-        params = body.get("params", {})
-        request_id = body.get("id")
-        
-        if method == "initialize":
-            # Return server capabilities per MCP spec
-            return JSONResponse(content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {
-                        "tools": {}
-                    },
-                    "serverInfo": {
-                        "name": "fredesa-knowledge-registry",
-                        "version": "1.0.0"
-                    }
-                }
-            })
-        
-        elif method == "tools/list":
-            # Return available tools with JSON Schema (MCP format)
-            return JSONResponse(content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "tools": [
-                        {
-                            "name": "query_knowledge_base",
-                            "description": "Search 1,043 authoritative federal contracting sources with epistemological filtering. Returns sources with authority scores (90=official, 70=expert, 50=community).",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "query": {
-                                        "type": "string",
-                                        "description": "Search query (e.g., 'FAR Part 15', 'DFARS cybersecurity')"
-                                    },
-                                    "dimension": {
-                                        "type": "string",
-                                        "enum": ["theory", "practice", "history", "current", "future"],
-                                        "description": "Epistemological dimension to filter by"
-                                    },
-                                    "category": {
-                                        "type": "string",
-                                        "description": "Knowledge category (e.g., 'Federal_Contracting', 'Cybersecurity')"
-                                    },
-                                    "min_authority": {
-                                        "type": "integer",
-                                        "minimum": 50,
-                                        "maximum": 90,
-                                        "default": 50,
-                                        "description": "Minimum authority score (50-90)"
-                                    },
-                                    "max_results": {
-                                        "type": "integer",
-                                        "minimum": 1,
-                                        "maximum": 15,
-                                        "default": 10,
-                                        "description": "Maximum results to return"
-                                    }
-                                },
-                                "required": ["query"]
-                            }
-                        },
-                        {
-                            "name": "get_source_details",
-                            "description": "Get full metadata for a specific knowledge source by UUID.",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {
-                                    "source_id": {
-                                        "type": "string",
-                                        "description": "UUID of the source"
-                                    }
-                                },
-                                "required": ["source_id"]
-                            }
-                        },
-                        {
-                            "name": "list_categories",
-                            "description": "List all available knowledge categories with source counts.",
-                            "inputSchema": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        }
-                    ]
-                }
-            })
-        
-        elif method == "tools/call":
-            # Execute tool and return result
-            tool_name = params.get("name")
-            arguments = params.get("arguments", {})
-            
-            try:
-                if tool_name == "query_knowledge_base":
-                    result = db.query_knowledge_base(**arguments)
-                elif tool_name == "get_source_details":
-                    result = db.get_source_details(**arguments)
-                elif tool_name == "list_categories":
-                    result = db.list_categories()
-                else:
-                    return JSONResponse(content={
-                        "jsonrpc": "2.0",
-                        "id": request_id,
-                        "error": {
-                            "code": -32601,
-                            "message": f"Unknown tool: {tool_name}"
-                        }
-                    }, status_code=400)
-                
-                return JSONResponse(content={
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps(result, indent=2, default=str)
-                            }
-                        ]
-                    }
-                })
-                
-            except Exception as e:
-                return JSONResponse(content={
-                    "jsonrpc": "2.0",
-                    "id": request_id,
-                    "error": {
-                        "code": -32603,
-                        "message": str(e)
-                    }
-                }, status_code=500)
-        
-        elif method == "notifications/initialized":
-            # Client acknowledgment - return 202 Accepted per spec
-            return Response(status_code=202)
+        customer_id = request.headers.get(CUSTOMER_HEADER)
+        if isinstance(body, list):
+            return await _handle_rpc_batch(body, customer_id)
         
-        else:
-            return JSONResponse(content={
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32601,
-                    "message": f"Method not found: {method}"
-                }
-            }, status_code=400)
+        response, status_code = await _handle_rpc_message(body, customer_id)
+        if response is None:
+            return Response(status_code=status_code)
+        return JSONResponse(content=response, status_code=status_code)
             
     except json.JSONDecodeError:
-        return JSONResponse(content={
-            "jsonrpc": "2.0",
-            "id": None,
-            "error": {
-                "code": -32700,
-                "message": "Parse error"
-            }
-        }, status_code=400)
+        return JSONResponse(content=_rpc_error(None, -32700, "Parse error"), status_code=400)
     except Exception as e:
-        return JSONResponse(content={
-            "jsonrpc": "2.0",
-            "id": None,
-            "error": {
-                "code": -32603,
-                "message": str(e)
-            }
-        }, status_code=500)
+        return JSONResponse(content=_rpc_error(None, -32603, str(e)), status_code=500)
 
 # ============================================
 # Legacy REST API endpoints (for direct access)
@@ -265,7 +513,8 @@ async def list_tools():
                     "dimension": "string (optional): theory/practice/history/current/future",
                     "category": "string (optional): Federal_Contracting, Cybersecurity, etc.",
                     "min_authority": "integer (50-90, default: 50)",
-                    "max_results": "integer (1-15, default: 10)"
+                    "max_results": "integer (1-15, default: 10)",
+                    "mode": "string (optional): lexical/hybrid"
                 }
             },
             {
@@ -284,25 +533,31 @@ async def list_tools():
     }
 
 @app.post("/tools/query_knowledge_base")
-async def query_knowledge_base(request: QueryRequest):
+async def query_knowledge_base(request: QueryRequest, x_customer_id: Optional[str] = Header(None)):
     """Query the knowledge base (REST endpoint)."""
     try:
-        result = db.query_knowledge_base(
+        started = time.perf_counter()
+        arguments = dict(
             query=request.query,
             dimension=request.dimension,
             category=request.category,
             min_authority=request.min_authority,
-            max_results=request.max_results
+            max_results=request.max_results,
+            mode=request.mode
         )
+        result = await run_query_knowledge_base(**arguments)
+        record_tool_usage(x_customer_id, "query_knowledge_base", arguments, result, started, transport="rest")
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/tools/get_source_details")
-async def get_source_details(request: SourceDetailsRequest):
+async def get_source_details(request: SourceDetailsRequest, x_customer_id: Optional[str] = Header(None)):
     """Get source details (REST endpoint)."""
     try:
-        result = db.get_source_details(request.source_id)
+        started = time.perf_counter()
+        result = await adb.get_source_details(request.source_id)
+        record_tool_usage(x_customer_id, "get_source_details", {"source_id": request.source_id}, result, started, transport="rest")
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -311,7 +566,7 @@ async def get_source_details(request: SourceDetailsRequest):
 async def list_categories():
     """List all categories (REST endpoint)."""
     try:
-        result = db.list_categories()
+        result = await adb.list_categories()
         return {"categories": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -342,17 +597,19 @@ async def detect_knowledge_gap(request: GapDetectionRequest):
         if str(scripts_path) not in sys.path:
             sys.path.insert(0, str(scripts_path))
         
-        from knowledge_gap_manager import KnowledgeGapManager
+        from knowledge_gap_manager import get_gap_manager
         
-        # Initialize gap manager (reads ENVIRONMENT from env vars)
-        gap_manager = KnowledgeGapManager()
+        # Process-wide manager (reads ENVIRONMENT from env vars once; the
+        # parsed sources.yaml is reused until the file changes)
+        gap_manager = get_gap_manager()
         
-        # Detect gap
-        result = gap_manager.detect_gap(
-            query=request.query,
+        # Detect gap (file/webhook I/O - keep it off the event loop)
+        result = await asyncio.to_thread(
+            gap_manager.detect_gap,
+            topic=request.query,
             keywords=request.keywords,
             customer_id=request.customer_id,
-            context=request.context or f"MCP request from {request.customer_id}"
+            query_context=request.context or f"MCP request from {request.customer_id}"
         )
         
         return result
@@ -394,41 +651,27 @@ async def mcp_sse_get(authorization: str = Header(None)):
 # Stats endpoint
 @app.get("/stats")
 async def get_stats():
-    """Get knowledge base statistics."""
+    """Get knowledge base statistics (served from the in-process snapshot)."""
     try:
-        conn = db.get_connection()
-        cur = conn.cursor()
+        snapshot = _stats_snapshot
+        if snapshot is None:
+            # First request before the background refresh has completed
+            snapshot = await refresh_stats_snapshot()
         
-        # Get total sources
-        cur.execute("SELECT COUNT(*) FROM sources")
-        total_sources = cur.fetchone()[0]
-        
-        # Get by authority
-        cur.execute("""
-            SELECT authority_score, COUNT(*) 
-            FROM sources 
-            GROUP BY authority_score 
-            ORDER BY authority_score DESC
-        """)
-        authority_breakdown = {row[0]: row[1] for row in cur.fetchall()}
-        
-        # Get by dimension
-        cur.execute("""
-            SELECT epistemological_dimension, COUNT(*) 
-            FROM sources 
-            GROUP BY epistemological_dimension
-        """)
-        dimension_breakdown = {row[0]: row[1] for row in cur.fetchall()}
-        
-        cur.close()
-        conn.close()
-        
-        return {
-            "total_sources": total_sources,
-            "authority_breakdown": authority_breakdown,
-            "dimension_breakdown": dimension_breakdown,
-            "categories": len(db.list_categories())
+        stats = {
+            **snapshot,
+            "snapshot_age_seconds": round(time.time() - _stats_refreshed_at, 1),
+            "pool": adb.pool_stats()
         }
+        if knowledge_index is not None:
+            stats["knowledge_index"] = knowledge_index.stats()
+        if query_cache is not None:
+            stats["query_cache"] = {**query_cache.stats(), "change_notifications": _change_notifications}
+        gap_manager_module = sys.modules.get("knowledge_gap_manager")
+        if gap_manager_module is not None:
+            # Only once /tools/detect_knowledge_gap has loaded the gap manager
+            stats["gap_notifications"] = gap_manager_module.notification_stats()
+        return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -15,6 +15,7 @@ async def detect_knowledge_gap(request: GapDetectionRequest):
     """
     try:
         # Import gap manager (lazy load to avoid startup dependency)
+        import asyncio
         import sys
         from pathlib import Path
         
@@ -23,17 +24,19 @@ async def detect_knowledge_gap(request: GapDetectionRequest):
         if str(scripts_path) not in sys.path:
             sys.path.insert(0, str(scripts_path))
         
-        from knowledge_gap_manager import KnowledgeGapManager
+        from knowledge_gap_manager import get_gap_manager
         
-        # Initialize gap manager (reads ENVIRONMENT from env vars)
-        gap_manager = KnowledgeGapManager()
+        # Process-wide manager (reads ENVIRONMENT from env vars once; the
+        # parsed sources.yaml is reused until the file changes)
+        gap_manager = get_gap_manager()
         
-        # Detect gap
-        result = gap_manager.detect_gap(
-            query=request.query,
+        # Detect gap (file/webhook I/O - keep it off the event loop)
+        result = await asyncio.to_thread(
+            gap_manager.detect_gap,
+            topic=request.query,
             keywords=request.keywords,
             customer_id=request.customer_id,
-            context=request.context or f"MCP request from {request.customer_id}"
+            query_context=request.context or f"MCP request from {request.customer_id}"
         )
         
         return result
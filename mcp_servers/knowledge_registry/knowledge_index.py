@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+In-process inverted index for FreDeSa Knowledge Registry
+Serves query_knowledge_base from memory (no database round trip) using the
+same filters and relevance blend as build_search_query, refreshed
+incrementally from sources/categories by updated_at watermark
+"""
+
+import heapq
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from async_db_operations import to_asyncpg_sql
+from db_operations import (
+    MAX_RESULTS_LIMIT,
+    SEARCH_AUTHORITY_WEIGHT,
+    SEARCH_QUALITY_WEIGHT,
+    SEARCH_TEXT_WEIGHT,
+    STOP_WORDS,
+    VALID_DIMENSIONS,
+    extract_keywords,
+    format_search_response,
+)
+
+# Field weights mirror Postgres' default ts_rank weights for labels A/B/C/D
+FIELD_WEIGHTS = {
+    "name": 1.0,         # A
+    "description": 0.4,  # B
+    "category": 0.2,     # C
+    "tags": 0.1,         # D
+}
+
+INDEX_ROWS_SQL = """
+    SELECT
+        s.id,
+        s.name,
+        s.description,
+        s.url,
+        s.authority_score,
+        s.epistemological_dimension,
+        s.quality_score,
+        s.tags,
+        c.name as category_name,
+        c.display_name as category_display,
+        GREATEST(s.updated_at, c.updated_at) as changed_at
+    FROM sources s
+    JOIN categories c ON s.category_id = c.id
+    WHERE GREATEST(s.updated_at, c.updated_at) >= %s
+"""
+
+LIVE_IDS_SQL = "SELECT id FROM sources"
+
+# Re-read rows this far behind the watermark: updated_at is stamped at
+# transaction start, so a long transaction can commit "in the past"
+WATERMARK_OVERLAP = timedelta(seconds=30)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# websearch_to_tsquery operators the index does not emulate (phrases,
+# exclusions, explicit OR) - such queries are left to the database
+_ADVANCED_SYNTAX_RE = re.compile(r'"|(?:^|\s)-\w|\bor\b', re.IGNORECASE)
+
+
+def stem(token: str) -> str:
+    """Light English suffix stripping (approximates the Postgres 'english' stemmer)."""
+    for suffix, min_len in (("ies", 5), ("ing", 6), ("ed", 5), ("es", 5), ("s", 4)):
+        if token.endswith(suffix) and len(token) >= min_len:
+            if suffix == "ies":
+                return token[:-3] + "y"
+            if suffix == "s" and token.endswith("ss"):
+                return token
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase, split, drop stop words and stem."""
+    if not text:
+        return []
+    return [stem(t) for t in _TOKEN_RE.findall(text.lower().replace("_", " ")) if t not in STOP_WORDS]
+
+
+class KnowledgeIndex:
+    """Inverted index over the source catalog (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Dict] = {}
+        # term -> {source_id: weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # source_id -> terms it was posted under (for removal on update/delete)
+        self._doc_terms: Dict[str, Iterable[str]] = {}
+        self.watermark: Optional[datetime] = None
+        self._built = False
+
+        self._builds = 0
+        self._refreshes = 0
+        self._rows_applied = 0
+        self._rows_removed = 0
+        self._queries = 0
+        self._last_refresh_ms = 0.0
+        self._last_refresh_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once the initial build has completed."""
+        return self._built
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def apply(self, rows: Iterable, live_ids: Optional[Iterable] = None) -> int:
+        """
+        Upsert changed rows (INDEX_ROWS_SQL shape) and, when live_ids is
+        given, drop every indexed source no longer present in the database.
+        Returns how many sources were added, modified or removed.
+        """
+        changed = 0
+        with self._lock:
+            for row in rows:
+                changed += self._upsert(dict(row))
+                changed_at = row["changed_at"]
+                if changed_at is not None and (self.watermark is None or changed_at > self.watermark):
+                    self.watermark = changed_at
+
+            if live_ids is not None:
+                live = {str(source_id) for source_id in live_ids}
+                for source_id in [sid for sid in self._docs if sid not in live]:
+                    self._remove(source_id)
+                    self._rows_removed += 1
+                    changed += 1
+
+            self._built = True
+        return changed
+
+    def _upsert(self, row: Dict) -> bool:
+        source_id = str(row["id"])
+        existing = self._docs.get(source_id)
+        if existing is not None and all(existing.get(key) == value for key, value in row.items()):
+            # Re-read through the watermark overlap; nothing to do
+            return False
+        self._remove(source_id)
+
+        weights: Dict[str, float] = {}
+        category_text = f"{row.get('category_name') or ''} {row.get('category_display') or ''}"
+        fields = {
+            "name": row.get("name"),
+            "description": row.get("description"),
+            "category": category_text,
+            "tags": " ".join(row.get("tags") or []),
+        }
+        for field, text in fields.items():
+            for term in tokenize(text):
+                weights[term] = weights.get(term, 0.0) + FIELD_WEIGHTS[field]
+
+        for term, weight in weights.items():
+            self._postings.setdefault(term, {})[source_id] = weight
+
+        row["_category_keys"] = {row.get("category_name"), row.get("category_display")}
+        row["_base_score"] = (
+            SEARCH_AUTHORITY_WEIGHT * int(row["authority_score"] or 0) / 100.0
+            + SEARCH_QUALITY_WEIGHT * float(row.get("quality_score") or 0) / 100.0
+        )
+        self._docs[source_id] = row
+        self._doc_terms[source_id] = weights.keys()
+        self._rows_applied += 1
+        return True
+
+    def _remove(self, source_id: str):
+        if source_id not in self._docs:
+            return
+        for term in self._doc_terms.pop(source_id, ()):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(source_id, None)
+                if not posting:
+                    del self._postings[term]
+        del self._docs[source_id]
+
+    async def refresh(self, adb) -> int:
+        """
+        Pull rows changed since the watermark through an AsyncKnowledgeRegistryDB
+        (full build on first call). Returns the number of sources changed.
+        """
+        started = time.monotonic()
+        since = self.watermark - WATERMARK_OVERLAP if self.watermark is not None else _EPOCH
+
+        async with adb.connection() as conn:
+            rows = await conn.fetch(to_asyncpg_sql(INDEX_ROWS_SQL), since)
+            live_ids = [row["id"] for row in await conn.fetch(LIVE_IDS_SQL)]
+
+        first_build = not self.ready
+        changed = self.apply(rows, live_ids)
+
+        with self._lock:
+            if first_build:
+                self._builds += 1
+            else:
+                self._refreshes += 1
+            self._last_refresh_ms = round(1000 * (time.monotonic() - started), 3)
+            self._last_refresh_at = time.time()
+        return changed
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def can_serve(query: str) -> bool:
+        """Whether the query avoids websearch syntax the index does not emulate."""
+        return not _ADVANCED_SYNTAX_RE.search(query or "")
+
+    def query_knowledge_base(
+        self,
+        query: str,
+        dimension: Optional[str] = None,
+        category: Optional[str] = None,
+        min_authority: int = 50,
+        max_results: int = 10
+    ) -> Dict:
+        """In-memory equivalent of KnowledgeRegistryDB.query_knowledge_base."""
+        max_results = min(int(max_results), MAX_RESULTS_LIMIT)
+        min_authority = int(min_authority)
+        keywords = extract_keywords(query)
+        dimension_filter = dimension.lower() if dimension and dimension.lower() in VALID_DIMENSIONS else None
+
+        with self._lock:
+            self._queries += 1
+
+            # Candidate set: union of postings for any keyword (OR semantics)
+            if keywords:
+                text_scores: Dict[str, float] = {}
+                for term in {stem(kw) for kw in keywords}:
+                    for source_id, weight in self._postings.get(term, {}).items():
+                        text_scores[source_id] = text_scores.get(source_id, 0.0) + weight
+                candidates = text_scores.items()
+            else:
+                candidates = ((source_id, 0.0) for source_id in self._docs)
+
+            scored = []
+            for source_id, text_score in candidates:
+                doc = self._docs[source_id]
+                if doc["authority_score"] is None or doc["authority_score"] < min_authority:
+                    continue
+                if dimension_filter and doc["epistemological_dimension"] != dimension_filter:
+                    continue
+                if category and category not in doc["_category_keys"]:
+                    continue
+                # rank / (rank + 1) matches ts_rank_cd normalization flag 32
+                relevance = SEARCH_TEXT_WEIGHT * text_score / (text_score + 1.0) + doc["_base_score"]
+                scored.append((
+                    relevance,
+                    doc["authority_score"],
+                    doc.get("quality_score") or 0,
+                    source_id,
+                ))
+
+            top = heapq.nlargest(max_results, scored)
+            rows = [{**self._docs[item[3]], "relevance": item[0]} for item in top]
+
+        return format_search_response(rows, keywords, dimension, category, min_authority)
+
+    def stats(self) -> Dict:
+        """Index size and refresh metrics."""
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "sources": len(self._docs),
+                "terms": len(self._postings),
+                "watermark": self.watermark.isoformat() if self.watermark is not None else None,
+                "builds": self._builds,
+                "refreshes": self._refreshes,
+                "rows_applied": self._rows_applied,
+                "rows_removed": self._rows_removed,
+                "queries": self._queries,
+                "last_refresh_ms": self._last_refresh_ms,
+                "last_refresh_age_s": round(time.time() - self._last_refresh_at, 1) if self._last_refresh_at else None,
+            }
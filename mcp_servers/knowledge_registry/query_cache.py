@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Query result cache for FreDeSa Knowledge Registry
+Size-bounded LRU with TTL, invalidated by Postgres LISTEN/NOTIFY when
+sources or categories change (see scripts/database/add_change_notifications.sql)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from db_operations import MAX_RESULTS_LIMIT, VALID_DIMENSIONS, resolve_search_mode
+
+# Channel the sources/categories statement triggers notify on
+CHANGE_CHANNEL = "knowledge_registry_changes"
+
+
+def search_cache_key(
+    query: str,
+    dimension: Optional[str] = None,
+    category: Optional[str] = None,
+    min_authority: int = 50,
+    max_results: int = 10,
+    mode: Optional[str] = None
+) -> Tuple:
+    """
+    Normalize search arguments the same way build_search_query does, so
+    requests that produce identical SQL share one entry. The query text is
+    kept (case/whitespace-folded) rather than just its keywords because
+    websearch_to_tsquery ranking sees short terms, numbers and phrases.
+    """
+    return (
+        " ".join((query or "").lower().split()),
+        dimension.lower() if dimension and dimension.lower() in VALID_DIMENSIONS else None,
+        category or None,
+        int(min_authority),
+        min(int(max_results), MAX_RESULTS_LIMIT),
+        resolve_search_mode(mode),
+    )
+
+
+class QueryCache:
+    """
+    Thread-safe LRU + TTL cache with generation-based invalidation.
+
+    Callers read `generation` before computing a miss and pass it to put(); a
+    result computed across an invalidation is dropped instead of cached.
+    While `available` is False (change listener disconnected) the cache is
+    bypassed, since invalidations could be missed.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0, available: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.available = available
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._stale_puts = 0
+        self._last_invalidated_at: Optional[float] = None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on a miss (results must not be mutated)."""
+        with self._lock:
+            if not self.available:
+                self._misses += 1
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """Cache a value computed under `generation` (dropped if invalidated since)."""
+        with self._lock:
+            if not self.available or (generation is not None and generation != self.generation):
+                self._stale_puts += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self):
+        """Drop every entry (called on each change notification)."""
+        with self._lock:
+            self._invalidate()
+
+    def set_available(self, available: bool):
+        """Enable/bypass the cache; any transition also invalidates."""
+        with self._lock:
+            self._invalidate()
+            self.available = available
+
+    def _invalidate(self):
+        self._entries.clear()
+        self.generation += 1
+        self._invalidations += 1
+        self._last_invalidated_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "available": self.available,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "stale_puts": self._stale_puts,
+                "generation": self.generation,
+                "last_invalidated_at": self._last_invalidated_at,
+            }
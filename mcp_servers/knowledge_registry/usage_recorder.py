@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Batched usage recording for FreDeSa Knowledge Registry
+Request handlers append usage events to an in-memory ring buffer; a background
+task writes them to usage_tracking / connector_query_log in multi-row batches,
+so tool calls never wait on a billing INSERT or its commit
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Header identifying the calling customer (set by the gateway / frontend)
+CUSTOMER_HEADER = "X-Customer-ID"
+
+USAGE_COLUMNS = (
+    "customer_id", "source_id", "agent_id", "query_type", "query_metadata",
+    "response_time_ms", "tokens_used", "cost_incurred", "created_at",
+)
+CONNECTOR_QUERY_COLUMNS = (
+    "customer_id", "connector_id", "query_text", "files_retrieved", "bytes_retrieved",
+    "query_duration_ms", "cost_incurred", "created_at",
+)
+
+# One statement per table per batch (unnest of column arrays), so the rollup
+# statement triggers fire once per flush. Unknown customers/connectors are
+# skipped rather than failing the batch; a deleted source is recorded as NULL.
+INSERT_USAGE_SQL = """
+    INSERT INTO usage_tracking
+        (customer_id, source_id, agent_id, query_type, query_metadata,
+         response_time_ms, tokens_used, cost_incurred, created_at)
+    SELECT u.customer_id, s.id, u.agent_id, u.query_type, u.query_metadata::jsonb,
+           u.response_time_ms, u.tokens_used, u.cost_incurred, u.created_at
+    FROM unnest(%s::uuid[], %s::uuid[], %s::text[], %s::text[], %s::text[],
+                %s::int[], %s::int[], %s::numeric[], %s::timestamptz[])
+        AS u(customer_id, source_id, agent_id, query_type, query_metadata,
+             response_time_ms, tokens_used, cost_incurred, created_at)
+    JOIN customers c ON c.id = u.customer_id
+    LEFT JOIN sources s ON s.id = u.source_id
+"""
+
+INSERT_CONNECTOR_QUERIES_SQL = """
+    INSERT INTO connector_query_log
+        (customer_id, connector_id, query_text, files_retrieved, bytes_retrieved,
+         query_duration_ms, cost_incurred, created_at)
+    SELECT u.customer_id, u.connector_id, u.query_text, u.files_retrieved, u.bytes_retrieved,
+           u.query_duration_ms, u.cost_incurred, u.created_at
+    FROM unnest(%s::uuid[], %s::uuid[], %s::text[], %s::int[], %s::bigint[],
+                %s::int[], %s::numeric[], %s::timestamptz[])
+        AS u(customer_id, connector_id, query_text, files_retrieved, bytes_retrieved,
+             query_duration_ms, cost_incurred, created_at)
+    JOIN customer_connectors cc ON cc.id = u.connector_id AND cc.customer_id = u.customer_id
+"""
+
+# source_access events also bump source_counters.access_count (add_source_counters.sql)
+RECORD_SOURCE_ACCESS_SQL = """
+    SELECT bump_source_counters(array_agg(a.source_id), access_deltas => array_agg(a.accesses))
+    FROM (
+        SELECT source_id, COUNT(*)::int as accesses
+        FROM unnest(%s::uuid[]) AS source_id
+        GROUP BY source_id
+    ) a
+    JOIN sources s ON s.id = a.source_id
+"""
+
+UsageEvent = Tuple[str, Dict]
+
+
+def parse_uuid(value: Optional[str]) -> Optional[str]:
+    """Canonical UUID string, or None if the value is missing or malformed."""
+    if not value:
+        return None
+    try:
+        return str(uuid.UUID(value.strip()))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _decimal(value) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
+
+
+def usage_event_params(events: List[UsageEvent]) -> Dict[str, Tuple[List, ...]]:
+    """
+    Column arrays for INSERT_USAGE_SQL / INSERT_CONNECTOR_QUERIES_SQL /
+    RECORD_SOURCE_ACCESS_SQL, keyed by table. Tables without events are omitted.
+    """
+    usage = [row for table, row in events if table == "usage_tracking"]
+    connector = [row for table, row in events if table == "connector_query_log"]
+    params = {}
+    if usage:
+        params["usage_tracking"] = tuple(
+            [_decimal(row.get(column)) for row in usage] if column == "cost_incurred"
+            else [row.get(column) for row in usage]
+            for column in USAGE_COLUMNS
+        )
+        accessed = [row["source_id"] for row in usage if row["query_type"] == "source_access" and row.get("source_id")]
+        if accessed:
+            params["source_access"] = (accessed,)
+    if connector:
+        params["connector_query_log"] = tuple(
+            [_decimal(row.get(column)) for row in connector] if column == "cost_incurred"
+            else [row.get(column) for row in connector]
+            for column in CONNECTOR_QUERY_COLUMNS
+        )
+    return params
+
+
+def _dump_event(event: UsageEvent) -> str:
+    table, row = event
+    return json.dumps({"table": table, "row": row}, default=str)
+
+
+def _load_event(line: str) -> UsageEvent:
+    record = json.loads(line)
+    row = record["row"]
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return record["table"], row
+
+
+def _is_same_file(path: str, f) -> bool:
+    """True if `path` still names the open file `f` (not renamed away by a replayer)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    fst = os.fstat(f.fileno())
+    return (st.st_dev, st.st_ino) == (fst.st_dev, fst.st_ino)
+
+
+def _locked_append(path: str, lines: List[str]):
+    """Append under flock, reopening if the file was claimed between open and lock."""
+    while True:
+        with open(path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            if _is_same_file(path, f):
+                f.writelines(lines)
+                f.flush()
+                return
+
+
+class UsageRecorder:
+    """
+    Buffer usage events in memory and write them in batches off the request path.
+
+    record_usage() / record_connector_query() only append to a bounded ring
+    buffer: no I/O, never blocks. run() writes a batch every
+    flush_interval_seconds, or as soon as batch_size events are pending. A
+    failed batch goes back to the front of the buffer and is retried after
+    retry_seconds; if the buffer is more than half full at that point (the
+    database is down or too slow for the load) it is spilled to spill_path so
+    memory stays bounded. Events arriving while the buffer is full are dropped
+    and counted. close() writes what it can and spills the rest, and the spill
+    files are replayed by the next run(). Delivery is at least once: a crash
+    during a replay can write part of a batch twice.
+
+    spill_path is a base name: each process appends to `<spill_path>.<pid>`,
+    so workers started from the same directory never share a file. Any
+    worker may replay any spill file. It claims a file by renaming it to a
+    name of its own, and only one rename can win. It then holds an exclusive
+    flock while replaying and truncates the file once the events are
+    written. A claim left by a crashed worker is picked up on a later pass.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[UsageEvent]], Awaitable[int]],
+        max_events: int = 10000,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        retry_seconds: float = 5.0,
+        spill_path: Optional[str] = None
+    ):
+        self.write = write
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retry_seconds = retry_seconds
+        self.spill_path = os.path.abspath(spill_path) if spill_path else None
+        self._deferred_claims = 0
+        self._buffer: Deque[UsageEvent] = deque()
+        self._wake = asyncio.Event()
+        self.recorded = 0
+        self.written = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.unattributed = 0
+        self.failures = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.last_flush_ms: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+
+    def _append(self, table: str, row: Dict) -> bool:
+        if len(self._buffer) >= self.max_events:
+            self.dropped += 1
+            return False
+        row["created_at"] = datetime.now(timezone.utc)
+        self._buffer.append((table, row))
+        self.recorded += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def record_usage(
+        self,
+        customer_id: Optional[str],
+        query_type: str,
+        source_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        query_metadata: Optional[Dict] = None,
+        response_time_ms: Optional[int] = None,
+        tokens_used: Optional[int] = None,
+        cost_incurred: Optional[float] = None
+    ) -> bool:
+        """Queue a usage_tracking row; False if it was not queued."""
+        customer_id = parse_uuid(customer_id)
+        if customer_id is None:
+            self.unattributed += 1
+            return False
+        return self._append("usage_tracking", {
+            "customer_id": customer_id,
+            "source_id": parse_uuid(source_id),
+            "agent_id": agent_id,
+            "query_type": query_type,
+            "query_metadata": json.dumps(query_metadata, default=str) if query_metadata is not None else None,
+            "response_time_ms": response_time_ms,
+            "tokens_used": tokens_used,
+            "cost_incurred": cost_incurred,
+        })
+
+    def record_connector_query(
+        self,
+        customer_id: Optional[str],
+        connector_id: str,
+        query_text: str,
+        files_retrieved: int = 0,
+        bytes_retrieved: int = 0,
+        query_duration_ms: Optional[int] = None,
+        cost_incurred: Optional[float] = None
+    ) -> bool:
+        """Queue a connector_query_log row; False if it was not queued."""
+        customer_id = parse_uuid(customer_id)
+        if customer_id is None:
+            self.unattributed += 1
+            return False
+        return self._append("connector_query_log", {
+            "customer_id": customer_id,
+            "connector_id": connector_id,
+            "query_text": query_text,
+            "files_retrieved": files_retrieved,
+            "bytes_retrieved": bytes_retrieved,
+            "query_duration_ms": query_duration_ms,
+            "cost_incurred": cost_incurred,
+        })
+
+    # ------------------------------------------------------------------
+    # Background writer
+    # ------------------------------------------------------------------
+
+    async def _write_batch(self, batch: List[UsageEvent]):
+        started = time.monotonic()
+        inserted = await self.write(batch)
+        self.last_flush_ms = round(1000 * (time.monotonic() - started), 3)
+        self.written += inserted
+        self.rejected += len(batch) - inserted
+
+    async def flush(self) -> bool:
+        """Write everything buffered; False (batch re-queued) if a write failed."""
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            try:
+                await self._write_batch(batch)
+            except asyncio.CancelledError:
+                self._buffer.extendleft(reversed(batch))
+                raise
+            except Exception as e:
+                self.failures += 1
+                self._buffer.extendleft(reversed(batch))
+                logger.warning("Usage flush failed (%d events buffered): %s", len(self._buffer), e)
+                return False
+        return True
+
+    def _own_spill_path(self) -> str:
+        # Evaluated per call: a recorder created before a fork spills per worker
+        return f"{self.spill_path}.{os.getpid()}"
+
+    def _append_spill(self, events: List[UsageEvent]):
+        _locked_append(self._own_spill_path(), [_dump_event(event) + "\n" for event in events])
+
+    async def spill(self) -> int:
+        """Move every buffered event to the spill file; returns the number spilled."""
+        if not self.spill_path or not self._buffer:
+            return 0
+        events = list(self._buffer)
+        self._buffer.clear()
+        try:
+            await asyncio.to_thread(self._append_spill, events)
+        except Exception as e:
+            self._buffer.extendleft(reversed(events))
+            logger.error("Usage spill to %s failed: %s", self._own_spill_path(), e)
+            return 0
+        self.spilled += len(events)
+        return len(events)
+
+    def _claim_spill_files(self) -> List[Tuple[str, object]]:
+        """
+        Claim every spill file (per-process, legacy and leftover claims) by
+        renaming it to a name of our own, then lock it. Returns (path, open
+        locked file) pairs. Files still locked by another process stay
+        claimed under our name and are retried on the next pass.
+        """
+        directory, base = os.path.split(self.spill_path)
+        claims = []
+        self._deferred_claims = 0
+        try:
+            entries = sorted(os.listdir(directory))
+        except FileNotFoundError:
+            return claims
+        for entry in entries:
+            if entry != base and not entry.startswith(base + "."):
+                continue
+            claimed = f"{self.spill_path}.replay.{os.getpid()}.{uuid.uuid4().hex[:12]}"
+            try:
+                os.rename(os.path.join(directory, entry), claimed)
+            except FileNotFoundError:
+                continue  # another worker claimed it first
+            try:
+                f = open(claimed, "r+", encoding="utf-8")
+            except FileNotFoundError:
+                continue  # re-claimed by another worker straight after our rename
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                f.close()  # mid-append or mid-replay elsewhere
+                self._deferred_claims += 1
+                continue
+            claims.append((claimed, f))
+        return claims
+
+    @staticmethod
+    def _read_spill(f) -> List[UsageEvent]:
+        events = []
+        f.seek(0)
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                events.append(_load_event(line))
+            except (ValueError, KeyError, TypeError) as e:
+                # A line cut short by a crash mid-write
+                logger.warning("Skipping unreadable spilled usage event: %s", e)
+        return events
+
+    @staticmethod
+    def _finish_claim(path: str, f):
+        """Empty the claimed file (so a later claimant of this inode replays nothing) and remove it."""
+        f.truncate(0)
+        f.close()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def replay_spill(self) -> bool:
+        """Write spilled events directly (not through the buffer); False if any are left to replay."""
+        if not self.spill_path:
+            return True
+        claims = await asyncio.to_thread(self._claim_spill_files)
+        try:
+            while claims:
+                path, f = claims[0]
+                events = await asyncio.to_thread(self._read_spill, f)
+                for start in range(0, len(events), self.batch_size):
+                    batch = events[start:start + self.batch_size]
+                    try:
+                        await self._write_batch(batch)
+                    except Exception as e:
+                        self.failures += 1
+                        await asyncio.to_thread(self._append_spill, events[start:])
+                        await asyncio.to_thread(self._finish_claim, path, f)
+                        claims.pop(0)
+                        logger.warning("Usage spill replay failed, %d events left in %s: %s",
+                                       len(events) - start, self._own_spill_path(), e)
+                        return False
+                    self.replayed += len(batch)
+                await asyncio.to_thread(self._finish_claim, path, f)
+                claims.pop(0)
+            return self._deferred_claims == 0
+        finally:
+            # Unreplayed claims stay on disk under our name for the next pass
+            for _, f in claims:
+                f.close()
+
+    async def run(self):
+        """Flush loop; run as a background task and call close() on shutdown."""
+        spill_pending = True
+        next_replay = 0.0
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            if await self.flush():
+                if spill_pending and time.monotonic() >= next_replay:
+                    try:
+                        spill_pending = not await self.replay_spill()
+                    except OSError as e:
+                        # Unreadable spill directory etc.; keep flushing, retry later
+                        logger.error("Usage spill replay from %s failed: %s", self.spill_path, e)
+                    next_replay = time.monotonic() + self.retry_seconds
+                continue
+
+            if len(self._buffer) >= self.max_events // 2 and await self.spill():
+                spill_pending = True
+            await asyncio.sleep(self.retry_seconds)
+
+    async def close(self, timeout: float = 5.0):
+        """Final flush (bounded by timeout); whatever is left goes to the spill file."""
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Usage flush timed out on shutdown")
+        spilled = await self.spill()
+        if self._buffer:
+            logger.error("Dropping %d unwritten usage events (no spill file)", len(self._buffer))
+            self.dropped += len(self._buffer)
+            self._buffer.clear()
+        elif spilled:
+            logger.info("Spilled %d usage events to %s", spilled, self._own_spill_path())
+
+    def stats(self) -> Dict:
+        return {
+            "buffered": len(self._buffer),
+            "recorded": self.recorded,
+            "written": self.written,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "unattributed": self.unattributed,
+            "failures": self.failures,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "last_flush_ms": self.last_flush_ms,
+        }
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Debounced materialized view refresh for FreDeSa Knowledge Registry
+Graph-table writes notify knowledge_graph_changes (see
+scripts/database/add_knowledge_graph_summary_mv.sql); bursts of notifications
+collapse into one REFRESH MATERIALIZED VIEW CONCURRENTLY
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Channel the graph-table statement triggers notify on
+GRAPH_CHANGE_CHANNEL = "knowledge_graph_changes"
+
+
+class MaterializedViewRefresher:
+    """
+    Run `refresh` after changes settle.
+
+    request() marks the view stale. run() refreshes once no request has
+    arrived for quiet_seconds, or max_delay_seconds after the first pending
+    request (so a continuous load still refreshes periodically), and never
+    more often than every min_interval_seconds. refresh() returns False when
+    another process holds the refresh lock; that refresh may have started
+    before our changes committed, so the request is re-queued after
+    retry_seconds.
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[], Awaitable[bool]],
+        quiet_seconds: float = 2.0,
+        max_delay_seconds: float = 30.0,
+        min_interval_seconds: float = 10.0,
+        retry_seconds: float = 30.0
+    ):
+        self.refresh = refresh
+        self.quiet_seconds = quiet_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self.retry_seconds = retry_seconds
+        self._requested = asyncio.Event()
+        self._first_request: Optional[float] = None
+        self._last_request: Optional[float] = None
+        self._last_refresh: Optional[float] = None
+        self.requests = 0
+        self.refreshes = 0
+        self.skipped = 0
+        self.failures = 0
+        self.last_duration_ms: Optional[float] = None
+
+    def request(self, *_):
+        """Mark the view stale (safe to use directly as a notification callback)."""
+        now = time.monotonic()
+        self.requests += 1
+        if self._first_request is None:
+            self._first_request = now
+        self._last_request = now
+        self._requested.set()
+
+    async def _settle(self):
+        """Sleep until the pending requests have been quiet long enough (or waited too long)."""
+        while True:
+            now = time.monotonic()
+            due = min(self._last_request + self.quiet_seconds, self._first_request + self.max_delay_seconds)
+            if self._last_refresh is not None:
+                due = max(due, self._last_refresh + self.min_interval_seconds)
+            if now >= due:
+                return
+            await asyncio.sleep(due - now)
+
+    async def run(self):
+        """Refresh loop; run as a background task and cancel on shutdown."""
+        while True:
+            await self._requested.wait()
+            await self._settle()
+            # Requests arriving from here on need another refresh
+            self._requested.clear()
+            self._first_request = self._last_request = None
+
+            started = time.monotonic()
+            try:
+                refreshed = await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                logger.warning("Materialized view refresh failed: %s", e)
+                await asyncio.sleep(self.retry_seconds)
+                self.request()
+                continue
+            self._last_refresh = time.monotonic()
+            if refreshed:
+                self.refreshes += 1
+                self.last_duration_ms = round(1000 * (self._last_refresh - started), 3)
+            else:
+                self.skipped += 1
+                await asyncio.sleep(self.retry_seconds)
+                self.request()
+
+    def stats(self) -> Dict:
+        return {
+            "pending": self._requested.is_set(),
+            "requests": self.requests,
+            "refreshes": self.refreshes,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_duration_ms": self.last_duration_ms,
+            "seconds_since_refresh": (
+                round(time.monotonic() - self._last_refresh, 1) if self._last_refresh is not None else None
+            ),
+        }
@@ -11,18 +11,41 @@ Complies with:
 - AWS SaaS Lens (Tenant Isolation)
 """
 
+import atexit
+import hashlib
+import heapq
+import itertools
 import json
 import os
-from datetime import datetime
+import queue
+import random
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 import requests
 import yaml
 
+# libyaml-backed loader is ~10x faster than the pure-Python one
+YamlSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 REPO_ROOT = Path(__file__).parent.parent.parent
 SOURCES_FILE = REPO_ROOT / "config" / "sources.yaml"
+# Pre-parsed sources.yaml keyed by content hash (rebuilt automatically)
+# JSON, never pickle: the server process loads it, and anyone able to write
+# logs/ must not be able to run code by replacing it
+SOURCES_SNAPSHOT = Path(os.getenv("SOURCES_SNAPSHOT", str(REPO_ROOT / "logs" / "sources_snapshot.json")))
+SNAPSHOT_VERSION = 2
 GAPS_LOG = REPO_ROOT / "logs" / "knowledge_gaps.jsonl"
-GAPS_QUEUE = REPO_ROOT / "logs" / "production_gaps_queue.jsonl"
+GAPS_QUEUE = REPO_ROOT / "logs" / "production_gaps_queue.jsonl"  # legacy, imported into GAPS_DB
+GAPS_DB = Path(os.getenv("GAPS_DB", str(REPO_ROOT / "logs" / "production_gaps.sqlite3")))
+
+# Background Slack / dev API delivery of production gap notifications
+NOTIFY_DIGEST_SECONDS = float(os.getenv("GAP_NOTIFY_DIGEST_SECONDS", "30"))
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("GAP_NOTIFY_MAX_ATTEMPTS", "5"))
+NOTIFY_QUEUE_SIZE = int(os.getenv("GAP_NOTIFY_QUEUE_SIZE", "1000"))
 
 
 class EnvironmentConfig:
@@ -52,21 +75,798 @@ class EnvironmentConfig:
         )
 
 
+class SourceMatchIndex:
+    """
+    Inverted index over sources.yaml for keyword coverage checks.
+    
+    Matching semantics are those of the original linear scan: a keyword
+    matches a source when it is a (case-insensitive) substring of the
+    source's name, its space-joined metadata tags, or its category.
+    
+    Lowercased fields are computed once per load. A keyword without
+    whitespace is a substring of a field exactly when it is a substring of
+    one of the field's whitespace-delimited tokens. Such keywords are
+    resolved against the token vocabulary (narrowed by a trigram index) and
+    the postings of every matching token are unioned. Keywords containing
+    whitespace narrow candidates the same way per part, then verify
+    against the stored fields.
+    """
+    
+    def __init__(self, sources: Sequence[Dict]):
+        self.source_ids = [source.get("id") for source in sources]
+        self.fields = []
+        # token -> indexes of sources containing it (ascending = sources.yaml order)
+        self.postings: Dict[str, List[int]] = {}
+        # trigram -> vocabulary tokens containing it
+        self.trigrams: Dict[str, Set[str]] = {}
+        self._keyword_cache: Dict[str, Sequence[int]] = {}
+        
+        for position, source in enumerate(sources):
+            name = (source.get("name") or "").lower()
+            tags = " ".join(tag.lower() for tag in source.get("metadata_tags") or [])
+            category = (source.get("category") or "").lower()
+            self.fields.append((name, tags, category))
+            for token in set(name.split()) | set(tags.split()) | set(category.split()):
+                self.postings.setdefault(token, []).append(position)
+        
+        for token in self.postings:
+            for i in range(len(token) - 2):
+                self.trigrams.setdefault(token[i:i + 3], set()).add(token)
+    
+    def __len__(self) -> int:
+        return len(self.source_ids)
+    
+    def _tokens_containing(self, part: str) -> Set[str]:
+        """Vocabulary tokens that contain `part` as a substring."""
+        if len(part) < 3:
+            # Too short for the trigram index; scan the vocabulary
+            return {token for token in self.postings if part in token}
+        grams = sorted(
+            (self.trigrams.get(part[i:i + 3], set()) for i in range(len(part) - 2)),
+            key=len
+        )
+        if not grams[0]:
+            return set()
+        return {token for token in set.intersection(*grams) if part in token}
+    
+    def _sources_containing_part(self, part: str) -> Set[int]:
+        positions: Set[int] = set()
+        for token in self._tokens_containing(part):
+            positions.update(self.postings[token])
+        return positions
+    
+    def sources_matching(self, keyword: str) -> Sequence[int]:
+        """Positions of sources whose name, tags or category contain `keyword`."""
+        keyword = keyword.lower()
+        cached = self._keyword_cache.get(keyword)
+        if cached is not None:
+            return cached
+        
+        parts = keyword.split()
+        if parts and len(parts) == 1 and parts[0] == keyword:
+            positions = self._sources_containing_part(keyword)
+        else:
+            # Whitespace inside the keyword: narrow by each part, then verify
+            candidates = None
+            for part in parts:
+                found = self._sources_containing_part(part)
+                candidates = found if candidates is None else candidates & found
+                if not candidates:
+                    break
+            if candidates is None:
+                candidates = range(len(self.fields))
+            positions = {
+                position for position in candidates
+                if any(keyword in field for field in self.fields[position])
+            }
+        
+        result = tuple(sorted(positions))
+        if len(self._keyword_cache) >= 4096:
+            self._keyword_cache.clear()
+        self._keyword_cache[keyword] = result
+        return result
+    
+    def match(self, keywords: List[str], threshold: float = 0.6) -> List[str]:
+        """
+        Ids of sources matching at least `threshold` of the keywords, in
+        sources.yaml order (posting-list counts instead of a full scan).
+        """
+        required = len(keywords) * threshold
+        if required <= 0:
+            return list(self.source_ids)
+        
+        counts: Dict[int, int] = {}
+        for keyword in keywords:
+            for position in self.sources_matching(keyword):
+                counts[position] = counts.get(position, 0) + 1
+        
+        return [self.source_ids[position] for position in sorted(counts) if counts[position] >= required]
+
+
+def _encode_snapshot_value(value):
+    """json.dumps default: YAML timestamps as tagged ISO strings."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not snapshot-serializable")
+
+
+def _decode_snapshot_value(obj: Dict):
+    if len(obj) == 1:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class SourcesCatalog:
+    """
+    Parsed sources.yaml plus its SourceMatchIndex, reloaded only on change.
+    
+    Each get() costs one stat(): the catalog is re-read when the file's
+    mtime or size changes, and re-parsed only if its SHA-256 differs too
+    (a touch or a checkout of identical content keeps the parsed copy).
+    Parsing uses libyaml when available; the parsed result is saved as JSON
+    to `snapshot_path` so a cold start with an unchanged file skips YAML
+    entirely. The snapshot is only trusted when its recorded hash matches
+    the current file, and is only written when it round-trips to the
+    same data (YAML dates are tagged; non-string keys skip the snapshot).
+    """
+    
+    def __init__(self, path: Path = SOURCES_FILE, snapshot_path: Optional[Path] = SOURCES_SNAPSHOT):
+        self.path = Path(path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._sha256: Optional[str] = None
+        self._sources: Dict = {}
+        self._index = SourceMatchIndex([])
+        
+        self.loads = 0
+        self.parses = 0
+        self.snapshot_hits = 0
+    
+    def _stat_signature(self) -> Tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_snapshot(self, sha256: str) -> Optional[Dict]:
+        if self.snapshot_path is None:
+            return None
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = json.load(f, object_hook=_decode_snapshot_value)
+        except (OSError, ValueError):
+            return None
+        if (
+            isinstance(snapshot, dict)
+            and snapshot.get("version") == SNAPSHOT_VERSION
+            and snapshot.get("sha256") == sha256
+        ):
+            return snapshot["sources"]
+        return None
+    
+    def _write_snapshot(self, sha256: str, sources: Dict):
+        if self.snapshot_path is None:
+            return
+        try:
+            payload = json.dumps(
+                {"version": SNAPSHOT_VERSION, "sha256": sha256, "sources": sources},
+                default=_encode_snapshot_value, separators=(",", ":")
+            )
+        except (TypeError, ValueError):
+            return
+        if json.loads(payload, object_hook=_decode_snapshot_value)["sources"] != sources:
+            return  # e.g. integer mapping keys; parsing YAML stays correct
+        tmp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            # Read-only checkout etc. - parsing still works, just not cached
+            print(f"⚠️  Could not write sources snapshot {self.snapshot_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def _reload(self, signature: Tuple[int, int]):
+        content = self.path.read_bytes()
+        sha256 = hashlib.sha256(content).hexdigest()
+        self.loads += 1
+        if sha256 != self._sha256:
+            sources = self._read_snapshot(sha256)
+            if sources is not None:
+                self.snapshot_hits += 1
+            else:
+                sources = yaml.load(content, Loader=YamlSafeLoader) or {}
+                self.parses += 1
+                self._write_snapshot(sha256, sources)
+            self._sources = sources
+            self._index = SourceMatchIndex(sources.get("sources") or [])
+            self._sha256 = sha256
+        self._signature = signature
+    
+    def get(self) -> Tuple[Dict, SourceMatchIndex]:
+        """Current (sources, match index), reloading if the file changed."""
+        signature = self._stat_signature()
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._reload(signature)
+        return self._sources, self._index
+    
+    @property
+    def sources(self) -> Dict:
+        return self.get()[0]
+    
+    @property
+    def match_index(self) -> SourceMatchIndex:
+        return self.get()[1]
+    
+    def stats(self) -> Dict:
+        return {
+            "path": str(self.path),
+            "sha256": self._sha256,
+            "sources": len(self._index),
+            "loads": self.loads,
+            "parses": self.parses,
+            "snapshot_hits": self.snapshot_hits,
+        }
+
+
+class GapQueueStore:
+    """
+    Production gap queue in SQLite (WAL mode), shared by all worker processes.
+    
+    Gaps are appended as rows holding the JSON gap record; resolving sets
+    `resolved_at` instead of rewriting anything. Open/total counts are kept
+    in a counters table by triggers, so counting is a single-row read, and
+    tail reads walk a partial index over open gaps. Writers take
+    BEGIN IMMEDIATE and wait on `busy_timeout`, so concurrent uvicorn
+    workers serialize instead of failing. An existing JSONL queue file is
+    imported once and renamed to `*.imported`.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS gaps (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT,
+            topic TEXT,
+            customer_id TEXT,
+            record TEXT NOT NULL,
+            resolved_at TEXT,
+            resolution_notes TEXT
+        );
+        CREATE INDEX IF NOT EXISTS gaps_open_idx ON gaps (id) WHERE resolved_at IS NULL;
+        CREATE INDEX IF NOT EXISTS gaps_timestamp_idx ON gaps (timestamp);
+        
+        CREATE TABLE IF NOT EXISTS gap_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO gap_counters (name, value) VALUES ('open', 0), ('total', 0);
+        
+        CREATE TRIGGER IF NOT EXISTS gaps_count_insert AFTER INSERT ON gaps BEGIN
+            UPDATE gap_counters SET value = value + 1 WHERE name = 'total';
+            UPDATE gap_counters SET value = value + 1 WHERE name = 'open' AND NEW.resolved_at IS NULL;
+        END;
+        CREATE TRIGGER IF NOT EXISTS gaps_count_resolve AFTER UPDATE OF resolved_at ON gaps
+        WHEN (OLD.resolved_at IS NULL) != (NEW.resolved_at IS NULL) BEGIN
+            UPDATE gap_counters
+            SET value = value + CASE WHEN NEW.resolved_at IS NULL THEN 1 ELSE -1 END
+            WHERE name = 'open';
+        END;
+        CREATE TRIGGER IF NOT EXISTS gaps_count_delete AFTER DELETE ON gaps BEGIN
+            UPDATE gap_counters SET value = value - 1 WHERE name = 'total';
+            UPDATE gap_counters SET value = value - 1 WHERE name = 'open' AND OLD.resolved_at IS NULL;
+        END;
+        
+        CREATE TABLE IF NOT EXISTS gap_store_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    def __init__(self, path: Path = GAPS_DB, legacy_jsonl: Optional[Path] = GAPS_QUEUE, busy_timeout: float = 30.0):
+        self.path = Path(path)
+        self.legacy_jsonl = Path(legacy_jsonl) if legacy_jsonl else None
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript("BEGIN IMMEDIATE;" + self.SCHEMA + "COMMIT;")
+        self._import_legacy_jsonl()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shared)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    class _write:
+        """BEGIN IMMEDIATE ... COMMIT/ROLLBACK (takes the write lock up front)."""
+        
+        def __init__(self, conn: sqlite3.Connection):
+            self.conn = conn
+        
+        def __enter__(self):
+            self.conn.execute("BEGIN IMMEDIATE")
+            return self.conn
+        
+        def __exit__(self, exc_type, exc, tb):
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+            return False
+    
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, gap_record: Dict) -> int:
+        cursor = conn.execute(
+            "INSERT INTO gaps (timestamp, topic, customer_id, record) VALUES (?, ?, ?, ?)",
+            (
+                gap_record.get("timestamp"),
+                gap_record.get("topic"),
+                gap_record.get("customer_id"),
+                json.dumps(gap_record),
+            )
+        )
+        return cursor.lastrowid
+    
+    def _import_legacy_jsonl(self):
+        if self.legacy_jsonl is None or not self.legacy_jsonl.exists():
+            return
+        conn = self._connection()
+        with self._write(conn):
+            # Another worker may have imported it while we waited for the lock
+            done = conn.execute("SELECT value FROM gap_store_meta WHERE key = 'legacy_jsonl_imported'").fetchone()
+            if done is None and self.legacy_jsonl.exists():
+                with open(self.legacy_jsonl, "r") as f:
+                    for line in f:
+                        if line.strip():
+                            self._insert(conn, json.loads(line))
+                conn.execute(
+                    "INSERT INTO gap_store_meta (key, value) VALUES ('legacy_jsonl_imported', ?)",
+                    (datetime.utcnow().isoformat() + "Z",)
+                )
+                imported = True
+            else:
+                imported = False
+        if imported:
+            self.legacy_jsonl.rename(self.legacy_jsonl.with_name(self.legacy_jsonl.name + ".imported"))
+    
+    @staticmethod
+    def _row_to_gap(row: sqlite3.Row) -> Dict:
+        return {**json.loads(row["record"]), "id": row["id"]}
+    
+    def append(self, gap_record: Dict) -> Tuple[int, int]:
+        """Store a gap; returns (gap id, open gaps including this one)."""
+        conn = self._connection()
+        with self._write(conn):
+            gap_id = self._insert(conn, gap_record)
+            open_count = conn.execute("SELECT value FROM gap_counters WHERE name = 'open'").fetchone()[0]
+        return gap_id, open_count
+    
+    def count(self, include_resolved: bool = False) -> int:
+        """Open (or all) gaps, read from the trigger-maintained counter."""
+        row = self._connection().execute(
+            "SELECT value FROM gap_counters WHERE name = ?",
+            ("total" if include_resolved else "open",)
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def tail(self, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """
+        Open gaps, oldest first, ending `offset` gaps before the newest
+        (offset=0 is the most recent `limit` gaps).
+        """
+        rows = self._connection().execute(
+            """
+            SELECT id, record FROM gaps
+            WHERE resolved_at IS NULL
+            ORDER BY id DESC
+            LIMIT ? OFFSET ?
+            """,
+            (limit, offset)
+        ).fetchall()
+        return [self._row_to_gap(row) for row in reversed(rows)]
+    
+    def resolve(self, gap_id: Optional[int] = None, timestamp: Optional[str] = None, notes: Optional[str] = None) -> int:
+        """Mark open gaps resolved by id or by timestamp; returns rows updated."""
+        if (gap_id is None) == (timestamp is None):
+            raise ValueError("Pass exactly one of gap_id or timestamp")
+        column, value = ("id", gap_id) if gap_id is not None else ("timestamp", timestamp)
+        conn = self._connection()
+        with self._write(conn):
+            cursor = conn.execute(
+                f"""
+                UPDATE gaps SET resolved_at = ?, resolution_notes = ?
+                WHERE {column} = ? AND resolved_at IS NULL
+                """,
+                (datetime.utcnow().isoformat() + "Z", notes, value)
+            )
+        return cursor.rowcount
+    
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def format_slack_message(gap_record: Dict, queue_position: Optional[int] = None) -> str:
+    """Format one production gap as a Slack message"""
+    customer = gap_record.get("customer_id", "unknown")
+    topic = gap_record.get("topic")
+    keywords = ", ".join(gap_record.get("keywords", []))
+    context = gap_record.get("query_context", "N/A")
+    
+    return (
+        f"🔍 *Knowledge Gap Detected in Production*\n\n"
+        f"*Customer:* {customer}\n"
+        f"*Topic:* {topic}\n"
+        f"*Keywords:* {keywords}\n"
+        f"*Query:* {context}\n\n"
+        f"*Action Required:* Review and consider ingesting sources for this topic.\n"
+        f"*Queue Position:* {queue_position if queue_position is not None else 'N/A'}\n"
+        f"*View Queue:* `python3 scripts/automation/knowledge_gap_manager.py --view-queue`"
+    )
+
+
+def format_slack_digest(entries: List[Tuple[Dict, Optional[int]]]) -> str:
+    """Format (gap_record, queue_position) pairs as one Slack message"""
+    if len(entries) == 1:
+        return format_slack_message(*entries[0])
+    
+    lines = [f"🔍 *{len(entries)} Knowledge Gaps Detected in Production*\n"]
+    for gap_record, _ in entries:
+        keywords = ", ".join(gap_record.get("keywords", []))
+        lines.append(
+            f"• *{gap_record.get('topic')}* ({keywords}) - customer {gap_record.get('customer_id', 'unknown')}"
+        )
+    positions = [position for _, position in entries if position is not None]
+    lines.append(
+        f"\n*Action Required:* Review and consider ingesting sources for these topics.\n"
+        f"*Queue Size:* {max(positions) if positions else 'N/A'}\n"
+        f"*View Queue:* `python3 scripts/automation/knowledge_gap_manager.py --view-queue`"
+    )
+    return "\n".join(lines)
+
+
+class CircuitBreaker:
+    """
+    Per-destination circuit breaker.
+    
+    After `failure_threshold` consecutive failures the circuit opens and
+    deliveries are held for `reset_timeout` seconds; then one trial
+    delivery is let through (half-open) and its outcome closes or
+    re-opens the circuit.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+    
+    @property
+    def retry_at(self) -> float:
+        """Monotonic time the next trial delivery is allowed."""
+        return self.opened_at + self.reset_timeout if self.state == "open" else time.monotonic()
+    
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() < self.retry_at:
+                return False
+            self.state = "half_open"
+        return True
+    
+    def record_success(self):
+        self.failures = 0
+        self.state = "closed"
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.opens += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class NotificationDispatcher:
+    """
+    Delivers production gap notifications from a background thread.
+    
+    submit() only enqueues, so request handlers never wait on Slack or the
+    dev API. The worker posts each gap to the dev API and batches gaps
+    into one Slack digest per `digest_interval`. Failed deliveries are
+    retried with jittered exponential backoff up to `max_attempts`, and
+    each destination has a CircuitBreaker so a dead webhook is not hit on
+    every retry. stats() reports backlog depth and delivery latency.
+    """
+    
+    _STOP = object()
+    
+    def __init__(
+        self,
+        slack_webhook: Optional[str] = None,
+        dev_api_endpoint: Optional[str] = None,
+        digest_interval: float = NOTIFY_DIGEST_SECONDS,
+        max_attempts: int = NOTIFY_MAX_ATTEMPTS,
+        max_queue: int = NOTIFY_QUEUE_SIZE,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        timeout: float = 5.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0
+    ):
+        self.slack_webhook = slack_webhook
+        self.dev_api_endpoint = dev_api_endpoint
+        self.digest_interval = digest_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._retries: List[Tuple[float, int, Dict]] = []  # heap of (due, seq, job)
+        self._sequence = itertools.count()
+        self._slack_buffer: List[Tuple[float, Dict, Optional[int]]] = []
+        self._slack_flush_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        
+        self.breakers = {
+            destination: CircuitBreaker(failure_threshold, reset_timeout)
+            for destination in ("slack", "dev_api")
+        }
+        self._delivered = {"slack": 0, "dev_api": 0}
+        self._failed = {"slack": 0, "dev_api": 0}
+        self._retried = {"slack": 0, "dev_api": 0}
+        self._dropped = 0
+        self._latency_count = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last: Optional[float] = None
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.slack_webhook or self.dev_api_endpoint)
+    
+    def submit(self, gap_record: Dict, queue_position: Optional[int] = None) -> bool:
+        """Queue a gap for delivery; False if the backlog is full."""
+        if not self.enabled:
+            return False
+        self.start()
+        try:
+            self._queue.put_nowait((time.monotonic(), gap_record, queue_position))
+            return True
+        except queue.Full:
+            self._dropped += 1
+            print(f"⚠️  Gap notification backlog full; dropped notification for {gap_record.get('topic')}")
+            return False
+    
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="gap-notifications", daemon=True)
+                self._thread.start()
+    
+    def stop(self, timeout: float = 10.0):
+        """Flush the digest, make a last attempt at pending deliveries, and stop."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+    
+    # Worker thread
+    
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self._seconds_until_due())
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item is self._STOP:
+                    stopping = True
+                else:
+                    self._accept(*item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            self._run_due(force=stopping)
+    
+    def _seconds_until_due(self) -> Optional[float]:
+        deadlines = [due for due, _, _ in self._retries[:1]]
+        if self._slack_flush_at is not None:
+            deadlines.append(self._slack_flush_at)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+    
+    def _schedule(self, job: Dict, due: float):
+        heapq.heappush(self._retries, (due, next(self._sequence), job))
+    
+    def _accept(self, enqueued_at: float, gap_record: Dict, queue_position: Optional[int]):
+        if self.dev_api_endpoint:
+            self._schedule(
+                {"destination": "dev_api", "payload": gap_record, "gaps": 1, "enqueued_at": enqueued_at, "attempts": 0},
+                enqueued_at
+            )
+        if self.slack_webhook:
+            if not self._slack_buffer:
+                self._slack_flush_at = enqueued_at + self.digest_interval
+            self._slack_buffer.append((enqueued_at, gap_record, queue_position))
+    
+    def _run_due(self, force: bool = False):
+        now = time.monotonic()
+        if self._slack_buffer and (force or now >= self._slack_flush_at):
+            entries, self._slack_buffer, self._slack_flush_at = self._slack_buffer, [], None
+            self._schedule(
+                {
+                    "destination": "slack",
+                    "payload": {"text": format_slack_digest([(gap, position) for _, gap, position in entries])},
+                    "gaps": len(entries),
+                    "enqueued_at": entries[0][0],
+                    "attempts": 0,
+                },
+                now
+            )
+        while self._retries and (force or self._retries[0][0] <= time.monotonic()):
+            _, _, job = heapq.heappop(self._retries)
+            self._deliver(job, final=force)
+    
+    def _url(self, destination: str) -> str:
+        if destination == "slack":
+            return self.slack_webhook
+        return f"{self.dev_api_endpoint}/knowledge-gaps"
+    
+    def _deliver(self, job: Dict, final: bool = False):
+        destination = job["destination"]
+        breaker = self.breakers[destination]
+        if not breaker.allow():
+            if final:
+                self._failed[destination] += job["gaps"]
+            else:
+                # Hold until the circuit half-opens; not counted as an attempt
+                self._schedule(job, breaker.retry_at)
+            return
+        
+        job["attempts"] += 1
+        try:
+            response = requests.post(self._url(destination), json=job["payload"], timeout=self.timeout)
+            delivered = 200 <= response.status_code < 300
+            error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            delivered = False
+            error = str(e)
+        
+        if delivered:
+            breaker.record_success()
+            latency = time.monotonic() - job["enqueued_at"]
+            self._delivered[destination] += job["gaps"]
+            self._latency_count += 1
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+            self._latency_last = latency
+            return
+        
+        breaker.record_failure()
+        if final or job["attempts"] >= self.max_attempts:
+            self._failed[destination] += job["gaps"]
+            print(f"⚠️  {destination} notification failed after {job['attempts']} attempts: {error}")
+            return
+        self._retried[destination] += 1
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (job["attempts"] - 1))
+        self._schedule(job, time.monotonic() + delay * random.uniform(0.5, 1.0))
+    
+    def stats(self) -> Dict:
+        """Backlog depth, delivery counters and latency."""
+        return {
+            "backlog": self._queue.qsize() + len(self._retries) + len(self._slack_buffer),
+            "queued": self._queue.qsize(),
+            "pending_retries": len(self._retries),
+            "digest_buffer": len(self._slack_buffer),
+            "dropped": self._dropped,
+            "delivered": dict(self._delivered),
+            "failed": dict(self._failed),
+            "retries": dict(self._retried),
+            "circuit": {destination: breaker.state for destination, breaker in self.breakers.items()},
+            "latency_seconds": {
+                "last": self._latency_last,
+                "avg": self._latency_total / self._latency_count if self._latency_count else None,
+                "max": self._latency_max,
+            },
+        }
+
+
+_catalogs: Dict[Path, SourcesCatalog] = {}
+_dispatchers: Dict[Tuple[Optional[str], Optional[str]], NotificationDispatcher] = {}
+_gap_manager: Optional["KnowledgeGapManager"] = None
+_shared_lock = threading.Lock()
+
+
+def get_sources_catalog(path: Path = SOURCES_FILE) -> SourcesCatalog:
+    """Process-wide SourcesCatalog for `path`."""
+    path = Path(path).resolve()
+    with _shared_lock:
+        if path not in _catalogs:
+            _catalogs[path] = SourcesCatalog(path)
+        return _catalogs[path]
+
+
+def get_notification_dispatcher(config: EnvironmentConfig) -> NotificationDispatcher:
+    """Process-wide dispatcher for the configured webhooks (flushed at exit)."""
+    key = (config.slack_webhook, config.dev_api_endpoint)
+    with _shared_lock:
+        if key not in _dispatchers:
+            dispatcher = NotificationDispatcher(*key)
+            atexit.register(dispatcher.stop)
+            _dispatchers[key] = dispatcher
+        return _dispatchers[key]
+
+
+def notification_stats() -> Dict:
+    """stats() of every dispatcher created in this process."""
+    with _shared_lock:
+        dispatchers = list(_dispatchers.values())
+    return {
+        "destinations": [
+            {"slack": bool(d.slack_webhook), "dev_api": bool(d.dev_api_endpoint), **d.stats()}
+            for d in dispatchers if d.enabled
+        ]
+    }
+
+
+def get_gap_manager() -> "KnowledgeGapManager":
+    """
+    Process-wide KnowledgeGapManager for request handlers (environment is
+    read once; sources.yaml changes are still picked up on the next call).
+    """
+    global _gap_manager
+    with _shared_lock:
+        manager = _gap_manager
+    if manager is None:
+        manager = KnowledgeGapManager()
+        with _shared_lock:
+            if _gap_manager is None:
+                _gap_manager = manager
+            manager = _gap_manager
+    return manager
+
+
 class KnowledgeGapManager:
     """Manages knowledge gaps with environment awareness"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        catalog: Optional[SourcesCatalog] = None,
+        queue: Optional[GapQueueStore] = None,
+        notifier: Optional[NotificationDispatcher] = None
+    ):
         self.config = EnvironmentConfig()
-        self.sources = self._load_sources()
+        self.notifier = notifier or get_notification_dispatcher(self.config)
+        self.catalog = catalog or get_sources_catalog()
+        self.catalog.get()
         
         # Ensure log directories exist
         GAPS_LOG.parent.mkdir(parents=True, exist_ok=True)
-        GAPS_QUEUE.parent.mkdir(parents=True, exist_ok=True)
+        self.queue = queue or GapQueueStore()
     
-    def _load_sources(self) -> Dict:
-        """Load current sources.yaml"""
-        with open(SOURCES_FILE, "r") as f:
-            return yaml.safe_load(f)
+    @property
+    def sources(self) -> Dict:
+        """Current sources.yaml (reloaded when the file changes)"""
+        return self.catalog.sources
     
     def detect_gap(
         self, 
@@ -117,26 +917,7 @@ class KnowledgeGapManager:
     
     def _find_matching_sources(self, keywords: List[str]) -> List[str]:
         """Find sources matching keywords"""
-        matching = []
-        
-        for source in self.sources.get("sources", []):
-            source_id = source.get("id")
-            name = source.get("name", "").lower()
-            tags = [tag.lower() for tag in source.get("metadata_tags", [])]
-            category = source.get("category", "").lower()
-            
-            # Calculate keyword match score
-            keyword_matches = sum(
-                1 for kw in keywords
-                if kw.lower() in name or
-                   kw.lower() in " ".join(tags) or
-                   kw.lower() in category
-            )
-            
-            if keyword_matches >= len(keywords) * 0.6:  # 60% match threshold
-                matching.append(source_id)
-        
-        return matching
+        return self.catalog.match_index.match(keywords, threshold=0.6)  # 60% match threshold
     
     def _handle_production_gap(self, gap_record: Dict) -> Dict:
         """
@@ -148,11 +929,11 @@ class KnowledgeGapManager:
         - NIST AI RMF: Human-in-loop governance
         """
         # 1. Log to production gaps queue
-        with open(GAPS_QUEUE, "a") as f:
-            f.write(json.dumps(gap_record) + "\n")
+        gap_id, queue_position = self.queue.append(gap_record)
+        gap_record = {**gap_record, "id": gap_id}
         
         # 2. Notify development team
-        notification_sent = self._notify_development_team(gap_record)
+        notification_sent = self._notify_development_team(gap_record, queue_position)
         
         # 3. Return customer-safe message
         return {
@@ -163,7 +944,7 @@ class KnowledgeGapManager:
                 "Our team will review and expand coverage in the next update."
             ),
             "notification_sent": notification_sent,
-            "queue_position": self._count_queue_items()
+            "queue_position": queue_position
         }
     
     def _handle_development_gap(self, gap_record: Dict) -> Dict:
@@ -199,44 +980,23 @@ class KnowledgeGapManager:
             "suggested_keywords": gap_record["keywords"]
         }
     
-    def _notify_development_team(self, gap_record: Dict) -> bool:
+    def _notify_development_team(self, gap_record: Dict, queue_position: Optional[int] = None) -> bool:
         """
         Notify development team about production knowledge gap
         
         Methods:
-        1. Slack webhook (if configured)
+        1. Slack webhook (if configured) - batched into a digest
         2. HTTP POST to dev API (if configured)
         3. Email alert (future)
+        
+        1 and 2 are queued for the background NotificationDispatcher so a
+        slow or failing webhook never delays the customer's request.
         """
         notifications_sent = []
         
-        # 1. Slack notification
-        if self.config.slack_webhook:
-            try:
-                message = self._format_slack_message(gap_record)
-                response = requests.post(
-                    self.config.slack_webhook,
-                    json={"text": message},
-                    timeout=5
-                )
-                if response.status_code == 200:
-                    notifications_sent.append("slack")
-            except Exception as e:
-                print(f"⚠️  Slack notification failed: {e}")
-        
-        # 2. Dev API notification
-        if self.config.dev_api_endpoint:
-            try:
-                response = requests.post(
-                    f"{self.config.dev_api_endpoint}/knowledge-gaps",
-                    json=gap_record,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5
-                )
-                if response.status_code in [200, 201]:
-                    notifications_sent.append("dev_api")
-            except Exception as e:
-                print(f"⚠️  Dev API notification failed: {e}")
+        # 1-2. Slack / dev API notifications (background delivery with retries)
+        if self.notifier.submit(gap_record, queue_position):
+            notifications_sent.append("queued")
         
         # 3. File-based notification (always works)
         try:
@@ -252,59 +1012,31 @@ class KnowledgeGapManager:
         
         return len(notifications_sent) > 0
     
-    def _format_slack_message(self, gap_record: Dict) -> str:
+    def _format_slack_message(self, gap_record: Dict, queue_position: Optional[int] = None) -> str:
         """Format production gap as Slack message"""
-        customer = gap_record.get("customer_id", "unknown")
-        topic = gap_record.get("topic")
-        keywords = ", ".join(gap_record.get("keywords", []))
-        context = gap_record.get("query_context", "N/A")
-        
-        return (
-            f"🔍 *Knowledge Gap Detected in Production*\n\n"
-            f"*Customer:* {customer}\n"
-            f"*Topic:* {topic}\n"
-            f"*Keywords:* {keywords}\n"
-            f"*Query:* {context}\n\n"
-            f"*Action Required:* Review and consider ingesting sources for this topic.\n"
-            f"*Queue Position:* {self._count_queue_items()}\n"
-            f"*View Queue:* `cat logs/production_gaps_queue.jsonl`"
-        )
+        if queue_position is None:
+            queue_position = self._count_queue_items()
+        return format_slack_message(gap_record, queue_position)
     
     def _count_queue_items(self) -> int:
         """Count items in production gaps queue"""
-        try:
-            with open(GAPS_QUEUE, "r") as f:
-                return sum(1 for _ in f)
-        except FileNotFoundError:
-            return 0
+        return self.queue.count()
     
-    def get_production_gaps(self, limit: int = 50) -> List[Dict]:
-        """Retrieve production gaps for dev team review"""
-        try:
-            with open(GAPS_QUEUE, "r") as f:
-                gaps = [json.loads(line) for line in f]
-            return gaps[-limit:]  # Most recent N gaps
-        except FileNotFoundError:
-            return []
+    def get_production_gaps(self, limit: int = 50, offset: int = 0) -> List[Dict]:
+        """Retrieve production gaps for dev team review (most recent N, oldest first)"""
+        return self.queue.tail(limit=limit, offset=offset)
     
-    def mark_gap_resolved(self, gap_timestamp: str):
+    def mark_gap_resolved(self, gap: str, notes: Optional[str] = None):
         """
         Mark a gap as resolved (source ingested in dev)
-        Removes from queue
+        Removes from queue. `gap` is a gap id or its timestamp.
         """
         try:
-            with open(GAPS_QUEUE, "r") as f:
-                gaps = [json.loads(line) for line in f]
-            
-            # Filter out resolved gap
-            remaining = [g for g in gaps if g.get("timestamp") != gap_timestamp]
-            
-            # Rewrite queue
-            with open(GAPS_QUEUE, "w") as f:
-                for gap in remaining:
-                    f.write(json.dumps(gap) + "\n")
-            
-            return True
+            if isinstance(gap, int) or str(gap).isdigit():
+                resolved = self.queue.resolve(gap_id=int(gap), notes=notes)
+            else:
+                resolved = self.queue.resolve(timestamp=gap, notes=notes)
+            return resolved > 0
         except Exception as e:
             print(f"❌ Failed to mark gap resolved: {e}")
             return False
@@ -329,9 +1061,19 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--resolve",
-        metavar="TIMESTAMP",
+        metavar="ID_OR_TIMESTAMP",
         help="Mark gap as resolved"
     )
+    parser.add_argument(
+        "--notes",
+        help="Resolution notes (with --resolve)"
+    )
+    parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="Skip the N most recent gaps (with --view-queue)"
+    )
     parser.add_argument(
         "--config",
         action="store_true",
@@ -348,10 +1090,10 @@ if __name__ == "__main__":
         print(f"\n📊 Production Gaps in Queue: {manager._count_queue_items()}")
     
     elif args.view_queue:
-        gaps = manager.get_production_gaps()
-        print(f"📋 Production Knowledge Gaps ({len(gaps)} total)\n")
+        gaps = manager.get_production_gaps(offset=args.offset)
+        print(f"📋 Production Knowledge Gaps ({manager._count_queue_items()} open, showing {len(gaps)})\n")
         for i, gap in enumerate(gaps, 1):
-            print(f"{i}. {gap['topic']}")
+            print(f"{i}. {gap['topic']} (id {gap['id']})")
             print(f"   Keywords: {', '.join(gap['keywords'])}")
             print(f"   Customer: {gap.get('customer_id', 'N/A')}")
             print(f"   Time: {gap['timestamp']}")
@@ -367,7 +1109,7 @@ if __name__ == "__main__":
         print(json.dumps(result, indent=2))
     
     elif args.resolve:
-        if manager.mark_gap_resolved(args.resolve):
+        if manager.mark_gap_resolved(args.resolve, notes=args.notes):
             print(f"✅ Gap marked as resolved: {args.resolve}")
         else:
             print(f"❌ Failed to resolve gap")
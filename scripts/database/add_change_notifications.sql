@@ -0,0 +1,28 @@
+-- Change notifications for Knowledge Registry caches
+-- MCP servers LISTEN on knowledge_registry_changes to invalidate the search
+-- result cache and refresh the in-memory index whenever sources or
+-- categories change. Statement-level triggers: a bulk load or promotion sends
+-- one notification per statement; NOTIFY is delivered on commit and duplicate
+-- payloads within a transaction are collapsed.
+-- Idempotent: safe to re-run.
+
+CREATE OR REPLACE FUNCTION notify_knowledge_registry_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('knowledge_registry_changes', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_sources_change ON sources;
+CREATE TRIGGER notify_sources_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON sources
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_registry_change();
+
+DROP TRIGGER IF EXISTS notify_categories_change ON categories;
+CREATE TRIGGER notify_categories_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_registry_change();
+
+-- Verify
+SELECT tgname, tgrelid::regclass AS table_name
+FROM pg_trigger
+WHERE tgname IN ('notify_sources_change', 'notify_categories_change');
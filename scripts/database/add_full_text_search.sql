@@ -0,0 +1,77 @@
+-- Full-text search for query_knowledge_base
+-- Replaces the LOWER(col) LIKE '%kw%' chain (sequential scan) with a weighted
+-- tsvector + GIN index queried via websearch_to_tsquery.
+-- Weights: name (A) > description (B) > category (C) > tags (D)
+--
+-- search_vector is trigger-maintained rather than a GENERATED column because
+-- it includes the category name, which lives in another table.
+-- Idempotent: safe to re-run.
+
+CREATE OR REPLACE FUNCTION build_source_search_vector(
+    p_name TEXT,
+    p_description TEXT,
+    p_category TEXT,
+    p_tags TEXT[]
+)
+RETURNS TSVECTOR AS $$
+    SELECT
+        setweight(to_tsvector('english', COALESCE(p_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(p_description, '')), 'B') ||
+        setweight(to_tsvector('english', replace(COALESCE(p_category, ''), '_', ' ')), 'C') ||
+        setweight(to_tsvector('english', COALESCE(array_to_string(p_tags, ' '), '')), 'D');
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE sources ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- Source writes keep their own vector current
+CREATE OR REPLACE FUNCTION maintain_source_search_vector()
+RETURNS TRIGGER AS $$
+DECLARE
+    category_text TEXT;
+BEGIN
+    SELECT c.name || ' ' || c.display_name INTO category_text
+    FROM categories c
+    WHERE c.id = NEW.category_id;
+    
+    NEW.search_vector = build_source_search_vector(NEW.name, NEW.description, category_text, NEW.tags);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS maintain_search_vector ON sources;
+CREATE TRIGGER maintain_search_vector BEFORE INSERT OR UPDATE OF name, description, tags, category_id ON sources
+    FOR EACH ROW EXECUTE FUNCTION maintain_source_search_vector();
+
+-- Category renames re-weight every source in the category
+CREATE OR REPLACE FUNCTION refresh_category_search_vectors()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE sources s SET
+        search_vector = build_source_search_vector(s.name, s.description, NEW.name || ' ' || NEW.display_name, s.tags)
+    WHERE s.category_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS refresh_category_search_vectors_trigger ON categories;
+CREATE TRIGGER refresh_category_search_vectors_trigger AFTER UPDATE OF name, display_name ON categories
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.display_name IS DISTINCT FROM NEW.display_name)
+    EXECUTE FUNCTION refresh_category_search_vectors();
+
+-- Backfill existing rows
+UPDATE sources s SET
+    search_vector = build_source_search_vector(s.name, s.description, c.name || ' ' || c.display_name, s.tags)
+FROM categories c
+WHERE c.id = s.category_id;
+
+CREATE INDEX IF NOT EXISTS idx_sources_search_vector ON sources USING GIN(search_vector);
+
+ANALYZE sources;
+
+-- Verify: every source has a vector and the planner uses the GIN index
+SELECT COUNT(*) AS sources_without_vector FROM sources WHERE search_vector IS NULL;
+
+EXPLAIN
+SELECT id FROM sources
+WHERE search_vector @@ websearch_to_tsquery('english', 'FAR subcontracting');
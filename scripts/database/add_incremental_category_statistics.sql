@@ -0,0 +1,120 @@
+-- Incremental category statistics
+-- Replaces the per-row maintain_category_statistics() trigger, which re-counted
+-- the whole category six times for every inserted/updated/deleted source, with
+-- statement-level triggers that apply +1/-1 deltas from the transition tables:
+-- a bulk load touches each affected category row once per statement, and the
+-- cost no longer depends on category size. recalculate_category_statistics()
+-- rebuilds the counters from scratch (run below to establish the baseline;
+-- re-run to repair drift after restores or manual edits with triggers disabled).
+-- Idempotent: safe to re-run.
+
+-- Per-row triggers from schema.sql, create_priority_1_triggers.py and schema v1
+DROP TRIGGER IF EXISTS maintain_category_stats ON sources;
+DROP TRIGGER IF EXISTS update_category_stats ON sources;
+DROP TRIGGER IF EXISTS maintain_category_counts ON sources;
+
+CREATE OR REPLACE FUNCTION maintain_category_statistics()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+BEGIN
+    -- Transition tables: new_rows (INSERT/UPDATE), old_rows (UPDATE/DELETE)
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT category_id, epistemological_dimension, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT category_id, epistemological_dimension, -1 AS delta FROM old_rows'
+        ELSE
+            'SELECT category_id, epistemological_dimension, 1 AS delta FROM new_rows
+             UNION ALL
+             SELECT category_id, epistemological_dimension, -1 AS delta FROM old_rows'
+    END;
+
+    -- Categories whose deltas net to zero (updates that move no source) are not written
+    EXECUTE format($sql$
+        UPDATE categories c SET
+            total_sources = c.total_sources + d.total_delta,
+            theory_sources = c.theory_sources + d.theory_delta,
+            practice_sources = c.practice_sources + d.practice_delta,
+            history_sources = c.history_sources + d.history_delta,
+            current_sources = c.current_sources + d.current_delta,
+            future_sources = c.future_sources + d.future_delta
+        FROM (
+            SELECT category_id,
+                   SUM(delta) AS total_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'theory'), 0) AS theory_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'practice'), 0) AS practice_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'history'), 0) AS history_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'current'), 0) AS current_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'future'), 0) AS future_delta
+            FROM (%s) changes
+            GROUP BY category_id
+        ) d
+        WHERE c.id = d.category_id
+          AND (d.total_delta, d.theory_delta, d.practice_delta,
+               d.history_delta, d.current_delta, d.future_delta) <> (0, 0, 0, 0, 0, 0)
+    $sql$, changes);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS maintain_category_stats_insert ON sources;
+CREATE TRIGGER maintain_category_stats_insert AFTER INSERT ON sources
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_category_statistics();
+
+DROP TRIGGER IF EXISTS maintain_category_stats_update ON sources;
+CREATE TRIGGER maintain_category_stats_update AFTER UPDATE ON sources
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_category_statistics();
+
+DROP TRIGGER IF EXISTS maintain_category_stats_delete ON sources;
+CREATE TRIGGER maintain_category_stats_delete AFTER DELETE ON sources
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_category_statistics();
+
+-- Full recount in one pass over sources; returns the number of categories corrected
+CREATE OR REPLACE FUNCTION recalculate_category_statistics()
+RETURNS INTEGER AS $$
+DECLARE
+    corrected INTEGER;
+BEGIN
+    UPDATE categories c SET
+        total_sources = COALESCE(s.total_count, 0),
+        theory_sources = COALESCE(s.theory_count, 0),
+        practice_sources = COALESCE(s.practice_count, 0),
+        history_sources = COALESCE(s.history_count, 0),
+        current_sources = COALESCE(s.current_count, 0),
+        future_sources = COALESCE(s.future_count, 0)
+    FROM categories c2
+    LEFT JOIN (
+        SELECT category_id,
+               COUNT(*) AS total_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'theory') AS theory_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'practice') AS practice_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'history') AS history_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'current') AS current_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'future') AS future_count
+        FROM sources
+        GROUP BY category_id
+    ) s ON s.category_id = c2.id
+    WHERE c.id = c2.id
+      AND (c.total_sources, c.theory_sources, c.practice_sources,
+           c.history_sources, c.current_sources, c.future_sources)
+          IS DISTINCT FROM
+          (COALESCE(s.total_count, 0), COALESCE(s.theory_count, 0), COALESCE(s.practice_count, 0),
+           COALESCE(s.history_count, 0), COALESCE(s.current_count, 0), COALESCE(s.future_count, 0));
+
+    GET DIAGNOSTICS corrected = ROW_COUNT;
+    RETURN corrected;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT recalculate_category_statistics() AS categories_corrected;
+
+-- Verify
+SELECT tgname, tgrelid::regclass AS table_name
+FROM pg_trigger
+WHERE tgname LIKE 'maintain_category_stats%';
@@ -0,0 +1,79 @@
+-- Materialized knowledge graph summary
+-- knowledge_graph_summary joined concepts, relationships and use cases onto
+-- sources at once, so each source expanded to concepts x relationships x use
+-- cases rows before COUNT(DISTINCT ...) (and AVG(relevance_score) was weighted
+-- by that fan-out). Each child table is now aggregated per source first and
+-- joined 1:1. knowledge_graph_summary_mv materializes the view; its unique
+-- index on source_id allows REFRESH MATERIALIZED VIEW CONCURRENTLY, so readers
+-- are never blocked. Writes to the graph tables notify knowledge_graph_changes;
+-- the MCP server's debounced refresher (GRAPH_SUMMARY_REFRESH_ENABLED) listens
+-- there and on knowledge_registry_changes (sources) and refreshes the view.
+-- cited_by_count comes from source_counter_totals, so run add_source_counters.sql
+-- first (it drops sources.cited_by_count).
+-- Idempotent: safe to re-run.
+
+CREATE OR REPLACE VIEW knowledge_graph_summary AS
+SELECT
+    s.id as source_id,
+    s.name as source_name,
+    s.category_id,
+    COALESCE(c.concept_count, 0) as concept_count,
+    COALESCE(r.relationship_count, 0) as relationship_count,
+    COALESCE(u.use_case_count, 0) as use_case_count,
+    c.avg_concept_relevance,
+    COALESCE(t.cited_by_count, 0) as cited_by_count,
+    s.difficulty_level,
+    c.key_concepts
+FROM sources s
+LEFT JOIN (
+    SELECT source_id,
+           COUNT(*) as concept_count,
+           AVG(relevance_score) as avg_concept_relevance,
+           ARRAY_AGG(DISTINCT concept_name) FILTER (WHERE relevance_score > 0.7) as key_concepts
+    FROM source_concepts
+    GROUP BY source_id
+) c ON c.source_id = s.id
+LEFT JOIN (
+    SELECT source_id, COUNT(*) as relationship_count
+    FROM source_relationships
+    GROUP BY source_id
+) r ON r.source_id = s.id
+LEFT JOIN (
+    SELECT source_id, COUNT(*) as use_case_count
+    FROM source_use_cases
+    GROUP BY source_id
+) u ON u.source_id = s.id
+LEFT JOIN source_counter_totals t ON t.source_id = s.id;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS knowledge_graph_summary_mv AS
+SELECT * FROM knowledge_graph_summary;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_knowledge_graph_summary_mv_source ON knowledge_graph_summary_mv(source_id);
+CREATE INDEX IF NOT EXISTS idx_knowledge_graph_summary_mv_category ON knowledge_graph_summary_mv(category_id);
+
+CREATE OR REPLACE FUNCTION notify_knowledge_graph_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('knowledge_graph_changes', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_source_concepts_change ON source_concepts;
+CREATE TRIGGER notify_source_concepts_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON source_concepts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_graph_change();
+
+DROP TRIGGER IF EXISTS notify_source_relationships_change ON source_relationships;
+CREATE TRIGGER notify_source_relationships_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON source_relationships
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_graph_change();
+
+DROP TRIGGER IF EXISTS notify_source_use_cases_change ON source_use_cases;
+CREATE TRIGGER notify_source_use_cases_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON source_use_cases
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_graph_change();
+
+-- Verify
+SELECT matviewname, ispopulated FROM pg_matviews WHERE matviewname = 'knowledge_graph_summary_mv';
+SELECT tgname, tgrelid::regclass AS table_name
+FROM pg_trigger
+WHERE tgname IN ('notify_source_concepts_change', 'notify_source_relationships_change', 'notify_source_use_cases_change');
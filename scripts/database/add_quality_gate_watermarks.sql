@@ -0,0 +1,62 @@
+-- Incremental quality-gate runs (scripts/validation/quality_gates.py)
+-- quality_gate_watermarks records, per validation layer, the point up to which
+-- every source has a current row in source_validations. The next run only
+-- re-evaluates sources changed since then and merges the latest logged rows for
+-- the rest. source_relationship_changes records which sources gained or lost
+-- supporting relationships (source_relationships has no updated_at and deletes
+-- leave nothing behind); the validator prunes rows older than its watermark.
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS quality_gate_watermarks (
+    layer VARCHAR(50) PRIMARY KEY,
+    validated_through TIMESTAMPTZ NOT NULL,
+    validated_year INTEGER NOT NULL,
+    params JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS source_relationship_changes (
+    related_source_id UUID NOT NULL,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_relationship_changes_changed_at ON source_relationship_changes(changed_at);
+CREATE INDEX IF NOT EXISTS idx_sources_updated_at ON sources(updated_at);
+CREATE INDEX IF NOT EXISTS idx_feedback_resolved_at ON source_feedback(resolved_at);
+-- Latest validation per (source, layer) for DISTINCT ON merges
+CREATE INDEX IF NOT EXISTS idx_validations_latest ON source_validations(source_id, validation_type, created_at DESC);
+
+CREATE OR REPLACE FUNCTION record_relationship_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO source_relationship_changes (related_source_id)
+        SELECT DISTINCT related_source_id FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO source_relationship_changes (related_source_id)
+        SELECT DISTINCT related_source_id FROM old_rows;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS record_relationship_inserts ON source_relationships;
+CREATE TRIGGER record_relationship_inserts AFTER INSERT ON source_relationships
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_relationship_changes();
+
+DROP TRIGGER IF EXISTS record_relationship_updates ON source_relationships;
+CREATE TRIGGER record_relationship_updates AFTER UPDATE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_relationship_changes();
+
+DROP TRIGGER IF EXISTS record_relationship_deletes ON source_relationships;
+CREATE TRIGGER record_relationship_deletes AFTER DELETE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_relationship_changes();
+
+-- Verify
+SELECT tgname, tgrelid::regclass AS table_name
+FROM pg_trigger
+WHERE tgname LIKE 'record_relationship_%';
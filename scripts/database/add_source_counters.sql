@@ -0,0 +1,207 @@
+-- Hot counters side table
+-- sources carries ~two dozen indexes (one of them on cited_by_count), so every
+-- counter bump was a non-HOT update: a new wide tuple plus an entry in every
+-- index. The volatile counters (cited_by_count, cross_reference_count and the
+-- new access_count) now live in source_counters: narrow rows with only the
+-- primary key index and free space left on each page (fillfactor 70), so bumps
+-- are HOT updates. Each backend writes its own shard row per source
+-- (pg_backend_pid() % 8), so concurrent writers don't queue on one row lock;
+-- compact_source_counters() periodically folds the shards back into shard 0
+-- (scripts/database/compact_source_counters.py).
+--
+-- Read totals from source_counter_totals (SOURCE_DETAILS_SQL and
+-- knowledge_graph_summary join it; knowledge_graph_summary_mv caches it).
+-- The old sources columns are backfilled into shard 0 and dropped, along with
+-- idx_sources_cited_by_count; views selecting s.* are recreated around the drop.
+-- scripts/database/benchmark_source_counters.py measures write amplification
+-- and index growth of both layouts.
+-- Idempotent: safe to re-run.
+
+CREATE TABLE IF NOT EXISTS source_counters (
+    source_id UUID NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    shard SMALLINT NOT NULL DEFAULT 0,
+    cited_by_count INTEGER NOT NULL DEFAULT 0,
+    cross_reference_count INTEGER NOT NULL DEFAULT 0,
+    access_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (source_id, shard)
+) WITH (fillfactor = 70);
+
+-- Shard written by the current backend
+CREATE OR REPLACE FUNCTION source_counter_shard()
+RETURNS SMALLINT AS $$
+    SELECT (pg_backend_pid() % 8)::smallint;
+$$ LANGUAGE sql STABLE;
+
+-- Add per-source deltas (NULL arrays count as zeros). Rows are upserted in
+-- source_id order so concurrent bumps on the same shard can't deadlock.
+CREATE OR REPLACE FUNCTION bump_source_counters(
+    source_ids UUID[],
+    cited_by_deltas INTEGER[] DEFAULT NULL,
+    cross_reference_deltas INTEGER[] DEFAULT NULL,
+    access_deltas INTEGER[] DEFAULT NULL
+)
+RETURNS VOID AS $$
+    INSERT INTO source_counters AS sc (source_id, shard, cited_by_count, cross_reference_count, access_count)
+    SELECT d.source_id, source_counter_shard(),
+           COALESCE(SUM(d.cited_by), 0), COALESCE(SUM(d.cross_reference), 0), COALESCE(SUM(d.access), 0)
+    FROM unnest(source_ids, cited_by_deltas, cross_reference_deltas, access_deltas)
+        AS d(source_id, cited_by, cross_reference, access)
+    WHERE d.source_id IS NOT NULL
+    GROUP BY d.source_id
+    ORDER BY d.source_id
+    ON CONFLICT (source_id, shard) DO UPDATE SET
+        cited_by_count = sc.cited_by_count + EXCLUDED.cited_by_count,
+        cross_reference_count = sc.cross_reference_count + EXCLUDED.cross_reference_count,
+        access_count = sc.access_count + EXCLUDED.access_count;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION record_source_access(source_ids UUID[])
+RETURNS VOID AS $$
+    SELECT bump_source_counters(source_ids, access_deltas => array_fill(1, ARRAY[cardinality(source_ids)]));
+$$ LANGUAGE sql;
+
+-- Fold shards 1..7 into shard 0. Returns the number of shard rows folded, or
+-- NULL if another compaction is running.
+CREATE OR REPLACE FUNCTION compact_source_counters()
+RETURNS INTEGER AS $$
+DECLARE
+    folded INTEGER;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('compact_source_counters')) THEN
+        RETURN NULL;
+    END IF;
+
+    -- Lock in the same order bump_source_counters() writes
+    PERFORM 1 FROM source_counters WHERE shard <> 0 ORDER BY source_id, shard FOR UPDATE;
+
+    WITH moved AS (
+        DELETE FROM source_counters WHERE shard <> 0
+        RETURNING source_id, cited_by_count, cross_reference_count, access_count
+    ), totals AS (
+        INSERT INTO source_counters AS sc (source_id, shard, cited_by_count, cross_reference_count, access_count)
+        SELECT source_id, 0, SUM(cited_by_count), SUM(cross_reference_count), SUM(access_count)
+        FROM moved
+        GROUP BY source_id
+        ORDER BY source_id
+        ON CONFLICT (source_id, shard) DO UPDATE SET
+            cited_by_count = sc.cited_by_count + EXCLUDED.cited_by_count,
+            cross_reference_count = sc.cross_reference_count + EXCLUDED.cross_reference_count,
+            access_count = sc.access_count + EXCLUDED.access_count
+    )
+    SELECT COUNT(*) INTO folded FROM moved;
+
+    RETURN folded;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE VIEW source_counter_totals AS
+SELECT
+    source_id,
+    GREATEST(SUM(cited_by_count), 0)::int as cited_by_count,
+    GREATEST(SUM(cross_reference_count), 0)::int as cross_reference_count,
+    GREATEST(SUM(access_count), 0)::bigint as access_count
+FROM source_counters
+GROUP BY source_id;
+
+-- Citation triggers (add_statement_citation_counts.sql) now bump the side table
+CREATE OR REPLACE FUNCTION apply_citation_count_deltas(source_ids UUID[], deltas INTEGER[])
+RETURNS VOID AS $$
+BEGIN
+    PERFORM bump_source_counters(source_ids, deltas);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move the existing counts and drop the columns (only while they still exist)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'sources' AND column_name = 'cited_by_count'
+    ) THEN
+        INSERT INTO source_counters (source_id, shard, cited_by_count, cross_reference_count)
+        SELECT id, 0, COALESCE(cited_by_count, 0), COALESCE(cross_reference_count, 0)
+        FROM sources
+        WHERE COALESCE(cited_by_count, 0) <> 0 OR COALESCE(cross_reference_count, 0) <> 0
+        ON CONFLICT (source_id, shard) DO NOTHING;
+
+        DROP MATERIALIZED VIEW IF EXISTS knowledge_graph_summary_mv;
+        DROP VIEW IF EXISTS knowledge_graph_summary;
+        DROP VIEW IF EXISTS active_sources;
+        DROP VIEW IF EXISTS production_sources;
+
+        -- Also drops idx_sources_cited_by_count and the >= 0 CHECKs
+        ALTER TABLE sources DROP COLUMN cited_by_count, DROP COLUMN IF EXISTS cross_reference_count;
+    END IF;
+END $$;
+
+CREATE OR REPLACE VIEW active_sources AS
+SELECT
+    s.*,
+    c.name as category_name,
+    c.display_name as category_display_name,
+    CASE
+        WHEN s.environment_flags->>'production' = 'true' THEN 'production'
+        WHEN s.environment_flags->>'staging' = 'true' THEN 'staging'
+        WHEN s.environment_flags->>'dev' = 'true' THEN 'dev'
+        ELSE 'unknown'
+    END as current_environment
+FROM sources s
+JOIN categories c ON s.category_id = c.id
+WHERE s.ingestion_status = 'completed'
+  AND s.validation_status != 'deprecated';
+
+CREATE OR REPLACE VIEW production_sources AS
+SELECT
+    s.*,
+    c.name as category_name,
+    c.display_name as category_display_name
+FROM sources s
+JOIN categories c ON s.category_id = c.id
+WHERE s.environment_flags->>'production' = 'true'
+  AND s.validation_status = 'validated'
+  AND s.approval_status = 'approved';
+
+CREATE OR REPLACE VIEW knowledge_graph_summary AS
+SELECT
+    s.id as source_id,
+    s.name as source_name,
+    s.category_id,
+    COALESCE(c.concept_count, 0) as concept_count,
+    COALESCE(r.relationship_count, 0) as relationship_count,
+    COALESCE(u.use_case_count, 0) as use_case_count,
+    c.avg_concept_relevance,
+    COALESCE(t.cited_by_count, 0) as cited_by_count,
+    s.difficulty_level,
+    c.key_concepts
+FROM sources s
+LEFT JOIN (
+    SELECT source_id,
+           COUNT(*) as concept_count,
+           AVG(relevance_score) as avg_concept_relevance,
+           ARRAY_AGG(DISTINCT concept_name) FILTER (WHERE relevance_score > 0.7) as key_concepts
+    FROM source_concepts
+    GROUP BY source_id
+) c ON c.source_id = s.id
+LEFT JOIN (
+    SELECT source_id, COUNT(*) as relationship_count
+    FROM source_relationships
+    GROUP BY source_id
+) r ON r.source_id = s.id
+LEFT JOIN (
+    SELECT source_id, COUNT(*) as use_case_count
+    FROM source_use_cases
+    GROUP BY source_id
+) u ON u.source_id = s.id
+LEFT JOIN source_counter_totals t ON t.source_id = s.id;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS knowledge_graph_summary_mv AS
+SELECT * FROM knowledge_graph_summary;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_knowledge_graph_summary_mv_source ON knowledge_graph_summary_mv(source_id);
+CREATE INDEX IF NOT EXISTS idx_knowledge_graph_summary_mv_category ON knowledge_graph_summary_mv(category_id);
+
+-- Verify
+SELECT relname, reloptions FROM pg_class WHERE relname = 'source_counters';
+SELECT COUNT(*) AS counter_rows, COUNT(DISTINCT source_id) AS sources_with_counters FROM source_counters;
+SELECT column_name FROM information_schema.columns
+WHERE table_name = 'sources' AND column_name IN ('cited_by_count', 'cross_reference_count');
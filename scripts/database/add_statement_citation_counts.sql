@@ -0,0 +1,159 @@
+-- Statement-level citation counts
+-- Replaces the per-row maintain_citation_counts() trigger, which issued one
+-- UPDATE sources per inserted/deleted source_relationships row, with
+-- statement-level triggers that aggregate the transition table by
+-- related_source_id and update each target once per statement (locked in id
+-- order so concurrent graph loads don't deadlock).
+--
+-- Deferred mode, for large graph loads split across many statements:
+--     SET LOCAL knowledge_registry.defer_citation_counts = 'on';
+-- Deltas are then queued in citation_count_deltas and applied once, at commit,
+-- by a deferred constraint trigger (SET CONSTRAINTS apply_deferred_citation_counts
+-- IMMEDIATE applies them early).
+-- Idempotent: safe to re-run.
+
+DROP TRIGGER IF EXISTS maintain_citation_counts_trigger ON source_relationships;
+
+-- Transient per-transaction state: UNLOGGED, emptied by every commit
+CREATE UNLOGGED TABLE IF NOT EXISTS citation_count_deltas (
+    txid BIGINT NOT NULL DEFAULT txid_current(),
+    source_id UUID NOT NULL,
+    delta INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_citation_count_deltas_txid ON citation_count_deltas(txid);
+
+CREATE UNLOGGED TABLE IF NOT EXISTS citation_count_flushes (
+    txid BIGINT PRIMARY KEY DEFAULT txid_current()
+);
+
+-- Add deltas[i] to the cited_by_count of source_ids[i] (ids distinct and sorted,
+-- so rows are locked in a consistent order). Once add_source_counters.sql has
+-- moved the counters to source_counters (and dropped sources.cited_by_count),
+-- re-running this migration keeps bumping the side table.
+DO $$
+BEGIN
+    IF to_regclass('source_counters') IS NOT NULL THEN
+        CREATE OR REPLACE FUNCTION apply_citation_count_deltas(source_ids UUID[], deltas INTEGER[])
+        RETURNS VOID AS $fn$
+        BEGIN
+            PERFORM bump_source_counters(source_ids, deltas);
+        END;
+        $fn$ LANGUAGE plpgsql;
+    ELSE
+        CREATE OR REPLACE FUNCTION apply_citation_count_deltas(source_ids UUID[], deltas INTEGER[])
+        RETURNS VOID AS $fn$
+        BEGIN
+            PERFORM 1 FROM sources WHERE id = ANY(source_ids) ORDER BY id FOR UPDATE;
+
+            UPDATE sources s
+            SET cited_by_count = GREATEST(s.cited_by_count + d.delta, 0)
+            FROM unnest(source_ids, deltas) AS d(source_id, delta)
+            WHERE s.id = d.source_id;
+        END;
+        $fn$ LANGUAGE plpgsql;
+    END IF;
+END $$;
+
+CREATE OR REPLACE FUNCTION maintain_citation_counts()
+RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+    source_ids UUID[];
+    deltas INTEGER[];
+BEGIN
+    -- Transition tables: new_rows (INSERT/UPDATE), old_rows (UPDATE/DELETE).
+    -- They are only visible to this function's own queries, so aggregate here.
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT related_source_id AS source_id, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT related_source_id AS source_id, -1 AS delta FROM old_rows'
+        ELSE
+            'SELECT related_source_id AS source_id, 1 AS delta FROM new_rows
+             UNION ALL
+             SELECT related_source_id AS source_id, -1 AS delta FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        SELECT array_agg(source_id ORDER BY source_id), array_agg(delta ORDER BY source_id)
+        FROM (
+            SELECT source_id, SUM(delta)::int AS delta
+            FROM (%s) changes
+            GROUP BY source_id
+            HAVING SUM(delta) <> 0
+        ) d
+    $sql$, changes) INTO source_ids, deltas;
+
+    IF source_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF current_setting('knowledge_registry.defer_citation_counts', true) = 'on' THEN
+        INSERT INTO citation_count_deltas (source_id, delta)
+        SELECT * FROM unnest(source_ids, deltas);
+        INSERT INTO citation_count_flushes DEFAULT VALUES ON CONFLICT (txid) DO NOTHING;
+    ELSE
+        PERFORM apply_citation_count_deltas(source_ids, deltas);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fires once per transaction that queued deltas (one flush row per txid)
+CREATE OR REPLACE FUNCTION apply_deferred_citation_counts()
+RETURNS TRIGGER AS $$
+DECLARE
+    source_ids UUID[];
+    deltas INTEGER[];
+BEGIN
+    SELECT array_agg(source_id ORDER BY source_id), array_agg(delta ORDER BY source_id)
+    INTO source_ids, deltas
+    FROM (
+        SELECT source_id, SUM(delta)::int AS delta
+        FROM citation_count_deltas
+        WHERE txid = NEW.txid
+        GROUP BY source_id
+        HAVING SUM(delta) <> 0
+    ) d;
+
+    IF source_ids IS NOT NULL THEN
+        PERFORM apply_citation_count_deltas(source_ids, deltas);
+    END IF;
+    DELETE FROM citation_count_deltas WHERE txid = NEW.txid;
+    DELETE FROM citation_count_flushes WHERE txid = NEW.txid;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS apply_deferred_citation_counts ON citation_count_flushes;
+CREATE CONSTRAINT TRIGGER apply_deferred_citation_counts AFTER INSERT ON citation_count_flushes
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION apply_deferred_citation_counts();
+
+-- Transition tables require one trigger per event
+DROP TRIGGER IF EXISTS maintain_citation_counts_insert ON source_relationships;
+CREATE TRIGGER maintain_citation_counts_insert AFTER INSERT ON source_relationships
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_citation_counts();
+
+DROP TRIGGER IF EXISTS maintain_citation_counts_update ON source_relationships;
+CREATE TRIGGER maintain_citation_counts_update AFTER UPDATE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_citation_counts();
+
+DROP TRIGGER IF EXISTS maintain_citation_counts_delete ON source_relationships;
+CREATE TRIGGER maintain_citation_counts_delete AFTER DELETE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_citation_counts();
+
+-- Verify
+SELECT tgname, tgrelid::regclass AS table_name
+FROM pg_trigger
+WHERE tgname LIKE 'maintain_citation_counts_%' OR tgname = 'apply_deferred_citation_counts';
+
+SELECT CASE WHEN prosrc LIKE '%bump_source_counters%' THEN 'source_counters' ELSE 'sources.cited_by_count' END
+    AS citation_counts_target
+FROM pg_proc
+WHERE proname = 'apply_citation_count_deltas';
@@ -0,0 +1,32 @@
+-- Semantic (vector) search for query_knowledge_base hybrid mode
+-- Adds a 384-dim pgvector embedding on sources with an HNSW cosine index.
+-- Requires pgvector >= 0.8.0 (hnsw.iterative_scan keeps recall when
+-- filters such as min_authority = 90 are applied inside the kNN query).
+-- Idempotent: safe to re-run. Populate with scripts/database/backfill_embeddings.py
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+ALTER TABLE sources ADD COLUMN IF NOT EXISTS embedding VECTOR(384);
+
+CREATE INDEX IF NOT EXISTS idx_sources_embedding_hnsw ON sources USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- Text edits invalidate the stored embedding (unless the same UPDATE supplies a new one)
+CREATE OR REPLACE FUNCTION invalidate_source_embedding()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF (NEW.name, NEW.description, NEW.tags) IS DISTINCT FROM (OLD.name, OLD.description, OLD.tags)
+       AND NEW.embedding IS NOT DISTINCT FROM OLD.embedding THEN
+        NEW.embedding = NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS invalidate_embedding ON sources;
+CREATE TRIGGER invalidate_embedding BEFORE UPDATE OF name, description, tags ON sources
+    FOR EACH ROW EXECUTE FUNCTION invalidate_source_embedding();
+
+-- Verify
+SELECT extversion AS pgvector_version FROM pg_extension WHERE extname = 'vector';
+SELECT COUNT(*) AS sources_without_embedding FROM sources WHERE embedding IS NULL;
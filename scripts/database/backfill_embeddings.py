@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Backfill sources.embedding for semantic (hybrid) search.
+
+This script:
+1. Finds sources whose embedding is NULL (new rows, or text edited since the
+   last run - the invalidate_embedding trigger resets it)
+2. Encodes name + description + tags with the configured EMBEDDING_PROVIDER
+3. Writes vectors back in batches (one UPDATE ... FROM VALUES per batch)
+
+Connection settings come from the same environment variables / Key Vault
+lookup as the Knowledge Registry MCP server (POSTGRES_HOST, POSTGRES_PASSWORD, ...).
+
+Usage:
+    python3 scripts/database/backfill_embeddings.py
+    python3 scripts/database/backfill_embeddings.py --all --batch-size 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from psycopg2.extras import execute_values
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "mcp_servers" / "knowledge_registry"))
+
+from db_operations import KnowledgeRegistryDB
+from embeddings import get_embedder, source_embedding_text, to_pgvector
+
+
+def backfill(db: KnowledgeRegistryDB, batch_size: int = 200, recompute_all: bool = False) -> int:
+    """Embed sources in batches; returns the number of rows updated."""
+    embedder = get_embedder()
+    where_sql = "TRUE" if recompute_all else "embedding IS NULL"
+    updated = 0
+    last_id = None
+
+    while True:
+        with db.connection() as conn:
+            with conn.cursor() as cur:
+                # Keyset pagination so --all terminates and NULL rows are not re-read
+                cur.execute(
+                    f"""
+                    SELECT id, name, description, tags
+                    FROM sources
+                    WHERE {where_sql} AND (%s::uuid IS NULL OR id > %s::uuid)
+                    ORDER BY id
+                    LIMIT %s
+                    """,
+                    (last_id, last_id, batch_size)
+                )
+                rows = cur.fetchall()
+                if not rows:
+                    break
+
+                vectors = embedder.embed_many([source_embedding_text(row) for row in rows])
+                execute_values(
+                    cur,
+                    """
+                    UPDATE sources s SET embedding = v.embedding::vector
+                    FROM (VALUES %s) AS v(id, embedding)
+                    WHERE s.id = v.id::uuid
+                    """,
+                    [(str(row['id']), to_pgvector(vector)) for row, vector in zip(rows, vectors)]
+                )
+            conn.commit()
+
+        updated += len(rows)
+        last_id = str(rows[-1]['id'])
+        print(f"   ✓ {updated} sources embedded")
+
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill source embeddings for hybrid search')
+    parser.add_argument('--batch-size', '-b', type=int, default=200, help='Rows per batch (default: 200)')
+    parser.add_argument('--all', action='store_true', help='Recompute every embedding (e.g. after changing provider)')
+    args = parser.parse_args()
+
+    db = KnowledgeRegistryDB()
+    embedder = get_embedder()
+    print(f"🧮 Embedding sources with provider '{embedder.name}' ({embedder.dimensions} dims)")
+
+    started = time.perf_counter()
+    try:
+        updated = backfill(db, batch_size=args.batch_size, recompute_all=args.all)
+    finally:
+        db.close()
+
+    print(f"\n✅ {updated} sources embedded in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
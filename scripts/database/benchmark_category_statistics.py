@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Category Statistics Trigger Benchmark
+Insert cost into categories of increasing size with the statement-level delta
+triggers (add_incremental_category_statistics.sql), optionally against the
+previous per-row trigger that re-counted the category six times per row.
+Everything runs in one transaction that is rolled back.
+
+Usage:
+    python3 scripts/database/benchmark_category_statistics.py
+    python3 scripts/database/benchmark_category_statistics.py --sizes 0 1000 10000 100000 --batch 200
+    python3 scripts/database/benchmark_category_statistics.py --legacy --report category_stats.json
+"""
+
+import os
+import sys
+import time
+import uuid
+import json
+import argparse
+import psycopg2
+from psycopg2.extras import execute_values
+
+DIMENSIONS = ['theory', 'practice', 'history', 'current', 'future']
+
+# Previous per-row implementation, installed only inside the benchmark transaction
+LEGACY_TRIGGER_SQL = """
+    CREATE FUNCTION legacy_category_statistics()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        UPDATE categories SET
+            total_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id),
+            theory_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'theory'),
+            practice_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'practice'),
+            history_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'history'),
+            current_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'current'),
+            future_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'future')
+        WHERE id = NEW.category_id;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    ALTER TABLE sources DISABLE TRIGGER maintain_category_stats_insert;
+    CREATE TRIGGER legacy_category_stats AFTER INSERT ON sources
+        FOR EACH ROW EXECUTE FUNCTION legacy_category_statistics();
+"""
+
+
+class CategoryStatisticsBenchmark:
+    """Benchmark category statistics maintenance on INSERT"""
+
+    def __init__(self, connection_string):
+        self.conn = psycopg2.connect(connection_string)
+        self.conn.autocommit = False
+        self.results = {}
+
+    def __del__(self):
+        if self.conn:
+            self.conn.close()
+
+    def create_category(self, cursor, size):
+        """Category pre-loaded with `size` sources in one INSERT ... SELECT"""
+        cursor.execute("""
+            INSERT INTO categories (name, display_name)
+            VALUES (%s, %s)
+            RETURNING id
+        """, (f'bench-{uuid.uuid4()}', f'Benchmark category ({size} sources)'))
+        category_id = cursor.fetchone()[0]
+
+        cursor.execute("""
+            INSERT INTO sources (category_id, name, url, source_type, epistemological_dimension)
+            SELECT %s, 'Preload ' || n, 'https://example.com/preload/' || n, 'expert',
+                   (%s::text[])[1 + n %% 5]
+            FROM generate_series(1, %s) AS n
+        """, (category_id, DIMENSIONS, size))
+        return category_id
+
+    def time_inserts(self, cursor, category_id, batch):
+        """(ms per row for single-row INSERTs, ms per row for one multi-row INSERT)"""
+        start = time.perf_counter()
+        for i in range(batch):
+            cursor.execute("""
+                INSERT INTO sources (category_id, name, url, source_type, epistemological_dimension)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (category_id, f'Row {i}', f'https://example.com/row/{uuid.uuid4()}', 'expert', DIMENSIONS[i % 5]))
+        single_ms = (time.perf_counter() - start) * 1000 / batch
+
+        rows = [
+            (category_id, f'Bulk {i}', f'https://example.com/bulk/{uuid.uuid4()}', 'expert', DIMENSIONS[i % 5])
+            for i in range(batch)
+        ]
+        start = time.perf_counter()
+        execute_values(cursor, """
+            INSERT INTO sources (category_id, name, url, source_type, epistemological_dimension)
+            VALUES %s
+        """, rows, page_size=batch)
+        bulk_ms = (time.perf_counter() - start) * 1000 / batch
+
+        return single_ms, bulk_ms
+
+    def check_counts(self, cursor, category_id):
+        """True if the maintained counters match a fresh COUNT(*)"""
+        cursor.execute("""
+            SELECT c.total_sources = (SELECT COUNT(*) FROM sources WHERE category_id = c.id)
+            FROM categories c WHERE c.id = %s
+        """, (category_id,))
+        return cursor.fetchone()[0]
+
+    def run(self, sizes, batch, legacy=False):
+        cursor = self.conn.cursor()
+        try:
+            categories = {size: self.create_category(cursor, size) for size in sizes}
+
+            variants = [('delta', None)]
+            if legacy:
+                variants.append(('legacy', LEGACY_TRIGGER_SQL))
+
+            for variant, setup_sql in variants:
+                if setup_sql:
+                    cursor.execute(setup_sql)
+                for size, category_id in categories.items():
+                    single_ms, bulk_ms = self.time_inserts(cursor, category_id, batch)
+                    self.results[f'{variant} @ {size} sources'] = {
+                        'variant': variant,
+                        'category_size': size,
+                        'single_row_ms': round(single_ms, 3),
+                        'multi_row_ms_per_row': round(bulk_ms, 3),
+                        'counts_correct': self.check_counts(cursor, category_id)
+                    }
+        finally:
+            cursor.close()
+            self.conn.rollback()  # Don't persist test data
+
+        return self.results
+
+    def print_report(self):
+        print(f"\n{'Variant':<10} {'Category size':>14} {'Single-row ms':>14} {'Multi-row ms/row':>17} {'Counts':>7}")
+        for result in self.results.values():
+            print(f"{result['variant']:<10} {result['category_size']:>14} {result['single_row_ms']:>14} "
+                  f"{result['multi_row_ms_per_row']:>17} {'ok' if result['counts_correct'] else 'WRONG':>7}")
+
+        delta = [r for r in self.results.values() if r['variant'] == 'delta']
+        if len(delta) > 1:
+            ratio = delta[-1]['single_row_ms'] / max(delta[0]['single_row_ms'], 1e-9)
+            print(f"\nDelta triggers: largest/smallest category single-row cost = {ratio:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark category statistics triggers')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 1000, 10000, 50000],
+                        help='Pre-loaded sources per category (default: 0 1000 10000 50000)')
+    parser.add_argument('--batch', type=int, default=100, help='Rows inserted per measurement (default: 100)')
+    parser.add_argument('--legacy', action='store_true', help='Also measure the previous per-row trigger')
+    parser.add_argument('--report', '-r', type=str, help='Save report to JSON file')
+    args = parser.parse_args()
+
+    conn_str = os.getenv('DATABASE_URL')
+    if not conn_str:
+        print("❌ DATABASE_URL not set (point it at a local or scratch database)")
+        sys.exit(1)
+
+    bench = CategoryStatisticsBenchmark(conn_str)
+    print(f"📊 Inserting {args.batch} rows into categories of {', '.join(map(str, args.sizes))} sources...")
+    bench.run(args.sizes, args.batch, legacy=args.legacy)
+    bench.print_report()
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(bench.results, f, indent=2)
+        print(f"📁 Report saved to: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
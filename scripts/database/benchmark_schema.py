@@ -117,6 +117,34 @@ class SchemaBenchmark:
             iterations=iterations
         )
     
+    def bench_knowledge_graph_summary_mv(self, iterations=10):
+        """Benchmark: SELECT from materialized knowledge_graph_summary_mv"""
+        return self.run_benchmark(
+            'SELECT from knowledge_graph_summary_mv',
+            'SELECT * FROM knowledge_graph_summary_mv LIMIT 100',
+            iterations=iterations
+        )
+    
+    def bench_knowledge_graph_summary_by_category(self, iterations=10):
+        """Benchmark: one category's graph summary, view vs materialized view"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT id FROM categories LIMIT 1")
+        category_id = cursor.fetchone()[0]
+        cursor.close()
+        
+        self.run_benchmark(
+            'knowledge_graph_summary by category',
+            'SELECT * FROM knowledge_graph_summary WHERE category_id = %s',
+            (category_id,),
+            iterations=iterations
+        )
+        return self.run_benchmark(
+            'knowledge_graph_summary_mv by category',
+            'SELECT * FROM knowledge_graph_summary_mv WHERE category_id = %s',
+            (category_id,),
+            iterations=iterations
+        )
+    
     # ========================================================================
     # WRITE BENCHMARKS
     # ========================================================================
@@ -310,6 +338,48 @@ class SchemaBenchmark:
             iterations=iterations
         )
     
+    def bench_keyword_like_search(self, iterations=10):
+        """Benchmark: Legacy LOWER(col) LIKE '%kw%' keyword search (sequential scan)"""
+        keywords = ['cybersecurity', 'compliance', 'dfars']
+        conditions = " OR ".join(
+            ["(LOWER(s.name) LIKE %s OR LOWER(s.description) LIKE %s OR LOWER(c.name) LIKE %s)"] * len(keywords)
+        )
+        params = tuple(p for kw in keywords for p in [f"%{kw}%"] * 3)
+        return self.run_benchmark(
+            'Keyword search (LIKE chain)',
+            f"""
+            SELECT s.id, s.name, s.authority_score
+            FROM sources s
+            JOIN categories c ON s.category_id = c.id
+            WHERE s.authority_score >= 50 AND ({conditions})
+            ORDER BY s.authority_score DESC, s.quality_score DESC
+            LIMIT 10
+            """,
+            params,
+            iterations=iterations
+        )
+    
+    def bench_full_text_search(self, iterations=10):
+        """Benchmark: Weighted tsvector search via GIN index (query_knowledge_base)"""
+        return self.run_benchmark(
+            'Full-text search (GIN + ts_rank_cd)',
+            """
+            SELECT s.id, s.name, s.authority_score,
+                   (0.6 * ts_rank_cd(s.search_vector, q.query, 32)
+                    + 0.25 * s.authority_score / 100.0
+                    + 0.15 * COALESCE(s.quality_score, 0) / 100.0) AS relevance
+            FROM sources s
+            JOIN categories c ON s.category_id = c.id,
+                 LATERAL (SELECT websearch_to_tsquery('english', %s)
+                             || websearch_to_tsquery('english', %s) AS query) q
+            WHERE s.search_vector @@ q.query AND s.authority_score >= 50
+            ORDER BY relevance DESC, s.authority_score DESC, s.quality_score DESC
+            LIMIT 10
+            """,
+            ('DFARS cybersecurity compliance', 'cybersecurity or compliance or dfars'),
+            iterations=iterations
+        )
+    
     def bench_relationship_traversal(self, iterations=10):
         """Benchmark: Knowledge graph relationship traversal"""
         # Get a source with relationships
@@ -485,6 +555,10 @@ def main():
     bench.bench_select_active_sources_view(iterations)
     bench.bench_select_vertical_completeness_view(iterations)
     bench.bench_knowledge_graph_summary_view(iterations)
+    bench.bench_knowledge_graph_summary_mv(iterations)
+    bench.bench_knowledge_graph_summary_by_category(iterations)
+    bench.bench_keyword_like_search(iterations)
+    bench.bench_full_text_search(iterations)
     
     print("\n✍️  Running WRITE benchmarks...")
     bench.bench_insert_source(iterations)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Source Counter Write Amplification Benchmark
+Applies the same stream of counter bumps to the old layout (a cited_by_count
+column and index on the wide sources row) and to the sharded source_counters
+side table (add_source_counters.sql), and reports per layout: HOT vs non-HOT
+updates, heap and index growth, and WAL bytes per bump. Everything runs in one
+transaction that is rolled back.
+
+Usage:
+    python3 scripts/database/benchmark_source_counters.py
+    python3 scripts/database/benchmark_source_counters.py --sources 1000 --bumps 20000 --report counters.json
+"""
+
+import os
+import sys
+import time
+import uuid
+import json
+import random
+import argparse
+import psycopg2
+
+# Old layout, recreated only inside the benchmark transaction
+LEGACY_COLUMN_SQL = """
+    ALTER TABLE sources ADD COLUMN IF NOT EXISTS legacy_cited_by_count INTEGER DEFAULT 0;
+    CREATE INDEX idx_sources_legacy_cited_by_count ON sources(legacy_cited_by_count);
+"""
+
+LAYOUTS = {
+    'sources column': (
+        'sources',
+        "UPDATE sources SET legacy_cited_by_count = legacy_cited_by_count + 1 WHERE id = %s"
+    ),
+    'source_counters': (
+        'source_counters',
+        "SELECT bump_source_counters(ARRAY[%s]::uuid[], ARRAY[1])"
+    ),
+}
+
+SNAPSHOT_SQL = """
+    SELECT pg_stat_get_xact_tuples_updated(%(table)s::regclass),
+           pg_stat_get_xact_tuples_hot_updated(%(table)s::regclass),
+           pg_relation_size(%(table)s::regclass),
+           pg_indexes_size(%(table)s::regclass),
+           (SELECT COUNT(*) FROM pg_index WHERE indrelid = %(table)s::regclass),
+           pg_current_wal_insert_lsn()
+"""
+
+
+class SourceCounterBenchmark:
+    """Benchmark counter bumps on sources vs source_counters"""
+
+    def __init__(self, connection_string):
+        self.conn = psycopg2.connect(connection_string)
+        self.conn.autocommit = False
+        self.results = {}
+
+    def __del__(self):
+        if self.conn:
+            self.conn.close()
+
+    def create_sources(self, cursor, count):
+        cursor.execute("""
+            INSERT INTO categories (name, display_name)
+            VALUES (%s, 'Counter benchmark')
+            RETURNING id
+        """, (f'bench-{uuid.uuid4()}',))
+        category_id = cursor.fetchone()[0]
+
+        cursor.execute("""
+            INSERT INTO sources (category_id, name, url, source_type, epistemological_dimension)
+            SELECT %s, 'Counter ' || n, 'https://example.com/counter/' || n, 'expert', 'theory'
+            FROM generate_series(1, %s) AS n
+            RETURNING id
+        """, (category_id, count))
+        return [str(row[0]) for row in cursor.fetchall()]
+
+    def snapshot(self, cursor, table):
+        cursor.execute(SNAPSHOT_SQL, {'table': table})
+        return cursor.fetchone()
+
+    def measure(self, cursor, layout, source_ids, bumps, seed):
+        table, bump_sql = LAYOUTS[layout]
+        stream = random.Random(seed)
+
+        before = self.snapshot(cursor, table)
+        start = time.perf_counter()
+        for _ in range(bumps):
+            cursor.execute(bump_sql, (stream.choice(source_ids),))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        after = self.snapshot(cursor, table)
+
+        cursor.execute("SELECT pg_wal_lsn_diff(%s::pg_lsn, %s::pg_lsn)", (after[5], before[5]))
+        wal_bytes = int(cursor.fetchone()[0])
+        updates = after[0] - before[0]
+        hot_updates = after[1] - before[1]
+
+        return {
+            'layout': layout,
+            'indexes': after[4],
+            'bumps': bumps,
+            'updates': updates,
+            'hot_updates': hot_updates,
+            'hot_percent': round(100.0 * hot_updates / updates, 1) if updates else None,
+            'heap_growth_bytes': after[2] - before[2],
+            'index_growth_bytes': after[3] - before[3],
+            'wal_bytes_per_bump': round(wal_bytes / bumps, 1),
+            'ms_per_bump': round(elapsed_ms / bumps, 3),
+        }
+
+    def run(self, sources, bumps, seed=42):
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(LEGACY_COLUMN_SQL)
+            source_ids = self.create_sources(cursor, sources)
+            # Give every source its counter row first, as a steady-state table would have
+            cursor.execute("SELECT bump_source_counters(%s::uuid[], array_fill(0, ARRAY[%s]))",
+                           (source_ids, len(source_ids)))
+            for layout in LAYOUTS:
+                self.results[layout] = self.measure(cursor, layout, source_ids, bumps, seed)
+        finally:
+            cursor.close()
+            self.conn.rollback()  # Don't persist test data or the legacy column
+
+        return self.results
+
+    def print_report(self):
+        print(f"\n{'Layout':<16} {'Indexes':>8} {'HOT %':>7} {'Heap +KB':>9} {'Index +KB':>10} "
+              f"{'WAL B/bump':>11} {'ms/bump':>8}")
+        for r in self.results.values():
+            print(f"{r['layout']:<16} {r['indexes']:>8} {str(r['hot_percent']):>7} "
+                  f"{r['heap_growth_bytes'] // 1024:>9} {r['index_growth_bytes'] // 1024:>10} "
+                  f"{r['wal_bytes_per_bump']:>11} {r['ms_per_bump']:>8}")
+
+        old, new = self.results.get('sources column'), self.results.get('source_counters')
+        if old and new and new['wal_bytes_per_bump']:
+            print(f"\nWAL per bump: {old['wal_bytes_per_bump'] / new['wal_bytes_per_bump']:.1f}x less with source_counters")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark counter write amplification')
+    parser.add_argument('--sources', type=int, default=1000, help='Sources receiving bumps (default: 1000)')
+    parser.add_argument('--bumps', type=int, default=10000, help='Counter bumps per layout (default: 10000)')
+    parser.add_argument('--report', '-r', type=str, help='Save report to JSON file')
+    args = parser.parse_args()
+
+    conn_str = os.getenv('DATABASE_URL')
+    if not conn_str:
+        print("❌ DATABASE_URL not set (point it at a local or scratch database)")
+        sys.exit(1)
+
+    bench = SourceCounterBenchmark(conn_str)
+    print(f"📊 {args.bumps} counter bumps over {args.sources} sources per layout...")
+    bench.run(args.sources, args.bumps)
+    bench.print_report()
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(bench.results, f, indent=2)
+        print(f"📁 Report saved to: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Source Counter Compaction
+Folds the per-backend shard rows of source_counters back into shard 0
+(compact_source_counters(), see add_source_counters.sql), keeping the table
+at roughly one row per source. Run once from cron, or with --interval as a
+long-running worker.
+
+Usage:
+    python3 scripts/database/compact_source_counters.py
+    python3 scripts/database/compact_source_counters.py --interval 300
+"""
+
+import os
+import sys
+import time
+import argparse
+import psycopg2
+
+
+def compact(conn):
+    """Shard rows folded, or None if another compaction held the lock"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT compact_source_counters()")
+        folded = cursor.fetchone()[0]
+    conn.commit()
+    return folded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact sharded source counters')
+    parser.add_argument('--interval', type=float, help='Repeat every N seconds instead of running once')
+    args = parser.parse_args()
+
+    conn_str = os.getenv('DATABASE_URL')
+    if not conn_str:
+        print("❌ DATABASE_URL not set")
+        sys.exit(1)
+
+    conn = psycopg2.connect(conn_str)
+    try:
+        while True:
+            started = time.perf_counter()
+            folded = compact(conn)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if folded is None:
+                print("⏭️  Another compaction is running, skipped")
+            else:
+                print(f"✅ Folded {folded} shard rows in {elapsed_ms:.1f} ms")
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@ Adds auto-calculation and statistics maintenance
 """
 
 import psycopg2
+from pathlib import Path
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
 
@@ -61,79 +62,10 @@ def main():
         """)
         print("   ✓ Complete\n")
         
-        # Trigger 2: Maintain category statistics
-        print("2. Creating maintain_category_stats trigger...")
-        cursor.execute("""
-            CREATE OR REPLACE FUNCTION maintain_category_stats()
-            RETURNS TRIGGER AS $$
-            BEGIN
-                IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
-                    UPDATE categories
-                    SET 
-                        theory_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = NEW.category_id 
-                            AND epistemological_dimension = 'theory'
-                            AND is_active = TRUE),
-                        practice_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = NEW.category_id 
-                            AND epistemological_dimension = 'practice'
-                            AND is_active = TRUE),
-                        history_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = NEW.category_id 
-                            AND epistemological_dimension = 'history'
-                            AND is_active = TRUE),
-                        current_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = NEW.category_id 
-                            AND epistemological_dimension = 'current'
-                            AND is_active = TRUE),
-                        future_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = NEW.category_id 
-                            AND epistemological_dimension = 'future'
-                            AND is_active = TRUE),
-                        total_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = NEW.category_id
-                            AND is_active = TRUE)
-                    WHERE id = NEW.category_id;
-                ELSIF TG_OP = 'DELETE' THEN
-                    UPDATE categories
-                    SET 
-                        theory_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = OLD.category_id 
-                            AND epistemological_dimension = 'theory'
-                            AND is_active = TRUE),
-                        practice_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = OLD.category_id 
-                            AND epistemological_dimension = 'practice'
-                            AND is_active = TRUE),
-                        history_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = OLD.category_id 
-                            AND epistemological_dimension = 'history'
-                            AND is_active = TRUE),
-                        current_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = OLD.category_id 
-                            AND epistemological_dimension = 'current'
-                            AND is_active = TRUE),
-                        future_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = OLD.category_id 
-                            AND epistemological_dimension = 'future'
-                            AND is_active = TRUE),
-                        total_sources = (SELECT COUNT(*) FROM sources 
-                            WHERE category_id = OLD.category_id
-                            AND is_active = TRUE)
-                    WHERE id = OLD.category_id;
-                END IF;
-                RETURN NULL;
-            END;
-            $$ LANGUAGE plpgsql;
-        """)
-        
-        cursor.execute("""
-            DROP TRIGGER IF EXISTS update_category_stats ON sources;
-            CREATE TRIGGER update_category_stats
-                AFTER INSERT OR UPDATE OR DELETE ON sources
-                FOR EACH ROW
-                EXECUTE FUNCTION maintain_category_stats();
-        """)
+        # Trigger 2: Maintain category statistics (statement-level deltas)
+        print("2. Creating maintain_category_stats triggers...")
+        with open(Path(__file__).parent / 'add_incremental_category_statistics.sql') as f:
+            cursor.execute(f.read())
         print("   ✓ Complete\n")
         
         conn.commit()
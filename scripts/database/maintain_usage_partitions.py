@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Usage Log Partition Maintenance
+Creates the upcoming monthly partitions of usage_tracking and
+connector_query_log and, with --retention-months, detaches months past
+retention into the usage_archive schema (partition_usage_tables.sql).
+Archived partitions can be dumped with pg_dump and dropped; the hourly and
+daily rollups keep their totals. Run daily from cron. If it stops running,
+inserts past the last partition land in <table>_default; the next run
+creates the missing months and moves those rows into them.
+
+Usage:
+    python3 scripts/database/maintain_usage_partitions.py
+    python3 scripts/database/maintain_usage_partitions.py --months-ahead 3 --retention-months 13
+    python3 scripts/database/maintain_usage_partitions.py --list
+"""
+
+import os
+import sys
+import argparse
+import psycopg2
+from psycopg2 import sql
+
+PARTITIONED_TABLES = ['usage_tracking', 'connector_query_log']
+
+
+def maintain(conn, months_ahead, retention_months=None):
+    """{table: {'created': [...], 'detached': [...], 'default_rows': n}}"""
+    results = {}
+    with conn.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            cursor.execute("SELECT * FROM create_monthly_partitions(%s, %s)", (table, months_ahead))
+            created = [row[0] for row in cursor.fetchall()]
+            detached = []
+            if retention_months is not None:
+                cursor.execute("SELECT * FROM detach_usage_partitions(%s, %s)", (table, retention_months))
+                detached = [row[0] for row in cursor.fetchall()]
+            results[table] = {'created': created, 'detached': detached,
+                              'default_rows': default_partition_rows(cursor, table)}
+    conn.commit()
+    return results
+
+
+def default_partition_rows(cursor, table):
+    """Rows left in the DEFAULT partition (dated past --months-ahead)."""
+    cursor.execute(
+        "SELECT partition_name FROM usage_partitions WHERE parent_table = %s AND is_default", (table,)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return 0
+    cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(row[0])))
+    return cursor.fetchone()[0]
+
+
+def list_partitions(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT parent_table, partition_name, range_start, range_end, pg_size_pretty(total_bytes), is_default
+            FROM usage_partitions
+            ORDER BY parent_table, is_default, range_end
+        """)
+        return cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain monthly usage log partitions')
+    parser.add_argument('--months-ahead', type=int, default=3,
+                        help='Months to create beyond the current one (default: 3)')
+    parser.add_argument('--retention-months', type=int,
+                        help='Detach partitions that ended more than N months ago (default: keep all)')
+    parser.add_argument('--list', action='store_true', help='List partitions and exit')
+    args = parser.parse_args()
+
+    conn_str = os.getenv('DATABASE_URL')
+    if not conn_str:
+        print("❌ DATABASE_URL not set")
+        sys.exit(1)
+
+    conn = psycopg2.connect(conn_str)
+    try:
+        if args.list:
+            for parent, partition, start, end, size, is_default in list_partitions(conn):
+                if is_default:
+                    start, end = 'DEFAULT', ''
+                print(f"{parent:<22} {partition:<34} {str(start or 'MINVALUE'):<26} {str(end):<26} {size:>10}")
+            return
+
+        results = maintain(conn, args.months_ahead, args.retention_months)
+        for table, changes in results.items():
+            print(f"✅ {table}: created {len(changes['created'])}, detached {len(changes['detached'])}")
+            for name in changes['created']:
+                print(f"   + {name}")
+            for name in changes['detached']:
+                print(f"   → usage_archive.{name}")
+            if changes['default_rows']:
+                print(f"   ⚠️  {changes['default_rows']} rows in {table}_default are past the created months")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,419 @@
+-- Monthly partitions and rollups for usage_tracking and connector_query_log
+-- Both logs grow with every query and were single heap tables, and
+-- customer_stats aggregated their full history on every read. Now:
+--
+-- * Both tables are range-partitioned by created_at, one partition per UTC
+--   month (<table>_YYYY_MM). The existing table is renamed <table>_legacy and
+--   attached as the partition for everything before the cutover month, so no
+--   rows are copied. create_monthly_partitions() creates the upcoming months.
+--   detach_usage_partitions() detaches months past retention into the
+--   usage_archive schema (dump, then drop). Run both from
+--   scripts/database/maintain_usage_partitions.py.
+-- * A DEFAULT partition (<table>_default) takes rows no monthly partition
+--   covers, so inserts don't fail when maintenance has not run for a while.
+--   The next create_monthly_partitions() creates the missing months and moves
+--   those rows into them. Until then, each partition attach scans the
+--   DEFAULT partition, so keep it small by running maintenance daily.
+-- * Hourly and daily rollups (usage_rollup_*, connector_rollup_*) are kept up
+--   to date by statement-level INSERT triggers, so a batched insert (or COPY)
+--   costs one upsert per customer and bucket. Both logs are append-only; rows
+--   are removed only by customer/connector deletion, which cascades to the
+--   rollups as well. Detaching a partition leaves its rollups in place.
+-- * customer_stats reads usage_rollup_daily instead of the raw rows.
+--
+-- Primary keys become (id, created_at), because a partitioned table's unique
+-- keys must include the partition key. Write through the parent tables: the
+-- rollup triggers are statement triggers on the parents.
+-- Idempotent: safe to re-run.
+
+CREATE SCHEMA IF NOT EXISTS usage_archive;
+
+-- First instant of the UTC month `months` after the one containing ts
+CREATE OR REPLACE FUNCTION usage_month_start(ts TIMESTAMPTZ, months INTEGER DEFAULT 0)
+RETURNS TIMESTAMPTZ AS $$
+    SELECT (date_trunc('month', ts AT TIME ZONE 'UTC') + make_interval(months => months)) AT TIME ZONE 'UTC';
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Partitions of the usage logs with their ranges (NULL = MINVALUE; the DEFAULT
+-- partition has no range)
+CREATE OR REPLACE VIEW usage_partitions AS
+SELECT
+    parent.relname::text as parent_table,
+    child.relname::text as partition_name,
+    (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'FROM \(''([^'']+)''\)'))[1]::timestamptz as range_start,
+    (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'TO \(''([^'']+)''\)'))[1]::timestamptz as range_end,
+    pg_total_relation_size(child.oid) as total_bytes,
+    pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT' as is_default
+FROM pg_inherits i
+JOIN pg_class parent ON parent.oid = i.inhparent
+JOIN pg_class child ON child.oid = i.inhrelid
+WHERE parent.relname IN ('usage_tracking', 'connector_query_log');
+
+-- Create monthly partitions through months_ahead months after the current one,
+-- skipping months an existing partition already covers. Months missed while
+-- maintenance was not running are created too, and rows that landed in the
+-- DEFAULT partition meanwhile are moved into their month (attaching a range
+-- that DEFAULT still holds rows for would fail).
+CREATE OR REPLACE FUNCTION create_monthly_partitions(table_name TEXT, months_ahead INTEGER DEFAULT 3)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    covered TIMESTAMPTZ;
+    default_partition TEXT;
+    month_start TIMESTAMPTZ;
+    month_end TIMESTAMPTZ;
+    partition_name TEXT;
+BEGIN
+    SELECT MAX(p.range_end) INTO covered FROM usage_partitions p WHERE p.parent_table = table_name;
+    SELECT p.partition_name INTO default_partition FROM usage_partitions p
+    WHERE p.parent_table = table_name AND p.is_default;
+
+    month_start := LEAST(COALESCE(covered, usage_month_start(now())), usage_month_start(now()));
+    WHILE month_start < usage_month_start(now(), months_ahead + 1) LOOP
+        month_end := usage_month_start(month_start, 1);
+        IF covered IS NULL OR month_start >= covered THEN
+            partition_name := table_name || '_' || to_char(month_start AT TIME ZONE 'UTC', 'YYYY_MM');
+            IF default_partition IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                               partition_name, table_name, month_start, month_end);
+            ELSE
+                -- Moved rows were rolled up when first inserted; the rollup
+                -- triggers are on the parent, so the move doesn't count them again
+                EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                               partition_name, table_name);
+                EXECUTE format('WITH moved AS (DELETE FROM %I WHERE created_at >= %L AND created_at < %L RETURNING *)
+                                INSERT INTO %I SELECT * FROM moved',
+                               default_partition, month_start, month_end, partition_name);
+                EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                               table_name, partition_name, month_start, month_end);
+            END IF;
+            RETURN NEXT partition_name;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach partitions that ended more than keep_months months before the current
+-- month and move them to usage_archive
+CREATE OR REPLACE FUNCTION detach_usage_partitions(table_name TEXT, keep_months INTEGER)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    part RECORD;
+BEGIN
+    FOR part IN
+        SELECT p.partition_name FROM usage_partitions p
+        WHERE p.parent_table = table_name
+          AND p.range_end <= usage_month_start(now(), -keep_months)
+        ORDER BY p.range_end
+    LOOP
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', table_name, part.partition_name);
+        EXECUTE format('ALTER TABLE %I SET SCHEMA usage_archive', part.partition_name);
+        RETURN NEXT part.partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Turn table_name into a partitioned table with the existing table attached as
+-- <table>_legacy, covering everything before the month after its newest row.
+-- Foreign keys, indexes and policies are added on the parent by the caller.
+CREATE OR REPLACE FUNCTION convert_to_monthly_partitions(table_name TEXT)
+RETURNS VOID AS $$
+DECLARE
+    legacy TEXT := table_name || '_legacy';
+    cutover TIMESTAMPTZ;
+    obj RECORD;
+BEGIN
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', table_name, legacy);
+
+    -- Free the index names for the parent's indexes; the parent's foreign keys
+    -- are cloned onto the partition, so drop the legacy copies
+    FOR obj IN SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE i.indrelid = legacy::regclass LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', obj.relname, obj.relname || '_legacy');
+    END LOOP;
+    FOR obj IN SELECT conname FROM pg_constraint WHERE conrelid = legacy::regclass AND contype = 'f' LOOP
+        EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', legacy, obj.conname);
+    END LOOP;
+
+    -- created_at becomes the partition key (DEFAULT NOW(), so NULLs are not expected)
+    EXECUTE format('UPDATE %I SET created_at = ''epoch'' WHERE created_at IS NULL', legacy);
+    EXECUTE format('SELECT usage_month_start(GREATEST(now(), MAX(created_at)), 1) FROM %I', legacy) INTO cutover;
+
+    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)',
+                   table_name, legacy);
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN created_at SET NOT NULL, ADD PRIMARY KEY (id, created_at)', table_name);
+
+    -- A validated CHECK lets ATTACH PARTITION skip its own scan
+    EXECUTE format('ALTER TABLE %I ALTER COLUMN created_at SET NOT NULL, ADD CONSTRAINT %I CHECK (created_at < %L)',
+                   legacy, legacy || '_range', cutover);
+    EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (MINVALUE) TO (%L)', table_name, legacy, cutover);
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', legacy, legacy || '_range');
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'usage_tracking'::regclass) THEN
+        PERFORM convert_to_monthly_partitions('usage_tracking');
+        ALTER TABLE usage_tracking
+            ADD FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE,
+            ADD FOREIGN KEY (source_id) REFERENCES sources(id) ON DELETE SET NULL;
+        ALTER TABLE usage_tracking ENABLE ROW LEVEL SECURITY;
+        CREATE POLICY usage_tracking_isolation_policy ON usage_tracking FOR ALL
+            USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'connector_query_log'::regclass) THEN
+        PERFORM convert_to_monthly_partitions('connector_query_log');
+        ALTER TABLE connector_query_log
+            ADD FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE,
+            ADD FOREIGN KEY (connector_id) REFERENCES customer_connectors(id) ON DELETE CASCADE;
+        ALTER TABLE connector_query_log ENABLE ROW LEVEL SECURITY;
+        CREATE POLICY connector_log_isolation_policy ON connector_query_log FOR ALL
+            USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+    END IF;
+END $$;
+
+-- Partitioned indexes (the legacy partition's equivalent indexes are attached, not rebuilt)
+CREATE INDEX IF NOT EXISTS idx_usage_customer_created ON usage_tracking(customer_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_usage_source ON usage_tracking(source_id);
+CREATE INDEX IF NOT EXISTS idx_usage_query_type ON usage_tracking(query_type);
+CREATE INDEX IF NOT EXISTS idx_usage_created_at ON usage_tracking(created_at);
+CREATE INDEX IF NOT EXISTS idx_connector_log_customer ON connector_query_log(customer_id);
+CREATE INDEX IF NOT EXISTS idx_connector_log_connector ON connector_query_log(connector_id);
+CREATE INDEX IF NOT EXISTS idx_connector_log_created_at ON connector_query_log(created_at);
+
+SELECT create_monthly_partitions('usage_tracking');
+SELECT create_monthly_partitions('connector_query_log');
+
+-- Catch-all for rows past the last monthly partition, so inserts keep working
+-- if maintenance stops running; create_monthly_partitions() moves them out
+CREATE TABLE IF NOT EXISTS usage_tracking_default PARTITION OF usage_tracking DEFAULT;
+CREATE TABLE IF NOT EXISTS connector_query_log_default PARTITION OF connector_query_log DEFAULT;
+
+-- Rollups (buckets are UTC hours / UTC days)
+CREATE TABLE IF NOT EXISTS usage_rollup_hourly (
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    hour TIMESTAMPTZ NOT NULL,
+    query_type VARCHAR(50) NOT NULL,
+    queries BIGINT NOT NULL DEFAULT 0,
+    tokens_used BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    response_time_ms_total BIGINT NOT NULL DEFAULT 0,
+    timed_queries BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (customer_id, hour, query_type)
+);
+
+CREATE TABLE IF NOT EXISTS usage_rollup_daily (
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    query_type VARCHAR(50) NOT NULL,
+    queries BIGINT NOT NULL DEFAULT 0,
+    tokens_used BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    response_time_ms_total BIGINT NOT NULL DEFAULT 0,
+    timed_queries BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (customer_id, day, query_type)
+);
+
+CREATE TABLE IF NOT EXISTS connector_rollup_hourly (
+    connector_id UUID NOT NULL REFERENCES customer_connectors(id) ON DELETE CASCADE,
+    hour TIMESTAMPTZ NOT NULL,
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    queries BIGINT NOT NULL DEFAULT 0,
+    files_retrieved BIGINT NOT NULL DEFAULT 0,
+    bytes_retrieved BIGINT NOT NULL DEFAULT 0,
+    query_duration_ms_total BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (connector_id, hour)
+);
+
+CREATE TABLE IF NOT EXISTS connector_rollup_daily (
+    connector_id UUID NOT NULL REFERENCES customer_connectors(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    queries BIGINT NOT NULL DEFAULT 0,
+    files_retrieved BIGINT NOT NULL DEFAULT 0,
+    bytes_retrieved BIGINT NOT NULL DEFAULT 0,
+    query_duration_ms_total BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (connector_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_connector_rollup_hourly_customer ON connector_rollup_hourly(customer_id, hour);
+CREATE INDEX IF NOT EXISTS idx_connector_rollup_daily_customer ON connector_rollup_daily(customer_id, day);
+
+ALTER TABLE usage_rollup_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE usage_rollup_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE connector_rollup_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE connector_rollup_daily ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS usage_rollup_hourly_isolation_policy ON usage_rollup_hourly;
+CREATE POLICY usage_rollup_hourly_isolation_policy ON usage_rollup_hourly FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+DROP POLICY IF EXISTS usage_rollup_daily_isolation_policy ON usage_rollup_daily;
+CREATE POLICY usage_rollup_daily_isolation_policy ON usage_rollup_daily FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+DROP POLICY IF EXISTS connector_rollup_hourly_isolation_policy ON connector_rollup_hourly;
+CREATE POLICY connector_rollup_hourly_isolation_policy ON connector_rollup_hourly FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+DROP POLICY IF EXISTS connector_rollup_daily_isolation_policy ON connector_rollup_daily;
+CREATE POLICY connector_rollup_daily_isolation_policy ON connector_rollup_daily FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+
+-- Fold inserted usage rows into the hourly and daily rollups (one upsert per
+-- bucket, in key order so concurrent batches can't deadlock)
+CREATE OR REPLACE FUNCTION rollup_usage_tracking()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO usage_rollup_hourly AS r
+        (customer_id, hour, query_type, queries, tokens_used, cost_incurred, response_time_ms_total, timed_queries)
+    SELECT customer_id, date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', query_type,
+           COUNT(*), COALESCE(SUM(tokens_used), 0), COALESCE(SUM(cost_incurred), 0),
+           COALESCE(SUM(response_time_ms), 0), COUNT(response_time_ms)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (customer_id, hour, query_type) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        tokens_used = r.tokens_used + EXCLUDED.tokens_used,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred,
+        response_time_ms_total = r.response_time_ms_total + EXCLUDED.response_time_ms_total,
+        timed_queries = r.timed_queries + EXCLUDED.timed_queries;
+
+    INSERT INTO usage_rollup_daily AS r
+        (customer_id, day, query_type, queries, tokens_used, cost_incurred, response_time_ms_total, timed_queries)
+    SELECT customer_id, (created_at AT TIME ZONE 'UTC')::date, query_type,
+           COUNT(*), COALESCE(SUM(tokens_used), 0), COALESCE(SUM(cost_incurred), 0),
+           COALESCE(SUM(response_time_ms), 0), COUNT(response_time_ms)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (customer_id, day, query_type) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        tokens_used = r.tokens_used + EXCLUDED.tokens_used,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred,
+        response_time_ms_total = r.response_time_ms_total + EXCLUDED.response_time_ms_total,
+        timed_queries = r.timed_queries + EXCLUDED.timed_queries;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rollup_connector_query_log()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO connector_rollup_hourly AS r
+        (connector_id, hour, customer_id, queries, files_retrieved, bytes_retrieved, query_duration_ms_total, cost_incurred)
+    SELECT connector_id, date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', customer_id,
+           COUNT(*), COALESCE(SUM(files_retrieved), 0), COALESCE(SUM(bytes_retrieved), 0),
+           COALESCE(SUM(query_duration_ms), 0), COALESCE(SUM(cost_incurred), 0)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (connector_id, hour) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        files_retrieved = r.files_retrieved + EXCLUDED.files_retrieved,
+        bytes_retrieved = r.bytes_retrieved + EXCLUDED.bytes_retrieved,
+        query_duration_ms_total = r.query_duration_ms_total + EXCLUDED.query_duration_ms_total,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred;
+
+    INSERT INTO connector_rollup_daily AS r
+        (connector_id, day, customer_id, queries, files_retrieved, bytes_retrieved, query_duration_ms_total, cost_incurred)
+    SELECT connector_id, (created_at AT TIME ZONE 'UTC')::date, customer_id,
+           COUNT(*), COALESCE(SUM(files_retrieved), 0), COALESCE(SUM(bytes_retrieved), 0),
+           COALESCE(SUM(query_duration_ms), 0), COALESCE(SUM(cost_incurred), 0)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (connector_id, day) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        files_retrieved = r.files_retrieved + EXCLUDED.files_retrieved,
+        bytes_retrieved = r.bytes_retrieved + EXCLUDED.bytes_retrieved,
+        query_duration_ms_total = r.query_duration_ms_total + EXCLUDED.query_duration_ms_total,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Install the triggers and backfill in one transaction: CREATE TRIGGER blocks
+-- inserts until commit, so no row is counted by both
+DO $$
+BEGIN
+    DROP TRIGGER IF EXISTS rollup_usage_tracking_insert ON usage_tracking;
+    CREATE TRIGGER rollup_usage_tracking_insert AFTER INSERT ON usage_tracking
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_usage_tracking();
+
+    DROP TRIGGER IF EXISTS rollup_connector_query_log_insert ON connector_query_log;
+    CREATE TRIGGER rollup_connector_query_log_insert AFTER INSERT ON connector_query_log
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_connector_query_log();
+
+    IF NOT EXISTS (SELECT 1 FROM usage_rollup_hourly) THEN
+        INSERT INTO usage_rollup_hourly
+            (customer_id, hour, query_type, queries, tokens_used, cost_incurred, response_time_ms_total, timed_queries)
+        SELECT customer_id, date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', query_type,
+               COUNT(*), COALESCE(SUM(tokens_used), 0), COALESCE(SUM(cost_incurred), 0),
+               COALESCE(SUM(response_time_ms), 0), COUNT(response_time_ms)
+        FROM usage_tracking
+        GROUP BY 1, 2, 3;
+
+        INSERT INTO usage_rollup_daily
+            (customer_id, day, query_type, queries, tokens_used, cost_incurred, response_time_ms_total, timed_queries)
+        SELECT customer_id, (hour AT TIME ZONE 'UTC')::date, query_type,
+               SUM(queries), SUM(tokens_used), SUM(cost_incurred), SUM(response_time_ms_total), SUM(timed_queries)
+        FROM usage_rollup_hourly
+        GROUP BY 1, 2, 3;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM connector_rollup_hourly) THEN
+        INSERT INTO connector_rollup_hourly
+            (connector_id, hour, customer_id, queries, files_retrieved, bytes_retrieved, query_duration_ms_total, cost_incurred)
+        SELECT connector_id, date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', customer_id,
+               COUNT(*), COALESCE(SUM(files_retrieved), 0), COALESCE(SUM(bytes_retrieved), 0),
+               COALESCE(SUM(query_duration_ms), 0), COALESCE(SUM(cost_incurred), 0)
+        FROM connector_query_log
+        GROUP BY 1, 2, 3;
+
+        INSERT INTO connector_rollup_daily
+            (connector_id, day, customer_id, queries, files_retrieved, bytes_retrieved, query_duration_ms_total, cost_incurred)
+        SELECT connector_id, (hour AT TIME ZONE 'UTC')::date, customer_id,
+               SUM(queries), SUM(files_retrieved), SUM(bytes_retrieved), SUM(query_duration_ms_total), SUM(cost_incurred)
+        FROM connector_rollup_hourly
+        GROUP BY 1, 2, 3;
+    END IF;
+END $$;
+
+-- Customer stats from the daily rollup (the old view joined raw usage rows,
+-- connectors and feedback together, multiplying total_cost by the fan-out)
+DROP VIEW IF EXISTS customer_stats CASCADE;
+DROP VIEW IF EXISTS customer_stats_view CASCADE;
+
+CREATE VIEW customer_stats AS
+SELECT
+    c.id,
+    c.name,
+    c.tier,
+    COALESCE(u.total_queries, 0) as total_queries,
+    COALESCE(u.federated_queries, 0) as federated_queries,
+    u.total_cost,
+    (SELECT COUNT(*) FROM customer_connectors cc WHERE cc.customer_id = c.id AND cc.is_active = true) as active_connectors,
+    (SELECT COUNT(*) FROM source_feedback sf WHERE sf.customer_id = c.id) as feedback_count
+FROM customers c
+LEFT JOIN (
+    SELECT customer_id,
+           SUM(queries) as total_queries,
+           SUM(queries) FILTER (WHERE query_type = 'federated_query') as federated_queries,
+           SUM(cost_incurred) as total_cost
+    FROM usage_rollup_daily
+    GROUP BY customer_id
+) u ON u.customer_id = c.id;
+
+CREATE VIEW customer_stats_view AS SELECT * FROM customer_stats;
+
+-- Verify
+SELECT parent_table, partition_name, range_start, range_end, is_default FROM usage_partitions ORDER BY 1, range_end;
+SELECT tgname, tgrelid::regclass AS table_name
+FROM pg_trigger
+WHERE tgname IN ('rollup_usage_tracking_insert', 'rollup_connector_query_log_insert');
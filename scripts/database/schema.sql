@@ -2,6 +2,9 @@
 -- Multi-tenant knowledge registry with epistemological completeness framework
 -- 15 Tables: Core + Federated Architecture + Quality Validation + Knowledge Graph
 
+-- pgvector (semantic search embeddings on sources)
+CREATE EXTENSION IF NOT EXISTS vector;
+
 -- ============================================================================
 -- CATEGORIES TABLE
 -- Hierarchical organization of knowledge sources with epistemological stats
@@ -71,14 +74,12 @@ CREATE TABLE IF NOT EXISTS sources (
     fact_check_date TIMESTAMPTZ,
     fact_checked_by VARCHAR(255),
     
-    -- Cross-Reference & Deprecation
-    cross_reference_count INTEGER DEFAULT 0,
+    -- Deprecation (cross_reference_count lives in source_counters)
     superseded_by UUID REFERENCES sources(id) ON DELETE SET NULL,
     supersedes UUID REFERENCES sources(id) ON DELETE SET NULL,
     deprecation_reason TEXT,
     
-    -- Citation Tracking
-    cited_by_count INTEGER DEFAULT 0,
+    -- Citation Tracking (cited_by_count lives in source_counters)
     external_citations TEXT[],
     
     -- Curriculum & Learning Sequencing
@@ -107,14 +108,20 @@ CREATE TABLE IF NOT EXISTS sources (
     ingestion_status VARCHAR(50) DEFAULT 'pending',
     cost_estimate DECIMAL(10, 2),
     
+    -- Full-text search (weighted: name A > description B > category C > tags D)
+    -- Maintained by trigger because it includes the category name from categories
+    search_vector TSVECTOR,
+    
+    -- Semantic search embedding (384-dim, see mcp_servers/knowledge_registry/embeddings.py)
+    -- Reset to NULL when name/description/tags change; backfill_embeddings.py recomputes
+    embedding VECTOR(384),
+    
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW(),
     
     UNIQUE(url, category_id),
     CHECK (authority_score IS NULL OR (authority_score >= 0 AND authority_score <= 100)),
     CHECK (quality_score IS NULL OR (quality_score >= 0 AND quality_score <= 100)),
-    CHECK (cited_by_count >= 0),
-    CHECK (cross_reference_count >= 0),
     CHECK (estimated_read_time_minutes IS NULL OR estimated_read_time_minutes > 0)
 );
 
@@ -124,6 +131,7 @@ CREATE INDEX idx_sources_type ON sources(source_type);
 CREATE INDEX idx_sources_status ON sources(ingestion_status);
 CREATE INDEX idx_sources_tags ON sources USING GIN(tags);
 CREATE INDEX idx_sources_created_at ON sources(created_at);
+CREATE INDEX idx_sources_updated_at ON sources(updated_at);
 
 -- Epistemological indexes
 CREATE INDEX idx_sources_epistemological_dimension ON sources(epistemological_dimension);
@@ -143,7 +151,6 @@ CREATE INDEX idx_sources_approval_status ON sources(approval_status);
 CREATE INDEX idx_sources_prerequisite_sources ON sources USING GIN(prerequisite_sources);
 
 -- Citation indexes
-CREATE INDEX idx_sources_cited_by_count ON sources(cited_by_count);
 CREATE INDEX idx_sources_external_citations ON sources USING GIN(external_citations);
 
 -- Geographic indexes
@@ -158,6 +165,107 @@ CREATE INDEX idx_sources_available_translations ON sources USING GIN(available_t
 -- Federated indexes
 CREATE INDEX idx_sources_location ON sources(source_location);
 
+-- Full-text search index (serves websearch_to_tsquery matches in query_knowledge_base)
+CREATE INDEX idx_sources_search_vector ON sources USING GIN(search_vector);
+
+-- Approximate nearest-neighbour index (cosine distance, query_knowledge_base hybrid mode)
+CREATE INDEX idx_sources_embedding_hnsw ON sources USING hnsw (embedding vector_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- ============================================================================
+-- SOURCE COUNTERS TABLE
+-- Volatile per-source counters, kept off the wide, heavily indexed sources row
+-- so bumps are HOT updates. Each backend writes its own shard row;
+-- compact_source_counters() folds shards back into shard 0. Read totals from
+-- source_counter_totals.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS source_counters (
+    source_id UUID NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    shard SMALLINT NOT NULL DEFAULT 0,
+    cited_by_count INTEGER NOT NULL DEFAULT 0,
+    cross_reference_count INTEGER NOT NULL DEFAULT 0,
+    access_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (source_id, shard)
+) WITH (fillfactor = 70);
+
+-- Shard written by the current backend
+CREATE OR REPLACE FUNCTION source_counter_shard()
+RETURNS SMALLINT AS $$
+    SELECT (pg_backend_pid() % 8)::smallint;
+$$ LANGUAGE sql STABLE;
+
+-- Add per-source deltas (NULL arrays count as zeros). Rows are upserted in
+-- source_id order so concurrent bumps on the same shard can't deadlock.
+CREATE OR REPLACE FUNCTION bump_source_counters(
+    source_ids UUID[],
+    cited_by_deltas INTEGER[] DEFAULT NULL,
+    cross_reference_deltas INTEGER[] DEFAULT NULL,
+    access_deltas INTEGER[] DEFAULT NULL
+)
+RETURNS VOID AS $$
+    INSERT INTO source_counters AS sc (source_id, shard, cited_by_count, cross_reference_count, access_count)
+    SELECT d.source_id, source_counter_shard(),
+           COALESCE(SUM(d.cited_by), 0), COALESCE(SUM(d.cross_reference), 0), COALESCE(SUM(d.access), 0)
+    FROM unnest(source_ids, cited_by_deltas, cross_reference_deltas, access_deltas)
+        AS d(source_id, cited_by, cross_reference, access)
+    WHERE d.source_id IS NOT NULL
+    GROUP BY d.source_id
+    ORDER BY d.source_id
+    ON CONFLICT (source_id, shard) DO UPDATE SET
+        cited_by_count = sc.cited_by_count + EXCLUDED.cited_by_count,
+        cross_reference_count = sc.cross_reference_count + EXCLUDED.cross_reference_count,
+        access_count = sc.access_count + EXCLUDED.access_count;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION record_source_access(source_ids UUID[])
+RETURNS VOID AS $$
+    SELECT bump_source_counters(source_ids, access_deltas => array_fill(1, ARRAY[cardinality(source_ids)]));
+$$ LANGUAGE sql;
+
+-- Fold shards 1..7 into shard 0. Returns the number of shard rows folded, or
+-- NULL if another compaction is running.
+CREATE OR REPLACE FUNCTION compact_source_counters()
+RETURNS INTEGER AS $$
+DECLARE
+    folded INTEGER;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('compact_source_counters')) THEN
+        RETURN NULL;
+    END IF;
+
+    -- Lock in the same order bump_source_counters() writes
+    PERFORM 1 FROM source_counters WHERE shard <> 0 ORDER BY source_id, shard FOR UPDATE;
+
+    WITH moved AS (
+        DELETE FROM source_counters WHERE shard <> 0
+        RETURNING source_id, cited_by_count, cross_reference_count, access_count
+    ), totals AS (
+        INSERT INTO source_counters AS sc (source_id, shard, cited_by_count, cross_reference_count, access_count)
+        SELECT source_id, 0, SUM(cited_by_count), SUM(cross_reference_count), SUM(access_count)
+        FROM moved
+        GROUP BY source_id
+        ORDER BY source_id
+        ON CONFLICT (source_id, shard) DO UPDATE SET
+            cited_by_count = sc.cited_by_count + EXCLUDED.cited_by_count,
+            cross_reference_count = sc.cross_reference_count + EXCLUDED.cross_reference_count,
+            access_count = sc.access_count + EXCLUDED.access_count
+    )
+    SELECT COUNT(*) INTO folded FROM moved;
+
+    RETURN folded;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE VIEW source_counter_totals AS
+SELECT
+    source_id,
+    GREATEST(SUM(cited_by_count), 0)::int as cited_by_count,
+    GREATEST(SUM(cross_reference_count), 0)::int as cross_reference_count,
+    GREATEST(SUM(access_count), 0)::bigint as access_count
+FROM source_counters
+GROUP BY source_id;
+
 -- ============================================================================
 -- CUSTOMERS TABLE
 -- Multi-tenant customer accounts with subscription tiers
@@ -187,10 +295,11 @@ CREATE INDEX idx_customers_api_key ON customers(api_key_hash);
 -- ============================================================================
 -- USAGE TRACKING TABLE
 -- Track customer usage of knowledge registry and federated sources
+-- Partitioned by UTC month (see USAGE PARTITIONS AND ROLLUPS below)
 -- ============================================================================
 
 CREATE TABLE IF NOT EXISTS usage_tracking (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
     source_id UUID REFERENCES sources(id) ON DELETE SET NULL,
     agent_id VARCHAR(255),
@@ -199,14 +308,14 @@ CREATE TABLE IF NOT EXISTS usage_tracking (
     response_time_ms INTEGER,
     tokens_used INTEGER,
     cost_incurred DECIMAL(10, 4),
-    created_at TIMESTAMPTZ DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     
+    PRIMARY KEY (id, created_at),
     CHECK (response_time_ms IS NULL OR response_time_ms >= 0),
     CHECK (tokens_used IS NULL OR tokens_used >= 0),
     CHECK (cost_incurred IS NULL OR cost_incurred >= 0)
-);
+) PARTITION BY RANGE (created_at);
 
-CREATE INDEX idx_usage_customer ON usage_tracking(customer_id);
 CREATE INDEX idx_usage_source ON usage_tracking(source_id);
 CREATE INDEX idx_usage_query_type ON usage_tracking(query_type);
 CREATE INDEX idx_usage_created_at ON usage_tracking(created_at);
@@ -241,10 +350,11 @@ CREATE INDEX idx_connectors_active ON customer_connectors(is_active);
 -- ============================================================================
 -- CONNECTOR QUERY LOG TABLE
 -- Track federated queries for billing and analytics
+-- Partitioned by UTC month (see USAGE PARTITIONS AND ROLLUPS below)
 -- ============================================================================
 
 CREATE TABLE IF NOT EXISTS connector_query_log (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
     connector_id UUID NOT NULL REFERENCES customer_connectors(id) ON DELETE CASCADE,
     query_text TEXT NOT NULL,
@@ -252,17 +362,262 @@ CREATE TABLE IF NOT EXISTS connector_query_log (
     bytes_retrieved BIGINT DEFAULT 0,
     query_duration_ms INTEGER,
     cost_incurred DECIMAL(10, 4),
-    created_at TIMESTAMPTZ DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     
+    PRIMARY KEY (id, created_at),
     CHECK (files_retrieved >= 0),
     CHECK (bytes_retrieved >= 0),
     CHECK (query_duration_ms IS NULL OR query_duration_ms >= 0)
-);
+) PARTITION BY RANGE (created_at);
 
 CREATE INDEX idx_connector_log_customer ON connector_query_log(customer_id);
 CREATE INDEX idx_connector_log_connector ON connector_query_log(connector_id);
 CREATE INDEX idx_connector_log_created_at ON connector_query_log(created_at);
 
+-- ============================================================================
+-- USAGE PARTITIONS AND ROLLUPS
+-- usage_tracking and connector_query_log get one partition per UTC month;
+-- scripts/database/maintain_usage_partitions.py creates upcoming months and
+-- detaches months past retention into usage_archive. The <table>_default
+-- partition holds rows no month covers yet (maintenance lapsed) until
+-- create_monthly_partitions() moves them out. Hourly/daily rollups are
+-- maintained by statement-level INSERT triggers; dashboards and customer_stats
+-- read them instead of the raw logs.
+-- ============================================================================
+
+CREATE SCHEMA IF NOT EXISTS usage_archive;
+
+-- First instant of the UTC month `months` after the one containing ts
+CREATE OR REPLACE FUNCTION usage_month_start(ts TIMESTAMPTZ, months INTEGER DEFAULT 0)
+RETURNS TIMESTAMPTZ AS $$
+    SELECT (date_trunc('month', ts AT TIME ZONE 'UTC') + make_interval(months => months)) AT TIME ZONE 'UTC';
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Partitions of the usage logs with their ranges (NULL = MINVALUE; the DEFAULT
+-- partition has no range)
+CREATE OR REPLACE VIEW usage_partitions AS
+SELECT
+    parent.relname::text as parent_table,
+    child.relname::text as partition_name,
+    (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'FROM \(''([^'']+)''\)'))[1]::timestamptz as range_start,
+    (regexp_match(pg_get_expr(child.relpartbound, child.oid), 'TO \(''([^'']+)''\)'))[1]::timestamptz as range_end,
+    pg_total_relation_size(child.oid) as total_bytes,
+    pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT' as is_default
+FROM pg_inherits i
+JOIN pg_class parent ON parent.oid = i.inhparent
+JOIN pg_class child ON child.oid = i.inhrelid
+WHERE parent.relname IN ('usage_tracking', 'connector_query_log');
+
+-- Create monthly partitions through months_ahead months after the current one,
+-- skipping months an existing partition already covers. Months missed while
+-- maintenance was not running are created too, and rows that landed in the
+-- DEFAULT partition meanwhile are moved into their month (attaching a range
+-- that DEFAULT still holds rows for would fail).
+CREATE OR REPLACE FUNCTION create_monthly_partitions(table_name TEXT, months_ahead INTEGER DEFAULT 3)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    covered TIMESTAMPTZ;
+    default_partition TEXT;
+    month_start TIMESTAMPTZ;
+    month_end TIMESTAMPTZ;
+    partition_name TEXT;
+BEGIN
+    SELECT MAX(p.range_end) INTO covered FROM usage_partitions p WHERE p.parent_table = table_name;
+    SELECT p.partition_name INTO default_partition FROM usage_partitions p
+    WHERE p.parent_table = table_name AND p.is_default;
+
+    month_start := LEAST(COALESCE(covered, usage_month_start(now())), usage_month_start(now()));
+    WHILE month_start < usage_month_start(now(), months_ahead + 1) LOOP
+        month_end := usage_month_start(month_start, 1);
+        IF covered IS NULL OR month_start >= covered THEN
+            partition_name := table_name || '_' || to_char(month_start AT TIME ZONE 'UTC', 'YYYY_MM');
+            IF default_partition IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                               partition_name, table_name, month_start, month_end);
+            ELSE
+                -- Moved rows were rolled up when first inserted; the rollup
+                -- triggers are on the parent, so the move doesn't count them again
+                EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                               partition_name, table_name);
+                EXECUTE format('WITH moved AS (DELETE FROM %I WHERE created_at >= %L AND created_at < %L RETURNING *)
+                                INSERT INTO %I SELECT * FROM moved',
+                               default_partition, month_start, month_end, partition_name);
+                EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                               table_name, partition_name, month_start, month_end);
+            END IF;
+            RETURN NEXT partition_name;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach partitions that ended more than keep_months months before the current
+-- month and move them to usage_archive
+CREATE OR REPLACE FUNCTION detach_usage_partitions(table_name TEXT, keep_months INTEGER)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    part RECORD;
+BEGIN
+    FOR part IN
+        SELECT p.partition_name FROM usage_partitions p
+        WHERE p.parent_table = table_name
+          AND p.range_end <= usage_month_start(now(), -keep_months)
+        ORDER BY p.range_end
+    LOOP
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', table_name, part.partition_name);
+        EXECUTE format('ALTER TABLE %I SET SCHEMA usage_archive', part.partition_name);
+        RETURN NEXT part.partition_name;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_monthly_partitions('usage_tracking');
+SELECT create_monthly_partitions('connector_query_log');
+
+-- Catch-all for rows past the last monthly partition, so inserts keep working
+-- if maintenance stops running; create_monthly_partitions() moves them out
+CREATE TABLE IF NOT EXISTS usage_tracking_default PARTITION OF usage_tracking DEFAULT;
+CREATE TABLE IF NOT EXISTS connector_query_log_default PARTITION OF connector_query_log DEFAULT;
+
+-- Rollups (buckets are UTC hours / UTC days)
+CREATE TABLE IF NOT EXISTS usage_rollup_hourly (
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    hour TIMESTAMPTZ NOT NULL,
+    query_type VARCHAR(50) NOT NULL,
+    queries BIGINT NOT NULL DEFAULT 0,
+    tokens_used BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    response_time_ms_total BIGINT NOT NULL DEFAULT 0,
+    timed_queries BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (customer_id, hour, query_type)
+);
+
+CREATE TABLE IF NOT EXISTS usage_rollup_daily (
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    query_type VARCHAR(50) NOT NULL,
+    queries BIGINT NOT NULL DEFAULT 0,
+    tokens_used BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    response_time_ms_total BIGINT NOT NULL DEFAULT 0,
+    timed_queries BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (customer_id, day, query_type)
+);
+
+CREATE TABLE IF NOT EXISTS connector_rollup_hourly (
+    connector_id UUID NOT NULL REFERENCES customer_connectors(id) ON DELETE CASCADE,
+    hour TIMESTAMPTZ NOT NULL,
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    queries BIGINT NOT NULL DEFAULT 0,
+    files_retrieved BIGINT NOT NULL DEFAULT 0,
+    bytes_retrieved BIGINT NOT NULL DEFAULT 0,
+    query_duration_ms_total BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (connector_id, hour)
+);
+
+CREATE TABLE IF NOT EXISTS connector_rollup_daily (
+    connector_id UUID NOT NULL REFERENCES customer_connectors(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
+    queries BIGINT NOT NULL DEFAULT 0,
+    files_retrieved BIGINT NOT NULL DEFAULT 0,
+    bytes_retrieved BIGINT NOT NULL DEFAULT 0,
+    query_duration_ms_total BIGINT NOT NULL DEFAULT 0,
+    cost_incurred DECIMAL(14, 4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (connector_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_connector_rollup_hourly_customer ON connector_rollup_hourly(customer_id, hour);
+CREATE INDEX IF NOT EXISTS idx_connector_rollup_daily_customer ON connector_rollup_daily(customer_id, day);
+
+-- Fold inserted usage rows into the hourly and daily rollups (one upsert per
+-- bucket, in key order so concurrent batches can't deadlock)
+CREATE OR REPLACE FUNCTION rollup_usage_tracking()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO usage_rollup_hourly AS r
+        (customer_id, hour, query_type, queries, tokens_used, cost_incurred, response_time_ms_total, timed_queries)
+    SELECT customer_id, date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', query_type,
+           COUNT(*), COALESCE(SUM(tokens_used), 0), COALESCE(SUM(cost_incurred), 0),
+           COALESCE(SUM(response_time_ms), 0), COUNT(response_time_ms)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (customer_id, hour, query_type) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        tokens_used = r.tokens_used + EXCLUDED.tokens_used,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred,
+        response_time_ms_total = r.response_time_ms_total + EXCLUDED.response_time_ms_total,
+        timed_queries = r.timed_queries + EXCLUDED.timed_queries;
+
+    INSERT INTO usage_rollup_daily AS r
+        (customer_id, day, query_type, queries, tokens_used, cost_incurred, response_time_ms_total, timed_queries)
+    SELECT customer_id, (created_at AT TIME ZONE 'UTC')::date, query_type,
+           COUNT(*), COALESCE(SUM(tokens_used), 0), COALESCE(SUM(cost_incurred), 0),
+           COALESCE(SUM(response_time_ms), 0), COUNT(response_time_ms)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (customer_id, day, query_type) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        tokens_used = r.tokens_used + EXCLUDED.tokens_used,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred,
+        response_time_ms_total = r.response_time_ms_total + EXCLUDED.response_time_ms_total,
+        timed_queries = r.timed_queries + EXCLUDED.timed_queries;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rollup_connector_query_log()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO connector_rollup_hourly AS r
+        (connector_id, hour, customer_id, queries, files_retrieved, bytes_retrieved, query_duration_ms_total, cost_incurred)
+    SELECT connector_id, date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', customer_id,
+           COUNT(*), COALESCE(SUM(files_retrieved), 0), COALESCE(SUM(bytes_retrieved), 0),
+           COALESCE(SUM(query_duration_ms), 0), COALESCE(SUM(cost_incurred), 0)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (connector_id, hour) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        files_retrieved = r.files_retrieved + EXCLUDED.files_retrieved,
+        bytes_retrieved = r.bytes_retrieved + EXCLUDED.bytes_retrieved,
+        query_duration_ms_total = r.query_duration_ms_total + EXCLUDED.query_duration_ms_total,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred;
+
+    INSERT INTO connector_rollup_daily AS r
+        (connector_id, day, customer_id, queries, files_retrieved, bytes_retrieved, query_duration_ms_total, cost_incurred)
+    SELECT connector_id, (created_at AT TIME ZONE 'UTC')::date, customer_id,
+           COUNT(*), COALESCE(SUM(files_retrieved), 0), COALESCE(SUM(bytes_retrieved), 0),
+           COALESCE(SUM(query_duration_ms), 0), COALESCE(SUM(cost_incurred), 0)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (connector_id, day) DO UPDATE SET
+        queries = r.queries + EXCLUDED.queries,
+        files_retrieved = r.files_retrieved + EXCLUDED.files_retrieved,
+        bytes_retrieved = r.bytes_retrieved + EXCLUDED.bytes_retrieved,
+        query_duration_ms_total = r.query_duration_ms_total + EXCLUDED.query_duration_ms_total,
+        cost_incurred = r.cost_incurred + EXCLUDED.cost_incurred;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement triggers on the parents (write through usage_tracking /
+-- connector_query_log, not the partitions)
+CREATE TRIGGER rollup_usage_tracking_insert AFTER INSERT ON usage_tracking
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_usage_tracking();
+
+CREATE TRIGGER rollup_connector_query_log_insert AFTER INSERT ON connector_query_log
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_connector_query_log();
+
 -- ============================================================================
 -- SOURCE PROMOTIONS TABLE
 -- Audit trail for environment promotions (dev → staging → production)
@@ -306,6 +661,16 @@ CREATE INDEX idx_validations_source ON source_validations(source_id);
 CREATE INDEX idx_validations_type ON source_validations(validation_type);
 CREATE INDEX idx_validations_result ON source_validations(validation_result);
 CREATE INDEX idx_validations_created_at ON source_validations(created_at);
+CREATE INDEX idx_validations_latest ON source_validations(source_id, validation_type, created_at DESC);
+
+-- Per-layer high-water marks for incremental quality-gate runs
+CREATE TABLE IF NOT EXISTS quality_gate_watermarks (
+    layer VARCHAR(50) PRIMARY KEY,
+    validated_through TIMESTAMPTZ NOT NULL,
+    validated_year INTEGER NOT NULL,
+    params JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
 
 -- ============================================================================
 -- SOURCE FEEDBACK TABLE
@@ -330,6 +695,7 @@ CREATE INDEX idx_feedback_customer ON source_feedback(customer_id);
 CREATE INDEX idx_feedback_type ON source_feedback(feedback_type);
 CREATE INDEX idx_feedback_resolved ON source_feedback(resolved);
 CREATE INDEX idx_feedback_created_at ON source_feedback(created_at);
+CREATE INDEX idx_feedback_resolved_at ON source_feedback(resolved_at);
 
 -- ============================================================================
 -- SOURCE CONCEPTS TABLE
@@ -386,6 +752,14 @@ CREATE INDEX idx_relationships_related ON source_relationships(related_source_id
 CREATE INDEX idx_relationships_type ON source_relationships(relationship_type);
 CREATE INDEX idx_relationships_strength ON source_relationships(relationship_strength);
 
+-- Sources whose incoming relationships changed (incremental quality gates)
+CREATE TABLE IF NOT EXISTS source_relationship_changes (
+    related_source_id UUID NOT NULL,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_relationship_changes_changed_at ON source_relationship_changes(changed_at);
+
 -- ============================================================================
 -- SOURCE USE CASES TABLE
 -- Problem-driven discovery - map real-world problems to relevant sources
@@ -497,6 +871,10 @@ ALTER TABLE usage_tracking ENABLE ROW LEVEL SECURITY;
 ALTER TABLE customer_connectors ENABLE ROW LEVEL SECURITY;
 ALTER TABLE connector_query_log ENABLE ROW LEVEL SECURITY;
 ALTER TABLE source_feedback ENABLE ROW LEVEL SECURITY;
+ALTER TABLE usage_rollup_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE usage_rollup_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE connector_rollup_hourly ENABLE ROW LEVEL SECURITY;
+ALTER TABLE connector_rollup_daily ENABLE ROW LEVEL SECURITY;
 
 -- Sources: All customers can read, only admins can write
 CREATE POLICY sources_read_policy ON sources FOR SELECT USING (true);
@@ -522,6 +900,16 @@ CREATE POLICY connector_log_isolation_policy ON connector_query_log FOR ALL
 CREATE POLICY feedback_isolation_policy ON source_feedback FOR ALL 
     USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
 
+-- Usage rollups: Users can only see their own usage
+CREATE POLICY usage_rollup_hourly_isolation_policy ON usage_rollup_hourly FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+CREATE POLICY usage_rollup_daily_isolation_policy ON usage_rollup_daily FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+CREATE POLICY connector_rollup_hourly_isolation_policy ON connector_rollup_hourly FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+CREATE POLICY connector_rollup_daily_isolation_policy ON connector_rollup_daily FOR ALL
+    USING (customer_id::text = current_setting('app.current_customer_id', TRUE));
+
 -- ============================================================================
 -- TRIGGERS
 -- ============================================================================
@@ -550,38 +938,102 @@ CREATE TRIGGER update_connectors_updated_at BEFORE UPDATE ON customer_connectors
 CREATE TRIGGER update_learning_paths_updated_at BEFORE UPDATE ON learning_paths
     FOR EACH ROW EXECUTE FUNCTION update_updated_at();
 
--- Auto-update category epistemological statistics
+-- Auto-update category epistemological statistics (statement-level deltas)
 CREATE OR REPLACE FUNCTION maintain_category_statistics()
 RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
 BEGIN
-    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
-        UPDATE categories SET
-            total_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id),
-            theory_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'theory'),
-            practice_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'practice'),
-            history_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'history'),
-            current_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'current'),
-            future_sources = (SELECT COUNT(*) FROM sources WHERE category_id = NEW.category_id AND epistemological_dimension = 'future')
-        WHERE id = NEW.category_id;
-    END IF;
-    
-    IF TG_OP = 'DELETE' THEN
-        UPDATE categories SET
-            total_sources = (SELECT COUNT(*) FROM sources WHERE category_id = OLD.category_id),
-            theory_sources = (SELECT COUNT(*) FROM sources WHERE category_id = OLD.category_id AND epistemological_dimension = 'theory'),
-            practice_sources = (SELECT COUNT(*) FROM sources WHERE category_id = OLD.category_id AND epistemological_dimension = 'practice'),
-            history_sources = (SELECT COUNT(*) FROM sources WHERE category_id = OLD.category_id AND epistemological_dimension = 'history'),
-            current_sources = (SELECT COUNT(*) FROM sources WHERE category_id = OLD.category_id AND epistemological_dimension = 'current'),
-            future_sources = (SELECT COUNT(*) FROM sources WHERE category_id = OLD.category_id AND epistemological_dimension = 'future')
-        WHERE id = OLD.category_id;
-    END IF;
-    
-    RETURN COALESCE(NEW, OLD);
+    -- Transition tables: new_rows (INSERT/UPDATE), old_rows (UPDATE/DELETE)
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT category_id, epistemological_dimension, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT category_id, epistemological_dimension, -1 AS delta FROM old_rows'
+        ELSE
+            'SELECT category_id, epistemological_dimension, 1 AS delta FROM new_rows
+             UNION ALL
+             SELECT category_id, epistemological_dimension, -1 AS delta FROM old_rows'
+    END;
+
+    -- Categories whose deltas net to zero (updates that move no source) are not written
+    EXECUTE format($sql$
+        UPDATE categories c SET
+            total_sources = c.total_sources + d.total_delta,
+            theory_sources = c.theory_sources + d.theory_delta,
+            practice_sources = c.practice_sources + d.practice_delta,
+            history_sources = c.history_sources + d.history_delta,
+            current_sources = c.current_sources + d.current_delta,
+            future_sources = c.future_sources + d.future_delta
+        FROM (
+            SELECT category_id,
+                   SUM(delta) AS total_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'theory'), 0) AS theory_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'practice'), 0) AS practice_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'history'), 0) AS history_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'current'), 0) AS current_delta,
+                   COALESCE(SUM(delta) FILTER (WHERE epistemological_dimension = 'future'), 0) AS future_delta
+            FROM (%s) changes
+            GROUP BY category_id
+        ) d
+        WHERE c.id = d.category_id
+          AND (d.total_delta, d.theory_delta, d.practice_delta,
+               d.history_delta, d.current_delta, d.future_delta) <> (0, 0, 0, 0, 0, 0)
+    $sql$, changes);
+
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER maintain_category_stats AFTER INSERT OR UPDATE OR DELETE ON sources
-    FOR EACH ROW EXECUTE FUNCTION maintain_category_statistics();
+-- Transition tables require one trigger per event
+CREATE TRIGGER maintain_category_stats_insert AFTER INSERT ON sources
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_category_statistics();
+
+CREATE TRIGGER maintain_category_stats_update AFTER UPDATE ON sources
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_category_statistics();
+
+CREATE TRIGGER maintain_category_stats_delete AFTER DELETE ON sources
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_category_statistics();
+
+-- Full recount in one pass over sources; returns the number of categories corrected
+CREATE OR REPLACE FUNCTION recalculate_category_statistics()
+RETURNS INTEGER AS $$
+DECLARE
+    corrected INTEGER;
+BEGIN
+    UPDATE categories c SET
+        total_sources = COALESCE(s.total_count, 0),
+        theory_sources = COALESCE(s.theory_count, 0),
+        practice_sources = COALESCE(s.practice_count, 0),
+        history_sources = COALESCE(s.history_count, 0),
+        current_sources = COALESCE(s.current_count, 0),
+        future_sources = COALESCE(s.future_count, 0)
+    FROM categories c2
+    LEFT JOIN (
+        SELECT category_id,
+               COUNT(*) AS total_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'theory') AS theory_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'practice') AS practice_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'history') AS history_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'current') AS current_count,
+               COUNT(*) FILTER (WHERE epistemological_dimension = 'future') AS future_count
+        FROM sources
+        GROUP BY category_id
+    ) s ON s.category_id = c2.id
+    WHERE c.id = c2.id
+      AND (c.total_sources, c.theory_sources, c.practice_sources,
+           c.history_sources, c.current_sources, c.future_sources)
+          IS DISTINCT FROM
+          (COALESCE(s.total_count, 0), COALESCE(s.theory_count, 0), COALESCE(s.practice_count, 0),
+           COALESCE(s.history_count, 0), COALESCE(s.current_count, 0), COALESCE(s.future_count, 0));
+
+    GET DIAGNOSTICS corrected = ROW_COUNT;
+    RETURN corrected;
+END;
+$$ LANGUAGE plpgsql;
 
 -- Auto-calculate authority score based on source type
 CREATE OR REPLACE FUNCTION auto_calculate_authority_score()
@@ -602,24 +1054,244 @@ $$ LANGUAGE plpgsql;
 CREATE TRIGGER calculate_authority_score BEFORE INSERT OR UPDATE ON sources
     FOR EACH ROW EXECUTE FUNCTION auto_calculate_authority_score();
 
--- Auto-maintain citation counts
+-- Full-text search vector: name (A) > description (B) > category (C) > tags (D)
+CREATE OR REPLACE FUNCTION build_source_search_vector(
+    p_name TEXT,
+    p_description TEXT,
+    p_category TEXT,
+    p_tags TEXT[]
+)
+RETURNS TSVECTOR AS $$
+    SELECT
+        setweight(to_tsvector('english', COALESCE(p_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(p_description, '')), 'B') ||
+        setweight(to_tsvector('english', replace(COALESCE(p_category, ''), '_', ' ')), 'C') ||
+        setweight(to_tsvector('english', COALESCE(array_to_string(p_tags, ' '), '')), 'D');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION maintain_source_search_vector()
+RETURNS TRIGGER AS $$
+DECLARE
+    category_text TEXT;
+BEGIN
+    SELECT c.name || ' ' || c.display_name INTO category_text
+    FROM categories c
+    WHERE c.id = NEW.category_id;
+    
+    NEW.search_vector = build_source_search_vector(NEW.name, NEW.description, category_text, NEW.tags);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER maintain_search_vector BEFORE INSERT OR UPDATE OF name, description, tags, category_id ON sources
+    FOR EACH ROW EXECUTE FUNCTION maintain_source_search_vector();
+
+-- Text edits invalidate the stored embedding (unless the same UPDATE supplies a new one)
+CREATE OR REPLACE FUNCTION invalidate_source_embedding()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF (NEW.name, NEW.description, NEW.tags) IS DISTINCT FROM (OLD.name, OLD.description, OLD.tags)
+       AND NEW.embedding IS NOT DISTINCT FROM OLD.embedding THEN
+        NEW.embedding = NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER invalidate_embedding BEFORE UPDATE OF name, description, tags ON sources
+    FOR EACH ROW EXECUTE FUNCTION invalidate_source_embedding();
+
+-- Change notifications: MCP servers LISTEN on knowledge_registry_changes to
+-- invalidate search caches and refresh in-memory indexes. Statement-level, so a
+-- bulk load sends one notification; NOTIFY is delivered on commit and
+-- duplicate payloads within a transaction are collapsed.
+CREATE OR REPLACE FUNCTION notify_knowledge_registry_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('knowledge_registry_changes', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_sources_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON sources
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_registry_change();
+
+CREATE TRIGGER notify_categories_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON categories
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_registry_change();
+
+-- Knowledge graph writes notify knowledge_graph_changes (knowledge_graph_summary_mv refresh)
+CREATE OR REPLACE FUNCTION notify_knowledge_graph_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('knowledge_graph_changes', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER notify_source_concepts_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON source_concepts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_graph_change();
+
+CREATE TRIGGER notify_source_relationships_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON source_relationships
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_graph_change();
+
+CREATE TRIGGER notify_source_use_cases_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON source_use_cases
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_knowledge_graph_change();
+
+-- Category renames re-weight every source in the category
+CREATE OR REPLACE FUNCTION refresh_category_search_vectors()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE sources s SET
+        search_vector = build_source_search_vector(s.name, s.description, NEW.name || ' ' || NEW.display_name, s.tags)
+    WHERE s.category_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER refresh_category_search_vectors_trigger AFTER UPDATE OF name, display_name ON categories
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.display_name IS DISTINCT FROM NEW.display_name)
+    EXECUTE FUNCTION refresh_category_search_vectors();
+
+-- Auto-maintain citation counts (statement-level; deferred to commit when
+-- knowledge_registry.defer_citation_counts = 'on')
+-- Transient per-transaction state: UNLOGGED, emptied by every commit
+CREATE UNLOGGED TABLE IF NOT EXISTS citation_count_deltas (
+    txid BIGINT NOT NULL DEFAULT txid_current(),
+    source_id UUID NOT NULL,
+    delta INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_citation_count_deltas_txid ON citation_count_deltas(txid);
+
+CREATE UNLOGGED TABLE IF NOT EXISTS citation_count_flushes (
+    txid BIGINT PRIMARY KEY DEFAULT txid_current()
+);
+
+-- Add deltas[i] to the cited_by_count of source_ids[i]
+CREATE OR REPLACE FUNCTION apply_citation_count_deltas(source_ids UUID[], deltas INTEGER[])
+RETURNS VOID AS $$
+BEGIN
+    PERFORM bump_source_counters(source_ids, deltas);
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE OR REPLACE FUNCTION maintain_citation_counts()
 RETURNS TRIGGER AS $$
+DECLARE
+    changes TEXT;
+    source_ids UUID[];
+    deltas INTEGER[];
 BEGIN
-    IF TG_OP = 'INSERT' THEN
-        UPDATE sources SET cited_by_count = cited_by_count + 1 WHERE id = NEW.related_source_id;
+    -- Transition tables: new_rows (INSERT/UPDATE), old_rows (UPDATE/DELETE).
+    -- They are only visible to this function's own queries, so aggregate here.
+    changes := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT related_source_id AS source_id, 1 AS delta FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT related_source_id AS source_id, -1 AS delta FROM old_rows'
+        ELSE
+            'SELECT related_source_id AS source_id, 1 AS delta FROM new_rows
+             UNION ALL
+             SELECT related_source_id AS source_id, -1 AS delta FROM old_rows'
+    END;
+
+    EXECUTE format($sql$
+        SELECT array_agg(source_id ORDER BY source_id), array_agg(delta ORDER BY source_id)
+        FROM (
+            SELECT source_id, SUM(delta)::int AS delta
+            FROM (%s) changes
+            GROUP BY source_id
+            HAVING SUM(delta) <> 0
+        ) d
+    $sql$, changes) INTO source_ids, deltas;
+
+    IF source_ids IS NULL THEN
+        RETURN NULL;
     END IF;
-    
-    IF TG_OP = 'DELETE' THEN
-        UPDATE sources SET cited_by_count = GREATEST(cited_by_count - 1, 0) WHERE id = OLD.related_source_id;
+
+    IF current_setting('knowledge_registry.defer_citation_counts', true) = 'on' THEN
+        INSERT INTO citation_count_deltas (source_id, delta)
+        SELECT * FROM unnest(source_ids, deltas);
+        INSERT INTO citation_count_flushes DEFAULT VALUES ON CONFLICT (txid) DO NOTHING;
+    ELSE
+        PERFORM apply_citation_count_deltas(source_ids, deltas);
     END IF;
-    
-    RETURN COALESCE(NEW, OLD);
+
+    RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
 
-CREATE TRIGGER maintain_citation_counts_trigger AFTER INSERT OR DELETE ON source_relationships
-    FOR EACH ROW EXECUTE FUNCTION maintain_citation_counts();
+-- Fires once per transaction that queued deltas (one flush row per txid)
+CREATE OR REPLACE FUNCTION apply_deferred_citation_counts()
+RETURNS TRIGGER AS $$
+DECLARE
+    source_ids UUID[];
+    deltas INTEGER[];
+BEGIN
+    SELECT array_agg(source_id ORDER BY source_id), array_agg(delta ORDER BY source_id)
+    INTO source_ids, deltas
+    FROM (
+        SELECT source_id, SUM(delta)::int AS delta
+        FROM citation_count_deltas
+        WHERE txid = NEW.txid
+        GROUP BY source_id
+        HAVING SUM(delta) <> 0
+    ) d;
+
+    IF source_ids IS NOT NULL THEN
+        PERFORM apply_citation_count_deltas(source_ids, deltas);
+    END IF;
+    DELETE FROM citation_count_deltas WHERE txid = NEW.txid;
+    DELETE FROM citation_count_flushes WHERE txid = NEW.txid;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE CONSTRAINT TRIGGER apply_deferred_citation_counts AFTER INSERT ON citation_count_flushes
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION apply_deferred_citation_counts();
+
+-- Transition tables require one trigger per event
+CREATE TRIGGER maintain_citation_counts_insert AFTER INSERT ON source_relationships
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_citation_counts();
+
+CREATE TRIGGER maintain_citation_counts_update AFTER UPDATE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_citation_counts();
+
+CREATE TRIGGER maintain_citation_counts_delete AFTER DELETE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_citation_counts();
+
+-- Record which sources gained/lost relationships for incremental quality gates
+CREATE OR REPLACE FUNCTION record_relationship_changes()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO source_relationship_changes (related_source_id)
+        SELECT DISTINCT related_source_id FROM new_rows;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO source_relationship_changes (related_source_id)
+        SELECT DISTINCT related_source_id FROM old_rows;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER record_relationship_inserts AFTER INSERT ON source_relationships
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_relationship_changes();
+
+CREATE TRIGGER record_relationship_updates AFTER UPDATE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_relationship_changes();
+
+CREATE TRIGGER record_relationship_deletes AFTER DELETE ON source_relationships
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_relationship_changes();
 
 -- ============================================================================
 -- VIEWS
@@ -674,24 +1346,48 @@ FROM categories c
 WHERE c.total_sources > 0
 ORDER BY c.total_sources DESC;
 
--- Knowledge graph summary
+-- Knowledge graph summary (child tables aggregated per source, then joined 1:1)
 CREATE OR REPLACE VIEW knowledge_graph_summary AS
-SELECT 
+SELECT
     s.id as source_id,
     s.name as source_name,
     s.category_id,
-    COUNT(DISTINCT sc.id) as concept_count,
-    COUNT(DISTINCT sr.id) as relationship_count,
-    COUNT(DISTINCT suc.id) as use_case_count,
-    AVG(sc.relevance_score) as avg_concept_relevance,
-    s.cited_by_count,
+    COALESCE(c.concept_count, 0) as concept_count,
+    COALESCE(r.relationship_count, 0) as relationship_count,
+    COALESCE(u.use_case_count, 0) as use_case_count,
+    c.avg_concept_relevance,
+    COALESCE(t.cited_by_count, 0) as cited_by_count,
     s.difficulty_level,
-    ARRAY_AGG(DISTINCT sc.concept_name) FILTER (WHERE sc.relevance_score > 0.7) as key_concepts
+    c.key_concepts
 FROM sources s
-LEFT JOIN source_concepts sc ON s.id = sc.source_id
-LEFT JOIN source_relationships sr ON s.id = sr.source_id
-LEFT JOIN source_use_cases suc ON s.id = suc.source_id
-GROUP BY s.id, s.name, s.category_id, s.cited_by_count, s.difficulty_level;
+LEFT JOIN (
+    SELECT source_id,
+           COUNT(*) as concept_count,
+           AVG(relevance_score) as avg_concept_relevance,
+           ARRAY_AGG(DISTINCT concept_name) FILTER (WHERE relevance_score > 0.7) as key_concepts
+    FROM source_concepts
+    GROUP BY source_id
+) c ON c.source_id = s.id
+LEFT JOIN (
+    SELECT source_id, COUNT(*) as relationship_count
+    FROM source_relationships
+    GROUP BY source_id
+) r ON r.source_id = s.id
+LEFT JOIN (
+    SELECT source_id, COUNT(*) as use_case_count
+    FROM source_use_cases
+    GROUP BY source_id
+) u ON u.source_id = s.id
+LEFT JOIN source_counter_totals t ON t.source_id = s.id;
+
+-- Materialized copy for hot reads; the unique index allows REFRESH ... CONCURRENTLY.
+-- Refreshed (debounced) by the MCP server on knowledge_graph_changes notifications.
+CREATE MATERIALIZED VIEW IF NOT EXISTS knowledge_graph_summary_mv AS
+SELECT * FROM knowledge_graph_summary;
+
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_knowledge_graph_summary_mv_source ON knowledge_graph_summary_mv(source_id);
+CREATE INDEX IF NOT EXISTS idx_knowledge_graph_summary_mv_category ON knowledge_graph_summary_mv(category_id);
 
 -- Curriculum-ready sources (have prerequisites and difficulty level)
 CREATE OR REPLACE VIEW curriculum_ready_sources AS
@@ -709,22 +1405,26 @@ LEFT JOIN learning_paths lp ON s.category_id = lp.category_id
 WHERE s.difficulty_level IS NOT NULL
 GROUP BY s.id, s.name, s.difficulty_level, s.prerequisite_sources, s.estimated_read_time_minutes, c.name;
 
--- Customer stats
+-- Customer stats (usage totals from the daily rollup)
 CREATE OR REPLACE VIEW customer_stats AS
-SELECT 
+SELECT
     c.id,
     c.name,
     c.tier,
-    COUNT(DISTINCT ut.id) as total_queries,
-    COUNT(DISTINCT CASE WHEN ut.query_type = 'federated_query' THEN ut.id END) as federated_queries,
-    SUM(ut.cost_incurred) as total_cost,
-    COUNT(DISTINCT cc.id) as active_connectors,
-    COUNT(DISTINCT sf.id) as feedback_count
+    COALESCE(u.total_queries, 0) as total_queries,
+    COALESCE(u.federated_queries, 0) as federated_queries,
+    u.total_cost,
+    (SELECT COUNT(*) FROM customer_connectors cc WHERE cc.customer_id = c.id AND cc.is_active = true) as active_connectors,
+    (SELECT COUNT(*) FROM source_feedback sf WHERE sf.customer_id = c.id) as feedback_count
 FROM customers c
-LEFT JOIN usage_tracking ut ON c.id = ut.customer_id
-LEFT JOIN customer_connectors cc ON c.id = cc.customer_id AND cc.is_active = true
-LEFT JOIN source_feedback sf ON c.id = sf.customer_id
-GROUP BY c.id, c.name, c.tier;
+LEFT JOIN (
+    SELECT customer_id,
+           SUM(queries) as total_queries,
+           SUM(queries) FILTER (WHERE query_type = 'federated_query') as federated_queries,
+           SUM(cost_incurred) as total_cost
+    FROM usage_rollup_daily
+    GROUP BY customer_id
+) u ON u.customer_id = c.id;
 
 -- Pending approvals
 CREATE OR REPLACE VIEW pending_approvals AS
@@ -287,7 +287,7 @@ class TestSchemaV2(unittest.TestCase):
               citing_source, category_id, 'Citing Paper', 'https://example.com/citing', 'expert'))
         
         # Check initial citation count
-        self.cursor.execute("SELECT cited_by_count FROM sources WHERE id = %s", (cited_source,))
+        self.cursor.execute("SELECT COALESCE(SUM(cited_by_count), 0) FROM source_counters WHERE source_id = %s", (cited_source,))
         initial_count = self.cursor.fetchone()[0]
         
         # Create citation relationship
@@ -297,7 +297,7 @@ class TestSchemaV2(unittest.TestCase):
         """, (citing_source, cited_source, 'cites'))
         
         # Check updated citation count
-        self.cursor.execute("SELECT cited_by_count FROM sources WHERE id = %s", (cited_source,))
+        self.cursor.execute("SELECT COALESCE(SUM(cited_by_count), 0) FROM source_counters WHERE source_id = %s", (cited_source,))
         updated_count = self.cursor.fetchone()[0]
         
         self.assertEqual(updated_count, initial_count + 1, "Citation count should increment by 1")
@@ -788,9 +788,13 @@ class TestSchemaV2(unittest.TestCase):
         critical_triggers = [
             'update_categories_updated_at',
             'update_sources_updated_at',
-            'maintain_category_stats',
+            'maintain_category_stats_insert',
+            'maintain_category_stats_update',
+            'maintain_category_stats_delete',
             'calculate_authority_score',
-            'maintain_citation_counts_trigger'
+            'maintain_citation_counts_insert',
+            'maintain_citation_counts_delete',
+            'apply_deferred_citation_counts'
         ]
         
         self.cursor.execute("""
@@ -862,6 +866,175 @@ class TestSchemaV2(unittest.TestCase):
             """, (source2, source1, 'invalid_relationship'))
         
         print("  ✅ Relationship type constraint: builds_on/contradicts/applies/validates enforced")
+    
+    def test_29_category_statistics_statement_deltas(self):
+        """Test statement-level category statistics on bulk insert, move and delete"""
+        cat_a, cat_b = str(uuid.uuid4()), str(uuid.uuid4())
+        self.cursor.execute("""
+            INSERT INTO categories (id, name, display_name)
+            VALUES (%s, 'test_delta_a', 'Delta A'), (%s, 'test_delta_b', 'Delta B')
+        """, (cat_a, cat_b))
+        
+        # One multi-row statement: 3 theory + 2 practice
+        self.cursor.execute("""
+            INSERT INTO sources (category_id, name, url, source_type, epistemological_dimension)
+            SELECT %s, 'Delta ' || n, 'https://example.com/delta/' || n, 'expert',
+                   CASE WHEN n <= 3 THEN 'theory' ELSE 'practice' END
+            FROM generate_series(1, 5) AS n
+        """, (cat_a,))
+        
+        # Move one theory source to B as 'current', delete one practice source
+        self.cursor.execute("""
+            UPDATE sources SET category_id = %s, epistemological_dimension = 'current'
+            WHERE url = 'https://example.com/delta/1'
+        """, (cat_b,))
+        self.cursor.execute("DELETE FROM sources WHERE url = 'https://example.com/delta/5'")
+        # Update that moves nothing
+        self.cursor.execute("UPDATE sources SET description = 'x' WHERE category_id = %s", (cat_a,))
+        
+        self.cursor.execute("""
+            SELECT id, total_sources, theory_sources, practice_sources, current_sources
+            FROM categories WHERE id IN (%s, %s)
+        """, (cat_a, cat_b))
+        stats = {str(row[0]): row[1:] for row in self.cursor.fetchall()}
+        self.assertEqual(stats[cat_a], (3, 2, 1, 0), "A: 2 theory + 1 practice")
+        self.assertEqual(stats[cat_b], (1, 0, 0, 1), "B: 1 current")
+        
+        self.cursor.execute("SELECT recalculate_category_statistics()")
+        self.cursor.execute("""
+            SELECT id, total_sources, theory_sources, practice_sources, current_sources
+            FROM categories WHERE id IN (%s, %s)
+        """, (cat_a, cat_b))
+        recounted = {str(row[0]): row[1:] for row in self.cursor.fetchall()}
+        self.assertEqual(recounted, stats, "Deltas should match a full recount")
+        
+        print("  ✅ Category statistics deltas: bulk insert, move and delete match a full recount")
+    
+    def test_30_deferred_citation_counts(self):
+        """Test citation counts deferred to commit with knowledge_registry.defer_citation_counts"""
+        self.cursor.execute("SELECT id FROM categories LIMIT 1")
+        category_id = self.cursor.fetchone()[0]
+        
+        self.cursor.execute("""
+            INSERT INTO sources (category_id, name, url, source_type, epistemological_dimension)
+            SELECT %s, 'Graph ' || n, 'https://example.com/graph/' || n, 'expert', 'theory'
+            FROM generate_series(1, 4) AS n
+            RETURNING id
+        """, (category_id,))
+        cited, *citing = [row[0] for row in self.cursor.fetchall()]
+        
+        self.cursor.execute("SET LOCAL knowledge_registry.defer_citation_counts = 'on'")
+        for source_id in citing:
+            self.cursor.execute("""
+                INSERT INTO source_relationships (source_id, related_source_id, relationship_type)
+                VALUES (%s, %s, 'cites')
+            """, (source_id, cited))
+        
+        self.cursor.execute("SELECT COALESCE(SUM(cited_by_count), 0) FROM source_counters WHERE source_id = %s", (cited,))
+        self.assertEqual(self.cursor.fetchone()[0], 0, "Counts should wait for commit")
+        
+        # Fire the deferred trigger now instead of at commit
+        self.cursor.execute("SET CONSTRAINTS apply_deferred_citation_counts IMMEDIATE")
+        self.cursor.execute("SELECT COALESCE(SUM(cited_by_count), 0) FROM source_counters WHERE source_id = %s", (cited,))
+        self.assertEqual(self.cursor.fetchone()[0], 3, "Deferred deltas should be applied once")
+        
+        self.cursor.execute("SELECT COUNT(*) FROM citation_count_deltas WHERE txid = txid_current()")
+        self.assertEqual(self.cursor.fetchone()[0], 0, "Applied deltas should be cleared")
+        
+        print("  ✅ Deferred citation counts: applied once per transaction")
+    
+    def test_31_sharded_source_counters(self):
+        """Test counters live in sharded source_counters rows and compact into shard 0"""
+        self.cursor.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'sources' AND column_name IN ('cited_by_count', 'cross_reference_count')
+        """)
+        self.assertEqual(self.cursor.fetchall(), [], "Counters should be off the sources row")
+        
+        self.cursor.execute("SELECT id FROM categories LIMIT 1")
+        category_id = self.cursor.fetchone()[0]
+        self.cursor.execute("""
+            INSERT INTO sources (category_id, name, url, source_type)
+            VALUES (%s, 'Counted', 'https://example.com/counted', 'expert')
+            RETURNING id
+        """, (category_id,))
+        source_id = self.cursor.fetchone()[0]
+        
+        # Two bumps from this backend, plus rows other backends' shards would hold
+        self.cursor.execute("SELECT bump_source_counters(ARRAY[%s, %s]::uuid[], ARRAY[1, 1])", (source_id, source_id))
+        self.cursor.execute("SELECT record_source_access(ARRAY[%s]::uuid[])", (source_id,))
+        self.cursor.execute("""
+            INSERT INTO source_counters (source_id, shard, cited_by_count, access_count)
+            VALUES (%s, 101, 3, 5), (%s, 102, -1, 0)
+        """, (source_id, source_id))
+        
+        self.cursor.execute("SELECT cited_by_count, access_count FROM source_counter_totals WHERE source_id = %s", (source_id,))
+        self.assertEqual(self.cursor.fetchone(), (4, 6), "Totals should sum every shard")
+        
+        self.cursor.execute("SELECT compact_source_counters()")
+        self.assertGreaterEqual(self.cursor.fetchone()[0], 2)
+        self.cursor.execute("SELECT shard, cited_by_count, access_count FROM source_counters WHERE source_id = %s", (source_id,))
+        self.assertEqual(self.cursor.fetchall(), [(0, 4, 6)], "Compaction should fold shards into shard 0")
+        
+        print("  ✅ Source counters: sharded bumps, totals and compaction")
+    
+    def test_32_usage_partitions_and_rollups(self):
+        """Test usage_tracking is partitioned by month and rolled up on insert"""
+        self.cursor.execute("""
+            SELECT c.relname FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname IN ('usage_tracking', 'connector_query_log')
+        """)
+        self.assertEqual(len(self.cursor.fetchall()), 2, "Both usage logs should be partitioned")
+        
+        self.cursor.execute("SELECT * FROM create_monthly_partitions('usage_tracking')")
+        self.assertEqual(self.cursor.fetchall(), [], "Upcoming partitions should already exist")
+        
+        self.cursor.execute("""
+            INSERT INTO customers (name, email) VALUES ('Rollup Test', %s) RETURNING id
+        """, (f'rollup-{uuid.uuid4()}@example.com',))
+        customer_id = self.cursor.fetchone()[0]
+        
+        self.cursor.execute("""
+            INSERT INTO usage_tracking (customer_id, query_type, tokens_used, cost_incurred, response_time_ms)
+            VALUES (%s, 'semantic_search', 100, 0.01, 40), (%s, 'semantic_search', 50, 0.02, NULL),
+                   (%s, 'federated_query', 10, 0.50, 200)
+            RETURNING tableoid::regclass::text
+        """, (customer_id, customer_id, customer_id))
+        partitions = {row[0] for row in self.cursor.fetchall()}
+        self.assertEqual(len(partitions), 1)
+        self.assertNotEqual(partitions.pop(), 'usage_tracking', "Rows should land in a partition")
+        
+        self.cursor.execute("""
+            SELECT query_type, queries, tokens_used, timed_queries FROM usage_rollup_hourly
+            WHERE customer_id = %s ORDER BY query_type
+        """, (customer_id,))
+        self.assertEqual(self.cursor.fetchall(), [('federated_query', 1, 10, 1), ('semantic_search', 2, 150, 1)])
+        
+        self.cursor.execute("SELECT SUM(queries) FROM usage_rollup_daily WHERE customer_id = %s", (customer_id,))
+        self.assertEqual(self.cursor.fetchone()[0], 3)
+        
+        self.cursor.execute("SELECT total_queries, federated_queries FROM customer_stats WHERE id = %s", (customer_id,))
+        self.assertEqual(self.cursor.fetchone(), (3, 1), "customer_stats should read the rollups")
+        
+        # Past the last monthly partition (maintenance lapsed): DEFAULT catches it
+        self.cursor.execute("""
+            INSERT INTO usage_tracking (customer_id, query_type, created_at)
+            VALUES (%s, 'source_access', usage_month_start(now(), 8))
+            RETURNING tableoid::regclass::text
+        """, (customer_id,))
+        self.assertEqual(self.cursor.fetchone()[0], 'usage_tracking_default')
+        
+        self.cursor.execute("SELECT * FROM create_monthly_partitions('usage_tracking', 8)")
+        created = [row[0] for row in self.cursor.fetchall()]
+        self.cursor.execute("""
+            SELECT tableoid::regclass::text FROM usage_tracking
+            WHERE customer_id = %s AND query_type = 'source_access'
+        """, (customer_id,))
+        self.assertEqual(self.cursor.fetchone()[0], created[-1], "Row should move into its new month")
+        self.cursor.execute("SELECT SUM(queries) FROM usage_rollup_daily WHERE customer_id = %s", (customer_id,))
+        self.assertEqual(self.cursor.fetchone()[0], 4, "Moving rows should not roll them up twice")
+        
+        print("  ✅ Usage partitions: monthly partitions with hourly/daily rollups")
 
 
 def run_tests(verbose=False, test_filter=None):
@@ -2,9 +2,16 @@
 """
 Migrate sources from rdenz-knowledge-registry to FreDeSa PostgreSQL
 Maps sources.yaml structure to schema v2.1 epistemological framework
+
+Usage:
+    python3 migrate_sources_to_postgresql.py [limit]          # one source per transaction
+    python3 migrate_sources_to_postgresql.py [limit] --bulk   # COPY into staging, one set-based upsert
 """
 
-import sys
+import argparse
+import csv
+import io
+import time
 import yaml
 import psycopg2
 import psycopg2.extras
@@ -92,26 +99,86 @@ def ensure_categories_exist(cursor, sources: list):
     print("\n📊 Creating categories...")
     
     # Get unique categories
-    categories = set(s.get('category', 'Uncategorized') for s in sources)
+    categories = sorted(set(s.get('category', 'Uncategorized') for s in sources))
+    display_names = [category.replace('_', ' ') for category in categories]
+    descriptions = [f"Knowledge sources related to {name.lower()}" for name in display_names]
     
-    for category in sorted(categories):
-        # Check if exists
-        cursor.execute("SELECT id FROM categories WHERE name = %s", (category,))
-        if cursor.fetchone():
+    # One round trip: existing names hit ON CONFLICT, RETURNING lists the new ones
+    cursor.execute("""
+        INSERT INTO categories (name, display_name, description, sort_order)
+        SELECT name, display_name, description, 0
+        FROM unnest(%s::text[], %s::text[], %s::text[]) AS c(name, display_name, description)
+        ON CONFLICT (name) DO NOTHING
+        RETURNING name
+    """, (categories, display_names, descriptions))
+    created = {row[0] for row in cursor.fetchall()}
+    
+    for category in categories:
+        if category in created:
+            print(f"   ✅ {category}")
+        else:
             print(f"   ⏭️  {category} (already exists)")
-            continue
-        
-        # Create category
-        display_name = category.replace('_', ' ')
-        description = f"Knowledge sources related to {display_name.lower()}"
-        
-        cursor.execute("""
-            INSERT INTO categories (name, display_name, description, sort_order)
-            VALUES (%s, %s, %s, %s)
-            ON CONFLICT (name) DO NOTHING
-        """, (category, display_name, description, 0))
-        
-        print(f"   ✅ {category}")
+
+# Columns written by both migration paths, in build_source_row() order
+SOURCE_COLUMNS = (
+    'name', 'url', 'source_type', 'category_id',
+    'epistemological_dimension', 'difficulty_level',
+    'description', 'metadata', 'quality_score',
+    'is_active', 'environment_flags',
+    'word_count', 'file_count',
+)
+
+def build_source_row(source: dict, category_id) -> tuple:
+    """Transform a sources.yaml entry into a SOURCE_COLUMNS tuple (JSON columns as dicts)"""
+    category_name = source.get('category', 'Uncategorized')
+    
+    # Determine epistemological dimension
+    dimension = DIMENSION_MAPPING.get(category_name, 'current')
+    
+    # Determine authority type
+    authority_type = determine_authority_type(source)
+    
+    # Determine difficulty
+    difficulty = determine_difficulty(source)
+    
+    # Get ingestion data
+    ingestion = source.get('ingestion', {})
+    
+    # Get primary URL
+    urls = source.get('canonical_urls', [])
+    url = urls[0] if urls else 'https://example.com/unknown'
+    
+    # Quality score estimation (based on trust_score if available)
+    metadata = source.get('metadata', {})
+    quality_score = metadata.get('trust_score', 50.0)
+    
+    # Determine active status
+    is_active = source.get('status', 'active') == 'active'
+    
+    return (
+        source['name'],
+        url,
+        authority_type,  # Maps to source_type (official/expert/community)
+        category_id,
+        dimension,
+        difficulty,
+        source.get('description', ''),
+        {
+            'original_id': source['id'],
+            'tags': source.get('metadata_tags', []),
+            'ingestion_status': ingestion.get('status'),
+            'last_update': ingestion.get('last_update')
+        },
+        quality_score,
+        is_active,
+        {
+            'dev': True,
+            'staging': False,
+            'production': False
+        },
+        ingestion.get('words', 0),
+        ingestion.get('files_count', 0)
+    )
 
 def migrate_source(cursor, source: dict, category_map: dict) -> bool:
     """Migrate a single source to PostgreSQL"""
@@ -124,75 +191,19 @@ def migrate_source(cursor, source: dict, category_map: dict) -> bool:
             print(f"   ⚠️  {source['id']}: Category '{category_name}' not found")
             return False
         
-        # Determine epistemological dimension
-        dimension = DIMENSION_MAPPING.get(category_name, 'current')
-        
-        # Determine authority type
-        authority_type = determine_authority_type(source)
-        
-        # Determine difficulty
-        difficulty = determine_difficulty(source)
-        
-        # Get ingestion data
-        ingestion = source.get('ingestion', {})
-        words = ingestion.get('words', 0)
-        
-        # Get primary URL
-        urls = source.get('canonical_urls', [])
-        url = urls[0] if urls else 'https://example.com/unknown'
-        
-        # Quality score estimation (based on trust_score if available)
-        metadata = source.get('metadata', {})
-        quality_score = metadata.get('trust_score', 50.0)
-        
-        # Determine active status
-        is_active = source.get('status', 'active') == 'active'
+        row = build_source_row(source, category_id)
         
         # Check if URL already exists
-        cursor.execute("SELECT id FROM sources WHERE url = %s", (url,))
+        cursor.execute("SELECT id FROM sources WHERE url = %s", (row[1],))
         if cursor.fetchone():
             return None  # Already exists
         
         # Insert source
-        cursor.execute("""
-            INSERT INTO sources (
-                name, url, source_type, category_id,
-                epistemological_dimension, difficulty_level,
-                description, metadata, quality_score,
-                is_active, environment_flags,
-                word_count, file_count
-            ) VALUES (
-                %s, %s, %s, %s,
-                %s, %s,
-                %s, %s, %s,
-                %s, %s,
-                %s, %s
-            )
+        cursor.execute(f"""
+            INSERT INTO sources ({', '.join(SOURCE_COLUMNS)})
+            VALUES ({', '.join(['%s'] * len(SOURCE_COLUMNS))})
             RETURNING id
-        """, (
-            source['name'],
-            url,
-            authority_type,  # Maps to source_type (official/expert/community)
-            category_id,
-            dimension,
-            difficulty,
-            source.get('description', ''),
-            psycopg2.extras.Json({
-                'original_id': source['id'],
-                'tags': source.get('metadata_tags', []),
-                'ingestion_status': ingestion.get('status'),
-                'last_update': ingestion.get('last_update')
-            }),
-            quality_score,
-            is_active,
-            psycopg2.extras.Json({
-                'dev': True,
-                'staging': False,
-                'production': False
-            }),
-            words,
-            ingestion.get('files_count', 0)
-        ))
+        """, tuple(psycopg2.extras.Json(value) if isinstance(value, dict) else value for value in row))
         
         result = cursor.fetchone()
         return True if result else False
@@ -203,13 +214,105 @@ def migrate_source(cursor, source: dict, category_map: dict) -> bool:
         cursor.connection.rollback()
         return False
 
-def migrate_sources(limit: int = None):
+# Bulk path: rows are streamed with COPY into a temporary (never WAL-logged) staging
+# table, then moved into sources by one INSERT ... SELECT. Same skip rule as
+# migrate_source(): a URL already in sources, or earlier in the file, is skipped.
+STAGING_TABLE_SQL = """
+    CREATE TEMP TABLE source_migration_staging (
+        ord INTEGER NOT NULL,
+        name TEXT,
+        url TEXT,
+        source_type TEXT,
+        category_id UUID,
+        epistemological_dimension TEXT,
+        difficulty_level TEXT,
+        description TEXT,
+        metadata JSONB,
+        quality_score NUMERIC,
+        is_active BOOLEAN,
+        environment_flags JSONB,
+        word_count INTEGER,
+        file_count INTEGER
+    ) ON COMMIT DROP
+"""
+
+# Rows that would trip a sources constraint are counted as errors instead of
+# aborting the whole statement
+BULK_UPSERT_SQL = f"""
+    WITH invalid AS (
+        SELECT ord FROM source_migration_staging
+        WHERE name IS NULL OR length(name) > 500
+           OR round(quality_score) NOT BETWEEN 0 AND 100
+    ), candidates AS (
+        SELECT DISTINCT ON (url) *
+        FROM source_migration_staging
+        WHERE ord NOT IN (SELECT ord FROM invalid)
+        ORDER BY url, ord
+    ), inserted AS (
+        INSERT INTO sources ({', '.join(SOURCE_COLUMNS)})
+        SELECT {', '.join('c.' + column for column in SOURCE_COLUMNS)}
+        FROM candidates c
+        WHERE NOT EXISTS (SELECT 1 FROM sources s WHERE s.url = c.url)
+        ORDER BY c.ord
+        ON CONFLICT (url, category_id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM inserted),
+           (SELECT COUNT(*) FROM source_migration_staging) - (SELECT COUNT(*) FROM invalid),
+           (SELECT COUNT(*) FROM invalid)
+"""
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return value
+
+def copy_rows_csv(rows) -> io.StringIO:
+    """Encode (ord, *SOURCE_COLUMNS) rows as COPY CSV, with \\N for NULL"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow([_copy_value(value) for value in row])
+    buffer.seek(0)
+    return buffer
+
+def migrate_sources_bulk(cursor, sources: list, category_map: dict) -> dict:
+    """Migrate all sources with one COPY and one INSERT ... SELECT (caller commits)"""
+    rows = []
+    errors = 0
+    for ord_, source in enumerate(sources):
+        category_name = source.get('category', 'Uncategorized')
+        category_id = category_map.get(category_name)
+        if not category_id:
+            print(f"   ⚠️  {source.get('id', 'unknown')}: Category '{category_name}' not found")
+            errors += 1
+            continue
+        try:
+            rows.append((ord_,) + build_source_row(source, category_id))
+        except Exception as e:
+            print(f"   ❌ {source.get('id', 'unknown')}: {str(e)[:100]}")
+            errors += 1
+    
+    cursor.execute(STAGING_TABLE_SQL)
+    cursor.copy_expert(
+        f"COPY source_migration_staging (ord, {', '.join(SOURCE_COLUMNS)}) "
+        "FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+        copy_rows_csv(rows),
+    )
+    cursor.execute(BULK_UPSERT_SQL)
+    inserted, valid, invalid = cursor.fetchone()
+    return {'inserted': inserted, 'skipped': valid - inserted, 'errors': errors + invalid}
+
+def migrate_sources(limit: int = None, bulk: bool = False):
     """Main migration function"""
     print("="*70)
     print("📦 FreDeSa Knowledge Migration")
     print("="*70)
     print(f"Source: {SOURCES_FILE}")
     print(f"Target: fredesa-db-dev.postgres.database.azure.com")
+    print(f"Mode: {'bulk (COPY + set-based upsert)' if bulk else 'per source'}")
     
     # Load sources
     print(f"\n📖 Loading sources from {SOURCES_FILE.name}...")
@@ -237,25 +340,31 @@ def migrate_sources(limit: int = None):
         
         # Migrate sources
         print(f"\n🚀 Migrating sources...")
+        started = time.perf_counter()
         success_count = 0
         skip_count = 0
         error_count = 0
         
-        for i, source in enumerate(sources, 1):
-            if i % 10 == 0:
-                print(f"   Progress: {i}/{len(sources)}")
-            
-            result = migrate_source(cursor, source, category_map)
-            if result:
-                success_count += 1
-                conn.commit()  # Commit each success immediately
-            elif result is None:
-                skip_count += 1
-            else:
-                error_count += 1
+        if bulk:
+            counts = migrate_sources_bulk(cursor, sources, category_map)
+            success_count, skip_count, error_count = counts['inserted'], counts['skipped'], counts['errors']
+        else:
+            for i, source in enumerate(sources, 1):
+                if i % 10 == 0:
+                    print(f"   Progress: {i}/{len(sources)}")
+                
+                result = migrate_source(cursor, source, category_map)
+                if result:
+                    success_count += 1
+                    conn.commit()  # Commit each success immediately
+                elif result is None:
+                    skip_count += 1
+                else:
+                    error_count += 1
         
         # Final commit
         conn.commit()
+        elapsed = time.perf_counter() - started
         
         # Print summary
         print("\n" + "="*70)
@@ -265,6 +374,7 @@ def migrate_sources(limit: int = None):
         print(f"⏭️  Skipped (already exist): {skip_count}")
         print(f"❌ Errors: {error_count}")
         print(f"📈 Total processed: {len(sources)}")
+        print(f"⏱️  Elapsed: {elapsed:.1f}s")
         
         # Verify data
         cursor.execute("SELECT COUNT(*) FROM sources")
@@ -312,13 +422,13 @@ def migrate_sources(limit: int = None):
 
 if __name__ == '__main__':
     # Parse command line arguments
-    limit = None
-    if len(sys.argv) > 1:
-        try:
-            limit = int(sys.argv[1])
-            print(f"⚠️  LIMIT MODE: Migrating only first {limit} sources\n")
-        except ValueError:
-            print("Usage: python3 migrate_sources_to_postgresql.py [limit]")
-            sys.exit(1)
+    parser = argparse.ArgumentParser(description='Migrate sources.yaml into PostgreSQL')
+    parser.add_argument('limit', nargs='?', type=int, help='Migrate only the first N sources')
+    parser.add_argument('--bulk', action='store_true',
+                        help='COPY all sources into a staging table and insert them in one statement')
+    args = parser.parse_args()
+    
+    if args.limit:
+        print(f"⚠️  LIMIT MODE: Migrating only first {args.limit} sources\n")
     
-    migrate_sources(limit=limit)
+    migrate_sources(limit=args.limit, bulk=args.bulk)
@@ -8,25 +8,215 @@ Usage:
     python3 scripts/validation/quality_gates.py check-recency --dimension theory
     python3 scripts/validation/quality_gates.py detect-contradictions
     python3 scripts/validation/quality_gates.py report
+    python3 scripts/validation/quality_gates.py flag
+    python3 scripts/validation/quality_gates.py validate-all --output validation.json
+    python3 scripts/validation/quality_gates.py validate-all --full
 """
 
 import os
 import sys
 import argparse
 import psycopg2
+from psycopg2.extras import execute_values
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
 
+# Dimension-specific recency thresholds in years (None = no requirement)
+RECENCY_THRESHOLDS = {
+    'theory': 10,     # foundational knowledge stable
+    'practice': 2,    # tools/methods evolve
+    'current': 1,     # must be recent
+    'future': 2,      # forward-looking research
+    'history': None   # historical by nature
+}
+SUPPORTING_RELATIONSHIP_TYPES = ['cites', 'validates', 'supports']
+NEGATIVE_FEEDBACK_TYPES = ['accuracy_issue', 'outdated']
+
+# One statement per layer, shared by the single-source and bulk validators.
+# {where} is empty for a full-catalog run or "WHERE s.id = %(source_id)s".
+AUTHORITY_SQL = """
+    SELECT s.id, s.authority_score, s.source_type, s.name,
+           s.authority_score >= %(threshold)s AS passed
+    FROM sources s
+    {where}
+"""
+
+CROSS_REFERENCE_SQL = """
+    SELECT id, supporting_count,
+           CASE
+               WHEN supporting_count >= %(min_supporting)s THEN 'high'
+               WHEN supporting_count >= 2 THEN 'moderate'
+               WHEN supporting_count >= 1 THEN 'low'
+               ELSE 'single_source'
+           END AS confidence,
+           supporting_count >= LEAST(%(min_supporting)s, 2) AS passed
+    FROM (
+        SELECT s.id, COUNT(DISTINCT r.source_id) AS supporting_count
+        FROM sources s
+        LEFT JOIN source_relationships r
+          ON r.related_source_id = s.id
+         AND r.relationship_type = ANY(%(relationship_types)s)
+        {where}
+        GROUP BY s.id
+    ) counts
+"""
+
+RECENCY_SQL = """
+    SELECT s.id, s.name, s.epistemological_dimension, s.publication_year,
+           %(current_year)s - s.publication_year AS age_years,
+           t.threshold_years,
+           (t.threshold_years IS NULL
+            OR %(current_year)s - s.publication_year <= t.threshold_years) AS passed
+    FROM sources s
+    LEFT JOIN unnest(%(dimensions)s::text[], %(thresholds)s::int[]) AS t(dimension, threshold_years)
+      ON t.dimension = s.epistemological_dimension
+    {where}
+"""
+
+FEEDBACK_SQL = """
+    SELECT s.id,
+           COALESCE(f.flag_count, 0) AS flag_count,
+           f.avg_rating,
+           COALESCE(f.recent_feedback, '[]'::json) AS recent_feedback,
+           COALESCE(f.flag_count, 0) >= %(flag_threshold)s AS requires_review
+    FROM sources s
+    LEFT JOIN (
+        SELECT source_id,
+               COUNT(*) FILTER (WHERE feedback_type = ANY(%(feedback_types)s)) AS flag_count,
+               AVG(rating) FILTER (WHERE feedback_type = ANY(%(feedback_types)s)) AS avg_rating,
+               to_json((array_agg(
+                   json_build_object('type', feedback_type, 'rating', rating,
+                                     'text', feedback_text, 'date', created_at)
+                   ORDER BY created_at DESC
+               ))[1:5]) AS recent_feedback
+        FROM source_feedback
+        WHERE resolved = false {feedback_where}
+        GROUP BY source_id
+    ) f ON f.source_id = s.id
+    {where}
+"""
+
+SINGLE_SOURCE_WHERE = "WHERE s.id = %(source_id)s"
+
+# Sources the flag action marks for review; read as-is by the report.
+# A NULL threshold disables that rule.
+LOW_AUTHORITY_SQL = """
+    SELECT id, 'authority' AS rule,
+           'Authority score ' || authority_score || ' below threshold ' || %(threshold)s AS reason
+    FROM sources
+    WHERE authority_score < %(threshold)s
+      AND validation_status != 'deprecated'
+"""
+
+NEGATIVE_FEEDBACK_SQL = """
+    SELECT source_id AS id, 'customer_feedback' AS rule, NULL::text AS reason
+    FROM source_feedback
+    WHERE feedback_type = ANY(%(feedback_types)s)
+      AND resolved = false
+      AND rating < 3
+    GROUP BY source_id
+    HAVING COUNT(*) >= %(flag_threshold)s
+"""
+
+# One set-based UPDATE for every rule; rows already flagged with the same
+# reason are left alone so their triggers don't fire again
+FLAG_SQL = f"""
+    WITH targets AS (
+        SELECT id, array_agg(rule ORDER BY rule) AS rules, max(reason) AS reason
+        FROM ({LOW_AUTHORITY_SQL} UNION ALL {NEGATIVE_FEEDBACK_SQL}) matched
+        GROUP BY id
+    )
+    UPDATE sources s
+    SET validation_status = 'flagged',
+        deprecation_reason = COALESCE(t.reason, s.deprecation_reason)
+    FROM targets t
+    WHERE s.id = t.id
+      AND (s.validation_status, s.deprecation_reason)
+          IS DISTINCT FROM ('flagged', COALESCE(t.reason, s.deprecation_reason))
+    RETURNING s.id, s.name, t.rules, t.reason
+"""
+
+# Latest logged result per (source, layer), counted by layer and result
+VALIDATION_SUMMARY_SQL = """
+    SELECT validation_type, validation_result, COUNT(*)
+    FROM (
+        SELECT DISTINCT ON (source_id, validation_type) validation_type, validation_result
+        FROM source_validations
+        ORDER BY source_id, validation_type, created_at DESC
+    ) latest
+    GROUP BY validation_type, validation_result
+"""
+
+# Incremental runs: sources whose layer inputs changed since %(since)s
+# (the layer's watermark minus WATERMARK_OVERLAP)
+CHANGED_WHERE = {
+    'authority': "WHERE s.updated_at > %(since)s",
+    'cross_reference': """
+        WHERE s.updated_at > %(since)s
+           OR s.id IN (SELECT related_source_id FROM source_relationship_changes
+                       WHERE changed_at > %(since)s)
+    """,
+    # Also re-checks sources whose age crossed their threshold since the
+    # watermark's year: passed in prior_year, fails in current_year
+    'recency': """
+          AND (s.updated_at > %(since)s
+               OR s.publication_year + t.threshold_years
+                  BETWEEN %(prior_year)s AND %(current_year)s - 1)
+    """,
+    'customer_feedback': """
+        WHERE s.updated_at > %(since)s
+           OR s.id IN (SELECT source_id FROM source_feedback
+                       WHERE created_at > %(since)s OR resolved_at > %(since)s)
+    """,
+}
+# Re-read rows committed up to this long before a watermark (in-flight transactions)
+WATERMARK_OVERLAP = timedelta(seconds=30)
+
+# Latest logged validation per (source, layer), for sources unchanged since
+# that layer's watermark; merged with the rows re-evaluated this run
+LATEST_VALIDATIONS_SQL = """
+    SELECT DISTINCT ON (v.source_id, v.validation_type)
+           v.source_id, v.validation_type, v.validation_result, v.validation_details
+    FROM source_validations v
+    JOIN unnest(%(layers)s::text[], %(sinces)s::timestamptz[]) AS w(layer, since)
+      ON w.layer = v.validation_type
+    JOIN sources s ON s.id = v.source_id
+    WHERE s.updated_at <= w.since
+    ORDER BY v.source_id, v.validation_type, v.created_at DESC
+"""
+
+# (source_id, validation_type, validation_result, details) rows for source_validations
+ValidationLogRow = Tuple[str, str, str, Dict]
+
+# Layers covered by validate_all, with the result value that counts as a problem
+BULK_LAYERS = {
+    'authority': 'fail',
+    'cross_reference': 'warning',
+    'recency': 'warning',
+    'customer_feedback': 'warning',
+}
+
 class QualityValidator:
     """5-Layer Quality Validation Framework"""
     
-    def __init__(self, connection_string):
-        self.conn = psycopg2.connect(connection_string)
+    def __init__(self, connection_string=None, connection=None):
+        """
+        Args:
+            connection_string: PostgreSQL DSN to open a dedicated connection
+            connection: Existing psycopg2 connection (e.g. borrowed from a
+                pool); the caller keeps ownership and closes it
+        """
+        if connection is not None:
+            self.conn = connection
+            self._owns_connection = False
+        else:
+            self.conn = psycopg2.connect(connection_string)
+            self._owns_connection = True
         self.conn.autocommit = False
     
     def __del__(self):
-        if self.conn:
+        if getattr(self, '_owns_connection', True) and getattr(self, 'conn', None):
             self.conn.close()
     
     # ========================================================================
@@ -44,78 +234,55 @@ class QualityValidator:
         Returns:
             {'passed': bool, 'score': int, 'reason': str}
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            SELECT authority_score, source_type, name
-            FROM sources
-            WHERE id = %s
-        """, (source_id,))
+        rows = self._authority_rows(threshold, source_id)
         
-        result = cursor.fetchone()
-        cursor.close()
-        
-        if not result:
+        if not rows:
             return {
                 'passed': False,
                 'score': None,
                 'reason': f'Source {source_id} not found'
             }
         
-        score, source_type, name = result
-        
-        passed = score >= threshold
-        
-        validation = {
-            'passed': passed,
-            'score': score,
-            'source_type': source_type,
-            'name': name,
-            'threshold': threshold,
-            'reason': f"Authority score {score} {'meets' if passed else 'below'} threshold {threshold}"
-        }
+        validation = rows[0][2]
         
         # Log validation
-        self._log_validation(source_id, 'authority', 'pass' if passed else 'fail', validation)
+        self._log_validation(source_id, 'authority', rows[0][1], validation)
         
         return validation
     
+    def _authority_rows(
+        self, threshold: int, source_id: Optional[str] = None, changed: Optional[Dict] = None
+    ) -> List[Tuple[str, str, Dict]]:
+        """(source_id, result, validation) for one source, changed sources, or the whole catalog"""
+        validations = []
+        params = {'threshold': threshold, **(changed or {})}
+        where = CHANGED_WHERE['authority'] if changed else ''
+        for sid, score, source_type, name, passed in self._fetch(AUTHORITY_SQL, params, source_id, where):
+            validations.append((sid, 'pass' if passed else 'fail', {
+                'passed': passed,
+                'score': score,
+                'source_type': source_type,
+                'name': name,
+                'threshold': threshold,
+                'reason': f"Authority score {score} {'meets' if passed else 'below'} threshold {threshold}"
+            }))
+        return validations
+    
+    def bulk_validate_authority(self, threshold: int = 70, log: bool = True) -> Dict[str, Dict]:
+        """Layer 1 for every source in one query; returns {source_id: validation}"""
+        rows = self._authority_rows(threshold)
+        if log:
+            self._log_validations([(sid, 'authority', result, v) for sid, result, v in rows])
+        return {sid: v for sid, _, v in rows}
+    
     def block_low_authority_sources(self, threshold: int = 70) -> List[str]:
         """
-        Find and block sources below authority threshold
+        Flag sources below authority threshold (one set-based UPDATE)
         
         Returns:
-            List of blocked source IDs
+            List of newly blocked source IDs
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, name, authority_score, source_type
-            FROM sources
-            WHERE authority_score < %s
-              AND validation_status != 'deprecated'
-        """, (threshold,))
-        
-        low_authority = cursor.fetchall()
-        blocked = []
-        
-        for source_id, name, score, source_type in low_authority:
-            # Mark as flagged
-            cursor.execute("""
-                UPDATE sources
-                SET validation_status = 'flagged',
-                    deprecation_reason = %s
-                WHERE id = %s
-            """, (f"Authority score {score} below threshold {threshold}", source_id))
-            
-            blocked.append(source_id)
-            
-            print(f"⚠️  Blocked: {name} (score: {score}, type: {source_type})")
-        
-        self.conn.commit()
-        cursor.close()
-        
-        return blocked
+        return self.flag_sources(authority_threshold=threshold, flag_threshold=None)['authority']
     
     # ========================================================================
     # LAYER 2: CROSS-SOURCE VERIFICATION
@@ -132,49 +299,47 @@ class QualityValidator:
         Returns:
             {'confidence': str, 'supporting_count': int, 'passed': bool}
         """
-        cursor = self.conn.cursor()
+        rows = self._cross_reference_rows(min_supporting, source_id)
+        result, validation = (rows[0][1], rows[0][2]) if rows else self._cross_reference_validation(
+            0, 'single_source', False, min_supporting
+        )
         
-        # Count sources that cite or validate this source
-        cursor.execute("""
-            SELECT COUNT(DISTINCT source_id)
-            FROM source_relationships
-            WHERE related_source_id = %s
-              AND relationship_type IN ('cites', 'validates', 'supports')
-        """, (source_id,))
-        
-        supporting_count = cursor.fetchone()[0]
-        cursor.close()
-        
-        if supporting_count >= min_supporting:
-            confidence = 'high'
-            passed = True
-        elif supporting_count >= 2:
-            confidence = 'moderate'
-            passed = True
-        elif supporting_count >= 1:
-            confidence = 'low'
-            passed = False
-        else:
-            confidence = 'single_source'
-            passed = False
+        # Log validation
+        self._log_validation(source_id, 'cross_reference', result, validation)
         
-        validation = {
+        return validation
+    
+    @staticmethod
+    def _cross_reference_validation(supporting_count: int, confidence: str, passed: bool, min_supporting: int) -> Dict:
+        return {
             'confidence': confidence,
             'supporting_count': supporting_count,
             'min_required': min_supporting,
             'passed': passed,
             'reason': f"{supporting_count} supporting sources ({'≥' if passed else '<'} {min_supporting})"
         }
-        
-        # Log validation
-        self._log_validation(
-            source_id,
-            'cross_reference',
-            'pass' if passed else 'warning',
-            validation
-        )
-        
-        return validation
+    
+    def _cross_reference_rows(
+        self, min_supporting: int, source_id: Optional[str] = None, changed: Optional[Dict] = None
+    ) -> List[Tuple[str, str, Dict]]:
+        params = {
+            'min_supporting': min_supporting,
+            'relationship_types': SUPPORTING_RELATIONSHIP_TYPES,
+            **(changed or {})
+        }
+        where = CHANGED_WHERE['cross_reference'] if changed else ''
+        return [
+            (sid, 'pass' if passed else 'warning',
+             self._cross_reference_validation(count, confidence, passed, min_supporting))
+            for sid, count, confidence, passed in self._fetch(CROSS_REFERENCE_SQL, params, source_id, where)
+        ]
+    
+    def bulk_verify_cross_references(self, min_supporting: int = 3, log: bool = True) -> Dict[str, Dict]:
+        """Layer 2 for every source in one query; returns {source_id: validation}"""
+        rows = self._cross_reference_rows(min_supporting)
+        if log:
+            self._log_validations([(sid, 'cross_reference', result, v) for sid, result, v in rows])
+        return {sid: v for sid, _, v in rows}
     
     # ========================================================================
     # LAYER 3: RECENCY VALIDATION (Dimension-Specific)
@@ -194,52 +359,47 @@ class QualityValidator:
         Returns:
             {'passed': bool, 'age_years': float, 'dimension': str, 'threshold_years': int}
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            SELECT epistemological_dimension, publication_year, name
-            FROM sources
-            WHERE id = %s
-        """, (source_id,))
-        
-        result = cursor.fetchone()
-        cursor.close()
+        rows = self._fetch(RECENCY_SQL, self._recency_params(), source_id)
         
-        if not result:
+        if not rows:
             return {'passed': False, 'reason': 'Source not found'}
         
-        dimension, pub_year, name = result
-        
-        if not dimension or not pub_year:
+        validation = self._recency_validation(rows[0])
+        if validation is None:
             return {
                 'passed': False,
                 'reason': 'Missing epistemological dimension or publication year'
             }
         
-        # Calculate age
-        current_year = datetime.now().year
-        age_years = current_year - pub_year
-        
-        # Dimension-specific thresholds
-        thresholds = {
-            'theory': 10,
-            'practice': 2,
-            'current': 1,
-            'future': 2,
-            'history': None  # No threshold (historical content)
-        }
-        
-        threshold = thresholds.get(dimension)
+        # Log validation
+        self._log_validation(
+            source_id,
+            'recency',
+            'pass' if validation['passed'] else 'warning',
+            validation
+        )
         
+        return validation
+    
+    @staticmethod
+    def _recency_params() -> Dict:
+        return {
+            'current_year': datetime.now().year,
+            'dimensions': list(RECENCY_THRESHOLDS),
+            'thresholds': list(RECENCY_THRESHOLDS.values()),
+        }
+    
+    @staticmethod
+    def _recency_validation(row) -> Optional[Dict]:
+        """Validation dict for a RECENCY_SQL row (None if it cannot be evaluated)"""
+        _, _, dimension, pub_year, age_years, threshold, passed = row
+        if not dimension or not pub_year:
+            return None
         if threshold is None:
-            # Historical sources have no recency requirement
-            passed = True
             reason = 'Historical content (no recency requirement)'
         else:
-            passed = age_years <= threshold
             reason = f"Age {age_years} years {'≤' if passed else '>'} threshold {threshold} years"
-        
-        validation = {
+        return {
             'passed': passed,
             'age_years': age_years,
             'publication_year': pub_year,
@@ -247,16 +407,28 @@ class QualityValidator:
             'threshold_years': threshold,
             'reason': reason
         }
-        
-        # Log validation
-        self._log_validation(
-            source_id,
-            'recency',
-            'pass' if passed else 'warning',
-            validation
-        )
-        
-        return validation
+    
+    def _recency_rows(self, exclude_deprecated: bool = False, changed: Optional[Dict] = None) -> List[Tuple[str, str, Dict]]:
+        where = """
+            WHERE s.epistemological_dimension IS NOT NULL
+              AND s.publication_year IS NOT NULL
+        """
+        if exclude_deprecated:
+            where += "  AND s.validation_status != 'deprecated'"
+        if changed:
+            where += CHANGED_WHERE['recency']
+        rows = []
+        for row in self._fetch(RECENCY_SQL, {**self._recency_params(), **(changed or {})}, where=where):
+            validation = self._recency_validation(row)
+            rows.append((row[0], 'pass' if validation['passed'] else 'warning', {**validation, 'name': row[1]}))
+        return rows
+    
+    def bulk_validate_recency(self, exclude_deprecated: bool = False, log: bool = True) -> Dict[str, Dict]:
+        """Layer 3 for every dated source in one query; returns {source_id: validation}"""
+        rows = self._recency_rows(exclude_deprecated)
+        if log:
+            self._log_validations([(sid, 'recency', result, v) for sid, result, v in rows])
+        return {sid: v for sid, _, v in rows}
     
     def check_outdated_sources(self) -> List[Dict]:
         """
@@ -265,34 +437,19 @@ class QualityValidator:
         Returns:
             List of outdated sources with details
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, name, epistemological_dimension, publication_year
-            FROM sources
-            WHERE epistemological_dimension IS NOT NULL
-              AND publication_year IS NOT NULL
-              AND validation_status != 'deprecated'
-        """)
-        
-        sources = cursor.fetchall()
-        cursor.close()
-        
-        outdated = []
-        
-        for source_id, name, dimension, pub_year in sources:
-            validation = self.validate_recency(source_id)
-            
-            if not validation['passed']:
-                outdated.append({
-                    'id': source_id,
-                    'name': name,
-                    'dimension': dimension,
-                    'age_years': validation['age_years'],
-                    'threshold_years': validation['threshold_years']
-                })
+        validations = self.bulk_validate_recency(exclude_deprecated=True)
         
-        return outdated
+        return [
+            {
+                'id': source_id,
+                'name': validation['name'],
+                'dimension': validation['dimension'],
+                'age_years': validation['age_years'],
+                'threshold_years': validation['threshold_years']
+            }
+            for source_id, validation in validations.items()
+            if not validation['passed']
+        ]
     
     # ========================================================================
     # LAYER 4: CUSTOMER FEEDBACK MONITORING
@@ -309,107 +466,98 @@ class QualityValidator:
         Returns:
             {'requires_review': bool, 'flag_count': int, 'avg_rating': float}
         """
-        cursor = self.conn.cursor()
-        
-        # Count negative feedback
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as flag_count,
-                AVG(rating) as avg_rating
-            FROM source_feedback
-            WHERE source_id = %s
-              AND feedback_type IN ('accuracy_issue', 'outdated')
-              AND resolved = false
-        """, (source_id,))
-        
-        result = cursor.fetchone()
-        flag_count, avg_rating = result
-        
-        # Get recent feedback
-        cursor.execute("""
-            SELECT feedback_type, rating, feedback_text, created_at
-            FROM source_feedback
-            WHERE source_id = %s
-              AND resolved = false
-            ORDER BY created_at DESC
-            LIMIT 5
-        """, (source_id,))
-        
-        recent_feedback = cursor.fetchall()
-        cursor.close()
-        
-        requires_review = flag_count >= flag_threshold
-        
-        validation = {
-            'requires_review': requires_review,
-            'flag_count': flag_count,
-            'flag_threshold': flag_threshold,
-            'avg_rating': float(avg_rating) if avg_rating else None,
-            'recent_feedback': [
-                {
-                    'type': fb[0],
-                    'rating': fb[1],
-                    'text': fb[2],
-                    'date': fb[3].isoformat()
-                }
-                for fb in recent_feedback
-            ]
-        }
+        rows = self._feedback_rows(flag_threshold, source_id)
+        validation = rows[0][2] if rows else self._feedback_validation(0, None, [], False, flag_threshold)
         
         # Log validation
         self._log_validation(
             source_id,
             'customer_feedback',
-            'warning' if requires_review else 'pass',
+            'warning' if validation['requires_review'] else 'pass',
             validation
         )
         
         return validation
     
+    @staticmethod
+    def _feedback_validation(flag_count, avg_rating, recent_feedback, requires_review, flag_threshold) -> Dict:
+        return {
+            'requires_review': requires_review,
+            'flag_count': flag_count,
+            'flag_threshold': flag_threshold,
+            'avg_rating': float(avg_rating) if avg_rating else None,
+            'recent_feedback': recent_feedback
+        }
+    
+    def _feedback_rows(
+        self, flag_threshold: int, source_id: Optional[str] = None, changed: Optional[Dict] = None
+    ) -> List[Tuple[str, str, Dict]]:
+        sql = FEEDBACK_SQL.replace(
+            '{feedback_where}', 'AND source_id = %(source_id)s' if source_id else ''
+        )
+        params = {'flag_threshold': flag_threshold, 'feedback_types': NEGATIVE_FEEDBACK_TYPES, **(changed or {})}
+        where = CHANGED_WHERE['customer_feedback'] if changed else ''
+        return [
+            (sid, 'warning' if requires_review else 'pass',
+             self._feedback_validation(flag_count, avg_rating, recent, requires_review, flag_threshold))
+            for sid, flag_count, avg_rating, recent, requires_review in self._fetch(sql, params, source_id, where)
+        ]
+    
+    def bulk_check_customer_feedback(self, flag_threshold: int = 3, log: bool = True) -> Dict[str, Dict]:
+        """Layer 4 for every source in one query; returns {source_id: validation}"""
+        rows = self._feedback_rows(flag_threshold)
+        if log:
+            self._log_validations([(sid, 'customer_feedback', result, v) for sid, result, v in rows])
+        return {sid: v for sid, _, v in rows}
+    
     def flag_sources_for_review(self, flag_threshold: int = 3) -> List[str]:
         """
-        Find sources with excessive negative feedback
+        Flag sources with excessive negative feedback (one set-based UPDATE)
         
         Returns:
-            List of source IDs requiring manual review
+            List of source IDs newly flagged for manual review
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            SELECT source_id, COUNT(*) as flag_count
-            FROM source_feedback
-            WHERE feedback_type IN ('accuracy_issue', 'outdated')
-              AND resolved = false
-              AND rating < 3
-            GROUP BY source_id
-            HAVING COUNT(*) >= %s
-        """, (flag_threshold,))
-        
-        flagged = cursor.fetchall()
-        
-        flagged_ids = []
-        for source_id, count in flagged:
-            # Update validation status
-            cursor.execute("""
-                UPDATE sources
-                SET validation_status = 'flagged'
-                WHERE id = %s
-            """, (source_id,))
-            
-            flagged_ids.append(source_id)
-            
-            print(f"⚠️  Flagged for review: {source_id} ({count} negative feedback)")
-        
-        self.conn.commit()
-        cursor.close()
+        return self.flag_sources(authority_threshold=None, flag_threshold=flag_threshold)['customer_feedback']
+    
+    def flag_sources(self, authority_threshold: Optional[int] = 70,
+                     flag_threshold: Optional[int] = 3) -> Dict[str, List[str]]:
+        """
+        Flag low-authority sources and sources with excessive negative
+        feedback in one UPDATE and one commit (None disables a rule)
         
-        return flagged_ids
+        Returns:
+            {'authority': [source_id, ...], 'customer_feedback': [source_id, ...]}
+            for sources whose status or reason changed
+        """
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(FLAG_SQL, {
+                'threshold': authority_threshold,
+                'flag_threshold': flag_threshold,
+                'feedback_types': NEGATIVE_FEEDBACK_TYPES,
+            })
+            updated = cursor.fetchall()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        
+        flagged = {'authority': [], 'customer_feedback': []}
+        for source_id, name, rules, reason in updated:
+            for rule in rules:
+                flagged[rule].append(source_id)
+            print(f"⚠️  Flagged: {name} ({reason or 'negative customer feedback'})")
+        
+        return flagged
     
     # ========================================================================
     # LAYER 5: CONTRADICTION DETECTION (LLM-Based)
     # ========================================================================
     
-    def detect_contradictions(self, source_id: str) -> Dict:
+    @staticmethod
+    def detect_contradictions(source_id: str) -> Dict:
         """
         Detect contradictions between sources (LLM-based)
         
@@ -493,20 +641,33 @@ class QualityValidator:
         print("  Layer 5: Contradiction detection...")
         results['layers']['contradictions'] = self.detect_contradictions(source_id)
         
-        # Determine overall status
+        self.summarize_layers(results)
+        
+        print(f"\n  ✅ Validation complete: {results['overall_status']}")
+        if results['critical_failures']:
+            print(f"  ❌ Critical failures: {', '.join(results['critical_failures'])}")
+        if results['warnings']:
+            print(f"  ⚠️  Warnings: {', '.join(results['warnings'])}")
+        
+        return results
+    
+    @staticmethod
+    def summarize_layers(results: Dict) -> Dict:
+        """Set overall_status, passed, critical_failures and warnings from results['layers']"""
+        layers = results['layers']
         critical_failures = []
         warnings = []
         
-        if not results['layers']['authority']['passed']:
+        if not layers['authority']['passed']:
             critical_failures.append('authority')
         
-        if not results['layers']['cross_reference']['passed']:
+        if not layers['cross_reference']['passed']:
             warnings.append('cross_reference')
         
-        if not results['layers']['recency']['passed']:
+        if not layers['recency']['passed']:
             warnings.append('recency')
         
-        if results['layers']['customer_feedback']['requires_review']:
+        if layers['customer_feedback']['requires_review']:
             warnings.append('customer_feedback')
         
         # Overall pass/fail
@@ -522,13 +683,6 @@ class QualityValidator:
         
         results['critical_failures'] = critical_failures
         results['warnings'] = warnings
-        
-        print(f"\n  ✅ Validation complete: {results['overall_status']}")
-        if critical_failures:
-            print(f"  ❌ Critical failures: {', '.join(critical_failures)}")
-        if warnings:
-            print(f"  ⚠️  Warnings: {', '.join(warnings)}")
-        
         return results
     
     # ========================================================================
@@ -601,58 +755,265 @@ class QualityValidator:
     # REPORTING
     # ========================================================================
     
-    def generate_quality_report(self) -> Dict:
+    def generate_quality_report(self, authority_threshold: int = 70, flag_threshold: int = 3) -> Dict:
         """
         Generate comprehensive quality report for all sources
         
+        Read-only: aggregate queries in one REPEATABLE READ snapshot, no row
+        locks or writes, so dashboards can poll it. Sources are flagged by
+        flag_sources(); 'validation_summary' counts the latest logged result
+        per source and layer (refreshed by validate_all).
+        
         Returns:
             {
                 'total_sources': int,
                 'by_status': {...},
                 'failed_authority': [...],
                 'outdated': [...],
-                'flagged_feedback': [...]
+                'flagged_feedback': [...],
+                'validation_summary': {layer: {result: int}}
             }
         """
-        cursor = self.conn.cursor()
-        
-        # Total sources
-        cursor.execute("SELECT COUNT(*) FROM sources")
-        total = cursor.fetchone()[0]
-        
-        # By validation status
-        cursor.execute("""
-            SELECT validation_status, COUNT(*)
-            FROM sources
-            GROUP BY validation_status
+        params = {
+            **self._recency_params(),
+            'threshold': authority_threshold,
+            'flag_threshold': flag_threshold,
+            'feedback_types': NEGATIVE_FEEDBACK_TYPES,
+        }
+        recency = RECENCY_SQL.format(where="""
+            WHERE s.epistemological_dimension IS NOT NULL
+              AND s.publication_year IS NOT NULL
+              AND s.validation_status != 'deprecated'
         """)
-        by_status = dict(cursor.fetchall())
         
-        cursor.close()
+        # SET TRANSACTION must be the first statement of a fresh transaction
+        self.conn.rollback()
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            
+            cursor.execute("""
+                SELECT validation_status, COUNT(*)
+                FROM sources
+                GROUP BY validation_status
+            """)
+            by_status = dict(cursor.fetchall())
+            
+            cursor.execute(f"SELECT id FROM ({LOW_AUTHORITY_SQL}) low_authority", params)
+            failed_authority = [row[0] for row in cursor.fetchall()]
+            
+            cursor.execute(f"""
+                SELECT id, name, epistemological_dimension, age_years, threshold_years
+                FROM ({recency}) recency
+                WHERE NOT passed
+            """, params)
+            outdated = [
+                {
+                    'id': source_id,
+                    'name': name,
+                    'dimension': dimension,
+                    'age_years': age_years,
+                    'threshold_years': threshold_years
+                }
+                for source_id, name, dimension, age_years, threshold_years in cursor.fetchall()
+            ]
+            
+            cursor.execute(f"SELECT id FROM ({NEGATIVE_FEEDBACK_SQL}) negative_feedback", params)
+            flagged_feedback = [row[0] for row in cursor.fetchall()]
+            
+            cursor.execute(VALIDATION_SUMMARY_SQL)
+            validation_summary = {}
+            for layer, result, count in cursor.fetchall():
+                validation_summary.setdefault(layer, {})[result] = count
+        finally:
+            cursor.close()
+            self.conn.rollback()
         
-        report = {
+        return {
             'timestamp': datetime.now().isoformat(),
-            'total_sources': total,
+            'total_sources': sum(by_status.values()),
             'by_status': by_status,
-            'failed_authority': self.block_low_authority_sources(threshold=70),
-            'outdated': self.check_outdated_sources(),
-            'flagged_feedback': self.flag_sources_for_review(flag_threshold=3)
+            'failed_authority': failed_authority,
+            'outdated': outdated,
+            'flagged_feedback': flagged_feedback,
+            'validation_summary': validation_summary
+        }
+    
+    # ========================================================================
+    # BULK VALIDATION
+    # ========================================================================
+    
+    def validate_all(self, log: bool = True, incremental: bool = False) -> Dict:
+        """
+        Run layers 1-4 over the whole catalog: one query per layer and a
+        single batched insert of every validation row in one transaction
+        
+        With incremental=True, a layer whose watermark was recorded with the
+        same parameters only re-evaluates sources changed since the mark
+        (see CHANGED_WHERE); every other source keeps its latest logged
+        result. Logged runs advance the watermarks in the same transaction
+        as the validation rows.
+        
+        Returns:
+            {
+                'timestamp': str,
+                'total_sources': int,
+                'layers': {layer: {source_id: validation}},
+                'summary': {layer: {'pass': int, 'fail' | 'warning': int}},
+                'reevaluated': {layer: int},
+                'incremental_since': {layer: str | None}
+            }
+        """
+        started_at = self._fetch("SELECT now()", {})[0][0]
+        current_year = datetime.now().year
+        layer_params = {
+            'authority': {'threshold': 70},
+            'cross_reference': {'min_supporting': 3},
+            'recency': {'thresholds': RECENCY_THRESHOLDS},
+            'customer_feedback': {'flag_threshold': 3},
+        }
+        
+        watermarks = self._load_watermarks() if incremental else {}
+        changed = {}
+        for layer, params in layer_params.items():
+            mark = watermarks.get(layer)
+            if mark and mark['params'] == params:
+                changed[layer] = {
+                    'since': mark['validated_through'] - WATERMARK_OVERLAP,
+                    'prior_year': mark['validated_year'],
+                }
+        
+        layer_rows = {
+            'authority': self._authority_rows(70, changed=changed.get('authority')),
+            'cross_reference': self._cross_reference_rows(3, changed=changed.get('cross_reference')),
+            'recency': self._recency_rows(changed=changed.get('recency')),
+            'customer_feedback': self._feedback_rows(3, changed=changed.get('customer_feedback')),
         }
         
-        return report
+        if log:
+            self._log_validations([
+                (sid, layer, result, validation)
+                for layer, rows in layer_rows.items()
+                for sid, result, validation in rows
+            ], commit=False)
+            self._save_watermarks(started_at, current_year, layer_params)
+            self.conn.commit()
+        
+        merged = {layer: {} for layer in layer_rows}
+        if changed:
+            for sid, layer, result, validation in self._fetch(LATEST_VALIDATIONS_SQL, {
+                'layers': list(changed),
+                'sinces': [marks['since'] for marks in changed.values()],
+            }):
+                merged[layer][sid] = (result, validation)
+        for layer, rows in layer_rows.items():
+            merged[layer].update((sid, (result, validation)) for sid, result, validation in rows)
+        
+        summary = {}
+        for layer, problem in BULK_LAYERS.items():
+            problems = sum(1 for result, _ in merged[layer].values() if result == problem)
+            summary[layer] = {'pass': len(merged[layer]) - problems, problem: problems}
+        
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'total_sources': len(merged['authority']),
+            'layers': {
+                layer: {sid: validation for sid, (_, validation) in results.items()}
+                for layer, results in merged.items()
+            },
+            'summary': summary,
+            'reevaluated': {layer: len(rows) for layer, rows in layer_rows.items()},
+            'incremental_since': {
+                layer: changed[layer]['since'].isoformat() if layer in changed else None
+                for layer in layer_rows
+            }
+        }
+    
+    def _load_watermarks(self) -> Dict[str, Dict]:
+        """Per-layer watermarks from quality_gate_watermarks"""
+        rows = self._fetch("""
+            SELECT layer, validated_through, validated_year, params
+            FROM quality_gate_watermarks
+        """, {})
+        return {
+            layer: {'validated_through': through, 'validated_year': year, 'params': params}
+            for layer, through, year, params in rows
+        }
+    
+    def _save_watermarks(self, validated_through: datetime, validated_year: int, layer_params: Dict[str, Dict]):
+        """Advance watermarks (caller commits, together with the validation rows)"""
+        cursor = self.conn.cursor()
+        try:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO quality_gate_watermarks (layer, validated_through, validated_year, params)
+                VALUES %s
+                ON CONFLICT (layer) DO UPDATE SET
+                    validated_through = EXCLUDED.validated_through,
+                    validated_year = EXCLUDED.validated_year,
+                    params = EXCLUDED.params,
+                    updated_at = NOW()
+                """,
+                [
+                    (layer, validated_through, validated_year, json.dumps(params))
+                    for layer, params in layer_params.items()
+                ],
+                template="(%s, %s, %s, %s::jsonb)"
+            )
+            # Changes older than the new cross-reference watermark are no longer needed
+            cursor.execute(
+                "DELETE FROM source_relationship_changes WHERE changed_at < %s",
+                (validated_through - WATERMARK_OVERLAP,)
+            )
+        finally:
+            cursor.close()
+    
+    def _fetch(self, sql: str, params: Dict, source_id: Optional[str] = None, where: str = '') -> List[tuple]:
+        """Run a layer query for one source (source_id) or the catalog (where)"""
+        if source_id is not None:
+            where = SINGLE_SOURCE_WHERE
+            params = {**params, 'source_id': source_id}
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(sql.format(where=where), params)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        # Read-only: end the snapshot so idle connections hold no locks
+        self.conn.rollback()
+        return rows
     
     def _log_validation(self, source_id: str, validation_type: str, result: str, details: Dict):
         """Log validation to source_validations table"""
+        self._log_validations([(source_id, validation_type, result, details)])
+    
+    def _log_validations(self, rows: List[ValidationLogRow], page_size: int = 1000, commit: bool = True):
+        """Log many validations in one multi-row INSERT per page and one commit"""
+        if not rows:
+            return
         cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO source_validations
-            (source_id, validation_type, validation_result, validation_details)
-            VALUES (%s, %s, %s, %s)
-        """, (source_id, validation_type, result, json.dumps(details)))
-        
-        self.conn.commit()
-        cursor.close()
+        try:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO source_validations
+                (source_id, validation_type, validation_result, validation_details)
+                VALUES %s
+                """,
+                [
+                    (source_id, validation_type, result, json.dumps(details, default=str))
+                    for source_id, validation_type, result, details in rows
+                ],
+                page_size=page_size
+            )
+            if commit:
+                self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
 
 
 def main():
@@ -660,13 +1021,15 @@ def main():
     parser = argparse.ArgumentParser(description='Quality Validation Automation')
     parser.add_argument('command', choices=[
         'validate', 'check-authority', 'check-recency', 'check-feedback',
-        'enforce-gate', 'report'
+        'enforce-gate', 'report', 'flag', 'validate-all'
     ], help='Validation command')
     parser.add_argument('--source-id', type=str, help='Source UUID to validate')
     parser.add_argument('--dimension', type=str, help='Epistemological dimension filter')
     parser.add_argument('--environment', type=str, choices=['staging', 'production'], 
                        help='Target environment for quality gate')
     parser.add_argument('--output', type=str, help='Save report to JSON file')
+    parser.add_argument('--full', action='store_true',
+                       help='validate-all: re-evaluate every source instead of only those changed since the last run')
     
     args = parser.parse_args()
     
@@ -735,15 +1098,33 @@ def main():
         passed = validator.enforce_quality_gates(args.source_id, args.environment)
         sys.exit(0 if passed else 1)
     
+    elif args.command == 'validate-all':
+        result = validator.validate_all(incremental=not args.full)
+        
+        print(f"\n📊 Validated {result['total_sources']} sources")
+        print("  re-evaluated: " + ", ".join(f"{count} {layer}" for layer, count in result['reevaluated'].items()))
+        for layer, counts in result['summary'].items():
+            print(f"  {layer}: " + ", ".join(f"{count} {status}" for status, count in counts.items()))
+        
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(result, f, indent=2, default=str)
+            print(f"📁 Results saved to: {args.output}")
+    
+    elif args.command == 'flag':
+        flagged = validator.flag_sources()
+        print(f"\n⚠️  Flagged {len(flagged['authority'])} low-authority sources, "
+              f"{len(flagged['customer_feedback'])} for negative feedback")
+    
     elif args.command == 'report':
         report = validator.generate_quality_report()
         
         if args.output:
             with open(args.output, 'w') as f:
-                json.dump(report, f, indent=2)
+                json.dump(report, f, indent=2, default=str)
             print(f"📁 Report saved to: {args.output}")
         else:
-            print(json.dumps(report, indent=2))
+            print(json.dumps(report, indent=2, default=str))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Parallel Validation Pipeline
+Runs the quality-gate layers for batches of sources across a bounded worker
+pool: the four database-backed layers of each source run concurrently, each
+on a connection borrowed from a shared pool, and results stream as NDJSON
+as each source completes
+
+Usage:
+    python3 scripts/validation/validation_pipeline.py run --source-file promotion_batch.txt
+    python3 scripts/validation/validation_pipeline.py run --validation-status unvalidated --workers 16 --output results.ndjson
+    python3 scripts/validation/validation_pipeline.py benchmark --limit 200 --workers 1 4 8 16
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+from psycopg2.pool import ThreadedConnectionPool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from quality_gates import QualityValidator
+
+# Independent database-backed layers: result key -> QualityValidator method
+PIPELINE_LAYERS = {
+    'authority': 'validate_authority_score',
+    'cross_reference': 'verify_cross_references',
+    'recency': 'validate_recency',
+    'customer_feedback': 'check_customer_feedback',
+}
+
+
+class ValidationPipeline:
+    """Validate many sources concurrently on a shared connection pool"""
+
+    def __init__(self, connection_string: Optional[str] = None, workers: int = 8,
+                 max_pending_sources: Optional[int] = None, pool=None):
+        """
+        Args:
+            connection_string: PostgreSQL DSN for the connection pool
+            workers: Worker threads, and the pool's maximum connections
+            max_pending_sources: Sources in flight at once (default: 2 x workers);
+                bounds memory when validating large batches
+            pool: Existing pool with getconn()/putconn() instead of a new one
+        """
+        self.workers = workers
+        self.max_pending_sources = max_pending_sources or workers * 2
+        self._owns_pool = pool is None
+        self.pool = pool or ThreadedConnectionPool(1, workers, connection_string)
+
+    def close(self):
+        if self._owns_pool:
+            self.pool.closeall()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def _connection(self):
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def _run_layer(self, source_id: str, layer: str) -> Dict:
+        with self._connection() as conn:
+            validator = QualityValidator(connection=conn)
+            return getattr(validator, PIPELINE_LAYERS[layer])(source_id)
+
+    def run(self, source_ids: Iterable[str]) -> Iterator[Dict]:
+        """
+        Validate sources, yielding each result as soon as all its layers finish
+        (completion order, not input order)
+
+        Results have the shape of QualityValidator.validate_source_complete,
+        plus 'duration_ms'. A layer that raises yields overall_status 'ERROR'
+        with the message under 'errors'.
+        """
+        source_ids = iter(source_ids)
+        sequence = itertools.count()
+        in_flight = {}  # sequence -> partial result
+        pending = {}    # future -> (sequence, layer)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='validation') as executor:
+            def submit_next() -> bool:
+                source_id = next(source_ids, None)
+                if source_id is None:
+                    return False
+                key = next(sequence)
+                in_flight[key] = {
+                    'source_id': source_id,
+                    'timestamp': datetime.now().isoformat(),
+                    'layers': {'contradictions': QualityValidator.detect_contradictions(source_id)},
+                    'started': time.perf_counter(),
+                }
+                for layer in PIPELINE_LAYERS:
+                    pending[executor.submit(self._run_layer, source_id, layer)] = (key, layer)
+                return True
+
+            try:
+                while len(in_flight) < self.max_pending_sources and submit_next():
+                    pass
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key, layer = pending.pop(future)
+                        result = in_flight[key]
+                        try:
+                            result['layers'][layer] = future.result()
+                        except Exception as e:
+                            result.setdefault('errors', {})[layer] = str(e)
+
+                        if len(result['layers']) + len(result.get('errors', {})) <= len(PIPELINE_LAYERS):
+                            continue
+
+                        del in_flight[key]
+                        yield self._finish(result)
+                        submit_next()
+            finally:
+                # Consumer stopped early: don't run layers nobody will read
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _finish(result: Dict) -> Dict:
+        result['duration_ms'] = round((time.perf_counter() - result.pop('started')) * 1000, 2)
+        if result.get('errors'):
+            result['overall_status'] = 'ERROR'
+            result['passed'] = False
+            return result
+        return QualityValidator.summarize_layers(result)
+
+    def select_source_ids(self, validation_status: Optional[str] = None, limit: Optional[int] = None) -> List[str]:
+        """Source IDs to validate, optionally filtered by validation_status"""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    SELECT id FROM sources
+                    WHERE %(status)s IS NULL OR validation_status = %(status)s
+                    ORDER BY id
+                    LIMIT %(limit)s
+                """, {'status': validation_status, 'limit': limit})
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+            conn.rollback()
+        return [str(row[0]) for row in rows]
+
+
+def write_ndjson(results: Iterable[Dict], stream: IO[str]) -> Dict[str, int]:
+    """Write one JSON object per line, flushing each; returns counts by overall_status"""
+    counts = {}
+    for result in results:
+        stream.write(json.dumps(result, default=str) + '\n')
+        stream.flush()
+        counts[result['overall_status']] = counts.get(result['overall_status'], 0) + 1
+    return counts
+
+
+def benchmark(conn_str: str, limit: int, worker_counts: List[int]) -> Dict:
+    """
+    Sources/second for sequential validate_source_complete vs the pipeline at
+    each worker count, over the same sources
+
+    Note: every run logs its validations to source_validations - point
+    DATABASE_URL at a local database.
+    """
+    with ValidationPipeline(conn_str, workers=1) as pipeline:
+        source_ids = pipeline.select_source_ids(limit=limit)
+    if not source_ids:
+        raise ValueError('No sources to benchmark')
+
+    results = {'sources': len(source_ids), 'runs': {}}
+
+    validator = QualityValidator(conn_str)
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull  # validate_source_complete prints progress
+        try:
+            for source_id in source_ids:
+                validator.validate_source_complete(source_id)
+        finally:
+            sys.stdout = stdout
+    elapsed = time.perf_counter() - start
+    results['runs']['sequential'] = {'seconds': round(elapsed, 3), 'sources_per_second': round(len(source_ids) / elapsed, 1)}
+
+    for workers in worker_counts:
+        with ValidationPipeline(conn_str, workers=workers) as pipeline:
+            start = time.perf_counter()
+            for _ in pipeline.run(source_ids):
+                pass
+            elapsed = time.perf_counter() - start
+        results['runs'][f'pipeline_{workers}'] = {
+            'seconds': round(elapsed, 3),
+            'sources_per_second': round(len(source_ids) / elapsed, 1)
+        }
+
+    return results
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description='Parallel Quality Validation Pipeline')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Validate sources and stream NDJSON results')
+    run_parser.add_argument('--source-id', action='append', default=[], help='Source UUID (repeatable)')
+    run_parser.add_argument('--source-file', type=str, help="File with one source UUID per line ('-' for stdin)")
+    run_parser.add_argument('--validation-status', type=str,
+                           choices=['unvalidated', 'validated', 'flagged', 'deprecated'],
+                           help='Validate every source with this status')
+    run_parser.add_argument('--workers', type=int, default=8, help='Worker threads / pooled connections (default: 8)')
+    run_parser.add_argument('--output', type=str, help='Write NDJSON to file instead of stdout')
+
+    bench_parser = subparsers.add_parser('benchmark', help='Measure throughput against the configured database')
+    bench_parser.add_argument('--limit', type=int, default=100, help='Sources to validate per run (default: 100)')
+    bench_parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16], help='Worker counts to compare')
+    bench_parser.add_argument('--report', type=str, help='Save benchmark results to JSON file')
+
+    args = parser.parse_args()
+
+    conn_str = os.getenv('DATABASE_URL')
+    if not conn_str:
+        print("❌ DATABASE_URL not set", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == 'benchmark':
+        results = benchmark(conn_str, args.limit, args.workers)
+        print(f"\n⏱️  Validated {results['sources']} sources per run")
+        for name, run in results['runs'].items():
+            print(f"  {name}: {run['seconds']}s ({run['sources_per_second']} sources/s)")
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"📁 Results saved to: {args.report}")
+        return
+
+    source_ids = list(args.source_id)
+    if args.source_file:
+        f = sys.stdin if args.source_file == '-' else open(args.source_file)
+        with f:
+            source_ids.extend(line.strip() for line in f if line.strip())
+
+    with ValidationPipeline(conn_str, workers=args.workers) as pipeline:
+        if args.validation_status:
+            source_ids.extend(pipeline.select_source_ids(args.validation_status))
+        if not source_ids:
+            print("❌ No sources: use --source-id, --source-file or --validation-status", file=sys.stderr)
+            sys.exit(1)
+
+        output = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            counts = write_ndjson(pipeline.run(source_ids), output)
+        finally:
+            if args.output:
+                output.close()
+
+    summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+    print(f"✅ Validated {sum(counts.values())} sources: {summary}", file=sys.stderr)
+    sys.exit(0 if 'FAILED' not in counts and 'ERROR' not in counts else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test API token verification - JWKS cache and verified-claims cache
+against a local JWKS endpoint
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+from auth import JWKSCache, TokenVerifier
+
+AUDIENCE = "api://test"
+ISSUER = "https://sts.example.test/tenant/"
+
+
+def make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return private_key, jwk
+
+
+@pytest.fixture
+def jwks_server():
+    """Local JWKS stand-in; `state["keys"]` is served and requests are counted."""
+    state = {"keys": [], "requests": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            body = json.dumps({"keys": state["keys"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/keys"
+    yield state
+    server.shutdown()
+
+
+def sign(private_key, kid, **claims):
+    payload = {"aud": AUDIENCE, "iss": ISSUER, "sub": "user-1", "exp": int(time.time()) + 600, **claims}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def make_verifier(url, **kwargs):
+    return TokenVerifier(JWKSCache(url, min_refetch_interval=60), audience=AUDIENCE, issuer=ISSUER, **kwargs)
+
+
+def test_keys_fetched_once_and_claims_cached(jwks_server):
+    private_key, jwk = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    verifier = make_verifier(jwks_server["url"])
+    token = sign(private_key, "k1")
+
+    for _ in range(5):
+        assert verifier.verify(token)["sub"] == "user-1"
+    assert verifier.verify(sign(private_key, "k1", sub="user-2"))["sub"] == "user-2"
+
+    assert jwks_server["requests"] == 1
+    stats = verifier.stats()
+    assert stats["hits"] == 4
+    assert stats["misses"] == 2
+    assert stats["cached_tokens"] == 2
+
+
+def test_cold_token_on_the_api_path_counts_one_miss(jwks_server):
+    private_key, jwk = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    verifier = make_verifier(jwks_server["url"])
+    token = sign(private_key, "k1")
+
+    # main.verify_token: cache check on the event loop, signature check in the threadpool
+    assert verifier.cached(token) is None
+    assert verifier._verify_uncached(token)["sub"] == "user-1"
+    assert verifier.cached(token)["sub"] == "user-1"
+
+    stats = verifier.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_rotated_kid_refetches_but_unknown_kids_are_rate_limited(jwks_server):
+    old_key, old_jwk = make_key("old")
+    new_key, new_jwk = make_key("new")
+    jwks_server["keys"] = [old_jwk]
+    verifier = make_verifier(jwks_server["url"])
+    verifier.jwks.min_refetch_interval = 0
+    verifier.verify(sign(old_key, "old"))
+
+    jwks_server["keys"] = [old_jwk, new_jwk]
+    assert verifier.verify(sign(new_key, "new"))["sub"] == "user-1"
+    assert jwks_server["requests"] == 2
+
+    verifier.jwks.min_refetch_interval = 60
+    forged_key, _ = make_key("forged")
+    for _ in range(3):
+        with pytest.raises(jwt.InvalidTokenError):
+            verifier.verify(sign(forged_key, "forged"))
+    assert jwks_server["requests"] == 2
+    assert verifier.jwks.stats()["rate_limited_refetches"] == 3
+
+
+def test_cached_claims_never_outlive_token_exp(jwks_server):
+    private_key, jwk = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    verifier = make_verifier(jwks_server["url"])
+    token = sign(private_key, "k1", exp=int(time.time()) + 1)
+
+    verifier.verify(token)
+    assert verifier.cached(token) is not None
+    time.sleep(1.1)
+
+    assert verifier.cached(token) is None
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(token)
+
+
+def test_wrong_audience_and_bad_signature_are_rejected(jwks_server):
+    private_key, jwk = make_key("k1")
+    other_key, _ = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    verifier = make_verifier(jwks_server["url"])
+
+    with pytest.raises(jwt.InvalidAudienceError):
+        verifier.verify(sign(private_key, "k1", aud="api://other"))
+    with pytest.raises(jwt.InvalidSignatureError):
+        verifier.verify(sign(other_key, "k1"))
+    assert verifier.stats()["cached_tokens"] == 0
+
+
+def test_background_refresh_populates_keys(jwks_server):
+    _, jwk = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    cache = JWKSCache(jwks_server["url"], refresh_interval=60)
+
+    cache.start()
+    deadline = time.time() + 5
+    while cache.stats()["keys"] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    cache.stop()
+
+    assert cache.get_signing_key("k1").key_id == "k1"
+    assert jwks_server["requests"] == 1
+
+
+def test_empty_keyset_refetches_are_rate_limited_with_backoff(jwks_server):
+    private_key, jwk = make_key("k1")
+    jwks_server["keys"] = [jwk]
+    cache = JWKSCache("http://127.0.0.1:9/keys", min_refetch_interval=60, timeout=1,
+                      empty_refetch_interval=0.2)
+
+    # JWKS down at startup: one fetch, then garbage kids are refused without refetching
+    for kid in ["k1", "junk-1", "junk-2", "junk-3"]:
+        with pytest.raises(jwt.PyJWKClientConnectionError):
+            cache.get_signing_key(kid)
+    assert cache.stats()["fetches"] == 1
+    assert cache.stats()["rate_limited_refetches"] == 3
+
+    time.sleep(0.45)  # 0.2s doubled after one failure
+    with pytest.raises(jwt.PyJWKClientConnectionError):
+        cache.get_signing_key("k1")
+    assert cache.stats()["fetches"] == 2
+
+    cache.jwks_url = jwks_server["url"]  # endpoint recovers
+    with pytest.raises(jwt.PyJWKClientConnectionError):
+        cache.get_signing_key("k1")  # still inside the 0.8s backoff
+    time.sleep(0.85)
+    assert cache.get_signing_key("k1").key_id == "k1"
+    assert cache.stats()["fetches"] == 3
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the API image layout - the files api/Dockerfile copies are enough to
+import the app and the Knowledge Registry engine the way the container does
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+DOCKERFILE = ROOT / "api" / "Dockerfile"
+DOCKERIGNORE = ROOT / "api" / "Dockerfile.dockerignore"
+
+
+def instructions():
+    text = re.sub(r"\\\n\s*", " ", DOCKERFILE.read_text())
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            keyword, _, rest = line.partition(" ")
+            yield keyword.upper(), rest.split()
+
+
+def in_app(path, app_dir):
+    """Map an image path (absolute under /app or relative to WORKDIR) into app_dir."""
+    return app_dir / (path[len("/app/"):] if path.startswith("/app/") else path)
+
+
+def build_layout(app_dir):
+    """Copy what the Dockerfile copies into app_dir; return (copied sources, ENV)."""
+    copied, env = [], {}
+    for keyword, args in instructions():
+        if keyword == "COPY":
+            *sources, dest = args
+            for source in sources:
+                target = in_app(dest, app_dir)
+                if dest.endswith("/"):
+                    target = target / Path(source).name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy(ROOT / source, target)
+                copied.append(source)
+        elif keyword == "ENV":
+            key, _, value = args[0].partition("=")
+            env[key] = str(in_app(value, app_dir)) if value.startswith("/app") else value
+    return copied, env
+
+
+def test_build_context_allowlist_covers_every_copied_file(tmp_path):
+    copied, _ = build_layout(tmp_path)
+    allowed = {line[1:] for line in DOCKERIGNORE.read_text().splitlines() if line.startswith("!")}
+
+    assert set(copied) <= allowed
+    assert "api/knowledge.py" in copied
+
+
+def test_container_layout_imports_app_and_engine(tmp_path):
+    _, env = build_layout(tmp_path)
+    assert "KNOWLEDGE_REGISTRY_PATH" in env
+
+    check = (
+        "import main, knowledge\n"
+        "assert knowledge.ENGINE_IMPORT_ERROR is None, knowledge.ENGINE_IMPORT_ERROR\n"
+        "assert knowledge.AsyncKnowledgeRegistryDB.__module__ == 'async_db_operations'\n"
+    )
+    process_env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+    process_env.update(env, POSTGRES_PASSWORD="unused")
+    result = subprocess.run(
+        [sys.executable, "-c", check], cwd=tmp_path, env=process_env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
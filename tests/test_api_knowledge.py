@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test API knowledge endpoints - shared engine, cached payloads, ETag revalidation
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("POSTGRES_PASSWORD", "test")  # skip the Key Vault lookup
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+import main
+from knowledge import KnowledgeService, etag_matches
+
+
+class FakeEngine:
+    """Stands in for AsyncKnowledgeRegistryDB."""
+
+    def __init__(self):
+        self.calls = []
+        self.total = 1043
+
+    async def get_stats(self):
+        self.calls.append("get_stats")
+        return {
+            "total_sources": self.total,
+            "authority_breakdown": {90: 180, 70: 592, 50: 271},
+            "dimension_breakdown": {"theory": 287, None: 3},
+            "categories": 2,
+        }
+
+    async def list_categories(self):
+        self.calls.append("list_categories")
+        return [
+            {"name": "Federal_Contracting", "display_name": "Federal Contracting", "total_sources": 245},
+            {"name": "Cybersecurity", "display_name": "Cybersecurity", "total_sources": 167},
+        ]
+
+    async def fetch(self, sql, *params):
+        self.calls.append("fetch")
+        return [{"name": "FAR", "authority_score": 90, "category_name": "Federal_Contracting"}]
+
+    async def query_knowledge_base(self, **arguments):
+        self.calls.append(("query_knowledge_base", arguments))
+        return {
+            "sources": [{
+                "id": "6f1c", "name": "FAR Part 19", "url": "https://www.acquisition.gov/far/part-19",
+                "description": "Small business programs", "authority_score": 90,
+                "epistemological_dimension": "practice", "quality_score": 95.0,
+                "category": "Federal Contracting", "relevance": 0.91,
+            }],
+            "query_info": {"keywords": ["small", "business"]},
+        }
+
+
+def make_client(ttl=60.0):
+    engine = FakeEngine()
+    service = KnowledgeService(cache_ttl=ttl)
+    service._db = engine
+    main.knowledge = service
+    main.app.dependency_overrides[main.verify_token] = lambda: {"sub": "user-1"}
+    return TestClient(main.app), engine
+
+
+def test_categories_are_cached_and_revalidated_with_etag():
+    client, engine = make_client()
+
+    first = client.get("/api/knowledge/categories")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.json()["categories"][0] == {"id": "Federal_Contracting", "name": "Federal Contracting", "count": 245}
+    assert etag.startswith('"') and not etag.startswith('W/')
+
+    revalidated = client.get("/api/knowledge/categories", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert engine.calls == ["list_categories"]
+
+
+def test_stats_come_from_engine_and_etag_changes_with_content():
+    client, engine = make_client(ttl=0)
+
+    first = client.get("/api/knowledge/stats")
+    body = first.json()
+    assert body["total_sources"] == 1043
+    assert body["by_authority"] == {"official_government": 180, "expert_documentation": 592, "community_resources": 271}
+    assert body["by_category"]["Cybersecurity"] == 167
+    assert body["top_sources"][0]["name"] == "FAR"
+
+    engine.total = 1044
+    second = client.get("/api/knowledge/stats", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+
+
+def test_search_uses_shared_engine():
+    client, engine = make_client()
+
+    response = client.get("/api/knowledge/search", params={"query": "small business", "limit": 3})
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["sources"][0]["dimension"] == "practice"
+    assert body["query_info"]["keywords"] == ["small", "business"]
+    assert engine.calls[-1] == ("query_knowledge_base", {
+        "query": "small business", "dimension": None, "category": None, "min_authority": 70, "max_results": 3
+    })
+
+
+def test_engine_failure_returns_503():
+    client, engine = make_client()
+
+    async def broken(**arguments):
+        raise ConnectionError("pool exhausted")
+
+    engine.query_knowledge_base = broken
+    assert client.get("/api/knowledge/search", params={"query": "x"}).status_code == 503
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
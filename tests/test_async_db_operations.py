@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test async Knowledge Registry data access - SQL shared with the sync layer
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import psycopg2.extensions
+
+os.environ.setdefault("POSTGRES_PASSWORD", "test")  # skip the Key Vault lookup
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+from async_db_operations import AsyncKnowledgeRegistryDB, init_connection, to_asyncpg_sql
+from db_operations import SOURCE_DETAIL_COLUMNS, SOURCE_DETAILS_SQL, build_search_query, extract_exclusions
+
+
+def test_placeholders_are_numbered_in_order():
+    assert to_asyncpg_sql("a = %s AND b = %s LIMIT %s") == "a = $1 AND b = $2 LIMIT $3"
+    assert to_asyncpg_sql("name LIKE '100%%' AND id = %s") == "name LIKE '100%' AND id = $1"
+
+
+def test_search_query_params_line_up_with_numbered_placeholders():
+    sql, params, keywords = build_search_query(
+        "DFARS cybersecurity", dimension="current", category="Cybersecurity",
+        min_authority=70, max_results=50
+    )
+    converted = to_asyncpg_sql(sql)
+
+    assert "%s" not in converted
+    assert f"${len(params)}" in converted
+    assert f"${len(params) + 1}" not in converted
+    assert params[-1] == 15  # hard result limit survives the shared builder
+    assert keywords == ["dfars", "cybersecurity"]
+
+
+def test_search_uses_full_text_index_and_ranks_by_relevance():
+    sql, params, keywords = build_search_query('"small business" subcontracting plan')
+
+    assert "LIKE" not in sql
+    assert "s.search_vector @@ q.query" in sql
+    assert "ORDER BY relevance DESC" in sql
+    # FROM-clause tsquery params come first, in placeholder order
+    assert params[:2] == ['"small business" subcontracting plan', "small or business or subcontracting or plan"]
+    assert params[2:] == [50, 10]
+
+
+def test_search_without_keywords_skips_text_match():
+    sql, params, keywords = build_search_query("AI", min_authority=90)
+
+    assert keywords == []
+    assert "search_vector" not in sql
+    assert params == [90, 10]
+
+
+
+def test_exclusions_are_anded_onto_the_keyword_or():
+    sql, params, keywords = build_search_query('FAR clauses -DFARS -"cost accounting"')
+
+    assert extract_exclusions('FAR -DFARS cyber-security "a -b"') == ["DFARS"]
+    assert "&& !! websearch_to_tsquery('english', %s)" in sql
+    # the excluded keyword no longer ORs its matches back in
+    assert params[:3] == ['FAR clauses -DFARS -"cost accounting"', "far or clauses", 'DFARS or "cost accounting"']
+    assert to_asyncpg_sql(sql).count("$") == len(params)
+
+
+def test_source_details_select_every_column_but_the_search_internals():
+    schema = (Path(__file__).parent.parent / "scripts" / "database" / "schema.sql").read_text()
+    table = schema[schema.index("CREATE TABLE IF NOT EXISTS sources ("):]
+    table = table[:table.index("UNIQUE(url, category_id)")]
+    columns = re.findall(r"^    ([a-z_]+) [A-Z]", table, re.MULTILINE)
+
+    assert "s.*" not in SOURCE_DETAILS_SQL
+    assert "embedding" not in SOURCE_DETAILS_SQL and "search_vector" not in SOURCE_DETAILS_SQL
+    assert list(SOURCE_DETAIL_COLUMNS) == [c for c in columns if c not in ("search_vector", "embedding")]
+
+
+class FakeConnection:
+    def __init__(self, age):
+        self.opened_at = time.monotonic() - age
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self, timeout=None):
+        yield self.conn
+
+
+def borrow(db, conn):
+    async def main():
+        db._pool = FakePool(conn)
+        async with db.connection():
+            pass
+    asyncio.run(main())
+
+
+def test_connections_past_max_lifetime_are_closed_on_release():
+    db = AsyncKnowledgeRegistryDB()
+    db.pool_max_lifetime = 60
+
+    fresh, old = FakeConnection(age=5), FakeConnection(age=120)
+    borrow(db, fresh)
+    borrow(db, old)
+
+    assert not fresh.closed
+    assert old.closed
+    assert db._recycled == 1
+
+    db.pool_max_lifetime = 0  # disabled, as in the sync pool
+    ancient = FakeConnection(age=10_000)
+    borrow(db, ancient)
+    assert not ancient.closed
+
+
+def test_pool_connections_decode_json_like_psycopg2():
+    codecs = {}
+
+    class CodecConnection:
+        async def set_type_codec(self, type_name, encoder, decoder, schema):
+            codecs[(schema, type_name)] = (encoder, decoder)
+
+    asyncio.run(init_connection(CodecConnection()))
+
+    flags = '{"dev": true, "staging": false, "production": false}'
+    for type_name, oid in (("json", 114), ("jsonb", 3802)):
+        encoder, decoder = codecs[("pg_catalog", type_name)]
+        sync_value = psycopg2.extensions.string_types[oid](flags, None)
+        assert decoder(flags) == sync_value == json.loads(flags)
+        assert json.loads(encoder(sync_value)) == sync_value
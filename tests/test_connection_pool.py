@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test Knowledge Registry connection pool - sizing, recycling, health checks
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from psycopg2 import extensions
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+from connection_pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    """Minimal stand-in for a psycopg2 connection."""
+
+    def __init__(self):
+        self.closed = 0
+        self.pings = 0
+        self.rollbacks = 0
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        conn = self
+
+        class _Cursor:
+            def execute(self, sql, params=None):
+                conn.pings += 1
+
+            def fetchall(self):
+                return [(1,)]
+
+            def close(self):
+                pass
+
+        return _Cursor()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.status
+
+    def close(self):
+        self.closed = 1
+
+
+def make_pool(**kwargs):
+    opened = []
+
+    def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    return ConnectionPool(connect, **kwargs), opened
+
+
+def test_connections_are_reused():
+    pool, opened = make_pool(min_size=1, max_size=2)
+
+    for _ in range(5):
+        with pool.connection():
+            pass
+
+    assert len(opened) == 1
+    stats = pool.stats()
+    assert stats["checkouts"] == 5
+    assert stats["connections_opened"] == 1
+
+
+def test_max_size_blocks_then_times_out():
+    pool, _ = make_pool(min_size=0, max_size=1, checkout_timeout=0.05)
+
+    conn = pool.getconn()
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_waiter_receives_returned_connection():
+    pool, opened = make_pool(min_size=0, max_size=1, checkout_timeout=2)
+    conn = pool.getconn()
+
+    threading.Timer(0.05, pool.putconn, args=(conn,)).start()
+    second = pool.getconn()
+
+    assert second is conn
+    assert len(opened) == 1
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["max_wait_ms"] > 0
+
+
+def test_open_transaction_is_rolled_back_on_return():
+    pool, _ = make_pool(min_size=0, max_size=1)
+    conn = pool.getconn()
+    conn.status = extensions.TRANSACTION_STATUS_INTRANS
+
+    pool.putconn(conn)
+
+    assert conn.rollbacks == 1
+    assert pool.getconn() is conn
+
+
+def test_expired_connections_are_recycled():
+    pool, opened = make_pool(min_size=0, max_size=1, max_lifetime=0.01)
+    conn = pool.getconn()
+    time.sleep(0.02)
+    pool.putconn(conn)
+
+    assert conn.closed
+    assert pool.getconn() is not conn
+    assert len(opened) == 2
+
+
+def test_idle_connection_is_pinged_and_broken_one_replaced():
+    pool, opened = make_pool(min_size=0, max_size=1, health_check_interval=0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+    assert conn.pings == 1
+    pool.putconn(conn)
+
+    conn.closed = 1
+    replacement = pool.getconn()
+    assert replacement is not conn
+    assert len(opened) == 2
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test SourceMatchIndex - indexed gap matching must return exactly what the
+original linear substring scan over sources.yaml returned
+"""
+
+import importlib.util
+import random
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location(
+    "knowledge_gap_manager",
+    Path(__file__).parent.parent / "scripts" / "automation" / "knowledge_gap_manager.py"
+)
+knowledge_gap_manager = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(knowledge_gap_manager)
+SourceMatchIndex = knowledge_gap_manager.SourceMatchIndex
+
+SOURCES = [
+    {"id": "nist-csf", "name": "NIST Cybersecurity Framework", "category": "cybersecurity",
+     "metadata_tags": ["compliance", "risk management", "federal"]},
+    {"id": "cmmc", "name": "CMMC Model", "category": "defense_compliance",
+     "metadata_tags": ["dod", "cybersecurity", "maturity"]},
+    {"id": "far", "name": "Federal Acquisition Regulation", "category": "federal_acquisition",
+     "metadata_tags": ["contracts", "procurement"]},
+    {"id": "pq-crypto", "name": "Post-Quantum Cryptography", "category": "cryptography",
+     "metadata_tags": ["quantum", "nist", "encryption"]},
+    {"id": "ai-rmf", "name": "AI Risk Management Framework", "category": "ai_governance",
+     "metadata_tags": ["ai", "ml", "risk"]},
+    {"id": "no-tags", "name": "Plain Source", "category": "misc"},
+]
+
+
+def brute_force(sources, keywords):
+    """The pre-index KnowledgeGapManager._find_matching_sources loop."""
+    matching = []
+    for source in sources:
+        name = source.get("name", "").lower()
+        tags = [tag.lower() for tag in source.get("metadata_tags", [])]
+        category = source.get("category", "").lower()
+        keyword_matches = sum(
+            1 for kw in keywords
+            if kw.lower() in name or kw.lower() in " ".join(tags) or kw.lower() in category
+        )
+        if keyword_matches >= len(keywords) * 0.6:
+            matching.append(source.get("id"))
+    return matching
+
+
+def test_matches_linear_scan_on_known_queries():
+    index = SourceMatchIndex(SOURCES)
+    queries = [
+        ["cybersecurity", "compliance"],
+        ["CYBER"],
+        ["risk management"],
+        ["ml risk"],            # spans two tags
+        ["quantum", "crypto", "nist"],
+        ["defense", "dod", "cmmc", "unknown", "other"],
+        ["ai"],
+        ["_"],
+        ["federal acquisition regulation"],
+        ["nothing-here"],
+        [],
+        [""],
+        [" "],
+    ]
+    for keywords in queries:
+        assert index.match(keywords) == brute_force(SOURCES, keywords), keywords
+
+
+def test_matches_linear_scan_on_random_catalog():
+    rng = random.Random(7)
+    words = ["data", "science", "cyber", "secure", "ai", "ml", "cloud", "zero", "trust", "fed", "ramp", "x"]
+
+    def phrase(n):
+        return " ".join(rng.choice(words) + rng.choice(["", "s", "ing"]) for _ in range(n))
+
+    sources = [
+        {"id": f"src-{i}", "name": phrase(3), "category": "_".join(rng.sample(words, 2)),
+         "metadata_tags": [phrase(rng.randint(1, 2)) for _ in range(rng.randint(0, 3))]}
+        for i in range(300)
+    ]
+    index = SourceMatchIndex(sources)
+
+    for _ in range(300):
+        keywords = [
+            rng.choice([rng.choice(words)[1:], phrase(2), rng.choice(words).upper(), "ta sc", "a_c"])
+            for _ in range(rng.randint(1, 4))
+        ]
+        assert index.match(keywords) == brute_force(sources, keywords), keywords
+
+
+def test_keyword_lookups_are_cached():
+    index = SourceMatchIndex(SOURCES)
+    first = index.sources_matching("Risk")
+    assert index.sources_matching("risk") is first
+    assert [index.source_ids[p] for p in first] == ["nist-csf", "ai-rmf"]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test NotificationDispatcher - background Slack digest / dev API delivery
+with retries and circuit breakers, against local HTTP stand-ins
+"""
+
+import importlib.util
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+spec = importlib.util.spec_from_file_location(
+    "knowledge_gap_manager",
+    Path(__file__).parent.parent / "scripts" / "automation" / "knowledge_gap_manager.py"
+)
+knowledge_gap_manager = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(knowledge_gap_manager)
+NotificationDispatcher = knowledge_gap_manager.NotificationDispatcher
+
+
+@pytest.fixture
+def webhook():
+    """Local webhook stand-in; `state["statuses"]` is consumed per request (then 200)."""
+    state = {"requests": [], "statuses": [], "delay": 0.0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(state["delay"])
+            state["requests"].append((self.path, body))
+            status = state["statuses"].pop(0) if state["statuses"] else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+
+
+def gap(topic):
+    return {"topic": topic, "keywords": topic.split(), "customer_id": "customer-1", "query_context": topic}
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+
+def test_slack_digest_and_dev_api_posts(webhook):
+    dispatcher = NotificationDispatcher(
+        slack_webhook=webhook["url"] + "/slack",
+        dev_api_endpoint=webhook["url"] + "/api",
+        digest_interval=0.3
+    )
+    for n, topic in enumerate(["ITAR export", "CMMC level", "Zero trust"], 1):
+        assert dispatcher.submit(gap(topic), queue_position=n)
+
+    wait_for(lambda: dispatcher.stats()["backlog"] == 0)
+    dispatcher.stop()
+
+    slack = [body for path, body in webhook["requests"] if path == "/slack"]
+    dev_api = [body for path, body in webhook["requests"] if path == "/api/knowledge-gaps"]
+    assert len(slack) == 1
+    assert "3 Knowledge Gaps" in slack[0]["text"] and "Zero trust" in slack[0]["text"]
+    assert [body["topic"] for body in dev_api] == ["ITAR export", "CMMC level", "Zero trust"]
+
+    stats = dispatcher.stats()
+    assert stats["delivered"] == {"slack": 3, "dev_api": 3}
+    assert stats["latency_seconds"]["max"] >= 0.3
+
+
+def test_failed_delivery_is_retried_with_backoff(webhook):
+    webhook["statuses"] = [500, 503]
+    dispatcher = NotificationDispatcher(dev_api_endpoint=webhook["url"], backoff_base=0.05)
+
+    dispatcher.submit(gap("ITAR export"))
+    wait_for(lambda: dispatcher.stats()["delivered"]["dev_api"] == 1)
+    dispatcher.stop()
+
+    assert len(webhook["requests"]) == 3
+    assert dispatcher.stats()["retries"]["dev_api"] == 2
+    assert dispatcher.stats()["circuit"]["dev_api"] == "closed"
+
+
+def test_circuit_opens_and_holds_deliveries(webhook):
+    webhook["statuses"] = [500] * 10
+    dispatcher = NotificationDispatcher(
+        dev_api_endpoint=webhook["url"],
+        backoff_base=0.01,
+        max_attempts=10,
+        failure_threshold=2,
+        reset_timeout=60
+    )
+
+    dispatcher.submit(gap("ITAR export"))
+    wait_for(lambda: dispatcher.stats()["circuit"]["dev_api"] == "open")
+    time.sleep(0.2)
+
+    assert len(webhook["requests"]) == 2
+    assert dispatcher.stats()["pending_retries"] == 1
+    dispatcher.stop()
+    assert dispatcher.stats()["failed"]["dev_api"] == 1
+
+
+def test_submit_does_not_wait_for_slow_webhooks(webhook):
+    webhook["delay"] = 1.0
+    dispatcher = NotificationDispatcher(slack_webhook=webhook["url"], dev_api_endpoint=webhook["url"], digest_interval=0)
+
+    started = time.perf_counter()
+    for n in range(5):
+        dispatcher.submit(gap(f"topic {n}"))
+    assert time.perf_counter() - started < 0.1
+    assert dispatcher.stats()["backlog"] > 0
+
+    webhook["delay"] = 0
+    dispatcher.stop()
+    assert dispatcher.stats()["delivered"] == {"slack": 5, "dev_api": 5}
+
+
+def test_disabled_without_destinations():
+    dispatcher = NotificationDispatcher()
+    assert not dispatcher.submit(gap("ITAR export"))
+    assert dispatcher._thread is None
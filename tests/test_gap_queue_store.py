@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test GapQueueStore - SQLite-backed production gap queue (counters, tail
+reads, resolve by id, legacy JSONL import, concurrent writers)
+"""
+
+import importlib.util
+import json
+import threading
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location(
+    "knowledge_gap_manager",
+    Path(__file__).parent.parent / "scripts" / "automation" / "knowledge_gap_manager.py"
+)
+knowledge_gap_manager = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(knowledge_gap_manager)
+GapQueueStore = knowledge_gap_manager.GapQueueStore
+
+
+def gap(n):
+    return {
+        "timestamp": f"2026-01-01T00:00:{n:02d}Z",
+        "topic": f"topic {n}",
+        "keywords": ["k"],
+        "customer_id": "customer-1",
+    }
+
+
+def test_append_count_and_tail(tmp_path):
+    store = GapQueueStore(tmp_path / "gaps.sqlite3", legacy_jsonl=None)
+    for n in range(10):
+        gap_id, position = store.append(gap(n))
+        assert position == n + 1
+
+    assert store.count() == 10
+    assert [g["topic"] for g in store.tail(limit=3)] == ["topic 7", "topic 8", "topic 9"]
+    assert [g["topic"] for g in store.tail(limit=3, offset=3)] == ["topic 4", "topic 5", "topic 6"]
+    assert store.tail(limit=3)[-1]["id"] == gap_id
+
+
+def test_resolve_by_id_and_timestamp(tmp_path):
+    store = GapQueueStore(tmp_path / "gaps.sqlite3", legacy_jsonl=None)
+    ids = [store.append(gap(n))[0] for n in range(3)]
+
+    assert store.resolve(gap_id=ids[0], notes="ingested") == 1
+    assert store.resolve(gap_id=ids[0]) == 0
+    assert store.resolve(timestamp=gap(2)["timestamp"]) == 1
+
+    assert store.count() == 1
+    assert store.count(include_resolved=True) == 3
+    assert [g["id"] for g in store.tail()] == [ids[1]]
+
+
+def test_legacy_jsonl_is_imported_once(tmp_path):
+    legacy = tmp_path / "production_gaps_queue.jsonl"
+    legacy.write_text("".join(json.dumps(gap(n)) + "\n" for n in range(4)))
+
+    store = GapQueueStore(tmp_path / "gaps.sqlite3", legacy_jsonl=legacy)
+    assert store.count() == 4
+    assert not legacy.exists()
+    assert (tmp_path / "production_gaps_queue.jsonl.imported").exists()
+
+    # A stray file reappearing later is not imported twice
+    legacy.write_text(json.dumps(gap(9)) + "\n")
+    assert GapQueueStore(tmp_path / "gaps.sqlite3", legacy_jsonl=legacy).count() == 4
+
+
+def test_concurrent_writers(tmp_path):
+    path = tmp_path / "gaps.sqlite3"
+    GapQueueStore(path, legacy_jsonl=None)
+
+    def writer(worker):
+        # Separate store per thread, like separate uvicorn workers
+        store = GapQueueStore(path, legacy_jsonl=None)
+        for n in range(50):
+            store.append({**gap(n), "topic": f"worker {worker}"})
+        store.close()
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    store = GapQueueStore(path, legacy_jsonl=None)
+    assert store.count() == 200
+    assert len(store.tail(limit=500)) == 200
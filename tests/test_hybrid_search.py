@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test hybrid search - hashing embedder and vector + lexical SQL fusion
+"""
+
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+from async_db_operations import to_asyncpg_sql
+from db_operations import build_hybrid_search_query, hnsw_session_settings
+from embeddings import EMBEDDING_DIMENSIONS, HashingEmbedder, to_pgvector
+
+
+def cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = HashingEmbedder()
+    vector = embedder.embed("DFARS cybersecurity requirements")
+
+    assert len(vector) == EMBEDDING_DIMENSIONS
+    assert vector == HashingEmbedder().embed("DFARS cybersecurity requirements")
+    assert math.isclose(math.sqrt(sum(v * v for v in vector)), 1.0)
+    assert embedder.embed("") == [0.0] * EMBEDDING_DIMENSIONS
+
+
+def test_hashing_embedder_similarity_tracks_term_overlap():
+    embedder = HashingEmbedder()
+    query = embedder.embed("cybersecurity compliance")
+
+    related = embedder.embed("DFARS cybersecurity compliance requirements")
+    unrelated = embedder.embed("FAR Part 15 contracting by negotiation")
+
+    assert cosine(query, related) > cosine(query, unrelated)
+
+
+def test_pgvector_literal():
+    assert to_pgvector([0.5, -0.25, 0.0]) == "[0.5,-0.25,0]"
+
+
+def test_hybrid_query_pushes_filters_into_knn_scan():
+    sql, params, keywords = build_hybrid_search_query(
+        "cybersecurity compliance", "[0.1,0.2]", dimension="current",
+        category="Cybersecurity", min_authority=90, max_results=5
+    )
+    knn = sql[sql.index("FROM (", sql.index("semantic AS")):sql.index(") knn")]
+
+    assert "s.authority_score >= %s" in knn
+    assert "s.epistemological_dimension = %s" in knn
+    assert "s.category_id IN (SELECT" in knn
+    assert "JOIN" not in knn  # single-table scan keeps the HNSW index usable
+    assert "ORDER BY distance" in knn
+    assert "1.0 / (60 + v.rank)" in sql
+    assert keywords == ["cybersecurity", "compliance"]
+
+
+def test_hybrid_params_line_up_with_placeholders():
+    sql, params, _ = build_hybrid_search_query(
+        "cybersecurity compliance", "[0.1,0.2]", category="Cybersecurity", min_authority=90, max_results=50
+    )
+    converted = to_asyncpg_sql(sql)
+
+    assert f"${len(params)}" in converted
+    assert f"${len(params) + 1}" not in converted
+    # lexical: tsquery x2, authority, category x2, candidates; knn: vector, authority, category x2, candidates
+    assert params == [
+        "cybersecurity compliance", "cybersecurity or compliance", 90, "Cybersecurity", "Cybersecurity", 40,
+        "[0.1,0.2]", 90, "Cybersecurity", "Cybersecurity", 40,
+        15,
+    ]
+
+
+def test_hybrid_query_without_keywords_is_vector_only():
+    sql, params, keywords = build_hybrid_search_query("AI", "[0.1]", max_results=3)
+
+    assert keywords == []
+    assert "WHERE false" in sql
+    assert params == ["[0.1]", 50, 40, 3]
+
+
+def test_hybrid_exclusions_filter_both_retrievers():
+    sql, params, _ = build_hybrid_search_query("FAR -DFARS", to_pgvector([0.1] * EMBEDDING_DIMENSIONS))
+
+    knn = sql[sql.index("semantic AS"):sql.index("fused AS")]
+    assert "NOT COALESCE(s.search_vector @@ websearch_to_tsquery('english', %s), false)" in knn
+    assert params.count("DFARS") == 2
+    assert to_asyncpg_sql(sql).count("$") == len(params)
+
+
+def test_hnsw_settings_cover_candidate_depth():
+    statements = hnsw_session_settings(400)
+
+    assert statements[0] == "SET LOCAL hnsw.ef_search = 400"
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test in-memory knowledge index - filters, ranking, incremental refresh
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+from knowledge_index import KnowledgeIndex
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_row(source_id, name, description="", authority=70, quality=80, dimension="practice",
+             category="Cybersecurity", tags=None, changed_at=T0):
+    return {
+        "id": source_id,
+        "name": name,
+        "description": description,
+        "url": f"https://example.gov/{source_id}",
+        "authority_score": authority,
+        "epistemological_dimension": dimension,
+        "quality_score": quality,
+        "tags": tags or [],
+        "category_name": category,
+        "category_display": category.replace("_", " "),
+        "changed_at": changed_at,
+    }
+
+
+def build_index():
+    index = KnowledgeIndex()
+    index.apply([
+        make_row("1", "DFARS Cybersecurity Requirements", "Safeguarding covered defense information", authority=90),
+        make_row("2", "Cyber blog", "Notes on cybersecurity compliance", authority=50),
+        make_row("3", "FAR Part 15", "Contracting by negotiation", authority=90,
+                 category="Federal_Contracting", dimension="theory"),
+        make_row("4", "NIST 800-171", "Protecting controlled unclassified information",
+                 tags=["cybersecurity", "cmmc"], authority=90, dimension="current"),
+    ], live_ids=["1", "2", "3", "4"])
+    return index
+
+
+def ids(result):
+    return [source["id"] for source in result["sources"]]
+
+
+def test_name_match_outranks_description_and_tag_matches():
+    index = build_index()
+
+    result = index.query_knowledge_base("cybersecurity")
+
+    assert ids(result) == ["1", "4", "2"]
+    assert result["query_info"]["keywords"] == ["cybersecurity"]
+    assert result["sources"][0]["relevance"] > result["sources"][1]["relevance"]
+
+
+def test_filters_match_database_semantics():
+    index = build_index()
+
+    assert ids(index.query_knowledge_base("cybersecurity", min_authority=70)) == ["1", "4"]
+    assert ids(index.query_knowledge_base("cybersecurity", dimension="current")) == ["4"]
+    assert ids(index.query_knowledge_base("contracting", category="Federal Contracting")) == ["3"]
+    assert ids(index.query_knowledge_base("contracting", category="Federal_Contracting")) == ["3"]
+    assert ids(index.query_knowledge_base("contracting", category="Cybersecurity")) == []
+
+
+def test_query_without_keywords_orders_by_authority_and_caps_results():
+    index = build_index()
+
+    result = index.query_knowledge_base("AI", max_results=50)
+
+    assert ids(result)[-1] == "2"
+    assert len(ids(result)) == 4
+
+
+def test_incremental_refresh_updates_and_deletes():
+    index = build_index()
+    later = T0 + timedelta(minutes=5)
+
+    index.apply([make_row("2", "Zero trust architecture", authority=50, category="Architecture",
+                          changed_at=later)],
+                live_ids=["1", "2", "4"])
+
+    assert index.watermark == later
+    assert ids(index.query_knowledge_base("contracting")) == []
+    assert ids(index.query_knowledge_base("zero trust")) == ["2"]
+    assert "2" not in ids(index.query_knowledge_base("cybersecurity"))
+    assert index.stats()["rows_removed"] == 1
+
+
+def test_websearch_syntax_is_left_to_the_database():
+    assert KnowledgeIndex.can_serve("FAR subcontracting plan requirements")
+    assert not KnowledgeIndex.can_serve('"small business" subcontracting')
+    assert not KnowledgeIndex.can_serve("cybersecurity -blog")
+    assert not KnowledgeIndex.can_serve("FAR or DFARS")
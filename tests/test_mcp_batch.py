@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test MCP JSON-RPC endpoint - single messages and batch arrays
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("POSTGRES_PASSWORD", "test")  # skip the Key Vault lookup
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+import http_server
+
+client = TestClient(http_server.app)
+
+
+def call(request_id, query):
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "query_knowledge_base", "arguments": {"query": query}},
+    }
+
+
+def fake_search(monkeypatch, delay=0.0):
+    running = {"now": 0, "peak": 0}
+
+    async def search(**arguments):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(delay)
+        running["now"] -= 1
+        if arguments["query"] == "boom":
+            raise RuntimeError("database unavailable")
+        return {"query": arguments["query"]}
+
+    monkeypatch.setattr(http_server, "run_query_knowledge_base", search)
+    return running
+
+
+def test_single_request_behaviour_is_unchanged(monkeypatch):
+    fake_search(monkeypatch)
+
+    response = client.post("/mcp", json=call(1, "FAR"))
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+
+    response = client.post("/mcp", json={"jsonrpc": "2.0", "id": 2, "method": "nope"})
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32601
+
+    response = client.post("/mcp", json={"jsonrpc": "2.0", "method": "notifications/initialized"})
+    assert response.status_code == 202
+
+
+def test_batch_runs_concurrently_and_preserves_order(monkeypatch):
+    running = fake_search(monkeypatch, delay=0.05)
+    monkeypatch.setattr(http_server, "MCP_BATCH_CONCURRENCY", 3)
+    batch = [call(i, f"query {i}") for i in range(6)]
+
+    started = time.perf_counter()
+    response = client.post("/mcp", json=batch)
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == list(range(6))
+    assert running["peak"] == 3
+    assert elapsed < 6 * 0.05
+
+
+def test_batch_mixes_results_errors_and_notifications(monkeypatch):
+    fake_search(monkeypatch)
+    batch = [
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        call("a", "FAR"),
+        call("b", "boom"),
+        {"jsonrpc": "2.0", "id": "c", "method": "tools/list"},
+        42,
+    ]
+
+    response = client.post("/mcp", json=batch)
+    body = response.json()
+
+    assert response.status_code == 200
+    assert [item["id"] for item in body] == ["a", "b", "c", None]
+    assert "result" in body[0]
+    assert body[1]["error"]["code"] == -32603
+    assert body[2]["result"]["tools"]
+    assert body[3]["error"]["code"] == -32600
+
+
+def test_notification_only_batch_returns_no_body():
+    response = client.post("/mcp", json=[{"jsonrpc": "2.0", "method": "notifications/initialized"}])
+    assert response.status_code == 202
+    assert response.content == b""
+
+
+def test_empty_and_oversized_batches_are_invalid(monkeypatch):
+    response = client.post("/mcp", json=[])
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32600
+
+    monkeypatch.setattr(http_server, "MCP_BATCH_MAX_SIZE", 2)
+    response = client.post("/mcp", json=[call(1, "a"), call(2, "b"), call(3, "c")])
+    assert response.status_code == 400
+
+
+def test_tool_calls_with_customer_header_queue_usage(monkeypatch):
+    fake_search(monkeypatch)
+    recorder = http_server.UsageRecorder(lambda events: None)
+    monkeypatch.setattr(http_server, "usage_recorder", recorder)
+    customer = "0b7f5a0e-8a38-4d1c-9d55-3f7b2f0c1a11"
+
+    response = client.post("/mcp", json=[call(1, "FAR"), call(2, "boom")], headers={"X-Customer-ID": customer})
+    assert response.status_code == 200
+    client.post("/mcp", json=call(3, "DFARS"))
+
+    queued = [row for _, row in recorder._buffer]
+    assert [json.loads(row["query_metadata"])["query"] for row in queued] == ["FAR"]
+    assert queued[0]["customer_id"] == customer
+    assert queued[0]["query_type"] == "semantic_search"
+    assert recorder.stats()["unattributed"] == 1
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test bulk source migration - one COPY, one set-based insert, and the same
+rows as the per-source path
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "migration"))
+
+import migrate_sources_to_postgresql as migration
+
+CATEGORIES = {"Federal_Contracting": "11111111-1111-1111-1111-111111111111"}
+SOURCES = [
+    {
+        "id": "far",
+        "name": "FAR Part 19",
+        "category": "Federal_Contracting",
+        "canonical_urls": ["https://www.acquisition.gov/far/part-19"],
+        "description": "",
+        "metadata": {"trust_score": 95},
+        "ingestion": {"words": 1200, "files_count": 3, "status": "complete"},
+    },
+    {"id": "orphan", "name": "Lost", "category": "Nowhere"},
+    {"id": "nameless", "category": "Federal_Contracting"},
+]
+
+
+class FakeCursor:
+    """psycopg2 cursor stand-in recording statements and COPY payloads."""
+
+    def __init__(self, result=(1, 1, 0)):
+        self.statements = []
+        self.copies = []
+        self.result = result
+
+    def execute(self, sql, params=None):
+        self.statements.append(" ".join(sql.split()))
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+    def fetchone(self):
+        return self.result
+
+
+def test_bulk_path_streams_one_copy_and_runs_one_insert():
+    cursor = FakeCursor()
+
+    counts = migration.migrate_sources_bulk(cursor, SOURCES, CATEGORIES)
+
+    assert len(cursor.copies) == 1
+    assert [s.split()[0] for s in cursor.statements] == ["CREATE", "WITH"]
+    assert "ON CONFLICT (url, category_id) DO NOTHING" in cursor.statements[1]
+    # orphan category and missing name never reach the staging table
+    assert counts == {"inserted": 1, "skipped": 0, "errors": 2}
+
+
+def test_copy_rows_match_the_per_source_row_builder():
+    cursor = FakeCursor()
+    migration.migrate_sources_bulk(cursor, SOURCES[:1], CATEGORIES)
+    sql, payload = cursor.copies[0]
+
+    (row,) = list(csv.reader(payload.splitlines()))
+    expected = migration.build_source_row(SOURCES[0], CATEGORIES["Federal_Contracting"])
+    columns = ("ord",) + migration.SOURCE_COLUMNS
+    staged = dict(zip(columns, row))
+
+    assert sql.startswith(f"COPY source_migration_staging ({', '.join(columns)})")
+    assert staged["ord"] == "0"
+    assert staged["url"] == expected[1]
+    assert staged["source_type"] == expected[2] == "official"
+    assert json.loads(staged["metadata"])["original_id"] == "far"
+    assert staged["is_active"] == "True" and staged["word_count"] == "1200"
+
+
+def test_null_and_empty_string_stay_distinct_in_copy_csv():
+    payload = migration.copy_rows_csv([(0, None, "", "a,b", {"k": "v"})]).read()
+
+    # with NULL '\N' an unquoted empty field loads as '' rather than NULL
+    assert payload == '0,\\N,,"a,b","{""k"": ""v""}"\n'
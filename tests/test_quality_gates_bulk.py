@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test bulk quality validation - one query per layer, one batched log insert,
+and the same verdicts as the single-source validators
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "validation"))
+
+import quality_gates
+from quality_gates import QualityValidator
+
+# Canned catalog: (id, authority, dimension, publication_year, supporting, flags)
+SOURCES = [
+    ("s1", 95, "theory", 2020, 4, 0),
+    ("s2", 60, "current", 2019, 1, 3),
+    ("s3", 80, "history", 1950, 2, 0),
+]
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+LAYER_PARAMS = {
+    "authority": {"threshold": 70},
+    "cross_reference": {"min_supporting": 3},
+    "recency": {"thresholds": quality_gates.RECENCY_THRESHOLDS},
+    "customer_feedback": {"flag_threshold": 3},
+}
+
+
+class FakeConnection:
+    """psycopg2 stand-in answering the layer queries from SOURCES."""
+
+    encoding = "UTF8"
+
+    def __init__(self):
+        self.statements = []
+        self.inserted = []
+        self.saved_watermarks = []
+        self.watermarks = []      # quality_gate_watermarks rows
+        self.changed = set()      # source ids matching CHANGED_WHERE
+        self.latest = []          # DISTINCT ON rows from source_validations
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+        self.rows = []
+        self.pending = []
+
+    def mogrify(self, template, args):
+        self.pending.append(args)
+        return b"(row)"
+
+    def execute(self, sql, params=None):
+        sql = sql.decode() if isinstance(sql, bytes) else sql
+        conn = self.connection
+        conn.statements.append(sql)
+        if "INSERT INTO quality_gate_watermarks" in sql:
+            conn.saved_watermarks.extend(self.pending)
+        elif "INSERT" in sql:
+            conn.inserted.extend(self.pending)
+        self.pending = []
+        rows = [s for s in SOURCES if not params or "source_id" not in params or s[0] == params["source_id"]]
+        if isinstance(params, dict) and "since" in params:
+            rows = [s for s in rows if s[0] in conn.changed]
+        if "SELECT now()" in sql:
+            self.rows = [(NOW,)]
+        elif "FROM quality_gate_watermarks" in sql:
+            self.rows = conn.watermarks
+        elif "DISTINCT ON" in sql:
+            self.rows = [row for row in conn.latest if row[1] in params["layers"]]
+        elif "INSERT" in sql or "DELETE" in sql:
+            self.rows = []
+        elif "source_relationships" in sql:
+            m = params["min_supporting"]
+            self.rows = [
+                (sid, n, "high" if n >= m else "moderate" if n >= 2 else "low" if n >= 1 else "single_source", n >= min(m, 2))
+                for sid, _, _, _, n, _ in rows
+            ]
+        elif "unnest" in sql:
+            thresholds = dict(zip(params["dimensions"], params["thresholds"]))
+            year = params["current_year"]
+            self.rows = [
+                (sid, f"name {sid}", dim, pub, year - pub, thresholds.get(dim),
+                 thresholds.get(dim) is None or year - pub <= thresholds[dim])
+                for sid, _, dim, pub, _, _ in rows
+            ]
+        elif "source_feedback" in sql:
+            t = params["flag_threshold"]
+            self.rows = [(sid, f, 2 if f else None, [], f >= t) for sid, _, _, _, _, f in rows]
+        elif "authority_score >=" in sql:
+            self.rows = [(sid, a, "official", f"name {sid}", a >= params["threshold"]) for sid, a, *_ in rows]
+        else:
+            self.rows = []
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def make_validator():
+    validator = QualityValidator.__new__(QualityValidator)
+    validator.conn = FakeConnection()
+    return validator
+
+
+def test_validate_all_uses_one_query_per_layer_and_one_commit():
+    validator = make_validator()
+    result = validator.validate_all()
+    conn = validator.conn
+
+    layer_queries = [
+        sql for sql in conn.statements
+        if not any(word in sql for word in ("INSERT", "DELETE", "now()", "quality_gate_watermarks"))
+    ]
+    inserts = [sql for sql in conn.statements if "INSERT INTO source_validations" in sql]
+    assert len(layer_queries) == 4
+    assert len(inserts) == 1
+    assert conn.commits == 1
+    assert len(conn.inserted) == 4 * len(SOURCES)
+    assert result["reevaluated"] == {layer: len(SOURCES) for layer in LAYER_PARAMS}
+
+    assert result["total_sources"] == 3
+    assert result["summary"]["authority"] == {"pass": 2, "fail": 1}
+    assert result["summary"]["cross_reference"] == {"pass": 2, "warning": 1}
+    assert result["summary"]["customer_feedback"] == {"pass": 2, "warning": 1}
+    assert result["layers"]["recency"]["s3"]["reason"] == "Historical content (no recency requirement)"
+
+
+def test_bulk_layers_match_single_source_validators():
+    validator = make_validator()
+    authority = validator.bulk_validate_authority(log=False)
+    cross = validator.bulk_verify_cross_references(log=False)
+    recency = validator.bulk_validate_recency(log=False)
+    feedback = validator.bulk_check_customer_feedback(log=False)
+
+    for sid, *_ in SOURCES:
+        assert validator.validate_authority_score(sid) == authority[sid]
+        assert validator.verify_cross_references(sid) == cross[sid]
+        single = validator.validate_recency(sid)
+        assert single == {k: v for k, v in recency[sid].items() if k != "name"}
+        assert validator.check_customer_feedback(sid) == feedback[sid]
+
+
+def test_check_outdated_sources_is_one_query():
+    validator = make_validator()
+    outdated = validator.check_outdated_sources()
+
+    assert [s["id"] for s in outdated] == ["s2"]
+    assert outdated[0]["threshold_years"] == quality_gates.RECENCY_THRESHOLDS["current"]
+    assert sum("INSERT" not in sql for sql in validator.conn.statements) == 1
+    assert validator.conn.commits == 1
+
+
+def test_logged_run_saves_watermarks_in_the_same_commit():
+    validator = make_validator()
+    validator.validate_all()
+    conn = validator.conn
+
+    saved = {layer: (through, year, params) for layer, through, year, params in conn.saved_watermarks}
+    assert set(saved) == set(LAYER_PARAMS)
+    assert saved["authority"][:2] == (NOW, datetime.now().year)
+    assert any("DELETE FROM source_relationship_changes" in sql for sql in conn.statements)
+    assert conn.commits == 1
+
+    validator = make_validator()
+    validator.validate_all(log=False)
+    assert validator.conn.saved_watermarks == [] and validator.conn.commits == 0
+
+
+def test_incremental_run_reevaluates_changed_sources_and_merges_cached_results():
+    validator = make_validator()
+    conn = validator.conn
+    conn.watermarks = [(layer, NOW, NOW.year, params) for layer, params in LAYER_PARAMS.items()]
+    conn.changed = {"s2"}
+    cached = {"passed": True, "cached": True}
+    conn.latest = [(sid, layer, "pass", cached) for sid in ("s1", "s3") for layer in LAYER_PARAMS]
+
+    result = validator.validate_all(incremental=True)
+
+    assert result["reevaluated"] == {layer: 1 for layer in LAYER_PARAMS}
+    assert result["incremental_since"]["authority"] == (NOW - quality_gates.WATERMARK_OVERLAP).isoformat()
+    assert all("%(since)s" in sql for sql in conn.statements if "source_relationships" in sql)
+    assert len(conn.inserted) == 4
+    assert result["total_sources"] == 3
+    assert result["layers"]["authority"]["s1"] == cached
+    assert result["layers"]["authority"]["s2"]["passed"] is False
+    assert result["summary"]["authority"] == {"pass": 2, "fail": 1}
+
+
+def test_incremental_run_ignores_watermark_with_other_parameters():
+    validator = make_validator()
+    conn = validator.conn
+    conn.watermarks = [("authority", NOW, NOW.year, {"threshold": 50})]
+
+    result = validator.validate_all(incremental=True)
+
+    assert result["reevaluated"]["authority"] == len(SOURCES)
+    assert result["incremental_since"] == {layer: None for layer in LAYER_PARAMS}
+    assert not any("DISTINCT ON" in sql for sql in conn.statements)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the read-only quality report (one REPEATABLE READ snapshot, no writes)
+and the set-based flag action
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "validation"))
+
+from quality_gates import QualityValidator
+
+
+class FakeConnection:
+    """psycopg2 stand-in returning canned rows for the report queries."""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        self.connection.statements.append((sql, params))
+        if "UPDATE sources" in sql:
+            self.rows = [
+                ("s1", "Blog post", ["authority"], "Authority score 40 below threshold 70"),
+                ("s2", "Vendor FAQ", ["authority", "customer_feedback"], "Authority score 55 below threshold 70"),
+                ("s3", "Old manual", ["customer_feedback"], None),
+            ]
+        elif "GROUP BY validation_status" in sql:
+            self.rows = [("validated", 7), ("flagged", 2), ("deprecated", 1)]
+        elif "low_authority" in sql:
+            self.rows = [("s1",), ("s2",)]
+        elif "recency" in sql:
+            self.rows = [("s4", "2019 threat report", "current", 7, 1)]
+        elif "negative_feedback" in sql:
+            self.rows = [("s2",), ("s3",)]
+        elif "source_validations" in sql:
+            self.rows = [("authority", "pass", 8), ("authority", "fail", 2), ("recency", "warning", 1)]
+        else:
+            self.rows = []
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def make_validator():
+    return QualityValidator(connection=FakeConnection())
+
+
+def test_report_reads_one_snapshot_without_writes():
+    validator = make_validator()
+    report = validator.generate_quality_report()
+    conn = validator.conn
+
+    statements = [sql for sql, _ in conn.statements]
+    assert statements[0] == "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+    assert not any(word in sql for sql in statements for word in ("UPDATE", "INSERT", "DELETE"))
+    assert conn.commits == 0
+    assert conn.rollbacks == 2
+
+    assert report["total_sources"] == 10
+    assert report["failed_authority"] == ["s1", "s2"]
+    assert report["outdated"] == [{
+        "id": "s4", "name": "2019 threat report", "dimension": "current", "age_years": 7, "threshold_years": 1
+    }]
+    assert report["flagged_feedback"] == ["s2", "s3"]
+    assert report["validation_summary"] == {"authority": {"pass": 8, "fail": 2}, "recency": {"warning": 1}}
+
+
+def test_flag_sources_is_one_update_and_one_commit():
+    validator = make_validator()
+    flagged = validator.flag_sources()
+    conn = validator.conn
+
+    assert len(conn.statements) == 1
+    sql, params = conn.statements[0]
+    assert sql.count("UPDATE sources") == 1
+    assert params["threshold"] == 70 and params["flag_threshold"] == 3
+    assert conn.commits == 1
+    assert flagged == {"authority": ["s1", "s2"], "customer_feedback": ["s2", "s3"]}
+
+
+def test_single_rule_actions_disable_the_other_rule():
+    validator = make_validator()
+    validator.block_low_authority_sources(threshold=60)
+    validator.flag_sources_for_review(flag_threshold=5)
+
+    (_, block_params), (_, review_params) = validator.conn.statements
+    assert (block_params["threshold"], block_params["flag_threshold"]) == (60, None)
+    assert (review_params["threshold"], review_params["flag_threshold"]) == (None, 5)
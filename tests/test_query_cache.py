@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test knowledge search result cache - LRU, TTL, invalidation
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+from query_cache import QueryCache, search_cache_key
+
+
+def test_keys_are_normalized_like_the_search_builder():
+    assert search_cache_key("  FAR   Part 15 ") == search_cache_key("far part 15")
+    assert search_cache_key("x", dimension="Theory") == search_cache_key("x", dimension="theory")
+    assert search_cache_key("x", dimension="bogus") == search_cache_key("x")
+    assert search_cache_key("x", max_results=50) == search_cache_key("x", max_results=15)
+    assert search_cache_key("x", min_authority="90") == search_cache_key("x", min_authority=90)
+    assert search_cache_key("x", mode="hybrid") != search_cache_key("x", mode="lexical")
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = QueryCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = QueryCache(ttl_seconds=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_result_computed_across_invalidation_is_not_cached():
+    cache = QueryCache()
+    generation = cache.generation
+    cache.invalidate()  # change notification arrives while the query runs
+    cache.put("a", "stale rows", generation)
+
+    assert cache.get("a") is None
+    assert cache.stats()["stale_puts"] == 1
+
+
+def test_cache_is_bypassed_while_listener_is_disconnected():
+    cache = QueryCache(available=False)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+
+    cache.set_available(True)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+
+    cache.set_available(False)
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test SourcesCatalog - sources.yaml is parsed once and reloaded only when the
+file's content changes; the JSON snapshot serves cold starts
+"""
+
+import importlib.util
+import json
+import os
+import pickle
+from datetime import date
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location(
+    "knowledge_gap_manager",
+    Path(__file__).parent.parent / "scripts" / "automation" / "knowledge_gap_manager.py"
+)
+knowledge_gap_manager = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(knowledge_gap_manager)
+SourcesCatalog = knowledge_gap_manager.SourcesCatalog
+KnowledgeGapManager = knowledge_gap_manager.KnowledgeGapManager
+GapQueueStore = knowledge_gap_manager.GapQueueStore
+
+CATALOG_YAML = """
+sources:
+  - id: nist-csf
+    name: NIST Cybersecurity Framework
+    category: cybersecurity
+    metadata_tags: [compliance, federal]
+  - id: cmmc
+    name: CMMC Model
+    category: defense_compliance
+    metadata_tags: [dod, cybersecurity]
+"""
+
+
+def write(path, text, mtime_offset=0):
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+
+def test_parses_once_and_skips_unchanged_content(tmp_path):
+    sources_file = tmp_path / "sources.yaml"
+    write(sources_file, CATALOG_YAML)
+    catalog = SourcesCatalog(sources_file, snapshot_path=None)
+
+    sources, index = catalog.get()
+    assert [s["id"] for s in sources["sources"]] == ["nist-csf", "cmmc"]
+    assert catalog.get()[1] is index
+    assert (catalog.loads, catalog.parses) == (1, 1)
+
+    # Touched but identical: re-hashed, not re-parsed
+    write(sources_file, CATALOG_YAML, mtime_offset=10**9)
+    assert catalog.get()[1] is index
+    assert (catalog.loads, catalog.parses) == (2, 1)
+
+
+def test_content_change_rebuilds_index(tmp_path):
+    sources_file = tmp_path / "sources.yaml"
+    write(sources_file, CATALOG_YAML)
+    catalog = SourcesCatalog(sources_file, snapshot_path=None)
+    assert catalog.match_index.match(["itar"]) == []
+
+    write(sources_file, CATALOG_YAML + """
+  - id: itar
+    name: ITAR Regulations
+    category: export_control
+    metadata_tags: [itar, state department]
+""", mtime_offset=10**9)
+    assert catalog.match_index.match(["itar"]) == ["itar"]
+    assert catalog.parses == 2
+
+
+def test_snapshot_serves_cold_start_and_is_ignored_when_stale(tmp_path):
+    sources_file = tmp_path / "sources.yaml"
+    snapshot = tmp_path / "snapshot.json"
+    write(sources_file, CATALOG_YAML)
+
+    SourcesCatalog(sources_file, snapshot_path=snapshot).get()
+    assert snapshot.exists()
+
+    warm = SourcesCatalog(sources_file, snapshot_path=snapshot)
+    assert len(warm.match_index) == 2
+    assert (warm.parses, warm.snapshot_hits) == (0, 1)
+
+    write(sources_file, CATALOG_YAML.replace("CMMC Model", "CMMC 2.0 Model"), mtime_offset=10**9)
+    stale = SourcesCatalog(sources_file, snapshot_path=snapshot)
+    assert stale.sources["sources"][1]["name"] == "CMMC 2.0 Model"
+    assert (stale.parses, stale.snapshot_hits) == (1, 0)
+
+
+def test_snapshot_is_plain_json_and_never_unpickled(tmp_path):
+    sources_file = tmp_path / "sources.yaml"
+    snapshot = tmp_path / "snapshot.json"
+    write(sources_file, CATALOG_YAML + "    ingestion: {last_update: 2025-06-30}\n")
+
+    SourcesCatalog(sources_file, snapshot_path=snapshot).get()
+    assert json.loads(snapshot.read_text())["version"] == knowledge_gap_manager.SNAPSHOT_VERSION
+
+    warm = SourcesCatalog(sources_file, snapshot_path=snapshot)
+    assert warm.sources["sources"][1]["ingestion"]["last_update"] == date(2025, 6, 30)
+    assert warm.snapshot_hits == 1
+
+    # A planted pickle is just an unreadable snapshot: re-parse, overwrite
+    snapshot.write_bytes(pickle.dumps({"version": 2, "sha256": "x", "sources": {}}))
+    replaced = SourcesCatalog(sources_file, snapshot_path=snapshot)
+    replaced.get()
+    assert (replaced.parses, replaced.snapshot_hits) == (1, 0)
+    assert json.loads(snapshot.read_text())["sources"]["sources"][0]["id"] == "nist-csf"
+
+
+def test_data_that_does_not_round_trip_is_not_snapshotted(tmp_path):
+    sources_file = tmp_path / "sources.yaml"
+    snapshot = tmp_path / "snapshot.json"
+    write(sources_file, CATALOG_YAML + "tiers: {1: basic, 2: pro}\n")
+
+    catalog = SourcesCatalog(sources_file, snapshot_path=snapshot)
+    assert catalog.sources["tiers"] == {1: "basic", 2: "pro"}
+    assert not snapshot.exists()
+
+
+def test_manager_uses_shared_catalog(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "development")
+    sources_file = tmp_path / "sources.yaml"
+    write(sources_file, CATALOG_YAML)
+    catalog = SourcesCatalog(sources_file, snapshot_path=None)
+    queue = GapQueueStore(tmp_path / "gaps.sqlite3", legacy_jsonl=None)
+
+    first = KnowledgeGapManager(catalog=catalog, queue=queue)
+    second = KnowledgeGapManager(catalog=catalog, queue=queue)
+    result = second.detect_gap(topic="cybersecurity", keywords=["cybersecurity"])
+
+    assert first.sources is second.sources
+    assert result == {"gap_detected": False, "sources_found": 2, "action": "none_needed"}
+    assert catalog.parses == 1
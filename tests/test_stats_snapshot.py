@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test /stats - single GROUPING SETS query folded into a cached snapshot
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+os.environ.setdefault("POSTGRES_PASSWORD", "test")  # skip the Key Vault lookup
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+import http_server
+from db_operations import build_stats
+
+
+def grouping_row(by_authority, by_dimension, authority, dimension, sources):
+    return {
+        "by_authority": by_authority,
+        "by_dimension": by_dimension,
+        "authority_score": authority,
+        "epistemological_dimension": dimension,
+        "sources": sources,
+        "categories": 43,
+    }
+
+
+def test_grouping_sets_rows_fold_into_breakdowns():
+    rows = [
+        grouping_row(1, 1, None, None, 1043),
+        grouping_row(0, 1, 50, None, 200),
+        grouping_row(0, 1, 90, None, 600),
+        grouping_row(0, 1, 70, None, 243),
+        grouping_row(1, 0, None, "practice", 700),
+        grouping_row(1, 0, None, None, 343),  # genuine NULL dimension, not the total
+    ]
+
+    stats = build_stats(rows)
+
+    assert stats["total_sources"] == 1043
+    assert list(stats["authority_breakdown"].items()) == [(90, 600), (70, 243), (50, 200)]
+    assert stats["dimension_breakdown"] == {"practice": 700, None: 343}
+    assert stats["categories"] == 43
+
+
+def test_stats_endpoint_serves_snapshot_without_querying(monkeypatch):
+    calls = []
+
+    async def get_stats():
+        calls.append(1)
+        return build_stats([grouping_row(1, 1, None, None, 7)])
+
+    monkeypatch.setattr(http_server.adb, "get_stats", get_stats)
+    monkeypatch.setattr(http_server, "_stats_snapshot", None)
+    client = TestClient(http_server.app)
+
+    first = client.get("/stats").json()
+    for _ in range(5):
+        assert client.get("/stats").json()["total_sources"] == 7
+
+    assert first["total_sources"] == 7
+    assert "snapshot_age_seconds" in first
+    assert len(calls) == 1
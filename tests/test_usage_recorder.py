@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test UsageRecorder - buffered, batched usage writes with spill and replay
+"""
+
+import asyncio
+import fcntl
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"
+sys.path.insert(0, str(SERVER_DIR))
+
+import usage_recorder
+from usage_recorder import USAGE_COLUMNS, UsageRecorder, parse_uuid, usage_event_params
+
+CUSTOMER = "0b7f5a0e-8a38-4d1c-9d55-3f7b2f0c1a11"
+SOURCE = "6f1c2d3e-4b5a-4c6d-8e7f-9a0b1c2d3e4f"
+
+
+class FakeWriter:
+    """Stands in for AsyncKnowledgeRegistryDB.write_usage_events."""
+
+    def __init__(self, fail=0, delay=0.0):
+        self.batches = []
+        self.fail = fail
+        self.delay = delay
+
+    async def __call__(self, events):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("connection refused")
+        self.batches.append(list(events))
+        return len(events)
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for _, row in batch]
+
+
+def run_with(recorder, scenario):
+    async def main():
+        task = asyncio.create_task(recorder.run())
+        try:
+            await scenario()
+        finally:
+            task.cancel()
+            await recorder.close()
+    asyncio.run(main())
+
+
+def test_events_are_written_in_batches():
+    writer = FakeWriter()
+    recorder = UsageRecorder(writer, batch_size=50, flush_interval_seconds=0.05)
+
+    async def scenario():
+        for i in range(120):
+            recorder.record_usage(CUSTOMER, "semantic_search", query_metadata={"query": f"q{i}"})
+        await asyncio.sleep(0.15)
+
+    run_with(recorder, scenario)
+    assert [len(batch) for batch in writer.batches] == [50, 50, 20]
+    assert recorder.stats()["written"] == 120
+    assert writer.rows[0]["created_at"].tzinfo is not None
+
+
+def test_recording_never_waits_on_a_slow_database():
+    writer = FakeWriter(delay=0.3)
+    recorder = UsageRecorder(writer, batch_size=10, flush_interval_seconds=0.01)
+
+    async def scenario():
+        await asyncio.sleep(0.02)
+        started = asyncio.get_running_loop().time()
+        for _ in range(500):
+            recorder.record_usage(CUSTOMER, "source_access", source_id=SOURCE)
+        assert asyncio.get_running_loop().time() - started < 0.1
+        await asyncio.sleep(0.05)
+
+    run_with(recorder, scenario)
+    assert recorder.stats()["recorded"] == 500
+
+
+def test_unattributed_and_overflowing_events_are_counted_not_queued():
+    recorder = UsageRecorder(FakeWriter(), max_events=3)
+
+    assert recorder.record_usage(None, "semantic_search") is False
+    assert recorder.record_usage("not-a-uuid", "semantic_search") is False
+    assert all(recorder.record_usage(CUSTOMER, "semantic_search") for _ in range(3))
+    assert recorder.record_usage(CUSTOMER, "semantic_search") is False
+
+    stats = recorder.stats()
+    assert (stats["unattributed"], stats["dropped"], stats["buffered"]) == (2, 1, 3)
+
+
+def test_failed_batch_is_retried_in_order():
+    writer = FakeWriter(fail=1)
+    recorder = UsageRecorder(writer, batch_size=10, flush_interval_seconds=0.02, retry_seconds=0.05)
+
+    async def scenario():
+        for i in range(5):
+            recorder.record_usage(CUSTOMER, "semantic_search", tokens_used=i)
+        await asyncio.sleep(0.15)
+
+    run_with(recorder, scenario)
+    assert [row["tokens_used"] for row in writer.rows] == [0, 1, 2, 3, 4]
+    assert recorder.stats()["failures"] == 1
+
+
+def test_unwritten_events_spill_on_shutdown_and_replay_on_next_start(tmp_path):
+    spill = tmp_path / "usage_spill.ndjson"
+    down = FakeWriter(fail=100)
+    recorder = UsageRecorder(down, flush_interval_seconds=10, spill_path=str(spill))
+    recorder.record_usage(CUSTOMER, "source_access", source_id=SOURCE, cost_incurred=0.25)
+    recorder.record_usage(CUSTOMER, "semantic_search", query_metadata={"query": "FAR"})
+
+    asyncio.run(recorder.close(timeout=0.1))
+    assert recorder.stats()["spilled"] == 2
+    # one file per process, so workers sharing a directory never share a file
+    own = tmp_path / f"usage_spill.ndjson.{os.getpid()}"
+    assert len(own.read_text().splitlines()) == 2
+
+    up = FakeWriter()
+    restarted = UsageRecorder(up, flush_interval_seconds=0.02, spill_path=str(spill))
+    run_with(restarted, lambda: asyncio.sleep(0.1))
+
+    assert [row["query_type"] for row in up.rows] == ["source_access", "semantic_search"]
+    assert up.rows[0]["created_at"].tzinfo is not None
+    assert restarted.stats()["replayed"] == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def spill_events(path, count):
+    recorder = UsageRecorder(FakeWriter())
+    for i in range(count):
+        recorder.record_usage(CUSTOMER, "semantic_search", tokens_used=i)
+    path.write_text("".join(usage_recorder._dump_event(event) + "\n" for event in recorder._buffer))
+
+
+def test_concurrent_workers_replay_each_spill_file_once(tmp_path):
+    spill = tmp_path / "usage_spill.ndjson"
+    for pid, count in [(111, 30), (222, 20)]:
+        spill_events(tmp_path / f"usage_spill.ndjson.{pid}", count)
+    spill_events(tmp_path / "usage_spill.ndjson.replay.333.dead", 10)  # claim left by a crash
+
+    writer = FakeWriter(delay=0.01)
+    workers = [UsageRecorder(writer, batch_size=7, spill_path=str(spill)) for _ in range(4)]
+
+    async def main():
+        return await asyncio.gather(*(worker.replay_spill() for worker in workers))
+
+    asyncio.run(main())
+    # files that were busy elsewhere during a claim are emptied, not replayed twice
+    assert asyncio.run(workers[0].replay_spill()) is True
+    assert sorted(row["tokens_used"] for row in writer.rows) == sorted(
+        list(range(30)) + list(range(20)) + list(range(10)))
+    assert sum(worker.stats()["replayed"] for worker in workers) == 60
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_spill_file_locked_by_another_replayer_is_deferred(tmp_path):
+    spill = tmp_path / "usage_spill.ndjson"
+    busy = tmp_path / "usage_spill.ndjson.replay.444.live"
+    spill_events(busy, 5)
+    writer = FakeWriter()
+    recorder = UsageRecorder(writer, spill_path=str(spill))
+
+    with open(busy, "r+") as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        assert asyncio.run(recorder.replay_spill()) is False
+        assert writer.rows == []
+        # the replayer it belongs to finishes: events written, file emptied
+        held.truncate(0)
+
+    assert asyncio.run(recorder.replay_spill()) is True
+    assert writer.rows == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_params_are_column_arrays_with_source_access_counts():
+    recorder = UsageRecorder(FakeWriter())
+    recorder.record_usage(CUSTOMER, "source_access", source_id=SOURCE, cost_incurred=0.1)
+    recorder.record_usage(CUSTOMER, "semantic_search", cost_incurred=None)
+    recorder.record_connector_query(CUSTOMER, SOURCE, "proposal templates", files_retrieved=3)
+
+    params = usage_event_params(list(recorder._buffer))
+
+    usage = dict(zip(USAGE_COLUMNS, params["usage_tracking"]))
+    assert usage["query_type"] == ["source_access", "semantic_search"]
+    assert [str(cost) if cost is not None else None for cost in usage["cost_incurred"]] == ["0.1", None]
+    assert params["source_access"] == ([SOURCE],)
+    assert params["connector_query_log"][2] == ["proposal templates"]
+
+
+def test_parse_uuid():
+    assert parse_uuid(" " + CUSTOMER.upper() + " ") == CUSTOMER
+    assert parse_uuid("") is None and parse_uuid("42") is None
+
+
+def test_server_imports_with_recording_enabled():
+    env = {k: v for k, v in os.environ.items() if not k.startswith("USAGE_")}
+    env.update(USAGE_RECORDING_ENABLED="true", POSTGRES_PASSWORD="unused", PYTHONPATH=str(SERVER_DIR))
+    check = "import http_server; print(http_server.usage_recorder.spill_path)"
+    result = subprocess.run([sys.executable, "-c", check], env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == str(SERVER_DIR.resolve() / "usage_spill.ndjson")
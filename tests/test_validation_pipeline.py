@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test ValidationPipeline - layers run concurrently on pooled connections,
+results stream as each source completes
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "validation"))
+
+from quality_gates import QualityValidator
+from validation_pipeline import ValidationPipeline, write_ndjson
+
+LAYER_DELAY = 0.1
+
+
+class FakeConnection:
+    autocommit = False
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """getconn/putconn stand-in that records peak checkouts."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_out = 0
+        self.peak = 0
+
+    def getconn(self):
+        with self.lock:
+            self.checked_out += 1
+            self.peak = max(self.peak, self.checked_out)
+        return FakeConnection()
+
+    def putconn(self, conn):
+        with self.lock:
+            self.checked_out -= 1
+
+
+@pytest.fixture
+def layers(monkeypatch):
+    """Slow canned layers; authority fails for ids starting with 'low', raises for 'bad'."""
+    calls = []
+
+    def layer(result):
+        def run(self, source_id):
+            calls.append(source_id)
+            time.sleep(LAYER_DELAY)
+            if source_id.startswith("bad"):
+                raise RuntimeError("connection lost")
+            return result(source_id)
+        return run
+
+    monkeypatch.setattr(QualityValidator, "validate_authority_score",
+                        layer(lambda sid: {"passed": not sid.startswith("low"), "score": 50}))
+    monkeypatch.setattr(QualityValidator, "verify_cross_references", layer(lambda sid: {"passed": True}))
+    monkeypatch.setattr(QualityValidator, "validate_recency", layer(lambda sid: {"passed": True}))
+    monkeypatch.setattr(QualityValidator, "check_customer_feedback", layer(lambda sid: {"requires_review": False}))
+    return calls
+
+
+def test_layers_run_concurrently_and_stream_results(layers):
+    pool = FakePool()
+    pipeline = ValidationPipeline(pool=pool, workers=16)
+
+    started = time.perf_counter()
+    results = list(pipeline.run(["s1", "s2", "low3", "s4"]))
+    elapsed = time.perf_counter() - started
+
+    # 16 layer calls of LAYER_DELAY each, all in flight at once
+    assert elapsed < 4 * LAYER_DELAY
+    assert len(layers) == 16
+    assert pool.peak <= 16 and pool.checked_out == 0
+
+    by_id = {r["source_id"]: r for r in results}
+    assert set(by_id) == {"s1", "s2", "low3", "s4"}
+    assert by_id["s1"]["overall_status"] == "PASSED"
+    assert by_id["low3"]["overall_status"] == "FAILED"
+    assert by_id["low3"]["critical_failures"] == ["authority"]
+    assert set(by_id["s1"]["layers"]) == {
+        "authority", "cross_reference", "recency", "customer_feedback", "contradictions"
+    }
+
+
+def test_pending_sources_are_bounded(layers):
+    pool = FakePool()
+    pipeline = ValidationPipeline(pool=pool, workers=8, max_pending_sources=1)
+
+    results = pipeline.run(f"s{n}" for n in range(3))
+    first = next(results)
+
+    assert first["source_id"] == "s0"
+    assert pool.peak == 4
+    assert len(list(results)) == 2
+
+
+def test_layer_error_is_reported_per_source(layers):
+    pipeline = ValidationPipeline(pool=FakePool(), workers=4)
+    results = {r["source_id"]: r for r in pipeline.run(["bad1", "s2"])}
+
+    assert results["bad1"]["overall_status"] == "ERROR"
+    assert results["bad1"]["passed"] is False
+    assert results["bad1"]["errors"]["authority"] == "connection lost"
+    assert results["s2"]["overall_status"] == "PASSED"
+
+
+def test_write_ndjson(layers):
+    pipeline = ValidationPipeline(pool=FakePool(), workers=4)
+    output = io.StringIO()
+    counts = write_ndjson(pipeline.run(["s1", "low2"]), output)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(line["source_id"] for line in lines) == ["low2", "s1"]
+    assert counts == {"PASSED": 1, "FAILED": 1}
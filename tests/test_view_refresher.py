@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test MaterializedViewRefresher - notification bursts collapse into one
+debounced refresh
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "mcp_servers" / "knowledge_registry"))
+
+from view_refresher import MaterializedViewRefresher
+
+
+def run_with(refresher, scenario):
+    async def main():
+        task = asyncio.create_task(refresher.run())
+        try:
+            await scenario()
+        finally:
+            task.cancel()
+    asyncio.run(main())
+
+
+def test_burst_collapses_into_one_refresh():
+    calls = []
+
+    async def refresh():
+        calls.append(1)
+        return True
+
+    refresher = MaterializedViewRefresher(refresh, quiet_seconds=0.05, min_interval_seconds=0)
+
+    async def scenario():
+        for _ in range(20):
+            refresher.request("source_concepts")
+            await asyncio.sleep(0.005)
+        assert calls == []
+        await asyncio.sleep(0.15)
+
+    run_with(refresher, scenario)
+    assert len(calls) == 1
+    assert refresher.stats()["requests"] == 20
+    assert refresher.stats()["pending"] is False
+
+
+def test_continuous_writes_still_refresh_after_max_delay():
+    calls = []
+
+    async def refresh():
+        calls.append(1)
+        return True
+
+    refresher = MaterializedViewRefresher(refresh, quiet_seconds=0.1, max_delay_seconds=0.15, min_interval_seconds=0)
+
+    async def scenario():
+        for _ in range(40):
+            refresher.request()
+            await asyncio.sleep(0.01)
+
+    run_with(refresher, scenario)
+    assert len(calls) >= 2
+
+
+def test_min_interval_spaces_refreshes_and_lock_contention_is_retried():
+    results = [False, True]
+    calls = []
+
+    async def refresh():
+        calls.append(asyncio.get_running_loop().time())
+        return results.pop(0)
+
+    refresher = MaterializedViewRefresher(refresh, quiet_seconds=0, min_interval_seconds=0.2, retry_seconds=0.05)
+
+    async def scenario():
+        # one request: the skipped refresh must be followed by another
+        refresher.request()
+        await asyncio.sleep(0.35)
+
+    run_with(refresher, scenario)
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.19
+    assert (refresher.stats()["skipped"], refresher.stats()["refreshes"]) == (1, 1)
+    assert refresher.stats()["pending"] is False
+
+
+def test_failed_refresh_is_retried():
+    attempts = []
+
+    async def refresh():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("materialized view does not exist")
+        return True
+
+    refresher = MaterializedViewRefresher(refresh, quiet_seconds=0, min_interval_seconds=0, retry_seconds=0.05)
+
+    async def scenario():
+        refresher.request()
+        await asyncio.sleep(0.2)
+
+    run_with(refresher, scenario)
+    assert len(attempts) == 2
+    assert refresher.stats()["failures"] == 1 and refresher.stats()["refreshes"] == 1